@@ -0,0 +1,41 @@
+"""Add duplicate_clusters report table for registry-wide duplicate audits
+
+Revision ID: 20251223_duplicate_clusters
+Revises: 20251222_earnings
+Create Date: 2024-12-23
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers
+revision = '20251223_duplicate_clusters'
+down_revision = '20251222_earnings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'duplicate_clusters',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('audit_id', sa.String(64), nullable=False, index=True),
+        sa.Column('cluster_id', sa.Integer, nullable=False),
+        sa.Column('cluster_size', sa.Integer, nullable=False),
+        sa.Column('identity_id', UUID(as_uuid=True), sa.ForeignKey('identities.id', ondelete='SET NULL'), index=True),
+        sa.Column('max_similarity', sa.Float),
+        sa.Column('threshold', sa.Float, nullable=False),
+        sa.Column('created_at', sa.DateTime, default=sa.func.now()),
+        sa.CheckConstraint('cluster_size >= 2', name='chk_duplicate_cluster_size'),
+    )
+
+    op.create_index(
+        'idx_duplicate_cluster_audit_cluster',
+        'duplicate_clusters',
+        ['audit_id', 'cluster_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_duplicate_cluster_audit_cluster', table_name='duplicate_clusters')
+    op.drop_table('duplicate_clusters')
@@ -0,0 +1,38 @@
+"""Add stats_watermarks for incremental usage statistics
+
+Revision ID: 20251224_stats_watermarks
+Revises: 20251223_duplicate_clusters
+Create Date: 2024-12-24
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers
+revision = '20251224_stats_watermarks'
+down_revision = '20251223_duplicate_clusters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stats_watermarks',
+        sa.Column('name', sa.String(64), primary_key=True),
+        sa.Column('last_created_at', sa.DateTime, nullable=False),
+        sa.Column('last_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('rows_applied', sa.Integer, server_default='0'),
+        sa.Column('reconciled_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.func.now()),
+    )
+
+    op.create_index(
+        'idx_license_created_id',
+        'licenses',
+        ['created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_license_created_id', table_name='licenses')
+    op.drop_table('stats_watermarks')
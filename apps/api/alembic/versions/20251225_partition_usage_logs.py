@@ -0,0 +1,138 @@
+"""Partition usage_logs by month
+
+Rebuilds usage_logs as a table range-partitioned on created_at, one
+partition per month (usage_logs_YYYY_MM) plus usage_logs_default, and
+copies the existing rows into it. Retention then archives and drops whole
+partitions (worker: tasks.cleanup.cleanup_old_logs) instead of deleting
+rows.
+
+The primary key becomes (id, created_at): Postgres requires the partition
+key in every unique constraint. created_at is made NOT NULL; rows without
+one are stamped with the migration time.
+
+Also adds usage_log_archived_counts, the per-identity verify counts of
+partitions that were archived and dropped.
+
+Revision ID: 20251225_partition_usage_logs
+Revises: 20251224_stats_watermarks
+Create Date: 2024-12-25
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers
+revision = '20251225_partition_usage_logs'
+down_revision = '20251224_stats_watermarks'
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created past the current month (the worker's
+# create_usage_log_partitions task keeps this horizon from then on)
+PARTITIONS_AHEAD = 3
+
+USAGE_LOG_INDEXES = [
+    ('ix_usage_logs_identity_id', ['identity_id']),
+    ('ix_usage_logs_license_id', ['license_id']),
+    ('ix_usage_logs_requester_id', ['requester_id']),
+    ('ix_usage_logs_action', ['action']),
+    ('ix_usage_logs_created_at', ['created_at']),
+    ('ix_usage_logs_actor_pack_id', ['actor_pack_id']),
+    ('ix_usage_logs_api_key_id', ['api_key_id']),
+    ('ix_usage_logs_analytics', ['identity_id', 'action', 'created_at']),
+    ('idx_usage_identity_date', ['identity_id', 'created_at']),
+    ('idx_usage_action_date', ['action', 'created_at']),
+    ('idx_usage_requester', ['requester_id', 'created_at']),
+]
+
+USAGE_LOG_FOREIGN_KEYS = [
+    ('usage_logs_identity_id_fkey', 'identities', 'identity_id'),
+    ('usage_logs_license_id_fkey', 'licenses', 'license_id'),
+    ('usage_logs_actor_pack_id_fkey', 'actor_packs', 'actor_pack_id'),
+    ('usage_logs_api_key_id_fkey', 'api_keys', 'api_key_id'),
+]
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes_and_keys() -> None:
+    for name, columns in USAGE_LOG_INDEXES:
+        op.create_index(name, 'usage_logs', columns)
+
+    for name, referent, column in USAGE_LOG_FOREIGN_KEYS:
+        op.create_foreign_key(
+            name,
+            'usage_logs', referent,
+            [column], ['id'],
+            ondelete='SET NULL'
+        )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    op.execute("UPDATE usage_logs SET created_at = NOW() AT TIME ZONE 'utc' WHERE created_at IS NULL")
+
+    # Keep the old table (and its pkey name out of the way) until the copy is done
+    op.execute("ALTER TABLE usage_logs RENAME TO usage_logs_legacy")
+    op.execute("ALTER TABLE usage_logs_legacy RENAME CONSTRAINT usage_logs_pkey TO usage_logs_legacy_pkey")
+
+    op.execute("""
+        CREATE TABLE usage_logs (
+            LIKE usage_logs_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER TABLE usage_logs ALTER COLUMN created_at SET NOT NULL")
+
+    oldest = conn.execute(sa.text("SELECT MIN(created_at) FROM usage_logs_legacy")).scalar()
+    current = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current
+    while month <= _add_months(current, PARTITIONS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE usage_logs_{month:%Y_%m} PARTITION OF usage_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE usage_logs_default PARTITION OF usage_logs DEFAULT")
+
+    op.execute("INSERT INTO usage_logs SELECT * FROM usage_logs_legacy")
+    op.execute("DROP TABLE usage_logs_legacy")
+
+    # Indexes and keys after the copy: one build per partition instead of
+    # row-by-row maintenance
+    op.create_primary_key('usage_logs_pkey', 'usage_logs', ['id', 'created_at'])
+    _create_indexes_and_keys()
+
+    op.create_table(
+        'usage_log_archived_counts',
+        sa.Column('identity_id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('verifications', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    # Archived (dropped) partitions are not restored; they stay in S3
+    op.drop_table('usage_log_archived_counts')
+
+    op.execute("ALTER TABLE usage_logs RENAME TO usage_logs_partitioned")
+    op.execute("ALTER TABLE usage_logs_partitioned RENAME CONSTRAINT usage_logs_pkey TO usage_logs_partitioned_pkey")
+
+    op.execute("""
+        CREATE TABLE usage_logs (
+            LIKE usage_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )
+    """)
+    op.execute("ALTER TABLE usage_logs ALTER COLUMN created_at DROP NOT NULL")
+
+    op.execute("INSERT INTO usage_logs SELECT * FROM usage_logs_partitioned")
+    op.execute("DROP TABLE usage_logs_partitioned")
+
+    op.create_primary_key('usage_logs_pkey', 'usage_logs', ['id'])
+    _create_indexes_and_keys()
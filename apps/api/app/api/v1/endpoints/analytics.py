@@ -3,7 +3,7 @@ Analytics Endpoints
 Usage, revenue, and performance analytics
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
@@ -30,6 +30,14 @@ logger = structlog.get_logger()
 router = APIRouter()
 
 
+def _log_time(value: datetime) -> datetime:
+    """
+    usage_logs.created_at bound as naive UTC (the column's type), so
+    Postgres can prune the monthly partitions outside the range.
+    """
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """Dependency that requires admin role"""
     if current_user.role != "ADMIN":
@@ -91,7 +99,7 @@ async def get_usage_analytics(
         func.date(UsageLog.created_at).label("date"),
     ).where(
         UsageLog.requester_id == current_user.id,
-        UsageLog.created_at >= period_start,
+        UsageLog.created_at >= _log_time(period_start),
     )
 
     if identity_id:
@@ -123,7 +131,7 @@ async def get_usage_analytics(
             func.count().label("total"),
         ).where(
             UsageLog.requester_id == current_user.id,
-            UsageLog.created_at >= period_start,
+            UsageLog.created_at >= _log_time(period_start),
         ).group_by(UsageLog.action)
     )
 
@@ -224,7 +232,7 @@ async def get_identity_analytics(
             func.count().label("count"),
         ).where(
             UsageLog.identity_id == identity_id,
-            UsageLog.created_at >= period_start,
+            UsageLog.created_at >= _log_time(period_start),
         ).group_by(UsageLog.action)
     )
 
@@ -247,7 +255,7 @@ async def get_identity_analytics(
             func.count().label("count"),
         ).where(
             UsageLog.identity_id == identity_id,
-            UsageLog.created_at >= period_start,
+            UsageLog.created_at >= _log_time(period_start),
         ).group_by(
             func.date(UsageLog.created_at)
         ).order_by(func.date(UsageLog.created_at))
@@ -304,10 +312,10 @@ async def get_platform_analytics(
         )
     ) or 0
 
-    # API calls
+    # API calls (total spans every retained partition)
     total_api_calls = await db.scalar(select(func.count()).select_from(UsageLog)) or 0
     period_api_calls = await db.scalar(
-        select(func.count()).where(UsageLog.created_at >= period_start)
+        select(func.count()).where(UsageLog.created_at >= _log_time(period_start))
     ) or 0
 
     # Daily active users
@@ -316,7 +324,7 @@ async def get_platform_analytics(
             func.date(UsageLog.created_at).label("date"),
             func.count(func.distinct(UsageLog.requester_id)).label("users"),
         ).where(
-            UsageLog.created_at >= period_start
+            UsageLog.created_at >= _log_time(period_start)
         ).group_by(
             func.date(UsageLog.created_at)
         ).order_by(func.date(UsageLog.created_at))
@@ -363,8 +371,8 @@ async def _get_usage_stats(
             func.count().label("count"),
         ).where(
             UsageLog.requester_id == user_id,
-            UsageLog.created_at >= period_start,
-            UsageLog.created_at <= period_end,
+            UsageLog.created_at >= _log_time(period_start),
+            UsageLog.created_at <= _log_time(period_end),
         ).group_by(UsageLog.action)
     )
 
@@ -448,7 +456,13 @@ async def _get_top_identities(
             func.coalesce(license_stats.c.license_count, 0).label("licenses_sold"),
             func.coalesce(license_stats.c.total_revenue, 0).label("revenue"),
         )
-        .outerjoin(UsageLog, UsageLog.identity_id == Identity.id)
+        .outerjoin(
+            UsageLog,
+            and_(
+                UsageLog.identity_id == Identity.id,
+                UsageLog.created_at >= _log_time(period_start),
+            ),
+        )
         .outerjoin(license_stats, license_stats.c.identity_id == Identity.id)
         .where(
             Identity.user_id == user_id,
@@ -490,8 +504,8 @@ async def _get_usage_trend(
             func.count().label("count"),
         ).where(
             UsageLog.requester_id == user_id,
-            UsageLog.created_at >= period_start,
-            UsageLog.created_at <= period_end,
+            UsageLog.created_at >= _log_time(period_start),
+            UsageLog.created_at <= _log_time(period_end),
         ).group_by(
             func.date(UsageLog.created_at)
         ).order_by(func.date(UsageLog.created_at))
@@ -47,6 +47,7 @@ async def readiness_check(
     - Redis
     - Qdrant (Vector DB)
     - Storage (S3/MinIO)
+    - Face models loaded and warmed up
     - Optional: Stripe, Replicate, SendGrid APIs
 
     Returns 503 if any core service is unhealthy.
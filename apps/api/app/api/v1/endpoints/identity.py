@@ -36,8 +36,10 @@ from app.schemas.response import PaginationMeta
 from app.core.helpers import get_or_404, check_ownership, get_owned_or_404
 from sqlalchemy import func
 from app.services.face_recognition import FaceRecognitionService
+from app.services.identity import IdentityService
 from app.services.storage import StorageService
 from app.services.listing import ListingService
+from app.services.usage_events import UsageEvent, usage_events
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -170,15 +172,21 @@ async def register_identity(
     if not verification_mime:
         raise HTTPException(400, "Invalid verification image format. Supported: JPEG, PNG, GIF, WebP")
 
+    # Analyze each image once; liveness, embedding and comparison all reuse
+    # the same detections (identical uploads are analyzed only once)
+    analyses = {}
+    face_analysis = await face_service.analyze(face_bytes, memo=analyses)
+    verification_analysis = await face_service.analyze(verification_bytes, memo=analyses)
+
     # Extract face embedding
-    embedding = await face_service.extract_embedding(face_bytes)
+    embedding = face_analysis.embedding
     if embedding is None:
         raise HTTPException(
             400, "Could not detect face in image. Please use a clear, front-facing photo."
         )
 
     # Liveness check
-    is_live = await face_service.liveness_check(verification_bytes)
+    is_live = face_service.assess_liveness(verification_analysis)
     if not is_live:
         raise HTTPException(
             400, "Liveness check failed. Please take a new selfie with good lighting."
@@ -186,7 +194,7 @@ async def register_identity(
 
     # CRITICAL SECURITY CHECK: Verify face_image and verification_image are the SAME person
     # This prevents attackers from registering someone else's face with their own selfie
-    verification_embedding = await face_service.extract_embedding(verification_bytes)
+    verification_embedding = verification_analysis.embedding
     if verification_embedding is None:
         raise HTTPException(
             400, "Could not detect face in verification selfie. Please use a clear, front-facing photo."
@@ -282,6 +290,7 @@ async def register_identity(
         "verification_passed": True,
         "is_live_capture": is_live,
         "liveness_metadata": parsed_liveness.model_dump() if parsed_liveness else None,
+        "face_quality_score": face_analysis.quality_score,
     }
 
     try:
@@ -413,39 +422,38 @@ async def verify_identity(
             request_id=request_id,
         )
 
-    # Check each face against registry
+    # Check all faces against registry in one batched search
+    matches = await face_service.find_matches(
+        [face["embedding"] for face in faces], threshold=settings.FACE_SIMILARITY_THRESHOLD
+    )
+
+    # Load every matched identity with a single IN (...) query
+    identity_service = IdentityService(db, face_service=face_service, storage_service=storage_service)
+    identities_by_id = await identity_service.get_identities_by_id(
+        {uuid.UUID(match["identity_id"]) for match in matches if match}
+    )
+
     results = []
     any_protected = False
 
-    for face in faces:
-        embedding = face["embedding"]
-        match = await face_service.find_match(
-            embedding, threshold=settings.FACE_SIMILARITY_THRESHOLD
-        )
-
+    for face, match in zip(faces, matches):
         if match:
             any_protected = True
-            identity = await db.get(Identity, uuid.UUID(match["identity_id"]))
+            identity = identities_by_id.get(uuid.UUID(match["identity_id"]))
 
             if identity:
-                # Log this verification
-                usage_log = UsageLog(
-                    identity_id=identity.id,
-                    requester_id=api_key.user_id,
-                    requester_type="api",
-                    requester_name=api_key.name,
-                    api_key_id=api_key.id,
-                    action="verify",
-                    similarity_score=match["score"],
-                    faces_detected=len(faces),
-                    matched=True,
-                    result="protected",
-                    response_time_ms=response_time_ms,
+                # Log this verification and bump identity stats (write-behind, no commit here)
+                usage_events.record(
+                    UsageEvent(
+                        identity_id=identity.id,
+                        requester_id=api_key.user_id,
+                        requester_name=api_key.name,
+                        api_key_id=api_key.id,
+                        similarity_score=match["score"],
+                        faces_detected=len(faces),
+                        response_time_ms=response_time_ms,
+                    )
                 )
-                db.add(usage_log)
-
-                # Update identity stats
-                identity.total_verifications += 1
 
                 # Build license options
                 license_options = []
@@ -492,8 +500,6 @@ async def verify_identity(
         else:
             results.append(VerifyResult(protected=False, face_bbox=face.get("bbox")))
 
-    await db.commit()
-
     return VerifyResponse(
         protected=any_protected,
         faces_detected=len(faces),
@@ -83,6 +83,21 @@ class Settings(BaseSettings):
     QDRANT_PORT: int = 6333
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_COLLECTION: str = "face_embeddings"
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = True  # Multiplex calls over one HTTP/2 channel
+    QDRANT_TIMEOUT: float = 10.0  # Seconds per call
+    QDRANT_MAX_RETRIES: int = 3  # Retries on transient connection errors
+
+    # Face collection schema (applied idempotently at startup, see app.core.qdrant_schema)
+    QDRANT_QUANTIZATION: str = "int8"  # none | int8 (4x less RAM) | binary (32x, needs rescoring)
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True  # Keep the quantized copy in RAM
+    QDRANT_RESCORE: bool = True  # Re-rank quantized candidates with original vectors
+    QDRANT_OVERSAMPLING: float = 2.0  # Quantized candidates per result before rescoring
+    QDRANT_ON_DISK_VECTORS: bool = False  # Original float32 vectors on disk (mmap)
+    QDRANT_HNSW_M: int = 16  # Graph edges per node; more = better recall, more RAM
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_ON_DISK: bool = False
+    QDRANT_HNSW_EF_SEARCH: int = 128  # Search beam width
 
     # AI/ML APIs
     OPENAI_API_KEY: Optional[str] = None
@@ -158,6 +173,49 @@ class Settings(BaseSettings):
     FACE_DUPLICATE_THRESHOLD: float = 0.85
     FACE_EMBEDDING_SIZE: int = 512
 
+    # Face detection cache (keyed by SHA-256 of image bytes)
+    FACE_EMBEDDING_CACHE_ENABLED: bool = True
+    FACE_EMBEDDING_CACHE_TTL: int = 86400  # 24 hours, applies to both tiers
+    FACE_EMBEDDING_CACHE_MEMORY_BYTES: int = 64 * 1024 * 1024  # In-process LRU budget
+
+    # Local exact-search embedding index (memory-mapped)
+    FACE_LOCAL_INDEX_MODE: str = "off"  # off | standby (Qdrant failover) | primary (serve all searches)
+    FACE_LOCAL_INDEX_PATH: str = "/var/lib/actorhub/face_index"  # Absolute; shared by the API workers on a host
+    FACE_LOCAL_INDEX_DTYPE: str = "float16"  # float16 halves memory; float32 for exact parity with Qdrant
+    FACE_LOCAL_INDEX_SYNC_INTERVAL: int = 300  # Seconds between reconciliations with Qdrant
+    FACE_QDRANT_RECONNECT_INTERVAL: int = 30  # Seconds between reconnect attempts while searching locally
+
+    # Reduced-resolution JPEG decode before detection (detector runs at 640x640)
+    FACE_DECODE_MIN_LONG_SIDE: int = 1280  # Keep decoded long side >= this; 0 = always decode full size
+    FACE_RECOGNITION_MIN_CROP_SIDE: int = 112  # Re-crop faces smaller than this on the reduced frame from a sharper decode; 0 = off
+
+    # buffalo_l modules to load; "all" adds 2D/3D landmarks and genderage (landmarks field in detections)
+    FACE_ANALYSIS_MODULES: str = "detection,recognition"
+
+    # Face inference worker pool (keeps InsightFace off the event loop)
+    FACE_INFERENCE_WORKERS: int = 2  # Processes, each with its own model; 0 = in-process thread
+    FACE_INFERENCE_QUEUE_SIZE: int = 32  # Jobs queued or running before returning 503
+    FACE_INFERENCE_INTRA_OP_THREADS: int = 1  # ONNX Runtime intra-op threads per process
+    FACE_INFERENCE_BATCH_WINDOW_MS: float = 5.0  # Max time to hold a frame waiting for a batch
+    FACE_INFERENCE_MAX_BATCH_SIZE: int = 16  # Frames per batched ArcFace forward pass
+    FACE_MODEL_WARMUP: bool = True  # Load + warm models at startup; /health/ready waits for it
+
+    # Shared HTTP client for URL-based image fetches
+    IMAGE_FETCH_TIMEOUT: float = 30.0  # Seconds per read/write/pool wait
+    IMAGE_FETCH_CONNECT_TIMEOUT: float = 5.0
+    IMAGE_FETCH_MAX_CONNECTIONS: int = 100  # Pooled keep-alive connections per process
+    IMAGE_FETCH_MAX_CONNECTIONS_PER_HOST: int = 10  # Concurrent downloads from one origin
+    IMAGE_FETCH_HTTP2: bool = True  # Requires the h2 package (httpx[http2])
+
+    # Write-behind usage events (verification logs + counters)
+    USAGE_EVENTS_STREAM: str = "usage:events"  # Redis stream buffering events for the flusher
+    USAGE_EVENTS_BUFFER_SIZE: int = 100000  # In-process ring buffer; events beyond this are dropped
+    USAGE_EVENTS_BATCH_SIZE: int = 1000  # Rows per bulk INSERT
+    USAGE_EVENTS_FLUSH_INTERVAL_MS: float = 250.0
+    USAGE_EVENTS_CLAIM_IDLE_MS: int = 60000  # Reclaim entries left pending by a dead worker
+    USAGE_EVENTS_MAX_DELIVERIES: int = 5  # Failed deliveries before a batch is written row by row
+    USAGE_EVENTS_DEAD_LETTER_STREAM: str = "usage:events:dead"  # Rows that still fail to insert
+
     # Allowed Image Domains (for URL-based verification)
     ALLOWED_IMAGE_DOMAINS: List[str] = [
         "storage.actorhub.ai",
@@ -194,6 +252,13 @@ class Settings(BaseSettings):
     MAX_AUDIO_SIZE_BYTES: int = 50 * 1024 * 1024  # 50MB per audio file
     MAX_TRAINING_IMAGES: int = 100  # Maximum images for training
 
+    # Training image quality pre-filter (0-100 scales, same as actorhub_ml QualityScore)
+    TRAINING_QUALITY_FILTER_ENABLED: bool = True
+    TRAINING_MIN_SHARPNESS: float = 0.0  # Laplacian variance / 30 at 512 px long side; 0 = off (uncalibrated)
+    TRAINING_MIN_BRIGHTNESS: float = 15.0
+    TRAINING_MAX_BRIGHTNESS: float = 92.0
+    TRAINING_MIN_CONTRAST: float = 10.0
+
     # Timeouts (in seconds)
     GENERATION_TIMEOUT: int = 300  # 5 minutes for AI generation
     S3_CONNECT_TIMEOUT: int = 10
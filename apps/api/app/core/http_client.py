@@ -0,0 +1,200 @@
+"""
+Shared HTTP Client
+
+One pooled httpx.AsyncClient per process for fetching partner-supplied
+images, replacing a fresh client (new TCP + TLS handshake) per request.
+
+- Keep-alive pool with HTTP/2 when the h2 package is installed
+- Per-host concurrency limit so one slow origin can't take the whole pool
+- Streamed downloads capped at a byte limit, checked against
+  Content-Length up front and against bytes read as they arrive
+- Clients are bound to an event loop, so one is created per running loop
+
+Like app.core.qdrant, nothing here reads settings at import time, so the
+worker can build its own SharedHttpClient from its own configuration.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class DownloadTooLarge(Exception):
+    """Remote body exceeds the configured size limit"""
+
+    def __init__(self, url: str, limit: int, size: Optional[int] = None):
+        self.url = url
+        self.limit = limit
+        self.size = size
+        super().__init__(
+            f"Download exceeds {limit} bytes"
+            + (f" (Content-Length {size})" if size is not None else "")
+        )
+
+
+class SharedHttpClient:
+    """Lazily creates and caches one pooled AsyncClient per event loop"""
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        http2: bool = True,
+        event_hooks: Optional[Dict[str, list]] = None,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.event_hooks = event_hooks
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 not installed, shared HTTP client falling back to HTTP/1.1")
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the client for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                self._retire(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30.0,
+                ),
+                # Redirects could point at internal hosts that bypassed URL validation
+                follow_redirects=False,
+                event_hooks=self.event_hooks,
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    def _retire(self, client: httpx.AsyncClient, old_loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a client left behind on another event loop"""
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # Its loop is still alive on another thread: close it there
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), old_loop)
+            return
+        # Its loop is gone: release what can be released from this one
+        task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return slot
+
+    async def fetch_bytes(self, url: str, max_bytes: int) -> bytearray:
+        """
+        Stream a GET response body, aborting once it exceeds ``max_bytes``.
+
+        The body is read into a single buffer (pre-sized from Content-Length
+        when present) that can be handed to np.frombuffer without a copy.
+
+        Raises:
+            DownloadTooLarge: Content-Length or bytes read exceed the limit
+            httpx.RemoteProtocolError: Body longer than its Content-Length
+            httpx.HTTPError: Transport failure or non-2xx status
+        """
+        client = self.get()
+        async with self._host_slot(url):
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+
+                declared = response.headers.get("content-length")
+                expected = int(declared) if declared and declared.isdigit() else None
+                if expected is not None and expected > max_bytes:
+                    raise DownloadTooLarge(url, max_bytes, expected)
+
+                encoded = response.headers.get("content-encoding", "identity") != "identity"
+                if expected is not None and not encoded:
+                    body = bytearray(expected)
+                    view = memoryview(body)
+                    received = 0
+                    async for chunk in response.aiter_bytes():
+                        end = received + len(chunk)
+                        if end > expected:
+                            # Malformed response, not a size-limit violation
+                            raise httpx.RemoteProtocolError(
+                                f"Body exceeds its Content-Length of {expected} bytes",
+                                request=response.request,
+                            )
+                        view[received:end] = chunk
+                        received = end
+                    view.release()
+                    if received != expected:
+                        del body[received:]
+                    return body
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > max_bytes:
+                        raise DownloadTooLarge(url, max_bytes)
+                return body
+
+    async def close(self) -> None:
+        """Close the client bound to the running loop"""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing shared HTTP client: {e}")
+
+
+async def _close_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.debug(f"Error closing replaced HTTP client: {e}")
+
+
+_http_client: Optional[SharedHttpClient] = None
+
+
+def get_http_client() -> SharedHttpClient:
+    """Process-wide shared HTTP client configured from the API settings"""
+    global _http_client
+    if _http_client is None:
+        from app.core.config import settings
+
+        _http_client = SharedHttpClient(
+            timeout=settings.IMAGE_FETCH_TIMEOUT,
+            connect_timeout=settings.IMAGE_FETCH_CONNECT_TIMEOUT,
+            max_connections=settings.IMAGE_FETCH_MAX_CONNECTIONS,
+            max_connections_per_host=settings.IMAGE_FETCH_MAX_CONNECTIONS_PER_HOST,
+            http2=settings.IMAGE_FETCH_HTTP2,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on shutdown)"""
+    if _http_client is not None:
+        await _http_client.close()
@@ -43,6 +43,112 @@ IDENTITY_VERIFICATIONS = Counter(
     "identity_verifications_total", "Total identity verifications", ["matched", "authorized"]
 )
 
+FACE_EMBEDDING_CACHE_REQUESTS = Counter(
+    "face_embedding_cache_requests_total",
+    "Face detection cache lookups",
+    ["tier", "result"],  # tier: memory, redis; result: hit, miss
+)
+
+FACE_EMBEDDING_CACHE_MEMORY_BYTES = Gauge(
+    "face_embedding_cache_memory_bytes", "Bytes held by the in-process face detection cache"
+)
+
+FACE_INFERENCE_QUEUE_DEPTH = Gauge(
+    "face_inference_queue_depth", "Face inference jobs queued or running in the worker pool"
+)
+
+FACE_INFERENCE_REJECTED = Counter(
+    "face_inference_rejected_total", "Face inference jobs rejected because the queue was full"
+)
+
+FACE_INFERENCE_DURATION = Histogram(
+    "face_inference_duration_seconds",
+    "Face inference latency including queue wait",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+
+FACE_INFERENCE_BATCH_SIZE = Histogram(
+    "face_inference_batch_size",
+    "Frames per micro-batched inference call",
+    buckets=[1, 2, 4, 8, 16, 32, 64],
+)
+
+FACE_INFERENCE_QUEUE_WAIT = Histogram(
+    "face_inference_queue_wait_seconds",
+    "Time a frame waits in the micro-batcher before dispatch",
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+FACE_DECODE_DURATION = Histogram(
+    "face_decode_duration_seconds",
+    "Image decode time before face detection, by JPEG reduction factor",
+    ["reduction"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5],
+)
+
+FACE_DECODE_PIXELS_SKIPPED = Counter(
+    "face_decode_pixels_skipped_total",
+    "Pixels not decoded thanks to reduced-resolution JPEG decoding",
+)
+
+USAGE_EVENTS_BUFFERED = Gauge(
+    "usage_events_buffered", "Usage events in the in-process ring buffer awaiting shipment"
+)
+
+USAGE_EVENTS_STREAM_BACKLOG = Gauge(
+    "usage_events_stream_backlog", "Usage events in the Redis stream not yet flushed to Postgres"
+)
+
+USAGE_EVENTS_FLUSHED = Counter(
+    "usage_events_flushed_total", "Usage events written to Postgres", ["path"]  # stream | direct
+)
+
+USAGE_EVENTS_DROPPED = Counter(
+    "usage_events_dropped_total", "Usage events dropped because the ring buffer was full"
+)
+
+USAGE_EVENTS_DEAD_LETTERED = Counter(
+    "usage_events_dead_lettered_total",
+    "Usage events that kept failing to insert and were moved to the dead-letter stream",
+)
+
+USAGE_EVENT_LAG = Histogram(
+    "usage_event_lag_seconds",
+    "Time from recording a usage event to its Postgres commit",
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0],
+)
+
+USAGE_EVENT_FLUSH_DURATION = Histogram(
+    "usage_event_flush_duration_seconds",
+    "Time to bulk-insert one batch of usage events and apply counter deltas",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+TRAINING_IMAGES_REJECTED = Counter(
+    "training_images_rejected_total",
+    "Training images dropped by the quality pre-filter before embedding",
+    ["reason"],
+)
+
+MODEL_READY = Gauge(
+    "face_model_ready", "1 once face models are loaded and warmed up in this process"
+)
+
+MODEL_LOAD_SECONDS = Gauge(
+    "face_model_load_seconds", "Time to load face models", ["backend"]
+)
+
+MODEL_WARMUP_SECONDS = Gauge(
+    "face_model_warmup_seconds", "Time for the dummy warm-up inference", ["backend"]
+)
+
+MODEL_RESIDENT_MEMORY_BYTES = Gauge(
+    "face_model_resident_memory_bytes",
+    "Resident memory of face models: growth of this process for in-process models, "
+    "total RSS of the inference worker processes otherwise",
+    ["backend"],
+)
+
 ACTOR_PACK_TRAININGS = Counter(
     "actor_pack_trainings_total", "Total Actor Pack trainings", ["status"]
 )
@@ -385,6 +491,23 @@ async def check_qdrant_health() -> dict:
         return {"status": "unhealthy", "error": str(e)}
 
 
+async def check_models_health() -> dict:
+    """Check face models are loaded and warmed up (see FACE_MODEL_WARMUP)"""
+    from app.services.model_registry import model_registry
+
+    if not settings.FACE_MODEL_WARMUP:
+        # Models load lazily on the first request; nothing to wait for
+        return {"status": "healthy", "state": model_registry.state, "warmup": "disabled"}
+
+    result = {
+        "status": "healthy" if model_registry.is_ready else "unhealthy",
+        "state": model_registry.state,
+    }
+    if model_registry.load_seconds is not None:
+        result["load_seconds"] = round(model_registry.load_seconds, 2)
+    return result
+
+
 async def check_storage_health() -> dict:
     """Check S3/MinIO connectivity"""
     import httpx
@@ -541,6 +664,7 @@ async def get_health_status(include_external: bool = False) -> dict:
         check_redis_health(),
         check_qdrant_health(),
         check_storage_health(),
+        check_models_health(),
         return_exceptions=True,
     )
 
@@ -565,6 +689,11 @@ async def get_health_status(include_external: bool = False) -> dict:
             if not isinstance(core_checks[3], Exception)
             else {"status": "error", "error": str(core_checks[3])}
         ),
+        "models": (
+            core_checks[4]
+            if not isinstance(core_checks[4], Exception)
+            else {"status": "error", "error": str(core_checks[4])}
+        ),
     }
 
     # External API checks (optional, slower)
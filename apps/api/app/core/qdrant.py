@@ -0,0 +1,223 @@
+"""
+Shared Qdrant Client
+
+One process-wide AsyncQdrantClient used by both the API and the Celery
+worker (the worker imports this module through the API path, like
+tasks/training.py), replacing sync clients wrapped in run_in_executor and
+per-call client construction.
+
+- gRPC preferred: all calls multiplex over one pooled HTTP/2 channel
+- REST fallback uses a bounded httpx connection pool
+- Per-call timeout and retry with exponential backoff on transient errors
+- Clients are bound to an event loop, so one is created per running loop
+
+This module reads no settings at import time; callers pass a
+QdrantClientConfig (see get_qdrant() for the API's configuration).
+"""
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+import httpx
+import structlog
+from qdrant_client import AsyncQdrantClient
+
+logger = structlog.get_logger()
+
+# gRPC status codes worth retrying (connection reset, overloaded, slow)
+_TRANSIENT_GRPC_CODES = {"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED", "ABORTED"}
+
+
+@dataclass
+class QdrantClientConfig:
+    """Connection settings for the shared Qdrant client"""
+
+    host: str = "localhost"
+    port: int = 6333
+    grpc_port: int = 6334
+    api_key: Optional[str] = None
+    prefer_grpc: bool = True
+    timeout: float = 10.0  # Seconds per call
+    max_retries: int = 3  # Attempts after the first on transient errors
+    retry_backoff: float = 0.1  # Base delay in seconds, doubled per attempt
+    max_connections: int = 20  # REST pool size (gRPC multiplexes one channel)
+    location: Optional[str] = None  # e.g. ":memory:" for local mode
+    grpc_options: Dict[str, Any] = field(
+        default_factory=lambda: {
+            "grpc.keepalive_time_ms": 30000,
+            "grpc.keepalive_timeout_ms": 10000,
+            "grpc.keepalive_permit_without_calls": 1,
+            "grpc.http2.max_pings_without_data": 0,
+        }
+    )
+
+
+def is_transient_qdrant_error(exc: BaseException) -> bool:
+    """True for connection/timeout failures that are safe to retry"""
+    if isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError, httpx.TransportError)):
+        return True
+
+    code = getattr(exc, "code", None)
+    if callable(code):  # grpc.aio.AioRpcError
+        try:
+            return getattr(code(), "name", "") in _TRANSIENT_GRPC_CODES
+        except Exception:
+            return False
+
+    # REST client wraps transport errors in ResponseHandlingException
+    try:
+        from qdrant_client.http.exceptions import ResponseHandlingException
+    except ImportError:
+        return False
+    return isinstance(exc, ResponseHandlingException)
+
+
+class QdrantClientFactory:
+    """
+    Lazily creates and caches one AsyncQdrantClient per event loop.
+
+    Use ``client`` for the retrying proxy; every coroutine method of
+    AsyncQdrantClient is available on it.
+    """
+
+    def __init__(self, config: QdrantClientConfig):
+        self.config = config
+        self._client: Optional[AsyncQdrantClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Future] = set()
+        self.client = RetryingQdrantClient(self)
+
+    def _create(self) -> AsyncQdrantClient:
+        config = self.config
+        if config.location:
+            return AsyncQdrantClient(location=config.location)
+
+        return AsyncQdrantClient(
+            host=config.host,
+            port=config.port,
+            grpc_port=config.grpc_port,
+            prefer_grpc=config.prefer_grpc,
+            api_key=config.api_key or None,
+            timeout=max(1, math.ceil(config.timeout)),  # Client takes whole seconds
+            grpc_options=config.grpc_options,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_connections,
+            ),
+        )
+
+    def get(self) -> AsyncQdrantClient:
+        """Return the client for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                # Previous loop is gone (e.g. per-task loops); its channel can't be reused
+                logger.debug("Event loop changed, creating new Qdrant client")
+                self._retire(self._client, self._loop)
+            self._client = self._create()
+            self._loop = loop
+            logger.info(
+                "Qdrant client created",
+                host=self.config.location or self.config.host,
+                grpc=self.config.prefer_grpc and not self.config.location,
+            )
+        return self._client
+
+    def _retire(self, client: AsyncQdrantClient, old_loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a client left behind on another event loop"""
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # Its loop is still alive on another thread: close it there
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), old_loop)
+            return
+        # Its loop is gone: release what can be released from this one
+        task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Close the client bound to the running loop"""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing Qdrant client: {e}")
+
+
+async def _close_quietly(client: AsyncQdrantClient) -> None:
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Error closing replaced Qdrant client: {e}")
+
+
+class RetryingQdrantClient:
+    """Proxy that forwards calls to the factory's client with timeout and retries"""
+
+    def __init__(self, factory: QdrantClientFactory):
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            config = self._factory.config
+            attempt = 0
+            while True:
+                method = getattr(self._factory.get(), name)
+                try:
+                    return await asyncio.wait_for(method(*args, **kwargs), timeout=config.timeout)
+                except Exception as e:
+                    if attempt >= config.max_retries or not is_transient_qdrant_error(e):
+                        raise
+                    delay = config.retry_backoff * (2 ** attempt) * (0.75 + random.random() * 0.5)
+                    attempt += 1
+                    logger.warning(
+                        f"Qdrant {name} failed, retrying",
+                        attempt=attempt,
+                        max_retries=config.max_retries,
+                        delay=round(delay, 3),
+                        error=str(e)[:200],
+                    )
+                    await asyncio.sleep(delay)
+
+        call.__name__ = name
+        return call
+
+
+_factory: Optional[QdrantClientFactory] = None
+
+
+def get_qdrant_factory() -> QdrantClientFactory:
+    """Process-wide factory configured from the API settings"""
+    global _factory
+    if _factory is None:
+        from app.core.config import settings
+
+        _factory = QdrantClientFactory(
+            QdrantClientConfig(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                api_key=settings.QDRANT_API_KEY,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                timeout=settings.QDRANT_TIMEOUT,
+                max_retries=settings.QDRANT_MAX_RETRIES,
+            )
+        )
+    return _factory
+
+
+def get_qdrant() -> RetryingQdrantClient:
+    """Shared Qdrant client for the API process"""
+    return get_qdrant_factory().client
+
+
+async def close_qdrant() -> None:
+    """Close the API's shared Qdrant client (call on shutdown)"""
+    if _factory is not None:
+        await _factory.close()
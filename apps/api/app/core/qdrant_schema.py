@@ -0,0 +1,242 @@
+"""
+Qdrant Collection Schema
+
+Declares how the face embeddings collection should be configured and
+applies it idempotently on startup:
+
+- Scalar int8 or binary quantization (kept in RAM) with rescoring against
+  the original vectors, so RAM per identity can be cut 4x / 32x without
+  losing top-1 accuracy
+- HNSW graph parameters (m, ef_construct) and search-time ef
+- Original vectors (and optionally the HNSW graph) on disk
+- Payload indexes, e.g. a keyword index on identity_id for filtered
+  lookups and deletes
+
+apply_collection_schema() creates the collection if it is missing;
+otherwise it compares the live config and sends only the differences
+(Qdrant re-optimizes segments in the background). Vector size and distance
+cannot be changed in place and raise CollectionSchemaError.
+
+Like app.core.qdrant, nothing here reads settings at import time; see
+face_collection_schema() for the API's configuration.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import structlog
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    PayloadSchemaType,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
+
+logger = structlog.get_logger()
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+
+
+class CollectionSchemaError(Exception):
+    """Live collection differs in a way that cannot be changed in place"""
+
+    pass
+
+
+@dataclass
+class CollectionSchema:
+    """Desired configuration of a single-vector Qdrant collection"""
+
+    name: str
+    vector_size: int
+    distance: Distance = Distance.COSINE
+    on_disk: bool = False  # Original vectors on disk (quantized copy stays in RAM)
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_on_disk: bool = False
+    search_ef: int = 128  # hnsw_ef per search; higher = better recall, slower
+    quantization: str = "int8"  # none | int8 | binary
+    quantization_always_ram: bool = True
+    quantile: float = 0.99  # int8 only: clip outliers when choosing the range
+    rescore: bool = True  # Re-rank quantized candidates with original vectors
+    oversampling: float = 2.0  # Candidates fetched per result before rescoring
+    payload_indexes: Dict[str, PayloadSchemaType] = field(
+        default_factory=lambda: {"identity_id": PayloadSchemaType.KEYWORD}
+    )
+
+    def __post_init__(self):
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"quantization must be one of {', '.join(QUANTIZATION_MODES)}, got {self.quantization!r}"
+            )
+
+    def vector_params(self) -> VectorParams:
+        return VectorParams(size=self.vector_size, distance=self.distance, on_disk=self.on_disk)
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(
+            m=self.hnsw_m, ef_construct=self.hnsw_ef_construct, on_disk=self.hnsw_on_disk
+        )
+
+    def quantization_config(self) -> Optional[Union[ScalarQuantization, BinaryQuantization]]:
+        if self.quantization == "int8":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=self.quantile,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(
+                binary=BinaryQuantizationConfig(always_ram=self.quantization_always_ram)
+            )
+        return None
+
+    def search_params(self) -> SearchParams:
+        """Per-search parameters matching this schema (pass as search_params/params)"""
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        return SearchParams(hnsw_ef=self.search_ef, quantization=quantization)
+
+
+def _quantization_state(config: Any) -> tuple:
+    """(mode, always_ram) of a live quantization config"""
+    if config is None:
+        return ("none", None)
+    if isinstance(config, ScalarQuantization):
+        return ("int8", bool(config.scalar.always_ram))
+    if isinstance(config, BinaryQuantization):
+        return ("binary", bool(config.binary.always_ram))
+    return (type(config).__name__, None)
+
+
+def _diff_collection(schema: CollectionSchema, info: Any) -> Dict[str, Any]:
+    """update_collection kwargs needed to bring ``info`` in line with ``schema``"""
+    vectors = info.config.params.vectors
+    if isinstance(vectors, dict):
+        vectors = vectors.get("")
+    if vectors is None:
+        raise CollectionSchemaError(f"{schema.name} uses named vectors; expected a single vector")
+
+    if vectors.size != schema.vector_size or vectors.distance != schema.distance:
+        raise CollectionSchemaError(
+            f"{schema.name} has {vectors.size}-d {vectors.distance} vectors, schema wants "
+            f"{schema.vector_size}-d {schema.distance}; re-index into a new collection"
+        )
+
+    update: Dict[str, Any] = {}
+
+    if bool(vectors.on_disk) != schema.on_disk:
+        update["vectors_config"] = {"": VectorParamsDiff(on_disk=schema.on_disk)}
+
+    hnsw = info.config.hnsw_config
+    if (hnsw.m, hnsw.ef_construct, bool(hnsw.on_disk)) != (
+        schema.hnsw_m,
+        schema.hnsw_ef_construct,
+        schema.hnsw_on_disk,
+    ):
+        update["hnsw_config"] = schema.hnsw_config()
+
+    wanted = (
+        schema.quantization,
+        schema.quantization_always_ram if schema.quantization != "none" else None,
+    )
+    if _quantization_state(info.config.quantization_config) != wanted:
+        update["quantization_config"] = schema.quantization_config() or Disabled.DISABLED
+
+    return update
+
+
+async def apply_collection_schema(client, schema: CollectionSchema) -> List[str]:
+    """
+    Create the collection, or update an existing one to match ``schema``.
+
+    Safe to run on every startup: a collection that already matches costs
+    one get_collections and one get_collection call.
+
+    Args:
+        client: AsyncQdrantClient (or the retrying proxy from app.core.qdrant)
+        schema: Desired configuration
+
+    Returns:
+        Names of the changes applied; empty if nothing changed
+
+    Raises:
+        CollectionSchemaError: Vector size/distance differ from the live collection
+    """
+    changes: List[str] = []
+    collections = await client.get_collections()
+
+    if not any(c.name == schema.name for c in collections.collections):
+        await client.create_collection(
+            collection_name=schema.name,
+            vectors_config=schema.vector_params(),
+            hnsw_config=schema.hnsw_config(),
+            quantization_config=schema.quantization_config(),
+        )
+        changes.append("created")
+        indexed: Dict[str, Any] = {}
+    else:
+        info = await client.get_collection(schema.name)
+        update = _diff_collection(schema, info)
+        if update:
+            await client.update_collection(collection_name=schema.name, **update)
+            changes.extend(
+                {"vectors_config": "on_disk", "hnsw_config": "hnsw", "quantization_config": "quantization"}[key]
+                for key in update
+            )
+        indexed = info.payload_schema or {}
+
+    for field_name, field_type in schema.payload_indexes.items():
+        current = indexed.get(field_name)
+        if current is not None and current.data_type == field_type:
+            continue
+        if current is not None:
+            await client.delete_payload_index(collection_name=schema.name, field_name=field_name)
+        await client.create_payload_index(
+            collection_name=schema.name, field_name=field_name, field_schema=field_type
+        )
+        changes.append(f"payload_index:{field_name}")
+
+    if changes:
+        logger.info(
+            "Qdrant collection schema applied",
+            collection=schema.name,
+            changes=changes,
+            quantization=schema.quantization,
+            hnsw_m=schema.hnsw_m,
+            on_disk=schema.on_disk,
+        )
+    return changes
+
+
+def face_collection_schema() -> CollectionSchema:
+    """Schema of the face embeddings collection from the API settings"""
+    from app.core.config import settings
+
+    return CollectionSchema(
+        name=settings.QDRANT_COLLECTION,
+        vector_size=settings.FACE_EMBEDDING_SIZE,
+        on_disk=settings.QDRANT_ON_DISK_VECTORS,
+        hnsw_m=settings.QDRANT_HNSW_M,
+        hnsw_ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+        hnsw_on_disk=settings.QDRANT_HNSW_ON_DISK,
+        search_ef=settings.QDRANT_HNSW_EF_SEARCH,
+        quantization=settings.QDRANT_QUANTIZATION,
+        quantization_always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+        rescore=settings.QDRANT_RESCORE,
+        oversampling=settings.QDRANT_OVERSAMPLING,
+    )
@@ -3,6 +3,7 @@ ActorHub.ai API
 Digital Identity Protection & Marketplace Platform
 """
 
+import asyncio
 import sys
 import time
 from contextlib import asynccontextmanager
@@ -38,6 +39,11 @@ from slowapi.util import get_remote_address
 from app.api.v1 import router as api_v1_router
 from app.core.config import settings
 from app.core.database import close_db, init_db
+from app.core.http_client import close_http_client
+from app.core.qdrant import close_qdrant
+from app.services.inference_pool import InferenceQueueFull, inference_pool
+from app.services.model_registry import model_registry
+from app.services.usage_events import usage_events
 from app.middleware.logging import RequestLoggingMiddleware
 
 # Custom middleware imports
@@ -84,17 +90,45 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Redis cache unavailable, running without cache", error=str(e))
 
+    # Start write-behind usage event flusher
+    await usage_events.start()
+
+    # Load and warm face models in the background: the server accepts
+    # liveness probes meanwhile, /health/ready stays 503 until they finish
+    warmup_task = None
+    if settings.FACE_MODEL_WARMUP:
+        warmup_task = asyncio.create_task(model_registry.warm_up())
+
     yield
 
     # Shutdown
     logger.info("Shutting down ActorHub.ai API")
 
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+
+    # Flush buffered usage events before Redis and the database go away
+    await usage_events.stop()
+
     # Close cache connection
     try:
         await cache.close()
     except Exception:
         pass
 
+    # Stop face inference worker processes
+    inference_pool.shutdown()
+
+    # Close shared Qdrant client
+    await close_qdrant()
+
+    # Close shared image-fetch HTTP client
+    await close_http_client()
+
     await close_db()
 
 
@@ -261,6 +295,20 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(InferenceQueueFull)
+async def inference_queue_full_handler(request: Request, exc: InferenceQueueFull):
+    """Face inference pool saturated - ask the client to back off"""
+    logger.warning("Face inference queue full", path=request.url.path)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content=create_error_response(
+            code=ErrorCodes.SERVICE_UNAVAILABLE,
+            message="Face analysis is at capacity. Please retry shortly.",
+        ),
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(
@@ -345,7 +393,9 @@ async def readiness_check():
 
     from app.core.database import engine
 
-    checks = {"database": False, "redis": False}
+    from app.core.monitoring import check_models_health
+
+    checks = {"database": False, "redis": False, "models": False}
 
     # Check database
     try:
@@ -366,6 +416,9 @@ async def readiness_check():
     except Exception as e:
         logger.error("Redis health check failed", error=str(e))
 
+    # Face models loaded and warmed up
+    checks["models"] = (await check_models_health())["status"] == "healthy"
+
     all_healthy = all(checks.values())
 
     return JSONResponse(
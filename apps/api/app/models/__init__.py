@@ -1,7 +1,7 @@
 """Database models for ActorHub.ai"""
 
-from app.models.identity import ActorPack, Identity, UsageLog
-from app.models.marketplace import License, Listing, Transaction
+from app.models.identity import ActorPack, DuplicateCluster, Identity, UsageLog, UsageLogArchivedCount
+from app.models.marketplace import License, Listing, StatsWatermark, Transaction
 from app.models.notifications import (
     AuditLog,
     Notification,
@@ -19,10 +19,13 @@ __all__ = [
     "Identity",
     "ActorPack",
     "UsageLog",
+    "UsageLogArchivedCount",
+    "DuplicateCluster",
     # Marketplace
     "License",
     "Transaction",
     "Listing",
+    "StatsWatermark",
     # Notifications & Audit
     "Notification",
     "AuditLog",
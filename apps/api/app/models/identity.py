@@ -9,6 +9,8 @@ from datetime import datetime
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -20,6 +22,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import relationship
@@ -335,10 +338,17 @@ class UsageLog(Base):
     """
     Log of every verification check or identity usage.
     Critical for tracking, billing, and analytics.
+
+    Range-partitioned by month on created_at (usage_logs_YYYY_MM, plus
+    usage_logs_default for rows outside every range). The worker creates
+    partitions ahead of time and archives expired ones to S3 before
+    dropping them; filter on created_at so queries prune to the months
+    they need.
     """
 
     __tablename__ = "usage_logs"
 
+    # Primary key includes the partition key, as Postgres requires
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # What was checked/used - SET NULL on delete to preserve history
@@ -394,8 +404,8 @@ class UsageLog(Base):
     user_agent = Column(Text)
     country_code = Column(String(2))
 
-    # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Metadata (partition key)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True)
 
     # Relationships
     identity = relationship("Identity", back_populates="usage_logs")
@@ -421,4 +431,66 @@ class UsageLog(Base):
         Index("idx_usage_identity_date", "identity_id", "created_at"),
         Index("idx_usage_action_date", "action", "created_at"),
         Index("idx_usage_requester", "requester_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+# Catch-all partition, so inserts never fail for want of a monthly one
+# (migrations create it explicitly; this covers metadata.create_all)
+event.listen(
+    UsageLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS usage_logs_default PARTITION OF usage_logs DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+class UsageLogArchivedCount(Base):
+    """
+    Per-identity verify counts of usage_logs partitions that were archived
+    to S3 and dropped.
+
+    Written by the worker in the transaction that drops a partition, so
+    reconciling identities.total_verifications can add the history that is
+    no longer in usage_logs.
+    """
+
+    __tablename__ = "usage_log_archived_counts"
+
+    identity_id = Column(UUID(as_uuid=True), primary_key=True)
+    verifications = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DuplicateCluster(Base):
+    """
+    Member of a near-duplicate face cluster found by a registry-wide audit
+    (tasks.face_recognition.audit_duplicates in the worker).
+
+    One row per identity per cluster; rows of the same audit share audit_id.
+    """
+
+    __tablename__ = "duplicate_clusters"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    audit_id = Column(String(64), nullable=False, index=True)
+    cluster_id = Column(Integer, nullable=False)  # Dense per audit, largest cluster first
+    cluster_size = Column(Integer, nullable=False)
+
+    identity_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("identities.id", ondelete="SET NULL"),
+        index=True,
+    )
+    max_similarity = Column(Float)  # Best similarity to another member of the cluster
+    threshold = Column(Float, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    identity = relationship("Identity")
+
+    __table_args__ = (
+        CheckConstraint("cluster_size >= 2", name="chk_duplicate_cluster_size"),
+        Index("idx_duplicate_cluster_audit_cluster", "audit_id", "cluster_id"),
     )
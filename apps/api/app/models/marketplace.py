@@ -205,6 +205,8 @@ class License(Base):
         # Indexes
         Index("idx_license_dates", "valid_from", "valid_until"),
         Index("idx_license_active", "is_active", "valid_until"),
+        # Keyset scans for incremental listing stats (worker update_usage_stats)
+        Index("idx_license_created_id", "created_at", "id"),
     )
 
     @property
@@ -370,3 +372,22 @@ class Listing(Base):
         Index("idx_listing_category_active", "category", "is_active"),
         Index("idx_listing_featured", "is_featured", "is_active"),
     )
+
+
+class StatsWatermark(Base):
+    """
+    High-water mark of an incremental counter aggregation.
+
+    The worker's update_usage_stats task adds only rows after
+    (last_created_at, last_id) to the denormalized counters, then moves
+    the mark forward in the same transaction.
+    """
+
+    __tablename__ = "stats_watermarks"
+
+    name = Column(String(64), primary_key=True)  # e.g. "listing_license_count"
+    last_created_at = Column(DateTime, nullable=False)
+    last_id = Column(UUID(as_uuid=True), nullable=False)
+    rows_applied = Column(Integer, default=0)  # Since the last reconciliation
+    reconciled_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -40,6 +40,7 @@ class CacheService:
 
     _instance: Optional["CacheService"] = None
     _redis: Optional[aioredis.Redis] = None
+    _redis_bytes: Optional[aioredis.Redis] = None  # decode_responses=False, for binary payloads
     _connection_attempts: int = 0
     _last_connection_error: Optional[str] = None
 
@@ -67,6 +68,14 @@ class CacheService:
                 )
                 # Verify connection with timeout
                 await asyncio.wait_for(self._redis.ping(), timeout=REDIS_CONNECT_TIMEOUT)
+                self._redis_bytes = await aioredis.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=False,
+                    max_connections=20,
+                    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    retry_on_timeout=True,
+                )
                 self._connection_attempts = attempt
                 logger.info(
                     "Cache service connected to Redis",
@@ -93,18 +102,27 @@ class CacheService:
             attempts=REDIS_RETRY_ATTEMPTS,
         )
         self._redis = None
+        self._redis_bytes = None
 
     async def close(self) -> None:
         """Close Redis connection"""
         if self._redis:
             await self._redis.close()
             self._redis = None
+        if self._redis_bytes:
+            await self._redis_bytes.close()
+            self._redis_bytes = None
 
     @property
     def is_available(self) -> bool:
         """Check if cache is available"""
         return self._redis is not None
 
+    @property
+    def bytes_client(self) -> Optional[aioredis.Redis]:
+        """Binary-safe client for commands beyond get/set (e.g. streams), or None"""
+        return self._redis_bytes
+
     async def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache"""
         if not self._redis:
@@ -138,6 +156,30 @@ class CacheService:
             logger.warning("Cache set failed", key=key, error=str(e))
             return False
 
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get raw binary value from cache (no JSON decoding)"""
+        if not self._redis_bytes:
+            return None
+        try:
+            return await self._redis_bytes.get(key)
+        except RedisError as e:
+            logger.warning("Cache get_bytes failed", key=key, error=str(e))
+            return None
+
+    async def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """Set raw binary value in cache with optional TTL (seconds)"""
+        if not self._redis_bytes:
+            return False
+        try:
+            if ttl:
+                await self._redis_bytes.setex(key, ttl, value)
+            else:
+                await self._redis_bytes.set(key, value)
+            return True
+        except RedisError as e:
+            logger.warning("Cache set_bytes failed", key=key, error=str(e))
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self._redis:
@@ -270,6 +312,10 @@ class CacheKeys:
     def rate_limit(identifier: str, window: str) -> str:
         return f"ratelimit:{identifier}:{window}"
 
+    @staticmethod
+    def face_detections(image_sha256: str, fingerprint: str) -> str:
+        return f"face:detections:v1:{fingerprint}:{image_sha256}"
+
 
 # Cache TTL constants (in seconds)
 class CacheTTL:
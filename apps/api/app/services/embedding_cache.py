@@ -0,0 +1,219 @@
+"""
+Face Detection Cache
+
+Content-addressed cache for face detection results, keyed by the SHA-256
+of the raw image bytes. Partners re-check the same frames and thumbnails
+many times a day; a hit skips both image decode and InsightFace inference.
+
+Keys also carry a fingerprint of everything else that shapes the result
+(model pack and detector input, loaded modules, decode and crop settings),
+so changing one of them misses instead of serving detections from the old
+configuration.
+
+Two tiers:
+- In-process LRU bounded by a byte budget (per worker)
+- Redis via app.services.cache (shared across workers)
+
+Detections are stored in a compact binary format rather than JSON:
+
+    header:  magic (2s) | version (B) | face count (H) | embedding dim (H)
+    face:    bbox (4f) | det_score (f) | has_landmarks (B) | [n landmarks (H) | landmarks (2f * n)]
+             | embedding (dim * f)
+"""
+
+import hashlib
+import struct
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.core.monitoring import FACE_EMBEDDING_CACHE_MEMORY_BYTES, FACE_EMBEDDING_CACHE_REQUESTS
+from app.services.cache import CacheKeys, cache
+from app.services.inference_pool import DET_SIZE, DET_THRESH, MODEL_NAME, face_analysis_modules
+
+logger = structlog.get_logger()
+
+_MAGIC = b"FD"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBHH")
+_FACE = struct.Struct("<5fB")
+_LANDMARK_COUNT = struct.Struct("<H")
+
+
+def image_digest(image_bytes: bytes) -> str:
+    """SHA-256 hex digest used as the content address of an image"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def detection_fingerprint() -> str:
+    """Short hash of the model and settings that detections depend on"""
+    modules = face_analysis_modules()
+    config = "|".join(str(part) for part in (
+        MODEL_NAME,
+        DET_SIZE,
+        DET_THRESH,
+        ",".join(sorted(modules)) if modules else "all",
+        settings.FACE_DECODE_MIN_LONG_SIDE,
+        settings.FACE_RECOGNITION_MIN_CROP_SIDE,
+    ))
+    return hashlib.sha256(config.encode()).hexdigest()[:12]
+
+
+def encode_detections(faces: List[Dict]) -> bytes:
+    """Serialize detections (bbox, normalized embedding, det_score, landmarks) to bytes"""
+    dim = len(faces[0]["embedding"]) if faces else 0
+    parts = [_HEADER.pack(_MAGIC, _VERSION, len(faces), dim)]
+
+    for face in faces:
+        landmarks = face.get("landmarks")
+        parts.append(_FACE.pack(*face["bbox"][:4], float(face["det_score"]), landmarks is not None))
+        if landmarks is not None:
+            points = np.asarray(landmarks, dtype="<f4").reshape(-1, 2)
+            parts.append(_LANDMARK_COUNT.pack(len(points)))
+            parts.append(points.tobytes())
+        parts.append(np.asarray(face["embedding"], dtype="<f4").tobytes())
+
+    return b"".join(parts)
+
+
+def decode_detections(data: bytes) -> List[Dict]:
+    """Inverse of encode_detections. Raises ValueError on malformed input."""
+    magic, version, count, dim = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Unknown face detection cache format")
+
+    offset = _HEADER.size
+    faces = []
+    for _ in range(count):
+        x1, y1, x2, y2, det_score, has_landmarks = _FACE.unpack_from(data, offset)
+        offset += _FACE.size
+
+        landmarks = None
+        if has_landmarks:
+            (n_points,) = _LANDMARK_COUNT.unpack_from(data, offset)
+            offset += _LANDMARK_COUNT.size
+            points = np.frombuffer(data, dtype="<f4", count=n_points * 2, offset=offset)
+            landmarks = points.reshape(-1, 2).tolist()
+            offset += points.nbytes
+
+        embedding = np.frombuffer(data, dtype="<f4", count=dim, offset=offset).astype(np.float32)
+        offset += embedding.nbytes
+
+        faces.append({
+            "bbox": [x1, y1, x2, y2],
+            "embedding": embedding,
+            "det_score": det_score,
+            "landmarks": landmarks,
+        })
+
+    return faces
+
+
+class _ByteBudgetLRU:
+    """In-process LRU of encoded entries, evicting oldest until under the byte budget"""
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (data, time.monotonic() + self.ttl)
+        self.current_bytes += len(data)
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+        FACE_EMBEDDING_CACHE_MEMORY_BYTES.set(self.current_bytes)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+        FACE_EMBEDDING_CACHE_MEMORY_BYTES.set(0)
+
+    def _remove(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self.current_bytes -= len(data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingCache:
+    """Two-tier (memory + Redis) cache of face detections keyed by image SHA-256"""
+
+    def __init__(
+        self,
+        max_memory_bytes: Optional[int] = None,
+        ttl: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.ttl = ttl if ttl is not None else settings.FACE_EMBEDDING_CACHE_TTL
+        self.enabled = enabled if enabled is not None else settings.FACE_EMBEDDING_CACHE_ENABLED
+        self._memory = _ByteBudgetLRU(
+            max_memory_bytes if max_memory_bytes is not None
+            else settings.FACE_EMBEDDING_CACHE_MEMORY_BYTES,
+            self.ttl,
+        )
+
+    async def get(self, digest: str) -> Optional[List[Dict]]:
+        """Return cached detections for an image digest, or None on miss"""
+        if not self.enabled:
+            return None
+
+        fingerprint = detection_fingerprint()
+        key = f"{fingerprint}:{digest}"
+        data = self._memory.get(key)
+        if data is not None:
+            FACE_EMBEDDING_CACHE_REQUESTS.labels(tier="memory", result="hit").inc()
+        else:
+            FACE_EMBEDDING_CACHE_REQUESTS.labels(tier="memory", result="miss").inc()
+            data = await cache.get_bytes(CacheKeys.face_detections(digest, fingerprint))
+            if data is None:
+                FACE_EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="miss").inc()
+                return None
+            FACE_EMBEDDING_CACHE_REQUESTS.labels(tier="redis", result="hit").inc()
+            self._memory.set(key, data)
+
+        try:
+            return decode_detections(data)
+        except (ValueError, struct.error) as e:
+            logger.warning("Discarding malformed face detection cache entry", error=str(e))
+            return None
+
+    async def set(self, digest: str, faces: List[Dict]) -> None:
+        """Store detections for an image digest in both tiers"""
+        if not self.enabled:
+            return
+
+        fingerprint = detection_fingerprint()
+        data = encode_detections(faces)
+        self._memory.set(f"{fingerprint}:{digest}", data)
+        await cache.set_bytes(CacheKeys.face_detections(digest, fingerprint), data, ttl=self.ttl)
+
+    def clear_memory(self) -> None:
+        """Drop all in-process entries (Redis entries expire via TTL)"""
+        self._memory.clear()
+
+
+# Shared per-process instance so every FaceRecognitionService hits the same LRU
+embedding_cache = EmbeddingCache()
@@ -9,26 +9,43 @@ load_dotenv()
 
 import asyncio
 import base64
+import functools
 import ipaddress
 import os
+import time
 import uuid
-from functools import partial
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
-import cv2
-import httpx
 import numpy as np
 import structlog
-from qdrant_client import QdrantClient
 from qdrant_client.models import (
-    Distance,
     PointIdsList,
     PointStruct,
-    VectorParams,
+    SearchRequest,
 )
 
 from app.core.config import settings
+from app.core.http_client import DownloadTooLarge, get_http_client
+from app.core.qdrant import (
+    QdrantClientConfig,
+    QdrantClientFactory,
+    get_qdrant,
+    is_transient_qdrant_error,
+)
+from app.core.qdrant_schema import apply_collection_schema, face_collection_schema
+from app.services.embedding_cache import embedding_cache, image_digest
+from app.services.image_decode import (
+    DecodedImage,
+    choose_crop_reduction,
+    decode_image,
+    scale_detections,
+)
+from app.services.local_index import get_local_index
+from app.services.inference_pool import InferenceQueueFull, align_faces, analyze_frames, embed_crops
+from app.services.micro_batcher import MicroBatcher
+from app.services.model_registry import model_registry
 
 logger = structlog.get_logger()
 
@@ -105,6 +122,56 @@ def validate_external_url(url: str) -> bool:
         return False
 
 
+class VectorStoreUnavailable(Exception):
+    """Qdrant is down and searches are served from the local index; writes are refused"""
+
+
+@dataclass
+class FaceAnalysisResult:
+    """
+    Result of one decode + InsightFace pass over an image.
+
+    Produced by FaceRecognitionService.analyze; liveness, embedding,
+    comparison and quality scoring all read from it.
+    """
+
+    faces: List[Dict] = field(default_factory=list)  # bbox, embedding, det_score, landmarks
+    decoded: bool = True
+    mock: bool = False
+
+    @property
+    def primary_face(self) -> Optional[Dict]:
+        """Largest detected face, or None"""
+        if not self.faces:
+            return None
+        return max(self.faces, key=lambda f: (f["bbox"][2] - f["bbox"][0]) * (f["bbox"][3] - f["bbox"][1]))
+
+    @property
+    def embedding(self) -> Optional[np.ndarray]:
+        """Normalized embedding of the primary face"""
+        face = self.primary_face
+        return face["embedding"] if face is not None else None
+
+    @property
+    def detection_score(self) -> float:
+        """Detection confidence of the first (highest scoring) face"""
+        return float(self.faces[0]["det_score"]) if self.faces else 0.0
+
+    @property
+    def quality_score(self) -> float:
+        """
+        Rough 0-100 face quality from detection confidence and face size.
+
+        Faces smaller than the 112px ArcFace input are penalized.
+        """
+        face = self.primary_face
+        if face is None:
+            return 0.0
+        x1, y1, x2, y2 = face["bbox"]
+        size_score = min(1.0, max(0.0, min(x2 - x1, y2 - y1)) / 112.0)
+        return round(100 * (0.6 * float(face["det_score"]) + 0.4 * size_score), 1)
+
+
 class FaceRecognitionService:
     """
     Face recognition service using InsightFace for embeddings
@@ -113,7 +180,18 @@ class FaceRecognitionService:
 
     def __init__(self):
         self._face_app = None
+        self._inference_pool = None
+        # In-process fallback: batch concurrent frames into one recognition pass
+        self._local_batcher = MicroBatcher(
+            self._analyze_local_batch,
+            max_batch_size=settings.FACE_INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=settings.FACE_INFERENCE_BATCH_WINDOW_MS,
+        )
         self._qdrant = None
+        self._schema = face_collection_schema()
+        self._local_index = None
+        self._index_sync_task = None
+        self._reconnect_task = None
         self._initialized = False
 
     async def _initialize(self):
@@ -121,63 +199,263 @@ class FaceRecognitionService:
         if self._initialized:
             return
 
-        # Skip InsightFace if mock mode is enabled
-        if FACE_RECOGNITION_MOCK:
-            logger.warning("MOCK MODE: Skipping InsightFace initialization")
-            self._face_app = None
-        else:
-            try:
-                # Initialize InsightFace
-                from insightface.app import FaceAnalysis
+        # Models are shared process-wide (usually already warmed up at startup)
+        await model_registry.load()
+        self._face_app = model_registry.face_app
+        self._inference_pool = model_registry.inference_pool
+        if model_registry.state == "unavailable":
+            logger.warning("InsightFace not available. Using mock embeddings.")
 
-                self._face_app = FaceAnalysis(
-                    name="buffalo_l", providers=["CPUExecutionProvider"]  # Use CUDA in production
-                )
-                self._face_app.prepare(ctx_id=0, det_size=(640, 640), det_thresh=0.3)
-                logger.info("InsightFace initialized successfully")
-            except Exception as e:
-                logger.warning(f"InsightFace not available: {e}. Using mock embeddings.")
-                self._face_app = None
+        # Local exact-search index: hot standby or primary search path
+        loop = asyncio.get_running_loop()
+        self._local_index = await loop.run_in_executor(None, get_local_index)
 
-        # Initialize Qdrant
+        # Initialize Qdrant (shared async client: gRPC, pooled, with retries)
         try:
-            self._qdrant = QdrantClient(
-                host=settings.QDRANT_HOST,
-                port=settings.QDRANT_PORT,
-                api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None,
-            )
+            self._qdrant = get_qdrant()
             await self._init_collection()
             logger.info("Qdrant initialized successfully")
         except Exception as e:
-            logger.warning(f"Qdrant not available: {e}. Using in-memory storage.")
-            self._qdrant = QdrantClient(":memory:")
-            await self._init_collection()
+            if self._local_index is not None:
+                logger.warning(
+                    f"Qdrant not available: {e}. Serving searches from local index.",
+                    indexed=len(self._local_index),
+                )
+                self._qdrant = None
+                self._start_reconnect()
+            else:
+                logger.warning(f"Qdrant not available: {e}. Using in-memory storage.")
+                self._qdrant = QdrantClientFactory(QdrantClientConfig(location=":memory:")).client
+                await self._init_collection()
+
+        if self._qdrant is not None:
+            self._start_index_sync()
 
         self._initialized = True
 
-    async def _init_collection(self):
-        """Initialize the face embeddings collection in Qdrant"""
-        collection_name = settings.QDRANT_COLLECTION
-        loop = asyncio.get_event_loop()
+    def _start_index_sync(self) -> None:
+        """Start reconciling the local index with Qdrant (no-op without an index)"""
+        # Keep the index converged with Qdrant, including writes made by
+        # other API hosts and the worker, so failover doesn't lose identities
+        if self._local_index is None:
+            return
+        if self._index_sync_task is None or self._index_sync_task.done():
+            self._index_sync_task = asyncio.ensure_future(self._local_index_sync_loop())
+
+    def _start_reconnect(self) -> None:
+        """Retry Qdrant in the background until searches can move back to it"""
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.ensure_future(self._qdrant_reconnect_loop())
+
+    async def _qdrant_reconnect_loop(self) -> None:
+        """Reconnect to Qdrant every FACE_QDRANT_RECONNECT_INTERVAL until it answers"""
+        while self._qdrant is None:
+            await asyncio.sleep(settings.FACE_QDRANT_RECONNECT_INTERVAL)
+            try:
+                client = get_qdrant()
+                await apply_collection_schema(client, self._schema)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.info(f"Qdrant still unavailable: {e}")
+                continue
+            self._qdrant = client
+            logger.info("Qdrant reconnected, searches served by Qdrant again")
+            self._start_index_sync()
+
+    def _fail_over(self, error: Exception) -> bool:
+        """
+        Move searches to the local index after a transient Qdrant failure.
+
+        Returns False (caller re-raises) when there is no local index or
+        the error is not an outage.
+        """
+        if self._local_index is None or not is_transient_qdrant_error(error):
+            return False
+        if self._qdrant is not None:
+            logger.warning(
+                f"Qdrant search failed: {error}. Serving searches from local index.",
+                indexed=len(self._local_index),
+            )
+            self._qdrant = None
+            self._start_reconnect()
+        return True
 
-        # Run sync Qdrant calls in executor to avoid blocking
-        collections = await loop.run_in_executor(
-            None, self._qdrant.get_collections
+    def _require_qdrant(self, action: str) -> None:
+        """
+        Refuse a write while searches are failed over to the local index.
+
+        Qdrant is the source of truth: sync_local_index would drop (or
+        restore) anything written only to the local index, so the caller
+        has to retry once Qdrant is back.
+        """
+        if self._qdrant is None:
+            raise VectorStoreUnavailable(f"Cannot {action} while Qdrant is unavailable")
+
+    @property
+    def _search_local(self) -> bool:
+        """Whether searches are answered by the local index instead of Qdrant"""
+        return self._local_index is not None and (
+            self._qdrant is None or settings.FACE_LOCAL_INDEX_MODE == "primary"
         )
-        exists = any(c.name == collection_name for c in collections.collections)
-
-        if not exists:
-            await loop.run_in_executor(
-                None,
-                partial(
-                    self._qdrant.create_collection,
-                    collection_name=collection_name,
-                    vectors_config=VectorParams(
-                        size=settings.FACE_EMBEDDING_SIZE, distance=Distance.COSINE
-                    ),
+
+    async def _local_index_sync_loop(self) -> None:
+        """Reconcile the local index with Qdrant now and every FACE_LOCAL_INDEX_SYNC_INTERVAL"""
+        while True:
+            try:
+                await self.sync_local_index()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Local index sync from Qdrant failed: {e}")
+            await asyncio.sleep(settings.FACE_LOCAL_INDEX_SYNC_INTERVAL)
+
+    async def sync_local_index(self, batch_size: int = 1024) -> Dict[str, int]:
+        """
+        Reconcile the local index with Qdrant, the source of truth.
+
+        Scrolls ids and updated_at versions only (no vectors), then fetches
+        the vectors of points that are missing locally or newer in Qdrant
+        and drops local identities Qdrant no longer has. Identities written
+        locally after the scroll started are kept, so a registration racing
+        the sync is not removed. One process per host runs it at a time.
+
+        Returns:
+            Counts of points checked, embeddings added and identities removed
+        """
+        await self._initialize()
+        stats = {"checked": 0, "added": 0, "removed": 0}
+        if self._qdrant is None or self._local_index is None:
+            return stats
+
+        loop = asyncio.get_running_loop()
+        with self._local_index.sync_lease() as leased:
+            if not leased:
+                return stats
+
+            started = time.time()
+            remote: Dict[str, tuple] = {}
+            offset = None
+            while True:
+                points, offset = await self._qdrant.scroll(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=["identity_id", "updated_at"],
+                    with_vectors=False,
                 )
-            )
-            logger.info(f"Created Qdrant collection: {collection_name}")
+                for p in points:
+                    payload = p.payload or {}
+                    remote[payload.get("identity_id", str(p.id))] = (p.id, float(payload.get("updated_at") or 0))
+                if offset is None:
+                    break
+            stats["checked"] = len(remote)
+
+            local = await loop.run_in_executor(None, self._local_index.versions)
+            stale = [
+                point_id for identity_id, (point_id, version) in remote.items()
+                if local.get(identity_id, -1.0) < version
+            ]
+            gone = [
+                identity_id for identity_id, version in local.items()
+                if identity_id not in remote and version < started
+            ]
+
+            for start in range(0, len(stale), batch_size):
+                points = await self._qdrant.retrieve(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    ids=stale[start:start + batch_size],
+                    with_payload=["identity_id", "updated_at"],
+                    with_vectors=True,
+                )
+                items = [
+                    (
+                        (p.payload or {}).get("identity_id", str(p.id)),
+                        np.asarray(p.vector, dtype=np.float32),
+                        float((p.payload or {}).get("updated_at") or 0),
+                    )
+                    for p in points
+                    if p.vector is not None
+                ]
+                stats["added"] += await loop.run_in_executor(None, self._local_index.add_many, items)
+
+            if gone:
+                stats["removed"] = await loop.run_in_executor(None, self._local_index.remove_many, gone)
+
+        if stats["added"] or stats["removed"]:
+            logger.info("Local index reconciled with Qdrant", **stats)
+        return stats
+
+    async def _init_collection(self):
+        """Create or update the face embeddings collection to match the configured schema"""
+        await apply_collection_schema(self._qdrant, self._schema)
+
+    async def analyze(
+        self,
+        image_bytes: bytes,
+        memo: Optional[Dict[str, "FaceAnalysisResult"]] = None,
+    ) -> "FaceAnalysisResult":
+        """
+        Decode an image and run face analysis exactly once.
+
+        Liveness, embedding extraction, comparison and quality scoring all
+        read from the returned result. Pass the same ``memo`` dict for every
+        image in a request so identical images are analyzed only once.
+
+        Args:
+            image_bytes: Raw image bytes
+            memo: Optional per-request memo keyed by image SHA-256
+
+        Returns:
+            FaceAnalysisResult (``decoded`` is False if the image is invalid)
+        """
+        digest = image_digest(image_bytes)
+        if memo is not None and digest in memo:
+            return memo[digest]
+
+        await self._initialize()
+
+        logger.info(f"Analyzing image ({len(image_bytes)} bytes)")
+
+        if self._face_app is None and self._inference_pool is None:
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, self._decode_image, image_bytes) is None:
+                logger.warning("Failed to decode image")
+                result = FaceAnalysisResult(decoded=False)
+            else:
+                # In production, InsightFace must be available
+                if not FACE_RECOGNITION_MOCK:
+                    raise RuntimeError("Face recognition service not available. InsightFace not initialized.")
+                # Mock mode only enabled via explicit env var
+                # Use deterministic embedding based on image content hash for consistent comparisons
+                seed = int(digest[:8], 16)
+                rng = np.random.default_rng(seed)
+                mock_embedding = rng.standard_normal(512).astype(np.float32)
+                mock_embedding = mock_embedding / np.linalg.norm(mock_embedding)  # Normalize
+                logger.warning(f"MOCK: Returning deterministic face embedding (seed={seed})")
+                result = FaceAnalysisResult(
+                    faces=[
+                        {
+                            "bbox": [100, 100, 200, 200],
+                            "embedding": mock_embedding,
+                            "det_score": 0.95,
+                            "landmarks": None,
+                        }
+                    ],
+                    mock=True,
+                )
+        else:
+            faces = await self._get_detections(image_bytes)
+            if faces is None:
+                logger.warning("Failed to decode image")
+                result = FaceAnalysisResult(decoded=False)
+            else:
+                logger.info(f"Face detection result: {len(faces)} faces found")
+                result = FaceAnalysisResult(faces=faces)
+
+        if memo is not None:
+            memo[digest] = result
+        return result
 
     async def extract_embedding(self, image_bytes: bytes) -> Optional[np.ndarray]:
         """
@@ -189,60 +467,127 @@ class FaceRecognitionService:
         Returns:
             numpy array of shape (512,) or None if no face detected
         """
-        await self._initialize()
+        analysis = await self.analyze(image_bytes)
 
-        logger.info(f"Extracting embedding from image ({len(image_bytes)} bytes)")
+        if analysis.decoded and not analysis.faces:
+            logger.warning("No faces detected in image - returning None")
 
-        # Decode image
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        return analysis.embedding
 
-        if img is None:
-            logger.warning("Failed to decode image")
-            return None
+    def _decode_image(self, image_bytes: bytes) -> Optional[DecodedImage]:
+        """Decode raw image bytes to a (possibly reduced) BGR frame, or None if undecodable"""
+        return decode_image(image_bytes)
 
-        logger.info(f"Image decoded successfully: {img.shape}")
-
-        if self._face_app is None:
-            # In production, InsightFace must be available
-            if not FACE_RECOGNITION_MOCK:
-                raise RuntimeError("Face recognition service not available. InsightFace not initialized.")
-            # Mock mode only enabled via explicit env var
-            # Use deterministic embedding based on image content hash for consistent comparisons
-            import hashlib
-            image_hash = hashlib.sha256(image_bytes).digest()
-            seed = int.from_bytes(image_hash[:4], 'big')
-            rng = np.random.default_rng(seed)
-            mock_embedding = rng.standard_normal(512).astype(np.float32)
-            mock_embedding = mock_embedding / np.linalg.norm(mock_embedding)  # Normalize
-            logger.warning(f"MOCK: Returning deterministic face embedding (seed={seed})")
-            return mock_embedding
-
-        # Detect faces
-        faces = self._face_app.get(img)
-
-        logger.info(f"Face detection result: {len(faces)} faces found")
-
-        if not faces:
-            logger.warning("No faces detected in image - returning None")
+    async def _get_detections(self, image_bytes: bytes) -> Optional[List[Dict]]:
+        """
+        Detect every face in an image with its normalized embedding.
+
+        Results are content-addressed by SHA-256 of the image bytes, so a
+        repeated image skips decode and inference entirely.
+
+        Returns:
+            List of dicts (bbox, embedding, det_score, landmarks), or None
+            if the image could not be decoded
+        """
+        digest = image_digest(image_bytes)
+        cached = await embedding_cache.get(digest)
+        if cached is not None:
+            logger.info("Face detection cache hit", digest=digest[:16], faces=len(cached))
+            return cached
+
+        loop = asyncio.get_running_loop()
+        decoded = await loop.run_in_executor(None, self._decode_image, image_bytes)
+        if decoded is None:
             return None
 
-        # Return embedding of largest face
-        largest_face = max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
-        embedding = largest_face.embedding
+        logger.info(
+            "Image decoded",
+            shape=decoded.image.shape,
+            original_size=decoded.original_size,
+            reduction=decoded.reduction,
+            decode_ms=round(decoded.decode_seconds * 1000, 2),
+        )
 
-        logger.info(f"Face detected with score {largest_face.det_score:.3f}, bbox: {largest_face.bbox.tolist()}")
+        if self._inference_pool is not None:
+            detections = await self._inference_pool.detect(decoded.image)
+        else:
+            detections = await self._local_batcher.submit(decoded.image)
+
+        # Cached and returned detections are always in original-image coordinates
+        detections = scale_detections(detections, decoded.scale)
+        await self._sharpen_small_faces(image_bytes, decoded, detections)
+        for detection in detections:
+            detection.pop("kps", None)
 
-        # Normalize embedding
-        embedding = embedding / np.linalg.norm(embedding)
+        await embedding_cache.set(digest, detections)
+        return detections
 
-        return embedding
+    async def _sharpen_small_faces(
+        self, image_bytes: bytes, decoded: DecodedImage, detections: List[Dict]
+    ) -> None:
+        """
+        Re-embed faces that were too small on the reduced frame.
+
+        Detection is fine on the reduced frame, but ArcFace sees a
+        RECOGNITION_CROP_SIZE aligned crop: a face narrower than
+        FACE_RECOGNITION_MIN_CROP_SIDE there is upsampled into that crop
+        and loses detail the original still has. Those faces are aligned
+        again from a decode at the largest reduction that keeps them at
+        crop size (full resolution for the smallest) and embedded from it.
+        """
+        min_side = settings.FACE_RECOGNITION_MIN_CROP_SIDE
+        if min_side <= 0 or decoded.reduction <= 1:
+            return
+
+        def face_side(detection: Dict) -> float:
+            x1, y1, x2, y2 = detection["bbox"][:4]
+            return min(x2 - x1, y2 - y1)
+
+        small = [
+            d for d in detections
+            if d.get("kps") is not None and face_side(d) / decoded.scale < min_side
+        ]
+        if not small:
+            return
+        reduction = choose_crop_reduction(min(face_side(d) for d in small), min_side)
+        if reduction >= decoded.reduction:
+            return
+
+        loop = asyncio.get_running_loop()
+        sharper = await loop.run_in_executor(
+            None, functools.partial(decode_image, image_bytes, reduction=reduction)
+        )
+        if sharper is None:
+            return
+        crops = await loop.run_in_executor(
+            None, align_faces, sharper.image, [np.asarray(d["kps"]) / sharper.scale for d in small]
+        )
+        if self._inference_pool is not None:
+            embeddings = await self._inference_pool.embed(crops)
+        else:
+            embeddings = await loop.run_in_executor(None, embed_crops, self._face_app, crops)
+
+        for detection, embedding in zip(small, embeddings):
+            detection["embedding"] = embedding
+        logger.info(
+            "Small faces re-embedded from sharper decode",
+            faces=len(small),
+            reduction=reduction,
+            detect_reduction=decoded.reduction,
+        )
+
+    async def _analyze_local_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """Run one micro-batch on the in-process model (thread, not the event loop)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, analyze_frames, self._face_app, frames)
 
     async def detect_faces_base64(self, image_b64: str) -> List[Dict]:
         """Detect all faces in base64 encoded image"""
         try:
             image_bytes = base64.b64decode(image_b64)
             return await self._detect_faces(image_bytes)
+        except InferenceQueueFull:
+            raise
         except Exception as e:
             logger.error(f"Error decoding base64 image: {e}")
             return []
@@ -255,51 +600,21 @@ class FaceRecognitionService:
             return []
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(image_url)
-                response.raise_for_status()
-                return await self._detect_faces(response.content)
+            image_bytes = await get_http_client().fetch_bytes(image_url, settings.MAX_IMAGE_SIZE_BYTES)
+            return await self._detect_faces(image_bytes)
+        except InferenceQueueFull:
+            raise
+        except DownloadTooLarge as e:
+            logger.warning("Image URL exceeds size limit", url=image_url[:100], limit=e.limit, size=e.size)
+            return []
         except Exception as e:
             logger.error(f"Error fetching image from URL: {e}")
             return []
 
     async def _detect_faces(self, image_bytes: bytes) -> List[Dict]:
         """Internal face detection"""
-        await self._initialize()
-
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-        if img is None:
-            return []
-
-        if self._face_app is None:
-            # In production, InsightFace must be available
-            if not FACE_RECOGNITION_MOCK:
-                raise RuntimeError("Face recognition service not available. InsightFace not initialized.")
-            # Mock mode only enabled via explicit env var
-            return [
-                {
-                    "bbox": [100, 100, 200, 200],
-                    "embedding": np.random.randn(512).astype(np.float32),
-                    "det_score": 0.95,
-                    "landmarks": None,
-                }
-            ]
-
-        faces = self._face_app.get(img)
-
-        return [
-            {
-                "bbox": face.bbox.tolist(),
-                "embedding": face.embedding / np.linalg.norm(face.embedding),
-                "det_score": float(face.det_score),
-                "landmarks": (
-                    face.landmark_2d_106.tolist() if hasattr(face, "landmark_2d_106") else None
-                ),
-            }
-            for face in faces
-        ]
+        analysis = await self.analyze(image_bytes)
+        return analysis.faces
 
     async def liveness_check(self, image_bytes: bytes) -> bool:
         """
@@ -312,34 +627,23 @@ class FaceRecognitionService:
 
         For MVP, check detection confidence as basic anti-spoofing.
         """
-        logger.info(f"Liveness check: Starting, image_bytes size={len(image_bytes)}, MOCK={FACE_RECOGNITION_MOCK}")
-        await self._initialize()
-        logger.info(f"Liveness check: Initialized, _face_app={self._face_app is not None}")
+        return self.assess_liveness(await self.analyze(image_bytes))
 
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        logger.info(f"Liveness check: Image decoded, img={img is not None}, shape={img.shape if img is not None else 'None'}")
-
-        if img is None:
+    def assess_liveness(self, analysis: "FaceAnalysisResult") -> bool:
+        """Liveness decision from an existing analysis (no extra inference)"""
+        if not analysis.decoded:
             logger.warning("Liveness check: Failed to decode image")
             return False
 
-        if self._face_app is None:
-            # In production, InsightFace must be available
-            if not FACE_RECOGNITION_MOCK:
-                logger.error("Liveness check: InsightFace not available and mock mode disabled")
-                raise RuntimeError("Face recognition service not available. InsightFace not initialized.")
-            # Mock mode only enabled via explicit env var
+        if analysis.mock:
             logger.info("Liveness check: Mock mode - passing")
             return True
 
-        faces = self._face_app.get(img)
-
-        if not faces:
+        if not analysis.faces:
             logger.warning("Liveness check: No faces detected in verification image")
             return False
 
-        det_score = faces[0].det_score
+        det_score = analysis.detection_score
         logger.info(f"Liveness check: Detection score = {det_score:.3f}")
 
         # Detection confidence threshold
@@ -393,23 +697,28 @@ class FaceRecognitionService:
     async def register_embedding(self, identity_id: uuid.UUID, embedding: np.ndarray):
         """Store embedding in vector database"""
         await self._initialize()
-        loop = asyncio.get_event_loop()
-
-        # Run sync Qdrant upsert in executor to avoid blocking
-        await loop.run_in_executor(
-            None,
-            partial(
-                self._qdrant.upsert,
-                collection_name=settings.QDRANT_COLLECTION,
-                points=[
-                    PointStruct(
-                        id=str(identity_id),
-                        vector=embedding.tolist(),
-                        payload={"identity_id": str(identity_id), "created_at": str(uuid.uuid1().time)},
-                    )
-                ],
-            )
+        self._require_qdrant("register an embedding")
+
+        # Version for local index reconciliation (see sync_local_index)
+        updated_at = time.time()
+        await self._qdrant.upsert(
+            collection_name=settings.QDRANT_COLLECTION,
+            points=[
+                PointStruct(
+                    id=str(identity_id),
+                    vector=embedding.tolist(),
+                    payload={
+                        "identity_id": str(identity_id),
+                        "created_at": str(uuid.uuid1().time),
+                        "updated_at": updated_at,
+                    },
+                )
+            ],
         )
+
+        if self._local_index is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._local_index.add, str(identity_id), embedding, updated_at)
         logger.info(f"Registered embedding for identity {identity_id}")
 
     async def find_match(self, embedding: np.ndarray, threshold: float = None) -> Optional[Dict]:
@@ -424,78 +733,151 @@ class FaceRecognitionService:
             Dict with identity_id and score, or None if no match
         """
         await self._initialize()
-        loop = asyncio.get_event_loop()
 
         if threshold is None:
             threshold = settings.FACE_SIMILARITY_THRESHOLD
 
-        # Run sync Qdrant search in executor to avoid blocking
-        results = await loop.run_in_executor(
-            None,
-            partial(
-                self._qdrant.search,
-                collection_name=settings.QDRANT_COLLECTION,
-                query_vector=embedding.tolist(),
-                limit=1,
-                score_threshold=threshold,
-            )
-        )
+        if not self._search_local:
+            try:
+                results = await self._qdrant.search(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    query_vector=embedding.tolist(),
+                    limit=1,
+                    score_threshold=threshold,
+                    search_params=self._schema.search_params(),
+                )
+            except Exception as e:
+                if not self._fail_over(e):
+                    raise
+            else:
+                if not results:
+                    return None
+                return {"identity_id": results[0].payload["identity_id"], "score": results[0].score}
+
+        matches = await self._local_search([embedding], limit=1, threshold=threshold)
+        return matches[0][0] if matches[0] else None
+
+    async def find_matches(
+        self, embeddings: List[np.ndarray], threshold: float = None
+    ) -> List[Optional[Dict]]:
+        """
+        Find matching identities for several embeddings in one round trip.
 
-        if not results:
-            return None
+        Group shots can contain dozens of faces; this issues a single
+        batched Qdrant search instead of one search per face.
+
+        Args:
+            embeddings: Face embeddings to search for
+            threshold: Minimum similarity score (default from settings)
+
+        Returns:
+            List aligned with ``embeddings``: a dict with identity_id and
+            score for each matched face, or None where there is no match
+        """
+        if not embeddings:
+            return []
+
+        await self._initialize()
 
-        return {"identity_id": results[0].payload["identity_id"], "score": results[0].score}
+        if threshold is None:
+            threshold = settings.FACE_SIMILARITY_THRESHOLD
+
+        if not self._search_local:
+            search_params = self._schema.search_params()
+            requests = [
+                SearchRequest(
+                    vector=np.asarray(embedding).tolist(),
+                    limit=1,
+                    score_threshold=threshold,
+                    with_payload=True,
+                    params=search_params,
+                )
+                for embedding in embeddings
+            ]
+
+            try:
+                batch_results = await self._qdrant.search_batch(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    requests=requests,
+                )
+            except Exception as e:
+                if not self._fail_over(e):
+                    raise
+            else:
+                return [
+                    {"identity_id": results[0].payload["identity_id"], "score": results[0].score}
+                    if results
+                    else None
+                    for results in batch_results
+                ]
+
+        matches = await self._local_search(embeddings, limit=1, threshold=threshold)
+        return [m[0] if m else None for m in matches]
 
     async def find_similar(
         self, embedding: np.ndarray, threshold: float = None, limit: int = 10
     ) -> List[Dict]:
         """Find all similar identities above threshold"""
         await self._initialize()
-        loop = asyncio.get_event_loop()
 
         if threshold is None:
             threshold = settings.FACE_DUPLICATE_THRESHOLD
 
-        # Run sync Qdrant search in executor to avoid blocking
-        results = await loop.run_in_executor(
+        if not self._search_local:
+            try:
+                results = await self._qdrant.search(
+                    collection_name=settings.QDRANT_COLLECTION,
+                    query_vector=embedding.tolist(),
+                    limit=limit,
+                    score_threshold=threshold,
+                    search_params=self._schema.search_params(),
+                )
+            except Exception as e:
+                if not self._fail_over(e):
+                    raise
+            else:
+                return [{"identity_id": r.payload["identity_id"], "score": r.score} for r in results]
+
+        return (await self._local_search([embedding], limit=limit, threshold=threshold))[0]
+
+    async def _local_search(
+        self, embeddings: List[np.ndarray], limit: int, threshold: float
+    ) -> List[List[Dict]]:
+        """Exact search on the local index (BLAS on a thread, off the event loop)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
             None,
-            partial(
-                self._qdrant.search,
-                collection_name=settings.QDRANT_COLLECTION,
-                query_vector=embedding.tolist(),
+            lambda: self._local_index.search_batch(
+                np.stack([np.asarray(e, dtype=np.float32) for e in embeddings]),
                 limit=limit,
-                score_threshold=threshold,
-            )
+                threshold=threshold,
+            ),
         )
 
-        return [{"identity_id": r.payload["identity_id"], "score": r.score} for r in results]
-
     async def delete_embedding(self, identity_id: uuid.UUID):
         """Remove embedding from vector database"""
         await self._initialize()
-        loop = asyncio.get_event_loop()
+        self._require_qdrant("delete an embedding")
 
-        # Run sync Qdrant delete in executor to avoid blocking
-        await loop.run_in_executor(
-            None,
-            partial(
-                self._qdrant.delete,
-                collection_name=settings.QDRANT_COLLECTION,
-                points_selector=PointIdsList(points=[str(identity_id)])
-            )
+        await self._qdrant.delete(
+            collection_name=settings.QDRANT_COLLECTION,
+            points_selector=PointIdsList(points=[str(identity_id)])
         )
+
+        if self._local_index is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._local_index.remove, str(identity_id))
         logger.info(f"Deleted embedding for identity {identity_id}")
 
     async def get_collection_stats(self) -> Dict:
         """Get statistics about the embeddings collection"""
         await self._initialize()
-        loop = asyncio.get_event_loop()
 
-        # Run sync Qdrant get_collection in executor to avoid blocking
-        info = await loop.run_in_executor(
-            None,
-            partial(self._qdrant.get_collection, settings.QDRANT_COLLECTION)
-        )
+        if self._qdrant is None:
+            count = len(self._local_index)
+            return {"vectors_count": count, "points_count": count, "status": "local_index"}
+
+        info = await self._qdrant.get_collection(settings.QDRANT_COLLECTION)
 
         return {
             "vectors_count": info.vectors_count,
@@ -25,6 +25,7 @@ from app.models.identity import Identity, IdentityStatus, UsageLog
 from app.models.user import User, ApiKey
 from app.services.face_recognition import FaceRecognitionService
 from app.services.storage import StorageService
+from app.services.usage_events import UsageEvent, usage_events
 
 logger = structlog.get_logger()
 
@@ -125,18 +126,23 @@ class IdentityService:
         if not self.validate_image_size(verification_bytes):
             raise ValueError("Verification image too large (max 10MB)")
 
+        # Analyze each image once and reuse the result for every check below
+        analyses = {}
+        face_analysis = await self.face_service.analyze(face_bytes, memo=analyses)
+        verification_analysis = await self.face_service.analyze(verification_bytes, memo=analyses)
+
         # Extract face embeddings
-        embedding = await self.face_service.extract_embedding(face_bytes)
+        embedding = face_analysis.embedding
         if embedding is None:
             raise ValueError("Could not detect face in image. Please use a clear, front-facing photo.")
 
         # Liveness check
-        is_live = await self.face_service.liveness_check(verification_bytes)
+        is_live = self.face_service.assess_liveness(verification_analysis)
         if not is_live:
             raise ValueError("Liveness check failed. Please take a new selfie with good lighting.")
 
         # Verify same person in both images
-        verification_embedding = await self.face_service.extract_embedding(verification_bytes)
+        verification_embedding = verification_analysis.embedding
         if verification_embedding is None:
             raise ValueError("Could not detect face in verification selfie.")
 
@@ -180,6 +186,7 @@ class IdentityService:
                 "face_similarity_score": round(face_similarity, 4),
                 "similarity_threshold": settings.FACE_SIMILARITY_THRESHOLD,
                 "verification_passed": True,
+                "face_quality_score": face_analysis.quality_score,
             },
         )
         self.db.add(identity)
@@ -243,38 +250,36 @@ class IdentityService:
                 "request_id": request_id,
             }
 
-        # Check each face
+        # Check all faces in one batched search
+        matches = await self.face_service.find_matches(
+            [face["embedding"] for face in faces], threshold=settings.FACE_SIMILARITY_THRESHOLD
+        )
+        identities_by_id = await self.get_identities_by_id(
+            {UUID(match["identity_id"]) for match in matches if match}
+        )
+
         results = []
         any_protected = False
 
-        for face in faces:
-            embedding = face["embedding"]
-            match = await self.face_service.find_match(
-                embedding, threshold=settings.FACE_SIMILARITY_THRESHOLD
-            )
-
+        for face, match in zip(faces, matches):
             if match:
                 any_protected = True
-                identity = await self.db.get(Identity, UUID(match["identity_id"]))
+                identity = identities_by_id.get(UUID(match["identity_id"]))
 
                 if identity:
-                    # Log verification
+                    # Log verification (write-behind; flushed in batches)
                     if api_key:
-                        usage_log = UsageLog(
-                            identity_id=identity.id,
-                            requester_id=api_key.user_id,
-                            requester_type="api",
-                            requester_name=api_key.name,
-                            api_key_id=api_key.id,
-                            action="verify",
-                            similarity_score=match["score"],
-                            faces_detected=len(faces),
-                            matched=True,
-                            result="protected",
-                            response_time_ms=response_time_ms,
+                        usage_events.record(
+                            UsageEvent(
+                                identity_id=identity.id,
+                                requester_id=api_key.user_id,
+                                requester_name=api_key.name,
+                                api_key_id=api_key.id,
+                                similarity_score=match["score"],
+                                faces_detected=len(faces),
+                                response_time_ms=response_time_ms,
+                            )
                         )
-                        self.db.add(usage_log)
-                        identity.total_verifications += 1
 
                     # Build result
                     result = {
@@ -303,8 +308,6 @@ class IdentityService:
             else:
                 results.append({"protected": False, "face_bbox": face.get("bbox")})
 
-        await self.db.commit()
-
         return {
             "protected": any_protected,
             "faces_detected": len(faces),
@@ -314,6 +317,13 @@ class IdentityService:
             "request_id": request_id,
         }
 
+    async def get_identities_by_id(self, identity_ids: set) -> Dict[UUID, Identity]:
+        """Load several identities with a single IN (...) query"""
+        if not identity_ids:
+            return {}
+        result = await self.db.execute(select(Identity).where(Identity.id.in_(identity_ids)))
+        return {identity.id: identity for identity in result.scalars().all()}
+
     def _build_license_options(self, identity: Identity) -> List[Dict[str, Any]]:
         """Build license options for an identity"""
         base_price = identity.base_license_fee or 99
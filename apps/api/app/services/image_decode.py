@@ -0,0 +1,167 @@
+"""
+Adaptive Image Decode
+
+InsightFace resizes every frame to det_size (640x640) before detection, so
+decoding a 24 MP upload at full resolution mostly produces pixels that are
+thrown away. For JPEGs, libjpeg can decode directly at 1/2, 1/4 or 1/8 scale
+by skipping DCT coefficients (cv2.IMREAD_REDUCED_COLOR_*), which is several
+times cheaper than a full decode followed by a resize.
+
+The image header is read first (Pillow, no pixel decode) and the largest
+reduction that keeps the long side at or above FACE_DECODE_MIN_LONG_SIDE is
+chosen. Detections made on the reduced image are mapped back to original
+coordinates with scale_detections(), so callers and the detection cache
+always see full-resolution bounding boxes.
+
+Detection only needs the reduced frame, but recognition works on a 112 px
+aligned crop: a face smaller than that on the reduced frame is re-cropped
+from a second decode at the reduction chosen by choose_crop_reduction()
+(FaceRecognitionService._sharpen_small_faces).
+"""
+
+import io
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import structlog
+from PIL import Image
+
+from app.core.config import settings
+from app.core.monitoring import FACE_DECODE_DURATION, FACE_DECODE_PIXELS_SKIPPED
+
+logger = structlog.get_logger()
+
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+_REDUCED_GRAY_FLAGS = {
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+}
+
+
+@dataclass
+class DecodedImage:
+    """A decoded BGR frame and its relation to the original image"""
+
+    image: np.ndarray  # BGR, or single-channel when decoded as grayscale
+    scale: float = 1.0  # original pixels per decoded pixel
+    original_size: Optional[Tuple[int, int]] = None  # (width, height) from the header
+    reduction: int = 1  # JPEG DCT scaling factor used (1 = full decode)
+    decode_seconds: float = 0.0
+
+
+def read_header(image_bytes: bytes) -> Optional[Tuple[str, int, int]]:
+    """Return (format, width, height) from the image header, or None"""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as header:
+            return header.format, header.width, header.height
+    except Exception:
+        return None
+
+
+def choose_reduction(width: int, height: int, min_long_side: int) -> int:
+    """Largest JPEG reduction factor that keeps the long side >= min_long_side"""
+    long_side = max(width, height)
+    for factor, _ in _REDUCED_FLAGS:
+        if long_side // factor >= min_long_side:
+            return factor
+    return 1
+
+
+def choose_crop_reduction(face_side: float, crop_side: int) -> int:
+    """Largest JPEG reduction factor that keeps a face (original pixels) >= crop_side"""
+    for factor, _ in _REDUCED_FLAGS:
+        if face_side / factor >= crop_side:
+            return factor
+    return 1
+
+
+def decode_image(
+    image_bytes: bytes,
+    min_long_side: Optional[int] = None,
+    grayscale: bool = False,
+    reduction: Optional[int] = None,
+) -> Optional[DecodedImage]:
+    """
+    Decode image bytes at the smallest resolution that still suits detection.
+
+    Args:
+        image_bytes: Raw encoded image (bytes or bytearray)
+        min_long_side: Minimum long side of the decoded frame; defaults to
+            FACE_DECODE_MIN_LONG_SIDE, 0 disables reduced decoding
+        grayscale: Decode straight to a single gray channel (libjpeg skips
+            chroma entirely), for callers that only need luminance
+        reduction: Use this JPEG reduction factor (1, 2, 4 or 8) instead of
+            choosing one from min_long_side
+
+    Returns:
+        DecodedImage, or None if the bytes are not a decodable image
+    """
+    if min_long_side is None:
+        min_long_side = settings.FACE_DECODE_MIN_LONG_SIDE
+
+    started = time.perf_counter()
+    buffer = np.frombuffer(image_bytes, np.uint8)
+
+    header = read_header(image_bytes) if min_long_side > 0 or reduction is not None else None
+    if header is None or header[0] != "JPEG":
+        reduction = 1
+    elif reduction is None:
+        reduction = choose_reduction(header[1], header[2], min_long_side)
+
+    if grayscale:
+        full_flag = cv2.IMREAD_GRAYSCALE
+        flag = _REDUCED_GRAY_FLAGS.get(reduction, full_flag)
+    else:
+        full_flag = cv2.IMREAD_COLOR
+        flag = dict(_REDUCED_FLAGS).get(reduction, full_flag)
+
+    image = cv2.imdecode(buffer, flag)
+    if image is None and reduction > 1:
+        # Header parsed but libjpeg refused the scaled decode; try full size
+        reduction = 1
+        image = cv2.imdecode(buffer, full_flag)
+    if image is None:
+        return None
+
+    elapsed = time.perf_counter() - started
+    FACE_DECODE_DURATION.labels(reduction=str(reduction)).observe(elapsed)
+
+    scale = 1.0
+    original_size = None
+    if header is not None:
+        original_size = (header[1], header[2])
+        # Uniform scale from long sides (EXIF rotation may swap width/height)
+        scale = max(original_size) / max(image.shape[:2])
+        skipped = original_size[0] * original_size[1] - image.shape[0] * image.shape[1]
+        if skipped > 0:
+            FACE_DECODE_PIXELS_SKIPPED.inc(skipped)
+
+    return DecodedImage(
+        image=image,
+        scale=scale,
+        original_size=original_size,
+        reduction=reduction,
+        decode_seconds=elapsed,
+    )
+
+
+def scale_detections(detections: List[Dict], scale: float) -> List[Dict]:
+    """Map bbox and landmark coordinates from a reduced frame to the original"""
+    if scale == 1.0:
+        return detections
+
+    for detection in detections:
+        detection["bbox"] = [float(v) * scale for v in detection["bbox"]]
+        for key in ("landmarks", "kps"):
+            if detection.get(key) is not None:
+                detection[key] = [[float(x) * scale, float(y) * scale] for x, y in detection[key]]
+    return detections
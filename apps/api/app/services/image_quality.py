@@ -0,0 +1,112 @@
+"""
+Image Quality Pre-filter
+
+Cheap checks run on training images before embedding extraction, so
+blurry, dark, overexposed or flat images are dropped without paying for
+face inference, S3 upload or LoRA training time.
+
+Metrics and their 0-100 scales match actorhub_ml's QualityAssessor:
+sharpness is Laplacian variance / 30, brightness the mean gray level and
+contrast its standard deviation / 80. Images are decoded straight to
+grayscale (at reduced resolution for large JPEGs), so every metric reads
+the same single-channel frame and no color conversion happens at all.
+
+Laplacian variance depends on resolution: the same photo scores higher
+the more it is downscaled, and the reduced decode picks the scale from
+the image size. Sharpness is therefore measured on the frame downscaled
+to SHARPNESS_LONG_SIDE, roughly the size of the face crops used for
+training. TRAINING_MIN_SHARPNESS ships at 0 (off) until it is calibrated
+on that scale.
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.services.image_decode import decode_image
+
+SHARPNESS_LONG_SIDE = 512  # Long side (px) the sharpness metric is measured at
+
+
+@dataclass
+class ImageQuality:
+    """Pre-filter scores for one image (0-100 scales)"""
+
+    sharpness: float
+    brightness: float
+    contrast: float
+    rejection: Optional[str] = None  # undecodable | blurry | dark | overexposed | low_contrast
+
+    @property
+    def is_acceptable(self) -> bool:
+        return self.rejection is None
+
+
+def assess_image(image_bytes: bytes) -> ImageQuality:
+    """Score one encoded image against the training quality thresholds"""
+    decoded = decode_image(image_bytes, grayscale=True)
+    if decoded is None:
+        return ImageQuality(sharpness=0.0, brightness=0.0, contrast=0.0, rejection="undecodable")
+
+    gray = decoded.image
+    sharpness = min(100.0, float(cv2.Laplacian(_fixed_size(gray), cv2.CV_64F).var()) / 30)
+    mean, std = cv2.meanStdDev(gray)
+    brightness = float(mean[0, 0]) / 255 * 100
+    contrast = min(100.0, float(std[0, 0]) / 80 * 100)
+
+    rejection = None
+    if settings.TRAINING_MIN_SHARPNESS > 0 and sharpness < settings.TRAINING_MIN_SHARPNESS:
+        rejection = "blurry"
+    elif brightness < settings.TRAINING_MIN_BRIGHTNESS:
+        rejection = "dark"
+    elif brightness > settings.TRAINING_MAX_BRIGHTNESS:
+        rejection = "overexposed"
+    elif contrast < settings.TRAINING_MIN_CONTRAST:
+        rejection = "low_contrast"
+
+    return ImageQuality(
+        sharpness=round(sharpness, 1),
+        brightness=round(brightness, 1),
+        contrast=round(contrast, 1),
+        rejection=rejection,
+    )
+
+
+def _fixed_size(gray: np.ndarray) -> np.ndarray:
+    """Downscale a frame to SHARPNESS_LONG_SIDE on its long side (smaller frames as-is)"""
+    height, width = gray.shape[:2]
+    factor = SHARPNESS_LONG_SIDE / max(height, width)
+    if factor >= 1.0:
+        # Upscaling would only add interpolation blur; small frames are measured natively
+        return gray
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+async def assess_images(
+    images: Sequence[bytes],
+    executor: Optional[Executor] = None,
+) -> List[ImageQuality]:
+    """
+    Score many images in parallel on a thread pool.
+
+    cv2 decode and metrics release the GIL, so threads scale across cores.
+
+    Args:
+        images: Encoded images
+        executor: Thread pool to run on (default: the loop's default executor)
+
+    Returns:
+        ImageQuality per image, in input order
+    """
+    loop = asyncio.get_running_loop()
+    return list(
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, assess_image, data) for data in images)
+        )
+    )
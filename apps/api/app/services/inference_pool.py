@@ -0,0 +1,462 @@
+"""
+Face Inference Worker Pool
+
+Runs InsightFace in dedicated processes so CPU-bound model inference never
+executes on the API event loop. Each process loads its own FaceAnalysis
+model once (ONNX Runtime intra-op threads are capped per process so N
+processes don't oversubscribe the CPU).
+
+Decoded frames are handed to workers through shared memory rather than
+pickled, and the pool admits at most FACE_INFERENCE_QUEUE_SIZE jobs
+(queued + running); beyond that callers get InferenceQueueFull, which the
+API maps to 503 so clients back off instead of piling up latency.
+
+Frames from concurrent requests are micro-batched (FACE_INFERENCE_BATCH_WINDOW_MS
+/ FACE_INFERENCE_MAX_BATCH_SIZE): detection still runs per frame, but every
+face crop in the batch goes through a single ArcFace forward pass.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.core.monitoring import (
+    FACE_INFERENCE_DURATION,
+    FACE_INFERENCE_QUEUE_DEPTH,
+    FACE_INFERENCE_REJECTED,
+)
+from app.services.micro_batcher import MicroBatcher
+
+logger = structlog.get_logger()
+
+MODEL_NAME = "buffalo_l"
+DET_SIZE = (640, 640)
+DET_THRESH = 0.3
+RECOGNITION_CROP_SIZE = 112  # buffalo_l ArcFace input (aligned square crop)
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference pool is saturated (mapped to HTTP 503)"""
+
+    pass
+
+
+def face_to_detection(face) -> Dict:
+    """Convert an InsightFace Face object to a plain, picklable detection dict"""
+    landmarks = getattr(face, "landmark_2d_106", None)
+    kps = getattr(face, "kps", None)
+    return {
+        "bbox": face.bbox.tolist(),
+        "embedding": (face.embedding / np.linalg.norm(face.embedding)).astype(np.float32),
+        "det_score": float(face.det_score),
+        "landmarks": landmarks.tolist() if landmarks is not None else None,
+        # 5-point alignment keypoints, for re-cropping from a sharper decode
+        "kps": kps.tolist() if isinstance(kps, np.ndarray) else None,
+    }
+
+
+def face_analysis_modules(spec: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Parse a FACE_ANALYSIS_MODULES value into FaceAnalysis allowed_modules.
+
+    Returns None ("all") to load every model in the pack. Detection and
+    recognition are always required: every detection carries an embedding.
+    """
+    spec = settings.FACE_ANALYSIS_MODULES if spec is None else spec
+    modules = [m.strip() for m in spec.split(",") if m.strip()]
+    if not modules or modules == ["all"]:
+        return None
+
+    missing = {"detection", "recognition"} - set(modules)
+    if missing:
+        raise ValueError(f"FACE_ANALYSIS_MODULES must include {', '.join(sorted(missing))}")
+    return modules
+
+
+def load_face_analysis(
+    intra_op_threads: Optional[int] = None,
+    modules: Optional[List[str]] = None,
+):
+    """
+    Load and prepare the buffalo_l FaceAnalysis model.
+
+    Args:
+        intra_op_threads: ONNX Runtime intra-op threads per session
+        modules: Model-pack modules to load (default: FACE_ANALYSIS_MODULES)
+    """
+    from insightface.app import FaceAnalysis
+
+    if modules is None:
+        modules = face_analysis_modules()
+
+    kwargs = {}
+    if intra_op_threads:
+        import onnxruntime as ort
+
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = intra_op_threads
+        sess_options.inter_op_num_threads = 1
+        kwargs["sess_options"] = sess_options
+
+    face_app = FaceAnalysis(
+        name=MODEL_NAME,
+        providers=["CPUExecutionProvider"],  # Use CUDA in production
+        allowed_modules=modules,
+        **kwargs,
+    )
+    face_app.prepare(ctx_id=0, det_size=DET_SIZE, det_thresh=DET_THRESH)
+    logger.info("FaceAnalysis loaded", modules=sorted(face_app.models))
+    return face_app
+
+
+def warm_face_analysis(face_app) -> None:
+    """
+    Run one dummy inference through every loaded model.
+
+    The first ONNX Runtime run allocates arenas and picks kernels, which
+    would otherwise land on the first real request. A blank frame has no
+    faces, so recognition is exercised separately on a blank crop.
+    """
+    face_app.get(np.zeros((DET_SIZE[1], DET_SIZE[0], 3), dtype=np.uint8))
+    recognition = face_app.models.get("recognition")
+    if recognition is not None:
+        width, height = recognition.input_size
+        recognition.get_feat([np.zeros((height, width, 3), dtype=np.uint8)])
+
+
+def resident_memory_bytes() -> int:
+    """Resident set size of the current process (0 where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def analyze_frames(face_app, frames: List[np.ndarray]) -> List[List[Dict]]:
+    """
+    Run FaceAnalysis over several frames with one batched recognition pass.
+
+    Mirrors FaceAnalysis.get: detection and any loaded per-face auxiliary
+    models (landmarks, gender/age) run per frame, then all aligned crops go
+    through ArcFace together.
+
+    The SDK runs the same loop in FaceEmbeddingExtractor._get_batch.
+
+    Returns:
+        Detections per frame, in input order
+    """
+    if len(frames) == 1:
+        return [[face_to_detection(face) for face in face_app.get(frames[0])]]
+
+    from insightface.app.common import Face
+    from insightface.utils import face_align
+
+    recognition = face_app.models.get("recognition")
+    per_frame = []
+    crops = []
+    crop_faces = []
+
+    for frame in frames:
+        bboxes, kpss = face_app.det_model.detect(frame, max_num=0, metric="default")
+        faces = []
+        for i in range(bboxes.shape[0]):
+            face = Face(
+                bbox=bboxes[i, 0:4],
+                kps=kpss[i] if kpss is not None else None,
+                det_score=bboxes[i, 4],
+            )
+            for taskname, model in face_app.models.items():
+                if taskname in ("detection", "recognition"):
+                    continue
+                model.get(frame, face)
+            if recognition is not None and face.kps is not None:
+                crops.append(
+                    face_align.norm_crop(frame, landmark=face.kps, image_size=recognition.input_size[0])
+                )
+                crop_faces.append(face)
+            faces.append(face)
+        per_frame.append(faces)
+
+    if crops:
+        embeddings = recognition.get_feat(crops)
+        for face, embedding in zip(crop_faces, embeddings):
+            face.embedding = embedding.flatten()
+
+    return [
+        [face_to_detection(face) for face in faces if face.embedding is not None]
+        for faces in per_frame
+    ]
+
+
+def align_faces(frame: np.ndarray, keypoints: List[np.ndarray]) -> List[np.ndarray]:
+    """ArcFace-aligned crops of a frame, one per set of 5-point keypoints (frame coordinates)"""
+    from insightface.utils import face_align
+
+    return [
+        face_align.norm_crop(frame, landmark=np.asarray(kps, dtype=np.float32), image_size=RECOGNITION_CROP_SIZE)
+        for kps in keypoints
+    ]
+
+
+def embed_crops(face_app, crops: List[np.ndarray]) -> List[np.ndarray]:
+    """Normalized embeddings of aligned face crops in one ArcFace forward pass"""
+    if not crops:
+        return []
+    embeddings = face_app.models["recognition"].get_feat(crops).reshape(len(crops), -1)
+    return [(e / np.linalg.norm(e)).astype(np.float32) for e in embeddings]
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_worker_model = None
+
+
+def _init_worker(intra_op_threads: int, modules: Optional[List[str]]) -> None:
+    """Process initializer: load the model once per worker process"""
+    global _worker_model
+
+    import cv2
+
+    cv2.setNumThreads(1)
+    _worker_model = load_face_analysis(intra_op_threads, modules)
+
+
+def _ping() -> bool:
+    """Warm-up probe; only returns once the worker's model is loaded"""
+    return _worker_model is not None
+
+
+def _warm_up() -> Tuple[int, int]:
+    """Warm the worker's model; returns (pid, resident bytes) for memory metrics"""
+    warm_face_analysis(_worker_model)
+    return os.getpid(), resident_memory_bytes()
+
+
+def _detect_shared_batch(frames: List[Tuple[str, Tuple[int, ...], str]]) -> List[List[Dict]]:
+    """
+    Run batched detection + embedding on frames held in shared memory.
+
+    Each caller unlinks its own segment when it returns, and a caller that
+    was cancelled after its frame was dispatched may do so before this
+    worker opens it. Such a frame gets an empty result (nobody is waiting
+    for it) rather than failing the rest of the batch.
+    """
+    segments: List[Optional[shared_memory.SharedMemory]] = []
+    for name, _, _ in frames:
+        try:
+            segments.append(shared_memory.SharedMemory(name=name))
+        except FileNotFoundError:
+            segments.append(None)
+    try:
+        present = [i for i, shm in enumerate(segments) if shm is not None]
+        views = [
+            np.ndarray(frames[i][1], dtype=np.dtype(frames[i][2]), buffer=segments[i].buf)
+            for i in present
+        ]
+        detected = analyze_frames(_worker_model, views) if views else []
+        del views  # Release the buffer exports before closing the segments
+        results: List[List[Dict]] = [[] for _ in frames]
+        for i, detections in zip(present, detected):
+            results[i] = detections
+        return results
+    finally:
+        for shm in segments:
+            if shm is not None:
+                shm.close()
+
+
+def _embed_crops(crops: List[np.ndarray]) -> List[np.ndarray]:
+    """Embed aligned crops (small enough to pickle) on the worker's model"""
+    return embed_crops(_worker_model, crops)
+
+
+# ---------------------------------------------------------------------------
+# API process side
+# ---------------------------------------------------------------------------
+
+
+def _copy_to_shared(img: np.ndarray) -> shared_memory.SharedMemory:
+    """Copy a decoded frame into a new shared memory segment"""
+    shm = shared_memory.SharedMemory(create=True, size=max(img.nbytes, 1))
+    frame = np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)
+    frame[...] = img
+    del frame
+    return shm
+
+
+class InferencePool:
+    """Process pool of InsightFace models with bounded admission"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        intra_op_threads: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        batch_window_ms: Optional[float] = None,
+    ):
+        self.workers = workers if workers is not None else settings.FACE_INFERENCE_WORKERS
+        self.max_queue = max_queue if max_queue is not None else settings.FACE_INFERENCE_QUEUE_SIZE
+        self.intra_op_threads = (
+            intra_op_threads if intra_op_threads is not None
+            else settings.FACE_INFERENCE_INTRA_OP_THREADS
+        )
+        self._batcher = MicroBatcher(
+            self._run_batch,
+            max_batch_size=(
+                max_batch_size if max_batch_size is not None
+                else settings.FACE_INFERENCE_MAX_BATCH_SIZE
+            ),
+            max_wait_ms=(
+                batch_window_ms if batch_window_ms is not None
+                else settings.FACE_INFERENCE_BATCH_WINDOW_MS
+            ),
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._start_failed = False
+        self._pending = 0
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> bool:
+        """
+        Start the worker processes and wait until every model is loaded.
+
+        Returns:
+            True if the pool is ready, False if workers could not load the model
+        """
+        async with self._start_lock:
+            if self._executor is not None:
+                return True
+            if self.workers <= 0 or self._start_failed:
+                return False
+
+            # Parse in the parent so a bad setting fails here, not in every worker
+            modules = face_analysis_modules()
+
+            started = time.perf_counter()
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn: never fork a process holding an event loop and threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.intra_op_threads, modules),
+            )
+            loop = asyncio.get_running_loop()
+            try:
+                ready = await asyncio.gather(
+                    *[loop.run_in_executor(executor, _ping) for _ in range(self.workers)]
+                )
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Face inference pool failed to start: {e}")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._start_failed = True
+                return False
+
+            if not all(ready):
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._start_failed = True
+                return False
+
+            self._executor = executor
+            logger.info(
+                "Face inference pool started",
+                workers=self.workers,
+                intra_op_threads=self.intra_op_threads,
+                modules=modules or "all",
+                max_queue=self.max_queue,
+                startup_seconds=round(time.perf_counter() - started, 2),
+            )
+            return True
+
+    async def warm_up(self) -> Dict[int, int]:
+        """
+        Run a dummy inference on the worker processes.
+
+        One job is submitted per worker; the executor usually hands each to
+        a different idle process, but that is not guaranteed, so a worker
+        may still take its first-run cost on a real request.
+
+        Returns:
+            Resident bytes per worker pid that ran a warm-up job
+        """
+        if self._executor is None:
+            raise RuntimeError("Face inference pool is not running")
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)]
+        )
+        return dict(results)
+
+    async def detect(self, img: np.ndarray) -> List[Dict]:
+        """
+        Detect faces in a decoded BGR frame on a worker process.
+
+        Concurrent calls are micro-batched into one worker round trip.
+
+        Raises:
+            InferenceQueueFull: If max_queue jobs are already admitted
+        """
+        if self._executor is None:
+            raise RuntimeError("Face inference pool is not running")
+
+        if self._pending >= self.max_queue:
+            FACE_INFERENCE_REJECTED.inc()
+            raise InferenceQueueFull("Face inference queue is full")
+
+        self._pending += 1
+        FACE_INFERENCE_QUEUE_DEPTH.set(self._pending)
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        shm = None
+        try:
+            # The copy into shared memory is a large memcpy; keep it off the loop too
+            shm = await loop.run_in_executor(None, _copy_to_shared, img)
+            return await self._batcher.submit((shm.name, img.shape, img.dtype.str))
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            self._pending -= 1
+            FACE_INFERENCE_QUEUE_DEPTH.set(self._pending)
+            FACE_INFERENCE_DURATION.observe(time.perf_counter() - started)
+
+    async def embed(self, crops: List[np.ndarray]) -> List[np.ndarray]:
+        """Embed aligned face crops on a worker process"""
+        if self._executor is None:
+            raise RuntimeError("Face inference pool is not running")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _embed_crops, crops)
+
+    async def _run_batch(self, frames: List[Tuple[str, Tuple[int, ...], str]]) -> List[List[Dict]]:
+        """Send one micro-batch of shared-memory frames to a worker process"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _detect_shared_batch, frames)
+
+    def shutdown(self) -> None:
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Face inference pool stopped")
+
+
+# Process-wide pool shared by every FaceRecognitionService instance
+inference_pool = InferencePool()
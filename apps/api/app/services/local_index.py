@@ -0,0 +1,542 @@
+"""
+Local Embedding Index
+
+Persistent, memory-mapped exact-search index of every registered face
+embedding. Serves two roles (FACE_LOCAL_INDEX_MODE):
+
+- standby: kept in sync on register/delete and used when Qdrant is
+  unreachable, instead of an empty in-memory Qdrant that loses identities.
+  While failed over, searches are served locally, register/delete are
+  refused and Qdrant is retried every FACE_QDRANT_RECONNECT_INTERVAL
+- primary: answers all searches locally; for registries under ~1M faces a
+  blocked BLAS matrix product beats a network hop
+
+On-disk layout (FACE_LOCAL_INDEX_PATH):
+
+    meta.json     count, deleted, capacity, dim, dtype, generation, epoch
+    vectors.bin   capacity x dim matrix (float16 or float32), L2-normalized rows
+    ids.bin       capacity x 16 bytes (identity UUIDs)
+    versions.bin  capacity x float64 (the point's updated_at in Qdrant)
+    deleted.bin   int64 row numbers of deleted rows, in deletion order
+
+Rows are append-only: a replace appends the new row and tombstones the old
+one, a delete only tombstones. Another process picking up a write therefore
+reads just the rows and tombstones added since its last load, not the
+whole index. When tombstones reach a quarter of the rows, the writer
+compacts the files and bumps the epoch, and readers do one full reload.
+Writers serialize on a file lock, so multiple API workers share one index.
+
+Qdrant stays the source of truth: FaceRecognitionService reconciles the
+index against it (by id and updated_at version) at startup and every
+FACE_LOCAL_INDEX_SYNC_INTERVAL seconds, which picks up registrations and
+deletions made by other API hosts and by the worker.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single-process only
+    fcntl = None
+
+logger = structlog.get_logger()
+
+_ID_BYTES = 16
+_ROW_BYTES = np.dtype(np.int64).itemsize  # deleted.bin entry
+_VERSION_BYTES = np.dtype(np.float64).itemsize
+
+# Compact once tombstones are this share of the rows (and at least COMPACT_MIN_DELETED)
+COMPACT_DELETED_RATIO = 0.25
+COMPACT_MIN_DELETED = 1024
+
+
+class LocalEmbeddingIndex:
+    """Memory-mapped exact cosine-similarity index keyed by identity UUID"""
+
+    def __init__(
+        self,
+        path: str,
+        dim: int = 512,
+        dtype: str = "float16",
+        block_rows: int = 16384,
+        initial_capacity: int = 1024,
+    ):
+        self.path = Path(path)
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.block_rows = block_rows
+        self.initial_capacity = initial_capacity
+
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._versions: Optional[np.memmap] = None
+        self._live = np.zeros(0, dtype=bool)  # Row is not tombstoned
+        self._row_of: Dict[str, int] = {}
+        self._count = 0  # Rows written, live or not
+        self._deleted = 0  # Tombstones applied
+        self._pending_deletes: List[int] = []
+        self._capacity = 0
+        self._generation = 0
+        self._epoch = 0
+        self._meta_mtime = None
+        self._mutex = threading.RLock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self._deleted_file.touch(exist_ok=True)
+            if self._meta_file.exists():
+                self._load()
+            else:
+                self._allocate(self.initial_capacity)
+                self._write_meta()
+
+    # ------------------------------------------------------------------
+    # Files and locking
+    # ------------------------------------------------------------------
+
+    @property
+    def _meta_file(self) -> Path:
+        return self.path / "meta.json"
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.bin"
+
+    @property
+    def _ids_file(self) -> Path:
+        return self.path / "ids.bin"
+
+    @property
+    def _versions_file(self) -> Path:
+        return self.path / "versions.bin"
+
+    @property
+    def _deleted_file(self) -> Path:
+        return self.path / "deleted.bin"
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock across threads and processes for writes"""
+        with self._mutex:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path / ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def sync_lease(self) -> Iterator[bool]:
+        """
+        Non-blocking lock for reconciling with Qdrant, so only one process
+        per host scrolls the collection. Yields whether it was acquired.
+        """
+        if fcntl is None:
+            yield True
+            return
+        with open(self.path / ".sync.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _map(self) -> None:
+        self._vectors = np.memmap(
+            self._vectors_file, dtype=self.dtype, mode="r+", shape=(self._capacity, self.dim)
+        )
+        self._ids = np.memmap(
+            self._ids_file, dtype=np.uint8, mode="r+", shape=(self._capacity, _ID_BYTES)
+        )
+        with open(self._versions_file, "ab") as f:
+            # Indexes written before versions were kept start at version 0
+            if f.tell() < self._capacity * _VERSION_BYTES:
+                f.truncate(self._capacity * _VERSION_BYTES)
+        self._versions = np.memmap(
+            self._versions_file, dtype=np.float64, mode="r+", shape=(self._capacity,)
+        )
+        if len(self._live) < self._capacity:
+            self._live = np.concatenate(
+                [self._live, np.zeros(self._capacity - len(self._live), dtype=bool)]
+            )
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow (or create) the backing files to hold ``capacity`` rows"""
+        if self._vectors is not None:
+            self._flush()
+        self._vectors = self._ids = self._versions = None
+
+        for file, row_bytes in (
+            (self._vectors_file, self.dim * self.dtype.itemsize),
+            (self._ids_file, _ID_BYTES),
+            (self._versions_file, _VERSION_BYTES),
+        ):
+            with open(file, "ab") as f:
+                f.truncate(capacity * row_bytes)
+
+        self._capacity = capacity
+        self._map()
+
+    def _read_meta(self) -> Dict:
+        meta = json.loads(self._meta_file.read_text())
+        if meta["dim"] != self.dim or meta["dtype"] != self.dtype.name:
+            raise ValueError(
+                f"Local index at {self.path} is {meta['dtype']}x{meta['dim']}, "
+                f"expected {self.dtype.name}x{self.dim}"
+            )
+        return meta
+
+    def _load(self) -> None:
+        """Map the files and build the id -> row lookup from scratch"""
+        meta = self._read_meta()
+        self._vectors = self._ids = self._versions = None
+        self._live = np.zeros(0, dtype=bool)
+        self._row_of = {}
+        self._count = self._deleted = 0
+        self._epoch = meta.get("epoch", 0)
+        self._apply(meta)
+
+    def _apply(self, meta: Dict) -> None:
+        """Apply rows and tombstones written since the last load (same epoch)"""
+        if meta["capacity"] != self._capacity or self._vectors is None:
+            self._capacity = meta["capacity"]
+            self._map()
+
+        count, deleted = meta["count"], meta.get("deleted", 0)
+        for row in range(self._count, count):
+            self._row_of[str(uuid.UUID(bytes=self._ids[row].tobytes()))] = row
+        self._live[self._count:count] = True
+
+        if deleted > self._deleted:
+            rows = np.fromfile(
+                self._deleted_file,
+                dtype=np.int64,
+                count=deleted - self._deleted,
+                offset=self._deleted * _ROW_BYTES,
+            )
+            self._drop_rows(rows)
+
+        self._count, self._deleted = count, deleted
+        self._generation = meta["generation"]
+        self._meta_mtime = self._meta_stamp()
+
+    def _drop_rows(self, rows: Iterable[int]) -> None:
+        for row in rows:
+            self._live[row] = False
+            identity_id = str(uuid.UUID(bytes=self._ids[row].tobytes()))
+            # A replaced identity already points at its newer row
+            if self._row_of.get(identity_id) == row:
+                del self._row_of[identity_id]
+
+    def _flush(self) -> None:
+        self._vectors.flush()
+        self._ids.flush()
+        self._versions.flush()
+
+    def _meta_stamp(self) -> Tuple[int, int]:
+        # meta.json is replaced on every write: a new inode even when the
+        # filesystem's mtime granularity hides the change
+        stat = self._meta_file.stat()
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _write_meta(self) -> None:
+        if self._pending_deletes:
+            with open(self._deleted_file, "r+b") as f:
+                f.seek(self._deleted * _ROW_BYTES)
+                f.write(np.asarray(self._pending_deletes, dtype=np.int64).tobytes())
+                f.truncate()
+            self._deleted += len(self._pending_deletes)
+            self._pending_deletes = []
+
+        self._flush()
+        self._generation += 1
+        tmp = self._meta_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "count": self._count,
+            "deleted": self._deleted,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "generation": self._generation,
+            "epoch": self._epoch,
+        }))
+        os.replace(tmp, self._meta_file)
+        self._meta_mtime = self._meta_stamp()
+
+    def _refresh(self) -> None:
+        """Pick up writes made by other processes"""
+        try:
+            mtime = self._meta_stamp()
+        except FileNotFoundError:
+            return
+        if mtime == self._meta_mtime:
+            return
+
+        with self._mutex:
+            meta = self._read_meta()
+            if meta.get("epoch", 0) != self._epoch or meta["count"] < self._count:
+                self._load()  # Compacted by another process
+            else:
+                self._apply(meta)
+
+    def _maybe_compact(self) -> None:
+        """Rewrite the live rows densely once tombstones pile up"""
+        if self._deleted < max(COMPACT_MIN_DELETED, self._count * COMPACT_DELETED_RATIO):
+            return
+
+        rows = np.flatnonzero(self._live[:self._count])
+        capacity = max(self.initial_capacity, len(rows))
+        for file, source, row_bytes in (
+            (self._vectors_file, self._vectors, self.dim * self.dtype.itemsize),
+            (self._ids_file, self._ids, _ID_BYTES),
+            (self._versions_file, self._versions, _VERSION_BYTES),
+        ):
+            tmp = file.with_suffix(".compact")
+            with open(tmp, "wb") as f:
+                for start in range(0, len(rows), self.block_rows):
+                    f.write(np.ascontiguousarray(source[rows[start:start + self.block_rows]]).tobytes())
+                f.truncate(capacity * row_bytes)
+            os.replace(tmp, file)
+        self._deleted_file.write_bytes(b"")
+
+        # New files: readers see the epoch change and reload once
+        self._epoch += 1
+        self._vectors = self._ids = self._versions = None
+        self._live = np.zeros(0, dtype=bool)
+        self._capacity = capacity
+        self._map()
+        self._live[:len(rows)] = True
+        self._row_of = {
+            str(uuid.UUID(bytes=self._ids[row].tobytes())): row for row in range(len(rows))
+        }
+        self._count, self._deleted = len(rows), 0
+        self._write_meta()
+        logger.info("Local embedding index compacted", rows=len(rows), epoch=self._epoch)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def _tombstone(self, row: int) -> None:
+        self._live[row] = False
+        self._pending_deletes.append(row)
+
+    def _put(self, identity_id: str, vector: np.ndarray, version: float) -> bool:
+        previous = self._row_of.get(identity_id)
+        if previous is not None and self._versions[previous] > version:
+            return False  # Already holds a newer embedding
+
+        if self._count == self._capacity:
+            self._allocate(max(self._capacity * 2, self.initial_capacity))
+        row = self._count
+        self._vectors[row] = vector
+        self._ids[row] = np.frombuffer(uuid.UUID(identity_id).bytes, dtype=np.uint8)
+        self._versions[row] = version
+        self._live[row] = True
+        self._count += 1
+
+        if previous is not None:
+            self._tombstone(previous)
+        self._row_of[identity_id] = row
+        return True
+
+    def add(self, identity_id: str, embedding: np.ndarray, version: Optional[float] = None) -> None:
+        """Insert or replace the embedding for an identity"""
+        self.add_many([(identity_id, embedding, version)])
+
+    def add_many(self, items: Iterable[Sequence]) -> int:
+        """
+        Insert or replace several embeddings under one lock/flush.
+
+        Items are (identity_id, embedding) or (identity_id, embedding,
+        version); version defaults to now. An item older than the indexed
+        version of the same identity is skipped.
+
+        Returns:
+            Number of embeddings written
+        """
+        added = 0
+        with self._locked():
+            self._refresh()
+            for identity_id, embedding, *version in items:
+                version = version[0] if version and version[0] is not None else time.time()
+                added += self._put(str(identity_id), self._normalize(embedding), float(version))
+            self._write_meta()
+            self._maybe_compact()
+        return added
+
+    def remove(self, identity_id: str) -> bool:
+        """Delete an identity's embedding; returns False if it wasn't indexed"""
+        return self.remove_many([identity_id]) == 1
+
+    def remove_many(self, identity_ids: Iterable[str]) -> int:
+        """Delete several identities under one lock/flush; returns how many were indexed"""
+        removed = 0
+        with self._locked():
+            self._refresh()
+            for identity_id in identity_ids:
+                row = self._row_of.pop(str(identity_id), None)
+                if row is not None:
+                    self._tombstone(row)
+                    removed += 1
+            if removed:
+                self._write_meta()
+                self._maybe_compact()
+        return removed
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search_batch(
+        self, queries: np.ndarray, limit: int = 1, threshold: float = -1.0
+    ) -> List[List[Dict]]:
+        """
+        Exact top-k cosine search for several queries.
+
+        Scans the matrix in blocks of ``block_rows`` so memory stays bounded
+        regardless of registry size; each block is one matrix product.
+        Tombstoned rows score -inf.
+
+        Args:
+            queries: (m, dim) or (dim,) query embeddings
+            limit: Results per query
+            threshold: Minimum similarity score
+
+        Returns:
+            Per query, a list of {"identity_id", "score"} sorted by score desc
+        """
+        self._refresh()
+        q = self._normalize(np.atleast_2d(queries))
+        m = q.shape[0]
+
+        with self._mutex:
+            n = self._count
+            vectors, ids = self._vectors, self._ids
+            dead = ~self._live[:n] if self._deleted or self._pending_deletes else None
+            live_rows = len(self._row_of)
+
+        if live_rows == 0 or m == 0 or limit <= 0:
+            return [[] for _ in range(m)]
+
+        k = min(limit, n)
+        best_scores = np.full((m, k), -np.inf, dtype=np.float32)
+        best_rows = np.full((m, k), -1, dtype=np.int64)
+
+        for start in range(0, n, self.block_rows):
+            end = min(start + self.block_rows, n)
+            block = np.asarray(vectors[start:end], dtype=np.float32)
+            scores = q @ block.T  # (m, block)
+            if dead is not None:
+                scores[:, dead[start:end]] = -np.inf
+
+            if scores.shape[1] > k:
+                candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                candidates = np.broadcast_to(np.arange(scores.shape[1]), (m, scores.shape[1]))
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+
+            merged_scores = np.concatenate([best_scores, candidate_scores], axis=1)
+            merged_rows = np.concatenate([best_rows, candidates + start], axis=1)
+            keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+        results = []
+        for scores_row, rows in zip(best_scores, best_rows):
+            matches = []
+            for score, row in zip(scores_row, rows):
+                if row < 0 or score == -np.inf or score < threshold:
+                    break
+                matches.append({
+                    "identity_id": str(uuid.UUID(bytes=ids[row].tobytes())),
+                    "score": float(score),
+                })
+            results.append(matches)
+        return results
+
+    def search(self, query: np.ndarray, limit: int = 1, threshold: float = -1.0) -> List[Dict]:
+        """Exact top-k cosine search for one query"""
+        return self.search_batch(query, limit=limit, threshold=threshold)[0]
+
+    def versions(self) -> Dict[str, float]:
+        """Indexed identity -> version, for reconciling with Qdrant"""
+        self._refresh()
+        with self._mutex:
+            return {
+                identity_id: float(self._versions[row]) for identity_id, row in self._row_of.items()
+            }
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._row_of)
+
+    def __contains__(self, identity_id: str) -> bool:
+        self._refresh()
+        return str(identity_id) in self._row_of
+
+
+_local_index: Optional[LocalEmbeddingIndex] = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index() -> Optional[LocalEmbeddingIndex]:
+    """Process-wide local index, or None when FACE_LOCAL_INDEX_MODE is off"""
+    global _local_index
+    if settings.FACE_LOCAL_INDEX_MODE == "off":
+        return None
+    if not os.path.isabs(settings.FACE_LOCAL_INDEX_PATH):
+        # A relative path lands wherever the process was started (often the repo)
+        logger.error(
+            "FACE_LOCAL_INDEX_PATH must be absolute; local index disabled",
+            path=settings.FACE_LOCAL_INDEX_PATH,
+        )
+        return None
+
+    with _local_index_lock:
+        if _local_index is None:
+            try:
+                _local_index = LocalEmbeddingIndex(
+                    settings.FACE_LOCAL_INDEX_PATH,
+                    dim=settings.FACE_EMBEDDING_SIZE,
+                    dtype=settings.FACE_LOCAL_INDEX_DTYPE,
+                )
+                logger.info(
+                    "Local embedding index opened",
+                    path=settings.FACE_LOCAL_INDEX_PATH,
+                    mode=settings.FACE_LOCAL_INDEX_MODE,
+                    count=len(_local_index),
+                )
+            except Exception as e:
+                logger.error(f"Local embedding index unavailable: {e}")
+                return None
+    return _local_index
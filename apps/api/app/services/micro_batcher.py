@@ -0,0 +1,109 @@
+"""
+Micro-batching Scheduler
+
+Collects items submitted by concurrent requests for up to a short window
+(or until a maximum batch size is reached), runs one batched call, and
+routes each result back to the coroutine that submitted it.
+
+Used to turn many concurrent single-image face inferences into one
+batched ArcFace forward pass.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+import structlog
+
+from app.core.monitoring import FACE_INFERENCE_BATCH_SIZE, FACE_INFERENCE_QUEUE_WAIT
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Async micro-batcher.
+
+    Args:
+        process_batch: Coroutine taking a list of items and returning a list
+            of results in the same order
+        max_batch_size: Flush as soon as this many items are waiting
+        max_wait_ms: Flush this long after the first item of a batch arrives
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: List[Tuple[T, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, item: T) -> R:
+        """Queue an item for the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch up to max_batch_size waiting items as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        # Drop callers that gave up (e.g. request cancelled) before dispatch
+        batch = [entry for entry in batch if not entry[1].done()]
+
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        FACE_INFERENCE_BATCH_SIZE.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            FACE_INFERENCE_QUEUE_WAIT.observe(now - enqueued_at)
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future, float]]) -> None:
+        try:
+            results = await self.process_batch([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(results) != len(batch):
+            error = RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+            logger.error("Micro-batch result count mismatch", expected=len(batch), got=len(results))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,165 @@
+"""
+Face Model Registry
+
+One place per process that owns the loaded InsightFace models, so every
+FaceRecognitionService instance (endpoint singletons, per-request service
+objects, Celery tasks) shares them instead of each loading its own.
+
+Models are loaded eagerly and warmed up with a dummy inference from the
+API lifespan and at Celery worker start (FACE_MODEL_WARMUP); /health/ready
+reports not-ready until that finishes. Load time, warm-up time and resident
+memory are exported as Prometheus metrics.
+
+States:
+    cold        - nothing loaded yet
+    loading     - load or warm-up in progress
+    loaded      - models usable, not warmed up (lazy load on first request)
+    ready       - loaded and warmed up
+    mock        - FACE_RECOGNITION_MOCK=true, no models needed
+    unavailable - models could not be loaded; not retried
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+import structlog
+
+from app.core.monitoring import (
+    MODEL_LOAD_SECONDS,
+    MODEL_READY,
+    MODEL_RESIDENT_MEMORY_BYTES,
+    MODEL_WARMUP_SECONDS,
+)
+from app.services.inference_pool import (
+    InferencePool,
+    inference_pool,
+    load_face_analysis,
+    resident_memory_bytes,
+    warm_face_analysis,
+)
+
+logger = structlog.get_logger()
+
+READY_STATES = ("ready", "mock")
+SETTLED_STATES = ("loaded", "ready", "mock", "unavailable")
+
+
+class ModelRegistry:
+    """Process-wide owner of the face models"""
+
+    def __init__(self, pool: Optional[InferencePool] = None):
+        self.pool = pool if pool is not None else inference_pool
+        self.state = "cold"
+        self.face_app = None
+        self.inference_pool: Optional[InferencePool] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state in READY_STATES
+
+    @property
+    def backend(self) -> str:
+        return "pool" if self.inference_pool is not None else "in_process"
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Each Celery worker process and the API run their own loop; a lock is only valid on one
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def load(self) -> "ModelRegistry":
+        """Load the models once; later calls return immediately"""
+        if self.state in SETTLED_STATES:
+            return self
+
+        async with self._get_lock():
+            if self.state in SETTLED_STATES:
+                return self
+            await self._load()
+        return self
+
+    async def _load(self) -> None:
+        if os.getenv("FACE_RECOGNITION_MOCK", "false").lower() == "true":
+            logger.warning("MOCK MODE: Skipping InsightFace initialization")
+            self.state = "mock"
+            MODEL_READY.set(1)
+            return
+
+        self.state = "loading"
+        started = time.perf_counter()
+        rss_before = resident_memory_bytes()
+        try:
+            if await self.pool.start():
+                # Model runs in worker processes; nothing CPU-bound on the event loop
+                self.inference_pool = self.pool
+            else:
+                # In-process fallback (FACE_INFERENCE_WORKERS=0); inference runs on a thread
+                loop = asyncio.get_running_loop()
+                self.face_app = await loop.run_in_executor(None, load_face_analysis)
+        except Exception as e:
+            logger.warning(f"InsightFace not available: {e}")
+            self.state = "unavailable"
+            return
+
+        self.load_seconds = time.perf_counter() - started
+        MODEL_LOAD_SECONDS.labels(backend=self.backend).set(self.load_seconds)
+        if self.face_app is not None:
+            MODEL_RESIDENT_MEMORY_BYTES.labels(backend=self.backend).set(
+                max(resident_memory_bytes() - rss_before, 0)
+            )
+        self.state = "loaded"
+        logger.info(
+            "InsightFace models loaded",
+            backend=self.backend,
+            load_seconds=round(self.load_seconds, 2),
+        )
+
+    async def warm_up(self) -> "ModelRegistry":
+        """
+        Load the models if needed and run a dummy inference.
+
+        A failed warm-up is logged, not raised: the models still serve
+        requests, only the first ones pay the first-run cost.
+        """
+        await self.load()
+        if self.state != "loaded":
+            return self
+
+        async with self._get_lock():
+            if self.state != "loaded":
+                return self
+
+            self.state = "loading"
+            started = time.perf_counter()
+            try:
+                if self.inference_pool is not None:
+                    rss = await self.inference_pool.warm_up()
+                    MODEL_RESIDENT_MEMORY_BYTES.labels(backend=self.backend).set(sum(rss.values()))
+                else:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, warm_face_analysis, self.face_app)
+            except Exception as e:
+                logger.warning(f"Face model warm-up failed: {e}")
+
+            self.warmup_seconds = time.perf_counter() - started
+            MODEL_WARMUP_SECONDS.labels(backend=self.backend).set(self.warmup_seconds)
+            self.state = "ready"
+            MODEL_READY.set(1)
+
+        logger.info(
+            "InsightFace models warmed up",
+            backend=self.backend,
+            warmup_seconds=round(self.warmup_seconds, 2),
+        )
+        return self
+
+
+model_registry = ModelRegistry()
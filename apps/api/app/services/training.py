@@ -27,7 +27,9 @@ from PIL import Image
 
 from app.core.config import settings
 from app.core.helpers import utc_now  # MEDIUM FIX: Use timezone-aware datetime
+from app.core.monitoring import TRAINING_IMAGES_REJECTED
 from app.core.resilience import CircuitBreaker, CircuitBreakerConfig, RetryConfig
+from app.services.image_quality import assess_images
 from app.services.storage import StorageService
 from app.models.notifications import Notification, NotificationType
 
@@ -291,8 +293,7 @@ class TrainingService:
 
         face_service = FaceRecognitionService()
 
-        embeddings = []
-        processed_images = []
+        downloaded = []
 
         async with httpx.AsyncClient(
             timeout=httpx.Timeout(60.0, connect=10.0)
@@ -301,27 +302,63 @@ class TrainingService:
                 try:
                     # Download with retry
                     image_bytes = await self._download_with_retry(client, url)
-                    if image_bytes is None:
-                        continue
-
-                    # Extract embedding
-                    embedding = await face_service.extract_embedding(image_bytes)
-                    if embedding is not None:
-                        embeddings.append(embedding)
-                        processed_images.append(image_bytes)
+                    if image_bytes is not None:
+                        downloaded.append((url, image_bytes))
 
                 except Exception as e:
-                    logger.warning(f"Failed to process image {url}: {e}")
+                    logger.warning(f"Failed to download image {url}: {e}")
                     continue
 
+        # Quality pre-filter: rejected images skip embedding, upload and LoRA training
+        quality_rejected = 0
+        if settings.TRAINING_QUALITY_FILTER_ENABLED and downloaded:
+            qualities = await assess_images([data for _, data in downloaded], executor=_executor)
+            accepted = []
+            for (url, image_bytes), quality in zip(downloaded, qualities):
+                if quality.is_acceptable:
+                    accepted.append((url, image_bytes))
+                    continue
+                TRAINING_IMAGES_REJECTED.labels(reason=quality.rejection).inc()
+                logger.info(
+                    "Training image rejected by quality filter",
+                    url=url[:50],
+                    reason=quality.rejection,
+                    sharpness=quality.sharpness,
+                    brightness=quality.brightness,
+                    contrast=quality.contrast,
+                )
+            quality_rejected = len(downloaded) - len(accepted)
+            downloaded = accepted
+
+        embeddings = []
+        processed_images = []
+
+        for url, image_bytes in downloaded:
+            try:
+                # Extract embedding
+                embedding = await face_service.extract_embedding(image_bytes)
+                if embedding is not None:
+                    embeddings.append(embedding)
+                    processed_images.append(image_bytes)
+
+            except Exception as e:
+                logger.warning(f"Failed to process image {url}: {e}")
+                continue
+
         if len(embeddings) < MIN_IMAGES_REQUIRED:
             raise ValueError(
                 f"Not enough valid face images after processing. "
-                f"Need {MIN_IMAGES_REQUIRED}, got {len(embeddings)}. "
-                f"Ensure images contain clear, detectable faces."
+                f"Need {MIN_IMAGES_REQUIRED}, got {len(embeddings)}"
+                + (f" ({quality_rejected} rejected as blurry, dark or low contrast)" if quality_rejected else "")
+                + ". Ensure images contain clear, detectable faces."
             )
 
-        return {"embeddings": embeddings, "images": processed_images, "count": len(embeddings)}
+        return {
+            "embeddings": embeddings,
+            "images": processed_images,
+            "count": len(embeddings),
+            "quality_rejected": quality_rejected,
+        }
 
     async def _download_with_retry(
         self, client: httpx.AsyncClient, url: str, max_attempts: int = 3
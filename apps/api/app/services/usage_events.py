@@ -0,0 +1,521 @@
+"""
+Usage Event Pipeline
+
+Write-behind logging for verification usage. Request handlers call
+``usage_events.record(...)``, which only appends to an in-process ring
+buffer. The verify path does no INSERT, no hot-row UPDATE on
+identities.total_verifications, and no commit.
+
+A background task per API process:
+
+1. Ships buffered events to a Redis stream (one pipelined XADD batch), so
+   they survive a process crash once shipped
+2. Reads the stream through a consumer group (all API workers share the
+   load; entries left pending by a dead worker are reclaimed after
+   USAGE_EVENTS_CLAIM_IDLE_MS)
+3. Bulk-inserts usage_logs rows in one multi-row INSERT ... ON CONFLICT DO
+   NOTHING RETURNING, then applies the per-identity counter deltas of the
+   rows actually inserted in one UPDATE ... FROM (VALUES ...), in the same
+   transaction
+4. XACKs and XDELs the flushed entries, so XLEN is the unflushed backlog
+5. A batch that has failed USAGE_EVENTS_MAX_DELIVERIES times (a poison
+   row, not an outage) is written row by row; rows that still fail are
+   moved to USAGE_EVENTS_DEAD_LETTER_STREAM, and the batch is acked so
+   it stops blocking the entries behind it
+
+Event ids are generated at record time and used as usage_logs.id, so a
+batch redelivered after a crash between commit and XACK inserts nothing
+and counts nothing twice. If Redis is unavailable, the flusher writes
+buffered events directly to Postgres. On shutdown, the ring buffer and
+this consumer's pending entries are drained before the process exits.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
+
+import structlog
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy import Integer, column, func, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.monitoring import (
+    USAGE_EVENT_FLUSH_DURATION,
+    USAGE_EVENT_LAG,
+    USAGE_EVENTS_BUFFERED,
+    USAGE_EVENTS_DEAD_LETTERED,
+    USAGE_EVENTS_DROPPED,
+    USAGE_EVENTS_FLUSHED,
+    USAGE_EVENTS_STREAM_BACKLOG,
+)
+from app.models.identity import Identity, UsageLog
+from app.services.cache import cache
+
+logger = structlog.get_logger()
+
+_FIELD = b"e"
+
+
+def _is_outage(exc: BaseException) -> bool:
+    """True if a write failed because the database is unreachable, not because of the row"""
+    if isinstance(exc, (OperationalError, InterfaceError, ConnectionError, OSError, asyncio.TimeoutError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+@dataclass
+class UsageEvent:
+    """One matched face in a verification request"""
+
+    identity_id: uuid.UUID
+    requester_id: Optional[uuid.UUID] = None
+    requester_name: Optional[str] = None
+    api_key_id: Optional[uuid.UUID] = None
+    similarity_score: Optional[float] = None
+    faces_detected: Optional[int] = None
+    response_time_ms: Optional[int] = None
+    requester_type: str = "api"
+    action: str = "verify"
+    result: str = "protected"
+    matched: bool = True
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    created_at: float = field(default_factory=time.time)  # epoch seconds
+
+    def encode(self) -> bytes:
+        """Compact stream payload (positional JSON array)"""
+        return json.dumps([
+            self.id.hex,
+            self.identity_id.hex,
+            self.requester_id.hex if self.requester_id else None,
+            self.requester_name,
+            self.api_key_id.hex if self.api_key_id else None,
+            self.similarity_score,
+            self.faces_detected,
+            self.response_time_ms,
+            self.requester_type,
+            self.action,
+            self.result,
+            self.matched,
+            self.created_at,
+        ], separators=(",", ":")).encode()
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "UsageEvent":
+        (
+            event_id, identity_id, requester_id, requester_name, api_key_id,
+            similarity_score, faces_detected, response_time_ms,
+            requester_type, action, result, matched, created_at,
+        ) = json.loads(payload)
+        return cls(
+            id=uuid.UUID(event_id),
+            identity_id=uuid.UUID(identity_id),
+            requester_id=uuid.UUID(requester_id) if requester_id else None,
+            requester_name=requester_name,
+            api_key_id=uuid.UUID(api_key_id) if api_key_id else None,
+            similarity_score=similarity_score,
+            faces_detected=faces_detected,
+            response_time_ms=response_time_ms,
+            requester_type=requester_type,
+            action=action,
+            result=result,
+            matched=matched,
+            created_at=created_at,
+        )
+
+    def to_row(self) -> dict:
+        return {
+            "id": self.id,
+            "identity_id": self.identity_id,
+            "requester_id": self.requester_id,
+            "requester_type": self.requester_type,
+            "requester_name": self.requester_name,
+            "api_key_id": self.api_key_id,
+            "action": self.action,
+            "similarity_score": self.similarity_score,
+            "faces_detected": self.faces_detected,
+            "matched": self.matched,
+            "result": self.result,
+            "response_time_ms": self.response_time_ms,
+            "created_at": datetime.utcfromtimestamp(self.created_at),
+        }
+
+
+async def write_usage_events(session, events: List[UsageEvent]) -> int:
+    """
+    Insert events and apply their counter deltas in one transaction.
+
+    Only rows that were actually inserted (not already present from an
+    earlier, unacknowledged flush) contribute to total_verifications.
+    The conflict target is the partitioned table's (id, created_at) key;
+    created_at is fixed when the event is recorded, so a redelivered
+    event still hits its earlier row.
+
+    Returns:
+        Number of newly inserted rows
+    """
+    if not events:
+        return 0
+
+    inserted = await session.execute(
+        insert(UsageLog)
+        .values([event.to_row() for event in events])
+        .on_conflict_do_nothing(index_elements=["id", "created_at"])
+        .returning(UsageLog.identity_id, UsageLog.action)
+    )
+    deltas = Counter(
+        identity_id for identity_id, action in inserted.all() if action == "verify"
+    )
+
+    if deltas:
+        delta_values = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("delta", Integer),
+            name="deltas",
+        ).data(list(deltas.items()))
+        await session.execute(
+            update(Identity)
+            .where(Identity.id == delta_values.c.id)
+            .values(
+                total_verifications=func.coalesce(Identity.total_verifications, 0) + delta_values.c.delta
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.commit()
+    return sum(deltas.values())
+
+
+class UsageEventPipeline:
+    """In-process ring buffer + Redis stream + batched Postgres flusher"""
+
+    def __init__(
+        self,
+        stream: str = "usage:events",
+        group: str = "usage-flushers",
+        buffer_size: int = 100_000,
+        batch_size: int = 1000,
+        flush_interval_ms: float = 250.0,
+        claim_idle_ms: int = 60_000,
+        max_deliveries: int = 5,
+        dead_letter_stream: Optional[str] = None,
+        session_factory=async_session_maker,
+    ):
+        self.stream = stream
+        self.group = group
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.dead_letter_stream = dead_letter_stream or f"{stream}:dead"
+        self.session_factory = session_factory
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._buffer: Deque[UsageEvent] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._group_ready = False
+
+    # ------------------------------------------------------------------
+    # Producer side (request handlers)
+    # ------------------------------------------------------------------
+
+    def record(self, event: UsageEvent) -> bool:
+        """
+        Enqueue an event without blocking. Returns False if the ring buffer
+        is full (flusher far behind) and the event was dropped.
+        """
+        if len(self._buffer) >= self.buffer_size:
+            USAGE_EVENTS_DROPPED.inc()
+            logger.error("Usage event buffer full, dropping event", identity_id=str(event.identity_id))
+            return False
+
+        self._buffer.append(event)
+        USAGE_EVENTS_BUFFERED.set(len(self._buffer))
+        self._ensure_started()
+        if len(self._buffer) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+        return True
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def start(self) -> None:
+        """Start the background flusher (called from the API lifespan)"""
+        self._ensure_started()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and drain buffered and pending events"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout=timeout)
+        except Exception as e:
+            logger.error(
+                "Usage event drain incomplete at shutdown",
+                error=str(e),
+                buffered=len(self._buffer),
+            )
+
+    async def _drain(self) -> None:
+        while self._buffer:
+            if not await self._ship():
+                break
+        while await self._flush_stream(claim=False):
+            pass
+        # Redis down: last resort is writing straight to Postgres
+        while self._buffer:
+            if not await self._write_direct():
+                break
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                shipped = await self._ship()
+                if not shipped and self._buffer:
+                    await self._write_direct()
+                while await self._flush_stream():
+                    pass
+                await self._update_backlog()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Usage event flush failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Ring buffer -> Redis stream
+    # ------------------------------------------------------------------
+
+    def _take(self) -> List[UsageEvent]:
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            batch.append(self._buffer.popleft())
+        USAGE_EVENTS_BUFFERED.set(len(self._buffer))
+        return batch
+
+    def _put_back(self, batch: List[UsageEvent]) -> None:
+        self._buffer.extendleft(reversed(batch))
+        USAGE_EVENTS_BUFFERED.set(len(self._buffer))
+
+    async def _ship(self) -> bool:
+        """Move buffered events to the stream; False if Redis is unavailable"""
+        redis = cache.bytes_client
+        if redis is None:
+            return False
+
+        while self._buffer:
+            batch = self._take()
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for event in batch:
+                        pipe.xadd(self.stream, {_FIELD: event.encode()})
+                    await pipe.execute()
+            except RedisError as e:
+                self._put_back(batch)
+                logger.warning(f"Usage event stream unavailable: {e}")
+                return False
+        return True
+
+    async def _write_direct(self) -> bool:
+        """Write one buffered batch straight to Postgres (Redis down)"""
+        batch = self._take()
+        if not batch:
+            return True
+        try:
+            await self._write(batch, path="direct")
+            return True
+        except Exception as e:
+            self._put_back(batch)
+            logger.error(f"Usage event direct write failed: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Redis stream -> Postgres
+    # ------------------------------------------------------------------
+
+    async def _ensure_group(self, redis) -> None:
+        if self._group_ready:
+            return
+        try:
+            await redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _read(self, redis, claim: bool) -> List[Tuple[bytes, bytes]]:
+        """Own pending entries first, then stale ones from dead consumers, then new"""
+        for start_id in ("0", ">"):
+            response = await redis.xreadgroup(
+                self.group, self.consumer, {self.stream: start_id}, count=self.batch_size
+            )
+            entries = [
+                (entry_id, fields[_FIELD])
+                for _, stream_entries in response or []
+                for entry_id, fields in stream_entries
+                if fields
+            ]
+            if entries:
+                return entries
+
+            if start_id == "0" and claim:
+                claimed = await redis.xautoclaim(
+                    self.stream, self.group, self.consumer,
+                    min_idle_time=self.claim_idle_ms, start_id="0-0", count=self.batch_size,
+                )
+                entries = [(entry_id, fields[_FIELD]) for entry_id, fields in claimed[1] if fields]
+                if entries:
+                    logger.info("Reclaimed stale usage events", count=len(entries))
+                    return entries
+        return []
+
+    async def _flush_stream(self, claim: bool = True) -> bool:
+        """Flush one batch from the stream; True if a batch was written"""
+        redis = cache.bytes_client
+        if redis is None:
+            return False
+
+        try:
+            await self._ensure_group(redis)
+            entries = await self._read(redis, claim)
+        except RedisError as e:
+            logger.warning(f"Usage event stream read failed: {e}")
+            return False
+        if not entries:
+            return False
+
+        try:
+            events = [UsageEvent.decode(payload) for _, payload in entries]
+            await self._write(events, path="stream")
+        except Exception as e:
+            if _is_outage(e) or await self._deliveries(redis, entries) < self.max_deliveries:
+                raise  # Left pending; read again on the next pass
+            await self._write_one_by_one(redis, entries, e)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.xack(self.stream, self.group, *entry_ids)
+                pipe.xdel(self.stream, *entry_ids)
+                await pipe.execute()
+        except RedisError as e:
+            # Committed but not acked: redelivery is a no-op thanks to ON CONFLICT
+            logger.warning(f"Usage event ack failed: {e}")
+        return True
+
+    async def _deliveries(self, redis, entries: List[Tuple[bytes, bytes]]) -> int:
+        """Highest delivery count among the batch's pending entries (XPENDING)"""
+        try:
+            pending = await redis.xpending_range(
+                self.stream, self.group,
+                min=entries[0][0], max=entries[-1][0], count=len(entries),
+                consumername=self.consumer,
+            )
+        except RedisError as e:
+            logger.warning(f"Usage event delivery count unavailable: {e}")
+            return 0
+        return max((item["times_delivered"] for item in pending), default=0)
+
+    async def _write_one_by_one(self, redis, entries: List[Tuple[bytes, bytes]], batch_error: Exception) -> None:
+        """
+        Write a repeatedly failing batch row by row and move the rows that
+        still fail to the dead-letter stream, so the batch can be acked.
+        Raises (leaving the batch pending) if the database goes away.
+        """
+        logger.error(
+            "Usage event batch keeps failing, isolating bad rows",
+            count=len(entries),
+            error=str(batch_error)[:200],
+        )
+        dead: List[Tuple[bytes, bytes, str]] = []
+        for entry_id, payload in entries:
+            try:
+                await self._write([UsageEvent.decode(payload)], path="stream")
+            except Exception as e:
+                if _is_outage(e):
+                    raise
+                dead.append((entry_id, payload, f"{type(e).__name__}: {e}"[:500]))
+
+        if not dead:
+            return
+        # Must land before the originals are acked and deleted
+        async with redis.pipeline(transaction=False) as pipe:
+            for entry_id, payload, error in dead:
+                pipe.xadd(self.dead_letter_stream, {_FIELD: payload, b"id": entry_id, b"error": error})
+            await pipe.execute()
+        USAGE_EVENTS_DEAD_LETTERED.inc(len(dead))
+        logger.error(
+            "Usage events moved to dead-letter stream",
+            count=len(dead),
+            stream=self.dead_letter_stream,
+            error=dead[0][2],
+        )
+
+    async def _write(self, events: List[UsageEvent], path: str) -> None:
+        started = time.perf_counter()
+        async with self.session_factory() as session:
+            inserted = await write_usage_events(session, events)
+
+        now = time.time()
+        USAGE_EVENT_FLUSH_DURATION.observe(time.perf_counter() - started)
+        USAGE_EVENTS_FLUSHED.labels(path=path).inc(len(events))
+        for event in events:
+            USAGE_EVENT_LAG.observe(max(0.0, now - event.created_at))
+        logger.debug("Usage events flushed", count=len(events), inserted=inserted, path=path)
+
+    async def _update_backlog(self) -> None:
+        redis = cache.bytes_client
+        if redis is None:
+            return
+        try:
+            USAGE_EVENTS_STREAM_BACKLOG.set(await redis.xlen(self.stream))
+        except RedisError:
+            pass
+
+
+usage_events = UsageEventPipeline(
+    stream=settings.USAGE_EVENTS_STREAM,
+    buffer_size=settings.USAGE_EVENTS_BUFFER_SIZE,
+    batch_size=settings.USAGE_EVENTS_BATCH_SIZE,
+    flush_interval_ms=settings.USAGE_EVENTS_FLUSH_INTERVAL_MS,
+    claim_idle_ms=settings.USAGE_EVENTS_CLAIM_IDLE_MS,
+    max_deliveries=settings.USAGE_EVENTS_MAX_DELIVERIES,
+    dead_letter_stream=settings.USAGE_EVENTS_DEAD_LETTER_STREAM,
+)
@@ -0,0 +1,125 @@
+"""
+Benchmark: FaceAnalysis module sets
+
+Loads buffalo_l with different module sets, each in a fresh process so the
+memory figures don't overlap, and reports:
+
+- load_s:         FaceAnalysis construction + prepare()
+- model_rss_mb:   resident memory added by loading the models
+- per_face_ms:    median FaceAnalysis.get time divided by faces found
+
+Configurations: "all" (every model in the pack), "detection,recognition"
+(the API default: verify and register) and "detection" (detection only).
+
+Usage:
+    python scripts/benchmark_face_modules.py group.jpg --repeat 20
+    python scripts/benchmark_face_modules.py --threads 1 --output modules.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import time
+from pathlib import Path
+
+CONFIGURATIONS = ["all", "detection,recognition", "detection"]
+
+
+def _rss_mb():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _load_images(paths):
+    import cv2
+
+    if paths:
+        return [(path, cv2.imread(path)) for path in paths]
+
+    # Group photo bundled with insightface (several faces)
+    from insightface.data import get_image
+
+    return [("insightface:t1", get_image("t1"))]
+
+
+def _measure(spec, paths, repeat, threads):
+    import insightface  # noqa: F401  (import cost is not model cost)
+    import onnxruntime  # noqa: F401
+
+    from insightface.app import FaceAnalysis
+
+    images = _load_images(paths)
+    modules = None if spec == "all" else spec.split(",")
+
+    kwargs = {}
+    if threads:
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.intra_op_num_threads = threads
+        kwargs["sess_options"] = sess_options
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    face_app = FaceAnalysis(
+        name="buffalo_l", providers=["CPUExecutionProvider"], allowed_modules=modules, **kwargs
+    )
+    face_app.prepare(ctx_id=0, det_size=(640, 640), det_thresh=0.3)
+    load_s = time.perf_counter() - started
+    rss_after = _rss_mb()
+
+    per_face = []
+    faces_found = 0
+    for _, image in images:
+        faces = face_app.get(image)  # warm-up
+        faces_found += len(faces)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            face_app.get(image)
+            samples.append(time.perf_counter() - started)
+        if faces:
+            per_face.append(statistics.median(samples) / len(faces))
+
+    return {
+        "modules": spec,
+        "loaded": sorted(face_app.models),
+        "load_s": round(load_s, 2),
+        "model_rss_mb": round(rss_after - rss_before, 1),
+        "faces": faces_found,
+        "per_face_ms": round(statistics.mean(per_face) * 1000, 2) if per_face else None,
+    }
+
+
+def main(args):
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for spec in args.modules or CONFIGURATIONS:
+            results.append(pool.apply(_measure, (spec, args.images, args.repeat, args.threads)))
+
+    baseline = next((r for r in results if r["modules"] == "all"), None)
+    for row in results:
+        saved = ""
+        if baseline and row is not baseline and row["per_face_ms"] and baseline["per_face_ms"]:
+            saved = (
+                f"  rss -{baseline['model_rss_mb'] - row['model_rss_mb']:.0f}MB"
+                f"  x{baseline['per_face_ms'] / row['per_face_ms']:.2f} per face"
+            )
+        print(
+            f"{row['modules']:<24} load={row['load_s']:>6}s  rss={row['model_rss_mb']:>7}MB  "
+            f"per_face={row['per_face_ms']}ms  faces={row['faces']}{saved}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="Image files (default: insightface sample group photo)")
+    parser.add_argument("--modules", action="append", help="Module set to measure (repeatable)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads (0 = default)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""
+Benchmark: full-resolution vs. reduced-resolution JPEG decode
+
+For each image (or synthetic JPEGs at common camera resolutions when no
+paths are given), measures cv2.imdecode(IMREAD_COLOR) against
+app.services.image_decode.decode_image and reports the decode time saved.
+
+Usage:
+    python scripts/benchmark_image_decode.py photo1.jpg photo2.jpg --repeat 20
+    python scripts/benchmark_image_decode.py --min-long-side 1280 --output decode.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.image_decode import decode_image
+
+SYNTHETIC_SIZES = [(1920, 1080), (4032, 3024), (6000, 4000)]  # 2 MP, 12 MP, 24 MP
+
+
+def _synthetic(width, height):
+    rng = np.random.default_rng(0)
+    # Smooth gradients + noise compress like photos, unlike pure noise
+    base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    image = (base + rng.normal(0, 12, (height, width, 3))).clip(0, 255).astype(np.uint8)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return f"synthetic_{width}x{height}.jpg", encoded.tobytes()
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(args):
+    if args.images:
+        inputs = [(path, Path(path).read_bytes()) for path in args.images]
+    else:
+        inputs = [_synthetic(w, h) for w, h in SYNTHETIC_SIZES]
+
+    results = []
+    for name, data in inputs:
+        buffer = np.frombuffer(data, np.uint8)
+        full = _time(lambda: cv2.imdecode(buffer, cv2.IMREAD_COLOR), args.repeat)
+        reduced = _time(lambda: decode_image(data, min_long_side=args.min_long_side), args.repeat)
+        decoded = decode_image(data, min_long_side=args.min_long_side)
+
+        results.append({
+            "image": name,
+            "bytes": len(data),
+            "original_size": decoded.original_size,
+            "decoded_shape": list(decoded.image.shape[:2][::-1]),
+            "reduction": decoded.reduction,
+            "full_ms": round(full * 1000, 2),
+            "reduced_ms": round(reduced * 1000, 2),
+            "saved_ms": round((full - reduced) * 1000, 2),
+            "speedup": round(full / reduced, 2) if reduced else None,
+        })
+
+    for row in results:
+        print(
+            f"{row['image']:<32} 1/{row['reduction']}  full={row['full_ms']:>8}ms  "
+            f"reduced={row['reduced_ms']:>8}ms  saved={row['saved_ms']:>8}ms  x{row['speedup']}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="Image files (default: synthetic JPEGs)")
+    parser.add_argument("--min-long-side", type=int, default=1280)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    main(parser.parse_args())
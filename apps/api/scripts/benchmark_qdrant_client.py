@@ -0,0 +1,158 @@
+"""
+Benchmark: shared AsyncQdrantClient vs. sync QdrantClient in run_in_executor
+
+Seeds a scratch collection with random embeddings, then measures per-search
+latency (p50/p95/p99) and throughput for:
+
+  executor  - sync QdrantClient (REST) on the default thread pool (previous API path)
+  per_call  - new sync QdrantClient per search (previous worker path)
+  async     - shared AsyncQdrantClient over REST
+  async_grpc- shared AsyncQdrantClient over gRPC (app.core.qdrant default)
+
+Usage:
+    python scripts/benchmark_qdrant_client.py --host localhost --searches 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.core.qdrant import QdrantClientConfig, QdrantClientFactory
+
+DIM = 512
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _summary(name, latencies, wall):
+    return {
+        "mode": name,
+        "searches": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "searches_per_s": round(len(latencies) / wall, 1),
+    }
+
+
+async def _run(name, search, queries, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query):
+        async with semaphore:
+            started = time.perf_counter()
+            await search(query)
+            latencies.append(time.perf_counter() - started)
+
+    # Warm up connections
+    await asyncio.gather(*[one(q) for q in queries[: min(concurrency, len(queries))]])
+    latencies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(q) for q in queries])
+    return _summary(name, latencies, time.perf_counter() - started)
+
+
+async def main(args):
+    rng = np.random.default_rng(0)
+    collection = f"bench_{uuid.uuid4().hex[:8]}"
+
+    sync_client = QdrantClient(host=args.host, port=args.port, api_key=args.api_key)
+    sync_client.create_collection(
+        collection_name=collection,
+        vectors_config=VectorParams(size=DIM, distance=Distance.COSINE),
+    )
+
+    try:
+        vectors = rng.standard_normal((args.points, DIM)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for start in range(0, args.points, 1000):
+            sync_client.upsert(
+                collection_name=collection,
+                points=[
+                    PointStruct(id=i, vector=vectors[i].tolist(), payload={"identity_id": str(i)})
+                    for i in range(start, min(start + 1000, args.points))
+                ],
+            )
+
+        queries = [v.tolist() for v in vectors[rng.integers(0, args.points, args.searches)]]
+        search_kwargs = {"collection_name": collection, "limit": 1, "score_threshold": 0.5}
+        results = []
+
+        loop = asyncio.get_running_loop()
+
+        async def executor_search(query):
+            await loop.run_in_executor(None, partial(sync_client.search, query_vector=query, **search_kwargs))
+
+        results.append(await _run("executor", executor_search, queries, args.concurrency))
+
+        def per_call(query):
+            QdrantClient(host=args.host, port=args.port, api_key=args.api_key).search(
+                query_vector=query, **search_kwargs
+            )
+
+        async def per_call_search(query):
+            await loop.run_in_executor(None, per_call, query)
+
+        results.append(
+            await _run("per_call", per_call_search, queries[: max(1, args.searches // 10)], args.concurrency)
+        )
+
+        for name, prefer_grpc in (("async", False), ("async_grpc", True)):
+            factory = QdrantClientFactory(
+                QdrantClientConfig(
+                    host=args.host,
+                    port=args.port,
+                    grpc_port=args.grpc_port,
+                    api_key=args.api_key,
+                    prefer_grpc=prefer_grpc,
+                )
+            )
+
+            async def async_search(query, client=factory.client):
+                await client.search(query_vector=query, **search_kwargs)
+
+            results.append(await _run(name, async_search, queries, args.concurrency))
+            await factory.close()
+    finally:
+        sync_client.delete_collection(collection)
+
+    for row in results:
+        print(
+            f"{row['mode']:<11} p50={row['p50_ms']:>8}ms  p95={row['p95_ms']:>8}ms  "
+            f"p99={row['p99_ms']:>8}ms  {row['searches_per_s']:>8} searches/s"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--points", type=int, default=10000, help="Embeddings to seed")
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
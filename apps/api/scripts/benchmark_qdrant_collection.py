@@ -0,0 +1,216 @@
+"""
+Benchmark: recall and latency of face collection schemas
+
+Seeds one scratch collection with synthetic 512-d embeddings, then for each
+quantization mode applies the schema in place with apply_collection_schema
+(the same path the API uses at startup), waits for Qdrant to re-optimize,
+and measures for each search ef:
+
+  recall@k   - overlap with exact (brute-force float32) top-k
+  top1       - fraction of queries whose exact nearest neighbour is ranked first
+  p50/p99    - per-search latency
+  ram_est_mb - estimated resident vector + graph memory for the schema
+
+Embeddings are generated deterministically in chunks, so exact ground truth
+at 1M/10M vectors is computed by streaming the same chunks through numpy
+instead of holding the whole gallery in memory. Queries are noisy copies of
+gallery vectors (a new photo of a registered face).
+
+Usage:
+    python scripts/benchmark_qdrant_collection.py --vectors 1000000 --quantization none int8 binary
+    python scripts/benchmark_qdrant_collection.py --vectors 10000000 --on-disk --ef 64 128 256 --keep
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qdrant_client.models import Batch, CollectionStatus
+
+from app.core.qdrant import QdrantClientConfig, QdrantClientFactory
+from app.core.qdrant_schema import CollectionSchema, apply_collection_schema
+
+DIM = 512
+CHUNK = 10000
+
+
+def _chunk(index):
+    """Deterministic normalized embeddings for gallery rows [index*CHUNK, (index+1)*CHUNK)"""
+    rng = np.random.default_rng(index)
+    vectors = rng.standard_normal((CHUNK, DIM), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def _gallery(n):
+    for index in range((n + CHUNK - 1) // CHUNK):
+        vectors = _chunk(index)
+        start = index * CHUNK
+        yield start, vectors[: min(CHUNK, n - start)]
+
+
+def _queries(n, count, noise):
+    rng = np.random.default_rng(10**6)
+    rows = rng.integers(0, n, count)
+    base = np.stack([_chunk(row // CHUNK)[row % CHUNK] for row in rows])
+    queries = base + rng.standard_normal(base.shape, dtype=np.float32) * noise / np.sqrt(DIM)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def _exact_topk(queries, n, k):
+    """Streaming brute-force top-k over the deterministic gallery"""
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+    for start, vectors in _gallery(n):
+        scores = queries @ vectors.T
+        ids = np.broadcast_to(np.arange(start, start + len(vectors)), scores.shape)
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+    order = np.argsort(-best_scores, axis=1)
+    return np.take_along_axis(best_ids, order, axis=1)
+
+
+def _ram_estimate_mb(schema, n):
+    vector_bytes = {"none": DIM * 4, "int8": DIM, "binary": DIM // 8}[schema.quantization]
+    resident = n * vector_bytes
+    if schema.quantization != "none" and not schema.on_disk:
+        resident += n * DIM * 4  # Originals stay in RAM too
+    if not schema.hnsw_on_disk:
+        resident += n * schema.hnsw_m * 2 * 4  # Layer-0 links dominate the graph
+    return round(resident / 2**20, 1)
+
+
+async def _wait_optimized(client, name, timeout):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        info = await client.get_collection(name)
+        if info.status == CollectionStatus.GREEN:
+            return round(time.perf_counter() - started, 1)
+        await asyncio.sleep(2)
+    raise TimeoutError(f"{name} still optimizing after {timeout}s")
+
+
+async def _seed(client, name, n):
+    info = await client.get_collection(name)
+    if info.points_count == n:
+        print(f"{name}: reusing {n} points")
+        return
+    started = time.perf_counter()
+    for start, vectors in _gallery(n):
+        for offset in range(0, len(vectors), 1000):
+            block = vectors[offset : offset + 1000]
+            ids = list(range(start + offset, start + offset + len(block)))
+            await client.upsert(
+                collection_name=name,
+                points=Batch(
+                    ids=ids,
+                    vectors=block.tolist(),
+                    payloads=[{"identity_id": str(i)} for i in ids],
+                ),
+            )
+    print(f"{name}: uploaded {n} points in {time.perf_counter() - started:.0f}s")
+
+
+async def main(args):
+    factory = QdrantClientFactory(
+        QdrantClientConfig(host=args.host, port=args.port, grpc_port=args.grpc_port, api_key=args.api_key, timeout=120)
+    )
+    client = factory.client
+    name = f"bench_faces_{args.vectors}"
+
+    queries = _queries(args.vectors, args.queries, args.noise)
+    started = time.perf_counter()
+    exact = _exact_topk(queries, args.vectors, args.k)
+    print(f"exact top-{args.k} for {args.queries} queries in {time.perf_counter() - started:.1f}s")
+
+    results = []
+    try:
+        for mode in args.quantization:
+            schema = CollectionSchema(
+                name=name,
+                vector_size=DIM,
+                quantization=mode,
+                on_disk=args.on_disk,
+                hnsw_m=args.m,
+                hnsw_ef_construct=args.ef_construct,
+                oversampling=args.oversampling,
+            )
+            changes = await apply_collection_schema(client, schema)
+            await _seed(client, name, args.vectors)
+            optimize_s = await _wait_optimized(client, name, args.optimize_timeout)
+
+            for ef in args.ef:
+                schema.search_ef = ef
+                params = schema.search_params()
+                latencies, found = [], []
+                for query in queries:
+                    t0 = time.perf_counter()
+                    hits = await client.search(
+                        collection_name=name, query_vector=query.tolist(), limit=args.k, search_params=params
+                    )
+                    latencies.append(time.perf_counter() - t0)
+                    found.append([hit.id for hit in hits])
+
+                recall = statistics.mean(len(set(f) & set(e)) / args.k for f, e in zip(found, exact.tolist()))
+                top1 = statistics.mean(bool(f) and f[0] == e[0] for f, e in zip(found, exact.tolist()))
+                latencies.sort()
+                results.append({
+                    "vectors": args.vectors,
+                    "quantization": mode,
+                    "on_disk": args.on_disk,
+                    "m": args.m,
+                    "ef": ef,
+                    "oversampling": args.oversampling,
+                    "schema_changes": changes,
+                    "optimize_s": optimize_s,
+                    f"recall@{args.k}": round(recall, 4),
+                    "top1": round(top1, 4),
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+                    "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+                    "ram_est_mb": _ram_estimate_mb(schema, args.vectors),
+                })
+                row = results[-1]
+                print(
+                    f"{mode:<7} ef={ef:<4} recall@{args.k}={row[f'recall@{args.k}']:<7} top1={row['top1']:<7} "
+                    f"p50={row['p50_ms']:>7}ms  p99={row['p99_ms']:>7}ms  ram~{row['ram_est_mb']}MB"
+                )
+    finally:
+        if not args.keep:
+            await client.delete_collection(name)
+        await factory.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6333)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--noise", type=float, default=0.5, help="Query noise relative to a unit vector")
+    parser.add_argument("--quantization", nargs="+", default=["none", "int8", "binary"])
+    parser.add_argument("--ef", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--on-disk", action="store_true", help="Keep original vectors on disk")
+    parser.add_argument("--optimize-timeout", type=int, default=7200)
+    parser.add_argument("--keep", action="store_true", help="Keep the collection to reuse across runs")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -42,7 +42,11 @@ async def main():
         from insightface.app import FaceAnalysis
 
         print("Initializing InsightFace...")
-        face_app = FaceAnalysis(name="buffalo_l", providers=["CPUExecutionProvider"])
+        face_app = FaceAnalysis(
+            name="buffalo_l",
+            providers=["CPUExecutionProvider"],
+            allowed_modules=["detection", "recognition"],
+        )
         face_app.prepare(ctx_id=0, det_size=(640, 640), det_thresh=0.3)
 
         # Decode image
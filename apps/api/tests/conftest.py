@@ -40,6 +40,16 @@ TestSessionLocal = async_sessionmaker(
 )
 
 
+@pytest.fixture(autouse=True)
+def local_index_path(tmp_path, monkeypatch):
+    """Keep the local embedding index out of the source tree"""
+    from app.core.config import settings
+    from app.services import local_index
+
+    monkeypatch.setattr(settings, "FACE_LOCAL_INDEX_PATH", str(tmp_path / "face_index"))
+    monkeypatch.setattr(local_index, "_local_index", None)
+
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator:
     """Create event loop for async tests"""
@@ -0,0 +1,167 @@
+"""
+Unit Tests for the Face Detection Cache
+Tests binary encoding, LRU byte budget and cache use in FaceRecognitionService
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.services.embedding_cache import (
+    EmbeddingCache,
+    decode_detections,
+    detection_fingerprint,
+    encode_detections,
+    image_digest,
+)
+from app.services.image_decode import DecodedImage
+
+
+def _face(with_landmarks: bool = False) -> dict:
+    embedding = np.random.rand(512).astype(np.float32)
+    return {
+        "bbox": [10.5, 20.25, 110.0, 140.75],
+        "embedding": embedding / np.linalg.norm(embedding),
+        "det_score": 0.875,
+        "landmarks": np.random.rand(106, 2).tolist() if with_landmarks else None,
+    }
+
+
+class TestDetectionEncoding:
+    """Test the compact binary detection format"""
+
+    @pytest.mark.unit
+    def test_roundtrip(self):
+        """Test detections survive encode/decode unchanged"""
+        faces = [_face(), _face(with_landmarks=True)]
+
+        decoded = decode_detections(encode_detections(faces))
+
+        assert len(decoded) == 2
+        for original, restored in zip(faces, decoded):
+            assert restored["bbox"] == original["bbox"]
+            assert restored["det_score"] == original["det_score"]
+            np.testing.assert_array_equal(restored["embedding"], original["embedding"])
+        assert decoded[0]["landmarks"] is None
+        np.testing.assert_allclose(decoded[1]["landmarks"], faces[1]["landmarks"], rtol=1e-6)
+
+    @pytest.mark.unit
+    def test_empty_detections(self):
+        """Test images with no faces are cacheable"""
+        assert decode_detections(encode_detections([])) == []
+
+    @pytest.mark.unit
+    def test_compact_size(self):
+        """Test one face costs roughly its float32 embedding, not JSON text"""
+        assert len(encode_detections([_face()])) < 512 * 4 + 64
+
+    @pytest.mark.unit
+    def test_rejects_unknown_format(self):
+        """Test malformed payloads raise instead of returning garbage"""
+        with pytest.raises(ValueError):
+            decode_detections(b"XX\x01\x00\x00\x00\x00")
+
+
+class TestEmbeddingCache:
+    """Test two-tier cache behaviour"""
+
+    @pytest.mark.unit
+    async def test_memory_hit_skips_redis(self):
+        """Test a memory hit does not touch Redis"""
+        cache = EmbeddingCache(max_memory_bytes=1024 * 1024, ttl=60, enabled=True)
+        with patch("app.services.embedding_cache.cache") as redis_cache:
+            redis_cache.set_bytes = AsyncMock(return_value=True)
+            redis_cache.get_bytes = AsyncMock(return_value=None)
+
+            await cache.set("abc", [_face()])
+            result = await cache.get("abc")
+
+            assert len(result) == 1
+            redis_cache.get_bytes.assert_not_called()
+            redis_cache.set_bytes.assert_awaited_once()
+            assert redis_cache.set_bytes.call_args.kwargs["ttl"] == 60
+
+    @pytest.mark.unit
+    async def test_redis_hit_populates_memory(self):
+        """Test a Redis hit is promoted into the in-process tier"""
+        cache = EmbeddingCache(max_memory_bytes=1024 * 1024, ttl=60, enabled=True)
+        payload = encode_detections([_face()])
+        with patch("app.services.embedding_cache.cache") as redis_cache:
+            redis_cache.get_bytes = AsyncMock(return_value=payload)
+
+            assert len(await cache.get("abc")) == 1
+            assert len(await cache.get("abc")) == 1
+            redis_cache.get_bytes.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_byte_budget_evicts_oldest(self):
+        """Test the LRU stays within its byte budget"""
+        entry_size = len(encode_detections([_face()]))
+        cache = EmbeddingCache(max_memory_bytes=entry_size * 2, ttl=60, enabled=True)
+        with patch("app.services.embedding_cache.cache") as redis_cache:
+            redis_cache.set_bytes = AsyncMock(return_value=True)
+            redis_cache.get_bytes = AsyncMock(return_value=None)
+
+            for key in ("a", "b", "c"):
+                await cache.set(key, [_face()])
+
+            assert cache._memory.current_bytes <= entry_size * 2
+            assert await cache.get("a") is None
+            assert await cache.get("c") is not None
+
+
+    @pytest.mark.unit
+    async def test_config_change_misses(self):
+        """Test detections cached under one decode/model config are not served under another"""
+        cache = EmbeddingCache(max_memory_bytes=1024 * 1024, ttl=60, enabled=True)
+        with patch("app.services.embedding_cache.cache") as redis_cache:
+            redis_cache.set_bytes = AsyncMock(return_value=True)
+            redis_cache.get_bytes = AsyncMock(return_value=None)
+
+            await cache.set("abc", [_face()])
+            first_key = redis_cache.set_bytes.call_args.args[0]
+            assert await cache.get("abc") is not None
+
+            with patch.object(settings, "FACE_DECODE_MIN_LONG_SIDE", settings.FACE_DECODE_MIN_LONG_SIDE + 1):
+                assert await cache.get("abc") is None
+                assert redis_cache.get_bytes.call_args.args[0] != first_key
+
+            with patch.object(settings, "FACE_ANALYSIS_MODULES", "all"):
+                assert await cache.get("abc") is None
+
+
+class TestFaceRecognitionServiceCaching:
+    """Test repeated images skip decode and inference"""
+
+    @pytest.mark.unit
+    async def test_repeated_image_runs_inference_once(self):
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        face = MagicMock()
+        face.bbox = np.array([0, 0, 50, 60], dtype=np.float32)
+        face.embedding = np.random.rand(512).astype(np.float32)
+        face.det_score = 0.9
+        face.landmark_2d_106 = None
+        service._face_app = MagicMock()
+        service._face_app.get.return_value = [face]
+
+        test_cache = EmbeddingCache(max_memory_bytes=1024 * 1024, ttl=60, enabled=True)
+        image_bytes = b"same-image-bytes"
+        with patch("app.services.face_recognition.embedding_cache", test_cache), \
+             patch("app.services.embedding_cache.cache") as redis_cache, \
+             patch.object(service, "_decode_image", return_value=DecodedImage(np.zeros((64, 64, 3), np.uint8))) as decode:
+            redis_cache.set_bytes = AsyncMock(return_value=True)
+            redis_cache.get_bytes = AsyncMock(return_value=None)
+
+            first = await service.extract_embedding(image_bytes)
+            second = await service.extract_embedding(image_bytes)
+            faces = await service._detect_faces(image_bytes)
+
+        assert service._face_app.get.call_count == 1
+        assert decode.call_count == 1
+        np.testing.assert_array_equal(first, second)
+        assert len(faces) == 1
+        assert f"{detection_fingerprint()}:{image_digest(image_bytes)}" in test_cache._memory._entries
@@ -5,8 +5,11 @@ Tests embedding extraction, face matching, and liveness detection logic
 
 import pytest
 import numpy as np
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from app.services.image_decode import DecodedImage
+
 
 class TestEmbeddingOperations:
     """Test embedding-related operations"""
@@ -281,3 +284,103 @@ class TestBoundingBox:
 
         assert center_x == 200
         assert center_y == 150
+
+
+class TestBatchedMatching:
+    """Test batched registry lookup for multi-face images"""
+
+    @pytest.fixture
+    def face_service(self):
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._qdrant = MagicMock()
+        service._initialized = True
+        return service
+
+    @pytest.mark.unit
+    async def test_find_matches_single_batched_search(self, face_service):
+        """Test all faces are searched with one Qdrant call, aligned to input order"""
+        identity_id = str(uuid4())
+        hit = MagicMock(payload={"identity_id": identity_id}, score=0.91)
+        face_service._qdrant.search_batch = AsyncMock(return_value=[[hit], [], [hit]])
+
+        embeddings = [np.random.rand(512) for _ in range(3)]
+        matches = await face_service.find_matches(embeddings, threshold=0.7)
+
+        face_service._qdrant.search_batch.assert_awaited_once()
+        requests = face_service._qdrant.search_batch.call_args.kwargs["requests"]
+        assert len(requests) == 3
+        assert all(r.limit == 1 and r.score_threshold == 0.7 for r in requests)
+        assert matches == [
+            {"identity_id": identity_id, "score": 0.91},
+            None,
+            {"identity_id": identity_id, "score": 0.91},
+        ]
+
+    @pytest.mark.unit
+    async def test_find_matches_empty(self, face_service):
+        """Test no search is issued when there are no faces"""
+        assert await face_service.find_matches([]) == []
+        face_service._qdrant.search_batch.assert_not_called()
+
+
+class TestSingleAnalysis:
+    """Test one decode + inference pass feeds every downstream check"""
+
+    @pytest.fixture
+    def face_service(self):
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        face = MagicMock()
+        face.bbox = np.array([0, 0, 120, 140], dtype=np.float32)
+        face.embedding = np.random.rand(512).astype(np.float32)
+        face.det_score = 0.9
+        face.landmark_2d_106 = None
+        service._face_app = MagicMock()
+        service._face_app.get.return_value = [face]
+        service._decode_image = MagicMock(return_value=DecodedImage(np.zeros((200, 200, 3), np.uint8)))
+        return service
+
+    @pytest.mark.unit
+    async def test_memo_reuses_analysis(self, face_service):
+        """Test the same image in one request is analyzed once"""
+        with patch("app.services.face_recognition.embedding_cache") as detection_cache:
+            detection_cache.get = AsyncMock(return_value=None)
+            detection_cache.set = AsyncMock()
+
+            memo = {}
+            first = await face_service.analyze(b"selfie", memo=memo)
+            second = await face_service.analyze(b"selfie", memo=memo)
+
+        assert first is second
+        assert face_service._face_app.get.call_count == 1
+        assert len(memo) == 1
+
+    @pytest.mark.unit
+    async def test_analysis_feeds_liveness_embedding_and_quality(self, face_service):
+        """Test liveness, embedding and quality read the same analysis"""
+        with patch("app.services.face_recognition.embedding_cache") as detection_cache:
+            detection_cache.get = AsyncMock(return_value=None)
+            detection_cache.set = AsyncMock()
+
+            analysis = await face_service.analyze(b"face")
+
+        assert face_service.assess_liveness(analysis) is True
+        assert analysis.embedding.shape == (512,)
+        assert abs(np.linalg.norm(analysis.embedding) - 1.0) < 1e-5
+        assert analysis.quality_score == 94.0
+        assert face_service._face_app.get.call_count == 1
+
+    @pytest.mark.unit
+    def test_undecodable_image_fails_liveness(self):
+        """Test an undecodable image yields no embedding and fails liveness"""
+        from app.services.face_recognition import FaceAnalysisResult, FaceRecognitionService
+
+        analysis = FaceAnalysisResult(decoded=False)
+
+        assert analysis.embedding is None
+        assert analysis.quality_score == 0.0
+        assert FaceRecognitionService().assess_liveness(analysis) is False
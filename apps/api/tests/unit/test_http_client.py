@@ -0,0 +1,123 @@
+"""
+Unit Tests for the Shared HTTP Client
+Tests client reuse and size-capped streamed downloads
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.http_client import DownloadTooLarge, SharedHttpClient
+
+
+def _client(handler, **kwargs) -> SharedHttpClient:
+    shared = SharedHttpClient(**kwargs)
+    shared._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    shared._loop = asyncio.get_running_loop()
+    return shared
+
+
+def _chunks(payload: bytes, size: int = 4):
+    async def stream():
+        for i in range(0, len(payload), size):
+            yield payload[i:i + size]
+    return stream()
+
+
+class TestSharedHttpClient:
+    """Test the pooled image-fetch client"""
+
+    @pytest.mark.unit
+    async def test_client_created_once_per_loop(self):
+        """Test repeated calls on the same loop share one pooled client"""
+        shared = SharedHttpClient()
+        first = shared.get()
+        assert shared.get() is first
+        assert first.follow_redirects is False
+        await shared.close()
+
+    @pytest.mark.unit
+    async def test_replaced_client_is_closed(self):
+        """Test a client left on a finished event loop is closed, not just dropped"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        shared = SharedHttpClient()
+        old_client = MagicMock()
+        old_client.aclose = AsyncMock()
+        old_loop = MagicMock()
+        old_loop.is_running.return_value = False
+        shared._client, shared._loop = old_client, old_loop
+
+        assert shared.get() is not old_client
+        await asyncio.sleep(0)
+
+        old_client.aclose.assert_awaited_once()
+        await shared.close()
+
+    @pytest.mark.unit
+    async def test_fetch_returns_body(self):
+        """Test a body within the limit is returned whole"""
+        payload = bytes(range(50))
+        shared = _client(lambda request: httpx.Response(200, content=payload))
+
+        body = await shared.fetch_bytes("https://cdn.actorhub.ai/a.jpg", max_bytes=100)
+
+        assert bytes(body) == payload
+
+    @pytest.mark.unit
+    async def test_rejects_declared_length_before_reading(self):
+        """Test an oversized Content-Length aborts without reading the body"""
+        read = []
+
+        async def stream():
+            read.append(True)
+            yield b"x" * 200
+
+        shared = _client(lambda request: httpx.Response(200, headers={"Content-Length": "200"}, content=stream()))
+
+        with pytest.raises(DownloadTooLarge) as exc:
+            await shared.fetch_bytes("https://cdn.actorhub.ai/a.jpg", max_bytes=100)
+
+        assert exc.value.size == 200
+        assert read == []
+
+    @pytest.mark.unit
+    async def test_rejects_undeclared_body_while_streaming(self):
+        """Test a chunked body is cut off once it passes the limit"""
+        shared = _client(lambda request: httpx.Response(200, content=_chunks(b"x" * 200, size=16)))
+
+        with pytest.raises(DownloadTooLarge):
+            await shared.fetch_bytes("https://cdn.actorhub.ai/a.jpg", max_bytes=100)
+
+    @pytest.mark.unit
+    async def test_body_longer_than_declared_is_protocol_error(self):
+        """Test a body overrunning its Content-Length is not reported as a size-limit violation"""
+        shared = _client(lambda request: httpx.Response(
+            200, headers={"Content-Length": "10"}, content=_chunks(b"x" * 20, size=8)
+        ))
+
+        with pytest.raises(httpx.RemoteProtocolError):
+            await shared.fetch_bytes("https://cdn.actorhub.ai/a.jpg", max_bytes=100)
+
+    @pytest.mark.unit
+    async def test_http_error_status_raises(self):
+        """Test non-2xx responses surface as httpx errors"""
+        shared = _client(lambda request: httpx.Response(404))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await shared.fetch_bytes("https://cdn.actorhub.ai/a.jpg", max_bytes=100)
+
+
+class TestDetectFacesUrl:
+    """Test URL verification uses the shared client"""
+
+    @pytest.mark.unit
+    async def test_oversized_image_returns_no_faces(self, monkeypatch):
+        from app.services import face_recognition
+
+        service = face_recognition.FaceRecognitionService()
+        shared = _client(lambda request: httpx.Response(200, headers={"Content-Length": str(10 ** 9)}))
+        monkeypatch.setattr(face_recognition, "get_http_client", lambda: shared)
+
+        assert await service.detect_faces_url("https://cdn.actorhub.ai/huge.jpg") == []
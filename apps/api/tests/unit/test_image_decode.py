@@ -0,0 +1,97 @@
+"""
+Unit Tests for Adaptive Image Decode
+Tests reduction choice, coordinate mapping and fallbacks
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.image_decode import (
+    choose_crop_reduction,
+    choose_reduction,
+    decode_image,
+    scale_detections,
+)
+
+
+def _encode(ext: str, width: int, height: int) -> bytes:
+    image = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(ext, image)
+    assert ok
+    return encoded.tobytes()
+
+
+class TestChooseReduction:
+    """Test picking the JPEG DCT scaling factor"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "size,expected",
+        [((6000, 4000), 4), ((3000, 2000), 2), ((1280, 720), 1), ((11000, 400), 8)],
+    )
+    def test_keeps_long_side_above_floor(self, size, expected):
+        assert choose_reduction(*size, min_long_side=1280) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("face_side,expected", [(1000, 8), (300, 2), (200, 1), (60, 1)])
+    def test_crop_reduction_keeps_face_above_crop(self, face_side, expected):
+        assert choose_crop_reduction(face_side, crop_side=112) == expected
+
+
+class TestDecodeImage:
+    """Test reduced-resolution decoding"""
+
+    @pytest.mark.unit
+    def test_large_jpeg_decoded_reduced(self):
+        """Test a large JPEG is decoded at 1/2 scale and reports the mapping"""
+        decoded = decode_image(_encode(".jpg", 3000, 2000), min_long_side=1280)
+
+        assert decoded.reduction == 2
+        assert decoded.image.shape[:2] == (1000, 1500)
+        assert decoded.original_size == (3000, 2000)
+        assert decoded.scale == pytest.approx(2.0)
+
+    @pytest.mark.unit
+    def test_png_decoded_full_size(self):
+        """Test formats without DCT scaling are decoded at full size"""
+        decoded = decode_image(_encode(".png", 1600, 400), min_long_side=256)
+
+        assert decoded.reduction == 1
+        assert decoded.image.shape[:2] == (400, 1600)
+        assert decoded.scale == 1.0
+
+    @pytest.mark.unit
+    def test_disabled_floor_decodes_full_size(self):
+        """Test min_long_side=0 turns reduced decoding off"""
+        decoded = decode_image(_encode(".jpg", 3000, 2000), min_long_side=0)
+
+        assert decoded.reduction == 1
+        assert decoded.image.shape[:2] == (2000, 3000)
+
+    @pytest.mark.unit
+    def test_forced_reduction(self):
+        """Test an explicit reduction overrides the long-side floor"""
+        decoded = decode_image(_encode(".jpg", 3000, 2000), min_long_side=1280, reduction=1)
+
+        assert decoded.reduction == 1
+        assert decoded.scale == 1.0
+        assert decoded.image.shape[:2] == (2000, 3000)
+
+    @pytest.mark.unit
+    def test_invalid_bytes(self):
+        assert decode_image(b"not an image") is None
+
+
+class TestScaleDetections:
+    """Test mapping detections back to original coordinates"""
+
+    @pytest.mark.unit
+    def test_bbox_and_landmarks_scaled(self):
+        detections = [{"bbox": [10, 20, 30, 40], "landmarks": [[1, 2], [3, 4]], "det_score": 0.9}]
+
+        scaled = scale_detections(detections, 4.0)
+
+        assert scaled[0]["bbox"] == [40.0, 80.0, 120.0, 160.0]
+        assert scaled[0]["landmarks"] == [[4.0, 8.0], [12.0, 16.0]]
+        assert scaled[0]["det_score"] == 0.9
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the Training Image Quality Pre-filter
+Tests metric thresholds, batch scoring and the training integration
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.image_quality import assess_image, assess_images
+
+
+def _encode(image: np.ndarray) -> bytes:
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
+
+
+def _sharp() -> bytes:
+    rng = np.random.default_rng(0)
+    return _encode(rng.integers(30, 220, (240, 320, 3), dtype=np.uint8))
+
+
+def _blurry() -> bytes:
+    rng = np.random.default_rng(0)
+    noise = rng.integers(30, 220, (240, 320, 3), dtype=np.uint8)
+    return _encode(cv2.GaussianBlur(noise, (31, 31), 12))
+
+
+@pytest.fixture(autouse=True)
+def sharpness_threshold(monkeypatch):
+    """The shipped default is 0 (off); these tests exercise an enabled threshold"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TRAINING_MIN_SHARPNESS", 5.0)
+
+
+def _dark() -> bytes:
+    rng = np.random.default_rng(0)
+    return _encode(rng.integers(0, 30, (240, 320, 3), dtype=np.uint8))
+
+
+class TestAssessImage:
+    """Test single-image scoring"""
+
+    @pytest.mark.unit
+    def test_sharp_image_accepted(self):
+        quality = assess_image(_sharp())
+
+        assert quality.is_acceptable
+        assert quality.sharpness == 100.0
+        assert 0 < quality.brightness < 100
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "image,reason",
+        [(_blurry, "blurry"), (_dark, "dark"), (lambda: b"not an image", "undecodable")],
+    )
+    def test_rejections(self, image, reason):
+        quality = assess_image(image())
+
+        assert not quality.is_acceptable
+        assert quality.rejection == reason
+
+    @pytest.mark.unit
+    def test_flat_image_low_contrast(self):
+        quality = assess_image(_encode(np.full((240, 320, 3), 128, dtype=np.uint8)))
+
+        # A flat frame has no edges either, so it fails sharpness first
+        assert quality.rejection == "blurry"
+        assert quality.contrast == 0.0
+
+
+    @pytest.mark.unit
+    def test_sharpness_independent_of_decode_reduction(self, monkeypatch):
+        """Test a large JPEG scores the same whether decoded reduced or at full size"""
+        from app.core.config import settings
+
+        rng = np.random.default_rng(0)
+        image = cv2.GaussianBlur(rng.integers(30, 220, (2000, 3000), dtype=np.uint8), (0, 0), 2)
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        assert ok
+
+        monkeypatch.setattr(settings, "FACE_DECODE_MIN_LONG_SIDE", 1280)
+        reduced = assess_image(encoded.tobytes()).sharpness
+        monkeypatch.setattr(settings, "FACE_DECODE_MIN_LONG_SIDE", 0)
+        full = assess_image(encoded.tobytes()).sharpness
+
+        assert reduced == pytest.approx(full, rel=0.2)
+
+    @pytest.mark.unit
+    def test_zero_threshold_disables_sharpness_check(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "TRAINING_MIN_SHARPNESS", 0.0)
+
+        assert assess_image(_blurry()).rejection != "blurry"
+
+
+class TestAssessImages:
+    """Test batch scoring on a thread pool"""
+
+    @pytest.mark.unit
+    async def test_preserves_input_order(self):
+        results = await assess_images([_sharp(), _dark(), _blurry(), _sharp()])
+
+        assert [r.rejection for r in results] == [None, "dark", "blurry", None]
+
+
+class TestTrainingPrefilter:
+    """Test TrainingService._process_images skips rejected images"""
+
+    @pytest.mark.unit
+    async def test_rejected_images_skip_embedding(self):
+        from app.services.training import TrainingService
+
+        images = [_sharp()] * 5 + [_blurry(), _dark()]
+        service = TrainingService()
+        service._download_with_retry = AsyncMock(side_effect=images)
+
+        face_service = MagicMock()
+        face_service.extract_embedding = AsyncMock(return_value=np.ones(512, dtype=np.float32))
+
+        with patch("app.services.face_recognition.FaceRecognitionService", return_value=face_service):
+            result = await service._process_images([f"https://example.com/{i}.jpg" for i in range(7)])
+
+        assert result["count"] == 5
+        assert result["quality_rejected"] == 2
+        assert face_service.extract_embedding.await_count == 5
+
+    @pytest.mark.unit
+    async def test_rejections_reported_when_too_few_remain(self):
+        from app.services.training import TrainingService
+
+        service = TrainingService()
+        service._download_with_retry = AsyncMock(side_effect=[_sharp()] * 3 + [_blurry()] * 2)
+
+        face_service = MagicMock()
+        face_service.extract_embedding = AsyncMock(return_value=np.ones(512, dtype=np.float32))
+
+        with patch("app.services.face_recognition.FaceRecognitionService", return_value=face_service):
+            with pytest.raises(ValueError, match="2 rejected as blurry"):
+                await service._process_images([f"https://example.com/{i}.jpg" for i in range(5)])
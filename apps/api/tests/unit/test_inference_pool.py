@@ -0,0 +1,191 @@
+"""
+Unit Tests for the Face Inference Worker Pool
+Tests backpressure, shared-memory frame transfer and service integration
+"""
+
+import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.image_decode import DecodedImage
+from app.services.inference_pool import InferencePool, InferenceQueueFull, face_analysis_modules
+
+
+def _mock_face():
+    face = MagicMock()
+    face.bbox = np.array([10, 10, 90, 110], dtype=np.float32)
+    face.embedding = np.random.rand(512).astype(np.float32)
+    face.det_score = 0.88
+    face.landmark_2d_106 = None
+    return face
+
+
+class TestInferencePool:
+    """Test pool admission and frame transfer"""
+
+    @pytest.mark.unit
+    async def test_disabled_pool_does_not_start(self):
+        """Test FACE_INFERENCE_WORKERS=0 keeps inference in-process"""
+        pool = InferencePool(workers=0, max_queue=4, intra_op_threads=1)
+        assert await pool.start() is False
+        assert pool.is_running is False
+
+    @pytest.mark.unit
+    async def test_full_queue_rejects(self):
+        """Test jobs beyond max_queue are rejected instead of queued"""
+        pool = InferencePool(workers=1, max_queue=2, intra_op_threads=1)
+        pool._executor = MagicMock()
+        pool._pending = 2
+
+        with pytest.raises(InferenceQueueFull):
+            await pool.detect(np.zeros((8, 8, 3), np.uint8))
+        pool._executor.submit.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_frame_passed_through_shared_memory(self):
+        """Test the worker sees the exact decoded frame and the slot is released"""
+        pool = InferencePool(workers=1, max_queue=2, intra_op_threads=1)
+        pool._executor = ThreadPoolExecutor(max_workers=1)
+        img = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+        seen = {}
+
+        def fake_get(frame):
+            seen["frame"] = frame.copy()
+            return [_mock_face()]
+
+        model = MagicMock()
+        model.get.side_effect = fake_get
+        try:
+            with patch("app.services.inference_pool._worker_model", model):
+                detections = await pool.detect(img)
+        finally:
+            pool.shutdown()
+
+        np.testing.assert_array_equal(seen["frame"], img)
+        assert len(detections) == 1
+        assert abs(np.linalg.norm(detections[0]["embedding"]) - 1.0) < 1e-5
+        assert pool._pending == 0
+
+    @pytest.mark.unit
+    def test_unlinked_segment_does_not_fail_batch(self):
+        """Test a frame whose caller already unlinked its segment gets no faces, the rest still run"""
+        from app.services.inference_pool import _copy_to_shared, _detect_shared_batch
+
+        img = np.random.randint(0, 255, (16, 16, 3), dtype=np.uint8)
+        kept, gone = _copy_to_shared(img), _copy_to_shared(img)
+        gone.close()
+        gone.unlink()
+
+        model = MagicMock()
+        model.get.return_value = [_mock_face()]
+        try:
+            with patch("app.services.inference_pool._worker_model", model):
+                results = _detect_shared_batch([
+                    (gone.name, img.shape, img.dtype.str),
+                    (kept.name, img.shape, img.dtype.str),
+                ])
+        finally:
+            kept.close()
+            kept.unlink()
+
+        assert results[0] == []
+        assert len(results[1]) == 1
+
+
+class TestFaceAnalysisModules:
+    """Test parsing of FACE_ANALYSIS_MODULES"""
+
+    @pytest.mark.unit
+    def test_default_skips_auxiliary_models(self):
+        assert face_analysis_modules("detection, recognition") == ["detection", "recognition"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("spec", ["all", ""])
+    def test_all_loads_every_model(self, spec):
+        assert face_analysis_modules(spec) is None
+
+    @pytest.mark.unit
+    def test_recognition_required(self):
+        with pytest.raises(ValueError, match="recognition"):
+            face_analysis_modules("detection,landmark_2d_106")
+
+
+class TestServiceUsesPool:
+    """Test FaceRecognitionService routes inference to the pool"""
+
+    @pytest.mark.unit
+    async def test_detections_come_from_pool(self):
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._inference_pool = MagicMock()
+        service._inference_pool.detect = AsyncMock(return_value=[
+            {"bbox": [0, 0, 50, 50], "embedding": np.ones(512, np.float32) / np.sqrt(512),
+             "det_score": 0.9, "landmarks": None},
+        ])
+        service._decode_image = MagicMock(return_value=DecodedImage(np.zeros((64, 64, 3), np.uint8)))
+
+        with patch("app.services.face_recognition.embedding_cache") as detection_cache:
+            detection_cache.get = AsyncMock(return_value=None)
+            detection_cache.set = AsyncMock()
+
+            analysis = await service.analyze(b"pooled-image")
+
+        service._inference_pool.detect.assert_awaited_once()
+        assert analysis.embedding is not None
+        assert analysis.mock is False
+
+    @pytest.mark.unit
+    async def test_small_face_reembedded_from_sharper_decode(self):
+        """Test a face below crop size on the reduced frame is embedded from a full-size crop"""
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        kps = [[10, 10], [20, 10], [15, 15], [11, 22], [19, 22]]
+        service._inference_pool = MagicMock()
+        service._inference_pool.detect = AsyncMock(return_value=[
+            {"bbox": [0, 0, 30, 30], "embedding": np.ones(512, np.float32) / np.sqrt(512),
+             "det_score": 0.9, "landmarks": None, "kps": kps},
+        ])
+        sharp = np.zeros(512, np.float32)
+        sharp[0] = 1.0
+        service._inference_pool.embed = AsyncMock(return_value=[sharp])
+        service._decode_image = MagicMock(
+            return_value=DecodedImage(np.zeros((250, 250, 3), np.uint8), scale=4.0, reduction=4)
+        )
+        full = DecodedImage(np.zeros((1000, 1000, 3), np.uint8), scale=1.0, reduction=1)
+        crop = np.zeros((112, 112, 3), np.uint8)
+
+        with patch("app.services.face_recognition.embedding_cache") as detection_cache, \
+                patch("app.services.face_recognition.decode_image", return_value=full) as decode, \
+                patch("app.services.face_recognition.align_faces", return_value=[crop]) as align:
+            detection_cache.get = AsyncMock(return_value=None)
+            detection_cache.set = AsyncMock()
+
+            analysis = await service.analyze(b"group-photo")
+
+        assert decode.call_args.kwargs["reduction"] == 1  # 120 px face: only full size keeps 112 px
+        np.testing.assert_allclose(align.call_args.args[1][0], np.asarray(kps) * 4.0)
+        service._inference_pool.embed.assert_awaited_once_with([crop])
+        np.testing.assert_array_equal(analysis.embedding, sharp)
+        assert "kps" not in analysis.faces[0]
+
+    @pytest.mark.unit
+    async def test_queue_full_propagates_from_base64_detection(self):
+        """Test saturation surfaces as InferenceQueueFull (503), not an empty result"""
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._inference_pool = MagicMock()
+        service._inference_pool.detect = AsyncMock(side_effect=InferenceQueueFull())
+        service._decode_image = MagicMock(return_value=DecodedImage(np.zeros((64, 64, 3), np.uint8)))
+
+        with patch("app.services.face_recognition.embedding_cache") as detection_cache:
+            detection_cache.get = AsyncMock(return_value=None)
+
+            with pytest.raises(InferenceQueueFull):
+                await service.detect_faces_base64("aW1hZ2U=")
@@ -0,0 +1,369 @@
+"""
+Unit Tests for the Local Embedding Index
+Tests exact top-k search, incremental sync, persistence and failover
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.local_index import LocalEmbeddingIndex
+
+
+def _unit(rng, n, dim=64):
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestLocalEmbeddingIndex:
+    """Test the memory-mapped exact-search index"""
+
+    @pytest.mark.unit
+    def test_topk_matches_brute_force_across_blocks(self, tmp_path):
+        """Test blocked search returns the same top-k as a full matrix product"""
+        rng = np.random.default_rng(0)
+        vectors = _unit(rng, 300)
+        ids = [str(uuid.uuid4()) for _ in range(300)]
+        index = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32", block_rows=64, initial_capacity=16)
+        index.add_many(zip(ids, vectors))
+
+        queries = _unit(rng, 5)
+        results = index.search_batch(queries, limit=3)
+
+        expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :3]
+        for result, rows in zip(results, expected):
+            assert [r["identity_id"] for r in result] == [ids[i] for i in rows]
+            assert result[0]["score"] >= result[1]["score"] >= result[2]["score"]
+
+    @pytest.mark.unit
+    def test_threshold_and_self_match(self, tmp_path):
+        """Test an indexed embedding finds itself and the threshold filters the rest"""
+        rng = np.random.default_rng(1)
+        vectors = _unit(rng, 20)
+        ids = [str(uuid.uuid4()) for _ in range(20)]
+        index = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float16")
+        index.add_many(zip(ids, vectors))
+
+        result = index.search(vectors[7], limit=5, threshold=0.9)
+
+        assert len(result) == 1
+        assert result[0]["identity_id"] == ids[7]
+        assert result[0]["score"] == pytest.approx(1.0, abs=1e-2)
+
+    @pytest.mark.unit
+    def test_remove_keeps_rows_dense(self, tmp_path):
+        """Test deleting swaps the last row in and the moved identity stays searchable"""
+        rng = np.random.default_rng(2)
+        vectors = _unit(rng, 3)
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+        index = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+        index.add_many(zip(ids, vectors))
+
+        assert index.remove(ids[0]) is True
+        assert index.remove(ids[0]) is False
+
+        assert len(index) == 2
+        assert ids[0] not in index
+        assert index.search(vectors[2], limit=1)[0]["identity_id"] == ids[2]
+
+    @pytest.mark.unit
+    def test_persists_and_shares_across_instances(self, tmp_path):
+        """Test a reopened index (or another process) sees committed writes"""
+        rng = np.random.default_rng(3)
+        vector = _unit(rng, 1)[0]
+        identity_id = str(uuid.uuid4())
+
+        writer = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float16", initial_capacity=2)
+        reader = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float16")
+        writer.add(identity_id, vector)
+        for _ in range(5):  # force growth beyond the initial capacity
+            writer.add(str(uuid.uuid4()), _unit(rng, 1)[0])
+
+        assert len(reader) == 6
+        assert reader.search(vector, limit=1)[0]["identity_id"] == identity_id
+        assert len(LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float16")) == 6
+
+    @pytest.mark.unit
+    def test_reader_applies_only_new_writes(self, tmp_path):
+        """Test another process's writes are applied incrementally, without a full reload"""
+        rng = np.random.default_rng(5)
+        vectors = _unit(rng, 4)
+        ids = [str(uuid.uuid4()) for _ in range(4)]
+        writer = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+        reader = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+        writer.add_many(zip(ids[:3], vectors[:3]))
+        assert len(reader) == 3
+
+        reader._load = MagicMock(side_effect=AssertionError("full reload"))
+        writer.add(ids[3], vectors[3])
+        writer.remove(ids[0])
+        writer.add(ids[1], vectors[0])  # replace
+
+        assert len(reader) == 3
+        assert ids[0] not in reader
+        assert reader.search(vectors[0], limit=1)[0]["identity_id"] == ids[1]
+        assert reader.search(vectors[3], limit=1)[0]["identity_id"] == ids[3]
+
+    @pytest.mark.unit
+    def test_replace_keeps_one_live_row(self, tmp_path):
+        """Test re-adding an identity hides its previous embedding"""
+        rng = np.random.default_rng(6)
+        old, new = _unit(rng, 2)
+        identity_id = str(uuid.uuid4())
+        index = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+
+        index.add(identity_id, old)
+        index.add(identity_id, new)
+
+        assert len(index) == 1
+        assert index.search(old, limit=5, threshold=0.99) == []
+        assert index.search(new, limit=5)[0]["identity_id"] == identity_id
+
+    @pytest.mark.unit
+    def test_older_version_does_not_replace_newer(self, tmp_path):
+        """Test a stale write (e.g. a slow sync) can't overwrite a newer registration"""
+        rng = np.random.default_rng(8)
+        newer, older = _unit(rng, 2)
+        identity_id = str(uuid.uuid4())
+        index = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+
+        index.add(identity_id, newer, version=20.0)
+        assert index.add_many([(identity_id, older, 10.0)]) == 0
+
+        assert index.versions() == {identity_id: 20.0}
+        assert index.search(newer, limit=1)[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+    @pytest.mark.unit
+    def test_compaction_reloads_readers(self, tmp_path, monkeypatch):
+        """Test tombstones are compacted away and other instances reload the new files"""
+        from app.services import local_index
+
+        monkeypatch.setattr(local_index, "COMPACT_MIN_DELETED", 2)
+        rng = np.random.default_rng(7)
+        vectors = _unit(rng, 6)
+        ids = [str(uuid.uuid4()) for _ in range(6)]
+        writer = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+        reader = LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float32")
+        writer.add_many(zip(ids, vectors))
+
+        writer.remove_many(ids[:3])
+
+        assert writer._count == 3 and writer._deleted == 0
+        assert (tmp_path / "deleted.bin").stat().st_size == 0
+        assert len(reader) == 3
+        assert reader.search(vectors[4], limit=1)[0]["identity_id"] == ids[4]
+        assert ids[0] not in reader
+
+    @pytest.mark.unit
+    def test_rejects_mismatched_layout(self, tmp_path):
+        """Test reopening with a different dim/dtype fails loudly"""
+        LocalEmbeddingIndex(str(tmp_path), dim=64, dtype="float16")
+        with pytest.raises(ValueError):
+            LocalEmbeddingIndex(str(tmp_path), dim=128, dtype="float16")
+
+
+class TestServiceFailover:
+    """Test FaceRecognitionService serves from the local index without Qdrant"""
+
+    @pytest.mark.unit
+    async def test_match_without_qdrant(self, tmp_path):
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._qdrant = None
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+
+        rng = np.random.default_rng(4)
+        embedding = rng.standard_normal(512).astype(np.float32)
+        identity_id = uuid.uuid4()
+        service._local_index.add(str(identity_id), embedding, 1.0)
+
+        matches = await service.find_matches([embedding, -embedding], threshold=0.7)
+        similar = await service.find_similar(embedding, threshold=0.7)
+
+        assert matches[0]["identity_id"] == str(identity_id)
+        assert matches[1] is None
+        assert similar[0]["identity_id"] == str(identity_id)
+        assert (await service.find_match(embedding, threshold=0.7))["identity_id"] == str(identity_id)
+
+    @pytest.mark.unit
+    async def test_writes_refused_without_qdrant(self, tmp_path):
+        """Test writes fail instead of landing only in the index, where the next sync would drop them"""
+        from app.services.face_recognition import FaceRecognitionService, VectorStoreUnavailable
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._qdrant = None
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        identity_id = uuid.uuid4()
+
+        with pytest.raises(VectorStoreUnavailable):
+            await service.register_embedding(identity_id, np.ones(512, dtype=np.float32))
+        with pytest.raises(VectorStoreUnavailable):
+            await service.delete_embedding(identity_id)
+
+        assert str(identity_id) not in service._local_index
+
+    @pytest.mark.unit
+    async def test_runtime_outage_fails_over_and_reconnects(self, tmp_path, monkeypatch):
+        """Test a Qdrant outage after startup is served locally, then Qdrant is retried"""
+        from unittest.mock import AsyncMock
+        from app.core.config import settings
+        from app.services import face_recognition
+        from app.services.face_recognition import FaceRecognitionService
+
+        monkeypatch.setattr(settings, "FACE_QDRANT_RECONNECT_INTERVAL", 0)
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        embedding = np.ones(512, dtype=np.float32)
+        identity_id = str(uuid.uuid4())
+        service._local_index.add(identity_id, embedding, 1.0)
+
+        down = MagicMock()
+        down.search = AsyncMock(side_effect=ConnectionError("qdrant down"))
+        down.search_batch = AsyncMock(side_effect=ConnectionError("qdrant down"))
+        service._qdrant = down
+        healthy = MagicMock()
+        monkeypatch.setattr(face_recognition, "get_qdrant", lambda: healthy)
+        monkeypatch.setattr(face_recognition, "apply_collection_schema", AsyncMock())
+        monkeypatch.setattr(service, "sync_local_index", AsyncMock())
+
+        match = await service.find_match(embedding, threshold=0.7)
+
+        assert match["identity_id"] == identity_id
+        down.search.assert_awaited_once()
+        await service._reconnect_task
+        assert service._qdrant is healthy
+        service._index_sync_task.cancel()
+
+    @pytest.mark.unit
+    async def test_non_transient_error_is_raised(self, tmp_path):
+        """Test a bad request is not hidden by the local index"""
+        from unittest.mock import AsyncMock
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        service._qdrant = MagicMock()
+        service._qdrant.search_batch = AsyncMock(side_effect=ValueError("wrong vector size"))
+
+        with pytest.raises(ValueError):
+            await service.find_matches([np.ones(512, dtype=np.float32)])
+        assert service._qdrant is not None
+
+    @pytest.mark.unit
+    async def test_writes_go_to_both_stores(self, tmp_path):
+        """Test register keeps Qdrant and the standby index in sync"""
+        from unittest.mock import AsyncMock
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._qdrant = MagicMock()
+        service._qdrant.upsert = AsyncMock()
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+
+        identity_id = uuid.uuid4()
+        await service.register_embedding(identity_id, np.ones(512, dtype=np.float32))
+
+        service._qdrant.upsert.assert_awaited_once()
+        assert str(identity_id) in service._local_index
+
+
+class TestGetLocalIndex:
+    """Test the process-wide index factory"""
+
+    @pytest.mark.unit
+    def test_rejects_relative_path(self, monkeypatch):
+        """Test a relative FACE_LOCAL_INDEX_PATH is refused instead of writing into the cwd"""
+        from app.core.config import settings
+        from app.services import local_index
+
+        monkeypatch.setattr(settings, "FACE_LOCAL_INDEX_MODE", "standby")
+        monkeypatch.setattr(settings, "FACE_LOCAL_INDEX_PATH", "data/face_index")
+
+        assert local_index.get_local_index() is None
+
+    @pytest.mark.unit
+    def test_opens_configured_path(self, monkeypatch):
+        """Test the index is created at the (test-local) configured path"""
+        from pathlib import Path
+        from app.core.config import settings
+        from app.services import local_index
+
+        monkeypatch.setattr(settings, "FACE_LOCAL_INDEX_MODE", "standby")
+
+        index = local_index.get_local_index()
+
+        assert index is not None
+        assert (Path(settings.FACE_LOCAL_INDEX_PATH) / "meta.json").exists()
+
+
+def _point(identity_id, version, vector=None):
+    point = MagicMock()
+    point.id = identity_id
+    point.payload = {"identity_id": identity_id, "updated_at": version}
+    point.vector = vector
+    return point
+
+
+class TestSyncWithQdrant:
+    """Test reconciliation of the local index against Qdrant"""
+
+    @pytest.mark.unit
+    async def test_fetches_missing_and_newer_and_drops_deleted(self, tmp_path):
+        """Test writes made elsewhere (other replicas, the worker) reach the local index"""
+        import time
+        from unittest.mock import AsyncMock
+        from app.services.face_recognition import FaceRecognitionService
+
+        rng = np.random.default_rng(9)
+        vectors = {name: rng.standard_normal(512).astype(np.float32) for name in "abcde"}
+        a, b, c, d, e = (str(uuid.uuid4()) for _ in range(5))
+
+        index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        index.add(a, vectors["a"], version=1.0)  # re-registered elsewhere (v2 in Qdrant)
+        index.add(b, vectors["b"], version=5.0)  # up to date
+        index.add(c, vectors["c"], version=1.0)  # deleted elsewhere
+        index.add(d, vectors["d"], version=time.time() + 60)  # registered here during the sync
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._local_index = index
+        service._qdrant = MagicMock()
+        service._qdrant.scroll = AsyncMock(return_value=([_point(a, 2.0), _point(b, 5.0), _point(e, 3.0)], None))
+        service._qdrant.retrieve = AsyncMock(return_value=[
+            _point(a, 2.0, vectors["e"].tolist()),
+            _point(e, 3.0, vectors["e"].tolist()),
+        ])
+
+        stats = await service.sync_local_index()
+
+        assert stats == {"checked": 3, "added": 2, "removed": 1}
+        assert service._qdrant.retrieve.await_args.kwargs["ids"] == [a, e]
+        assert service._qdrant.scroll.await_args.kwargs["with_vectors"] is False
+        assert set(index.versions()) == {a, b, d, e}
+        assert index.versions()[a] == 2.0
+
+    @pytest.mark.unit
+    async def test_one_sync_per_host(self, tmp_path):
+        """Test a second process skips the sync while another holds the lease"""
+        from app.services.face_recognition import FaceRecognitionService
+
+        service = FaceRecognitionService()
+        service._initialized = True
+        service._local_index = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        service._qdrant = MagicMock()
+
+        other = LocalEmbeddingIndex(str(tmp_path), dim=512, dtype="float16")
+        with other.sync_lease() as leased:
+            assert leased
+            stats = await service.sync_local_index()
+
+        assert stats["checked"] == 0
+        service._qdrant.scroll.assert_not_called()
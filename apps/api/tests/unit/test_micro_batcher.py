@@ -0,0 +1,74 @@
+"""
+Unit Tests for the Micro-batching Scheduler
+Tests batching window, size cap, result routing and error propagation
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test concurrent submissions are coalesced into batches"""
+
+    @pytest.mark.unit
+    async def test_concurrent_items_share_one_batch(self):
+        """Test items arriving within the window run as one batch, results in order"""
+        calls = []
+
+        async def process(items):
+            calls.append(list(items))
+            return [item * 10 for item in items]
+
+        batcher = MicroBatcher(process, max_batch_size=16, max_wait_ms=20)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(5)])
+
+        assert results == [0, 10, 20, 30, 40]
+        assert calls == [[0, 1, 2, 3, 4]]
+
+    @pytest.mark.unit
+    async def test_max_batch_size_caps_batches(self):
+        """Test a full batch is dispatched without waiting for the window"""
+        calls = []
+
+        async def process(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=1000)
+        results = await asyncio.wait_for(
+            asyncio.gather(*[batcher.submit(i) for i in range(8)]), timeout=0.5
+        )
+
+        assert results == list(range(8))
+        assert calls == [4, 4]
+
+    @pytest.mark.unit
+    async def test_remainder_flushed_after_window(self):
+        """Test a partial batch still runs once the window elapses"""
+        calls = []
+
+        async def process(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=5)
+        results = await asyncio.gather(*[batcher.submit(i) for i in range(6)])
+
+        assert results == list(range(6))
+        assert calls == [4, 2]
+
+    @pytest.mark.unit
+    async def test_batch_error_reaches_every_caller(self):
+        """Test a failed batch raises in each awaiting request"""
+        async def process(items):
+            raise ValueError("model failed")
+
+        batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=1)
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
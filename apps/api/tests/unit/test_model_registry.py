@@ -0,0 +1,115 @@
+"""
+Unit Tests for the Face Model Registry
+Tests one-time loading, warm-up and readiness gating
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.monitoring import check_models_health
+from app.services.model_registry import ModelRegistry
+
+
+def _pool(started=True):
+    pool = MagicMock()
+    pool.start = AsyncMock(return_value=started)
+    pool.warm_up = AsyncMock(return_value={101: 300 * 2**20, 102: 310 * 2**20})
+    return pool
+
+
+class TestModelRegistry:
+    """Test model loading states"""
+
+    @pytest.mark.unit
+    async def test_mock_mode_is_ready_without_loading(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "true")
+        pool = _pool()
+        registry = ModelRegistry(pool=pool)
+
+        await registry.warm_up()
+
+        assert registry.state == "mock"
+        assert registry.is_ready
+        pool.start.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_concurrent_callers_load_once(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "false")
+        pool = _pool()
+        registry = ModelRegistry(pool=pool)
+
+        await asyncio.gather(registry.load(), registry.load(), registry.warm_up())
+
+        pool.start.assert_awaited_once()
+        pool.warm_up.assert_awaited_once()
+        assert registry.inference_pool is pool
+        assert registry.state == "ready"
+
+    @pytest.mark.unit
+    async def test_load_without_warm_up_not_ready(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "false")
+        registry = ModelRegistry(pool=_pool())
+
+        await registry.load()
+
+        assert registry.state == "loaded"
+        assert not registry.is_ready
+        assert registry.load_seconds is not None
+
+    @pytest.mark.unit
+    async def test_in_process_fallback_warmed(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "false")
+        face_app = MagicMock()
+        registry = ModelRegistry(pool=_pool(started=False))
+
+        with patch("app.services.model_registry.load_face_analysis", return_value=face_app), \
+                patch("app.services.model_registry.warm_face_analysis") as warm:
+            await registry.warm_up()
+
+        assert registry.face_app is face_app
+        assert registry.backend == "in_process"
+        warm.assert_called_once_with(face_app)
+        assert registry.is_ready
+
+    @pytest.mark.unit
+    async def test_load_failure_is_terminal(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "false")
+        registry = ModelRegistry(pool=_pool(started=False))
+
+        with patch(
+            "app.services.model_registry.load_face_analysis", side_effect=ImportError("insightface")
+        ) as load:
+            await registry.warm_up()
+            await registry.load()
+
+        assert registry.state == "unavailable"
+        assert not registry.is_ready
+        load.assert_called_once()
+
+
+class TestModelsHealth:
+    """Test readiness gating on warm-up"""
+
+    @pytest.mark.unit
+    async def test_unhealthy_until_warmed_up(self, monkeypatch):
+        monkeypatch.setenv("FACE_RECOGNITION_MOCK", "false")
+        registry = ModelRegistry(pool=_pool())
+
+        with patch("app.services.model_registry.model_registry", registry):
+            assert (await check_models_health())["status"] == "unhealthy"
+            await registry.warm_up()
+            health = await check_models_health()
+
+        assert health["status"] == "healthy"
+        assert health["state"] == "ready"
+
+    @pytest.mark.unit
+    async def test_warm_up_disabled_never_gates(self):
+        with patch("app.core.monitoring.settings.FACE_MODEL_WARMUP", False), \
+                patch("app.services.model_registry.model_registry", ModelRegistry(pool=_pool())):
+            health = await check_models_health()
+
+        assert health["status"] == "healthy"
+        assert health["state"] == "cold"
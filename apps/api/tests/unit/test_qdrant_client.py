@@ -0,0 +1,125 @@
+"""
+Unit Tests for the Shared Qdrant Client
+Tests per-loop client reuse and retry behaviour
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.qdrant import (
+    QdrantClientConfig,
+    QdrantClientFactory,
+    is_transient_qdrant_error,
+)
+
+
+def _factory(**overrides) -> QdrantClientFactory:
+    config = QdrantClientConfig(max_retries=2, retry_backoff=0.001, timeout=1.0, **overrides)
+    return QdrantClientFactory(config)
+
+
+class TestQdrantClientFactory:
+    """Test the process-wide client factory"""
+
+    @pytest.mark.unit
+    async def test_client_created_once_per_loop(self):
+        """Test repeated calls on the same loop share one client"""
+        factory = _factory()
+        with patch("app.core.qdrant.AsyncQdrantClient") as client_cls:
+            first = factory.get()
+            second = factory.get()
+
+        assert first is second
+        client_cls.assert_called_once()
+        assert client_cls.call_args.kwargs["prefer_grpc"] is True
+
+    @pytest.mark.unit
+    async def test_replaced_client_is_closed(self):
+        """Test a client left on a finished event loop is closed, not just dropped"""
+        import asyncio
+
+        factory = _factory()
+        old_client = MagicMock()
+        old_client.close = AsyncMock()
+        old_loop = MagicMock()
+        old_loop.is_running.return_value = False
+        factory._client, factory._loop = old_client, old_loop
+
+        with patch("app.core.qdrant.AsyncQdrantClient") as client_cls:
+            assert factory.get() is client_cls.return_value
+        await asyncio.sleep(0)
+
+        old_client.close.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_sub_second_timeout_kept(self):
+        """Test a sub-second timeout rounds up to the client's whole seconds instead of disabling it"""
+        factory = _factory()
+        factory.config.timeout = 0.5
+        with patch("app.core.qdrant.AsyncQdrantClient") as client_cls:
+            factory.get()
+
+        assert client_cls.call_args.kwargs["timeout"] == 1
+
+    @pytest.mark.unit
+    async def test_in_memory_location(self):
+        """Test the local fallback builds an in-memory client"""
+        factory = _factory(location=":memory:")
+        collections = await factory.client.get_collections()
+        assert collections.collections == []
+        await factory.close()
+
+
+class TestRetryingClient:
+    """Test transient failures are retried, others are not"""
+
+    @pytest.mark.unit
+    async def test_transient_error_retried(self):
+        """Test a connection error is retried and the call then succeeds"""
+        factory = _factory()
+        client = MagicMock()
+        client.search = AsyncMock(side_effect=[ConnectionError("reset"), ["hit"]])
+
+        with patch.object(factory, "get", return_value=client):
+            result = await factory.client.search(collection_name="c", query_vector=[0.1])
+
+        assert result == ["hit"]
+        assert client.search.await_count == 2
+
+    @pytest.mark.unit
+    async def test_non_transient_error_not_retried(self):
+        """Test application errors surface immediately"""
+        factory = _factory()
+        client = MagicMock()
+        client.search = AsyncMock(side_effect=ValueError("bad request"))
+
+        with patch.object(factory, "get", return_value=client):
+            with pytest.raises(ValueError):
+                await factory.client.search(collection_name="c", query_vector=[0.1])
+
+        assert client.search.await_count == 1
+
+    @pytest.mark.unit
+    async def test_retries_exhausted(self):
+        """Test the last transient error is raised after max_retries"""
+        factory = _factory()
+        client = MagicMock()
+        client.upsert = AsyncMock(side_effect=ConnectionError("down"))
+
+        with patch.object(factory, "get", return_value=client):
+            with pytest.raises(ConnectionError):
+                await factory.client.upsert(collection_name="c", points=[])
+
+        assert client.upsert.await_count == 3
+
+    @pytest.mark.unit
+    def test_transient_classification(self):
+        """Test grpc-style status codes are classified"""
+        unavailable = MagicMock()
+        unavailable.code.return_value.name = "UNAVAILABLE"
+        invalid = MagicMock()
+        invalid.code.return_value.name = "INVALID_ARGUMENT"
+
+        assert is_transient_qdrant_error(unavailable) is True
+        assert is_transient_qdrant_error(invalid) is False
+        assert is_transient_qdrant_error(TimeoutError()) is True
@@ -0,0 +1,164 @@
+"""
+Unit Tests for Qdrant Collection Schema Management
+Tests creation, idempotent re-application and in-place updates
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    Distance,
+    PayloadSchemaType,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+
+from app.core.qdrant import QdrantClientConfig, QdrantClientFactory
+from app.core.qdrant_schema import (
+    CollectionSchema,
+    CollectionSchemaError,
+    apply_collection_schema,
+)
+
+
+def _info(size=512, quantization=None, m=16, ef_construct=100, on_disk=None, indexes=None):
+    """Collection info shaped like get_collection's response"""
+    return SimpleNamespace(
+        config=SimpleNamespace(
+            params=SimpleNamespace(
+                vectors=VectorParams(size=size, distance=Distance.COSINE, on_disk=on_disk)
+            ),
+            hnsw_config=SimpleNamespace(m=m, ef_construct=ef_construct, on_disk=None),
+            quantization_config=quantization,
+        ),
+        payload_schema=indexes if indexes is not None else {
+            "identity_id": SimpleNamespace(data_type=PayloadSchemaType.KEYWORD)
+        },
+    )
+
+
+def _int8(always_ram=True):
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+    )
+
+
+def _client(info):
+    client = MagicMock()
+    client.get_collections = AsyncMock(
+        return_value=SimpleNamespace(collections=[SimpleNamespace(name="faces")])
+    )
+    client.get_collection = AsyncMock(return_value=info)
+    client.update_collection = AsyncMock()
+    client.create_payload_index = AsyncMock()
+    client.delete_payload_index = AsyncMock()
+    return client
+
+
+class TestCollectionSchema:
+    """Test schema to Qdrant config mapping"""
+
+    @pytest.mark.unit
+    def test_int8_search_params_rescore(self):
+        params = CollectionSchema(name="faces", vector_size=512, search_ef=96).search_params()
+
+        assert params.hnsw_ef == 96
+        assert params.quantization.rescore is True
+        assert params.quantization.oversampling == 2.0
+
+    @pytest.mark.unit
+    def test_unquantized_has_no_quantization_params(self):
+        schema = CollectionSchema(name="faces", vector_size=512, quantization="none")
+
+        assert schema.quantization_config() is None
+        assert schema.search_params().quantization is None
+
+    @pytest.mark.unit
+    def test_unknown_quantization_rejected(self):
+        with pytest.raises(ValueError, match="quantization"):
+            CollectionSchema(name="faces", vector_size=512, quantization="pq")
+
+
+class TestApplyCollectionSchema:
+    """Test idempotent creation and updates"""
+
+    @pytest.mark.unit
+    async def test_creates_missing_collection_with_index(self):
+        client = QdrantClientFactory(QdrantClientConfig(location=":memory:")).client
+        schema = CollectionSchema(name="faces", vector_size=8)
+
+        changes = await apply_collection_schema(client, schema)
+
+        assert changes == ["created", "payload_index:identity_id"]
+        info = await client.get_collection("faces")
+        assert info.config.params.vectors.size == 8
+
+    @pytest.mark.unit
+    async def test_matching_collection_untouched(self):
+        client = _client(_info(quantization=_int8()))
+
+        changes = await apply_collection_schema(client, CollectionSchema(name="faces", vector_size=512))
+
+        assert changes == []
+        client.update_collection.assert_not_awaited()
+        client.create_payload_index.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_only_differences_sent(self):
+        client = _client(_info(quantization=None, m=16))
+        schema = CollectionSchema(name="faces", vector_size=512, quantization="binary", hnsw_m=32)
+
+        changes = await apply_collection_schema(client, schema)
+
+        assert changes == ["hnsw", "quantization"]
+        kwargs = client.update_collection.await_args.kwargs
+        assert set(kwargs) == {"collection_name", "hnsw_config", "quantization_config"}
+        assert kwargs["hnsw_config"].m == 32
+        assert isinstance(kwargs["quantization_config"], BinaryQuantization)
+
+    @pytest.mark.unit
+    async def test_quantization_disabled(self):
+        client = _client(_info(quantization=_int8()))
+        schema = CollectionSchema(name="faces", vector_size=512, quantization="none", on_disk=True)
+
+        changes = await apply_collection_schema(client, schema)
+
+        assert changes == ["on_disk", "quantization"]
+        kwargs = client.update_collection.await_args.kwargs
+        assert kwargs["quantization_config"] == Disabled.DISABLED
+        assert kwargs["vectors_config"][""].on_disk is True
+
+    @pytest.mark.unit
+    async def test_missing_payload_index_created(self):
+        client = _client(_info(quantization=_int8(), indexes={}))
+
+        changes = await apply_collection_schema(client, CollectionSchema(name="faces", vector_size=512))
+
+        assert changes == ["payload_index:identity_id"]
+        client.create_payload_index.assert_awaited_once_with(
+            collection_name="faces",
+            field_name="identity_id",
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+
+    @pytest.mark.unit
+    async def test_vector_size_mismatch_raises(self):
+        client = _client(_info(size=128))
+
+        with pytest.raises(CollectionSchemaError, match="re-index"):
+            await apply_collection_schema(client, CollectionSchema(name="faces", vector_size=512))
+        client.update_collection.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_binary_always_ram_change_detected(self):
+        live = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=False))
+        client = _client(_info(quantization=live))
+        schema = CollectionSchema(name="faces", vector_size=512, quantization="binary")
+
+        assert await apply_collection_schema(client, schema) == ["quantization"]
@@ -0,0 +1,220 @@
+"""
+Unit Tests for the Write-Behind Usage Event Pipeline
+Tests event encoding, buffering, batched writes and shutdown draining
+"""
+
+import uuid
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.usage_events import UsageEvent, UsageEventPipeline, write_usage_events
+
+
+def _session(inserted_rows):
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=inserted_rows)))
+    session.commit = AsyncMock()
+    return session
+
+
+def _session_factory(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+def _pipe():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    return pipe
+
+
+class TestUsageEvent:
+    """Test the compact stream payload"""
+
+    @pytest.mark.unit
+    def test_encode_roundtrip(self):
+        event = UsageEvent(
+            identity_id=uuid.uuid4(),
+            requester_id=uuid.uuid4(),
+            requester_name="Partner",
+            api_key_id=None,
+            similarity_score=0.91,
+            faces_detected=2,
+            response_time_ms=42,
+        )
+
+        assert UsageEvent.decode(event.encode()) == event
+
+    @pytest.mark.unit
+    def test_row_uses_event_id(self):
+        """Test the event id becomes the usage_logs primary key (idempotent redelivery)"""
+        event = UsageEvent(identity_id=uuid.uuid4())
+        row = event.to_row()
+
+        assert row["id"] == event.id
+        assert row["action"] == "verify"
+        assert row["matched"] is True
+
+
+class TestWriteUsageEvents:
+    """Test the bulk insert + counter delta transaction"""
+
+    @pytest.mark.unit
+    async def test_counts_only_inserted_rows(self):
+        hot, cold = uuid.uuid4(), uuid.uuid4()
+        events = [UsageEvent(identity_id=hot), UsageEvent(identity_id=hot), UsageEvent(identity_id=cold)]
+        # The cold identity's row already existed (redelivered batch)
+        session = _session([(hot, "verify"), (hot, "verify")])
+
+        inserted = await write_usage_events(session, events)
+
+        assert inserted == 2
+        assert session.execute.await_count == 2  # one INSERT, one UPDATE ... FROM (VALUES)
+        update_sql = str(session.execute.await_args_list[1].args[0])
+        assert "FROM (VALUES" in update_sql
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_conflict_target_is_partitioned_key(self):
+        """Test redelivered rows are matched on (id, created_at), the partitioned table's key"""
+        from sqlalchemy.dialects import postgresql
+
+        session = _session([])
+        await write_usage_events(session, [UsageEvent(identity_id=uuid.uuid4())])
+
+        insert_sql = str(session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id, created_at) DO NOTHING" in insert_sql
+
+    @pytest.mark.unit
+    async def test_no_update_when_nothing_inserted(self):
+        session = _session([])
+
+        assert await write_usage_events(session, [UsageEvent(identity_id=uuid.uuid4())]) == 0
+        assert session.execute.await_count == 1
+
+
+class TestUsageEventPipeline:
+    """Test buffering, stream flushing and shutdown"""
+
+    @pytest.mark.unit
+    def test_record_drops_when_buffer_full(self):
+        pipeline = UsageEventPipeline(buffer_size=2)
+
+        results = [pipeline.record(UsageEvent(identity_id=uuid.uuid4())) for _ in range(3)]
+
+        assert results == [True, True, False]
+        assert pipeline.buffered == 2
+
+    @pytest.mark.unit
+    async def test_flush_stream_writes_then_acks(self):
+        event = UsageEvent(identity_id=uuid.uuid4())
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xreadgroup = AsyncMock(return_value=[(b"usage:events", [(b"1-0", {b"e": event.encode()})])])
+        pipe = _pipe()
+        redis.pipeline = MagicMock(return_value=pipe)
+        session = _session([(event.identity_id, "verify")])
+        pipeline = UsageEventPipeline(session_factory=_session_factory(session))
+
+        with patch("app.services.usage_events.cache") as cache:
+            cache.bytes_client = redis
+            assert await pipeline._flush_stream() is True
+
+        session.commit.assert_awaited_once()
+        pipe.xack.assert_called_once_with("usage:events", "usage-flushers", b"1-0")
+        pipe.xdel.assert_called_once_with("usage:events", b"1-0")
+
+    @pytest.mark.unit
+    async def test_failed_write_leaves_entries_pending(self):
+        """Test a database failure does not ack, so the batch is retried"""
+        event = UsageEvent(identity_id=uuid.uuid4())
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xreadgroup = AsyncMock(return_value=[(b"usage:events", [(b"1-0", {b"e": event.encode()})])])
+        redis.xpending_range = AsyncMock(return_value=[{"message_id": b"1-0", "times_delivered": 1}])
+        redis.pipeline = MagicMock(return_value=_pipe())
+        session = _session([])
+        session.execute.side_effect = RuntimeError("db down")
+        pipeline = UsageEventPipeline(session_factory=_session_factory(session))
+
+        with patch("app.services.usage_events.cache") as cache:
+            cache.bytes_client = redis
+            with pytest.raises(RuntimeError):
+                await pipeline._flush_stream()
+
+        redis.pipeline.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_poison_row_dead_lettered_after_max_deliveries(self):
+        """Test a batch that keeps failing is split, good rows written, the bad one dead-lettered"""
+        good, bad = UsageEvent(identity_id=uuid.uuid4()), UsageEvent(identity_id=uuid.uuid4())
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xreadgroup = AsyncMock(return_value=[(b"usage:events", [
+            (b"1-0", {b"e": good.encode()}),
+            (b"2-0", {b"e": bad.encode()}),
+        ])])
+        redis.xpending_range = AsyncMock(return_value=[
+            {"message_id": b"1-0", "times_delivered": 5},
+            {"message_id": b"2-0", "times_delivered": 5},
+        ])
+        pipe = _pipe()
+        redis.pipeline = MagicMock(return_value=pipe)
+        pipeline = UsageEventPipeline(max_deliveries=5)
+
+        async def write(events, path):
+            if any(event.id == bad.id for event in events):
+                raise ValueError("value out of range")
+
+        with patch("app.services.usage_events.cache") as cache, \
+                patch.object(pipeline, "_write", side_effect=write) as written:
+            cache.bytes_client = redis
+            assert await pipeline._flush_stream() is True
+
+        assert written.await_count == 3  # the batch, then each row
+        pipe.xadd.assert_called_once()
+        assert pipe.xadd.call_args.args[0] == "usage:events:dead"
+        assert pipe.xadd.call_args.args[1][b"id"] == b"2-0"
+        pipe.xack.assert_called_once_with("usage:events", "usage-flushers", b"1-0", b"2-0")
+
+    @pytest.mark.unit
+    async def test_outage_never_dead_letters(self):
+        """Test connection failures leave the batch pending however often it was delivered"""
+        from sqlalchemy.exc import OperationalError
+
+        event = UsageEvent(identity_id=uuid.uuid4())
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xreadgroup = AsyncMock(return_value=[(b"usage:events", [(b"1-0", {b"e": event.encode()})])])
+        redis.xpending_range = AsyncMock(return_value=[{"message_id": b"1-0", "times_delivered": 50}])
+        redis.pipeline = MagicMock(return_value=_pipe())
+        pipeline = UsageEventPipeline(max_deliveries=5)
+
+        with patch("app.services.usage_events.cache") as cache, \
+                patch.object(pipeline, "_write", side_effect=OperationalError("INSERT", {}, Exception("down"))):
+            cache.bytes_client = redis
+            with pytest.raises(OperationalError):
+                await pipeline._flush_stream()
+
+        redis.pipeline.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_stop_writes_directly_without_redis(self):
+        """Test shutdown drains the ring buffer to Postgres when Redis is down"""
+        events = [UsageEvent(identity_id=uuid.uuid4()) for _ in range(3)]
+        session = _session([(e.identity_id, "verify") for e in events])
+        pipeline = UsageEventPipeline(batch_size=2, session_factory=_session_factory(session))
+
+        with patch("app.services.usage_events.cache") as cache:
+            cache.bytes_client = None
+            for event in events:
+                pipeline.record(event)
+            await pipeline.stop()
+
+        assert pipeline.buffered == 0
+        assert session.commit.await_count == 2  # two batches of at most 2
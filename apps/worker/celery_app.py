@@ -2,28 +2,31 @@
 Celery Application Configuration
 
 Includes distributed tracing integration for end-to-end visibility
-and Prometheus metrics for monitoring and alerting.
+and Prometheus metrics for monitoring and alerting, including per-task
+CPU, memory, DB and HTTP usage (profiling.py).
 """
-import time
+import os
+import sys
 import structlog
 from celery import Celery
 from celery.signals import (
+    celeryd_after_setup,
+    celeryd_init,
     task_prerun,
     task_postrun,
     task_failure,
     task_retry,
     worker_process_init,
+    worker_process_shutdown,
     worker_ready,
     worker_shutting_down,
 )
 
 from config import settings
+from profiling import finish_task_profile, install_sqlalchemy_hooks, start_task_profile
 
 logger = structlog.get_logger()
 
-# Task timing storage (thread-local would be better for production)
-_task_start_times = {}
-
 app = Celery(
     'actorhub_worker',
     broker=settings.CELERY_BROKER_URL,
@@ -37,11 +40,37 @@ app = Celery(
     ]
 )
 
+# Count and time DB queries per task (SQLAlchemy events on every engine)
+install_sqlalchemy_hooks()
+
 
 # =============================================================================
 # Celery Signal Handlers for Tracing & Logging
 # =============================================================================
 
+@celeryd_init.connect
+def init_multiprocess_metrics(**kwargs):
+    """
+    Share metrics between the prefork children and the parent's HTTP server.
+
+    prometheus_client picks its storage when first imported, so the
+    directory is set here, in the parent before the pool forks; samples
+    left by a previous run are removed.
+    """
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR') or settings.PROMETHEUS_MULTIPROC_DIR
+    if not path:
+        return
+    if 'prometheus_client' in sys.modules:
+        logger.warning("prometheus_client already imported, metrics stay per process")
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith('.db'):
+            os.remove(os.path.join(path, name))
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = path
+
+
 @worker_process_init.connect
 def init_worker_tracing(**kwargs):
     """Initialize tracing when worker process starts."""
@@ -60,6 +89,86 @@ def init_worker_tracing(**kwargs):
         logger.info("OpenTelemetry not available, worker tracing disabled")
 
 
+@worker_process_init.connect
+def init_worker_runtime(**kwargs):
+    """Create this worker process's persistent event loop."""
+    from runtime import init_worker_runtime as init_runtime
+
+    init_runtime()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_runtime(**kwargs):
+    """Dispose the shared DB/Qdrant/HTTP clients and close the event loop."""
+    try:
+        from runtime import shutdown_worker_runtime as shutdown_runtime
+
+        shutdown_runtime()
+    except Exception as e:
+        logger.warning(f"Worker runtime shutdown failed: {e}")
+
+    try:
+        from metrics import mark_process_dead
+
+        mark_process_dead(os.getpid())
+    except Exception as e:
+        logger.debug(f"Failed to release worker metrics: {e}")
+
+
+# Queues whose tasks run face inference (tasks.training, tasks.face_recognition)
+FACE_MODEL_QUEUES = {'training', 'face'}
+
+# Queues this worker consumes; recorded in the parent before the pool forks
+_consumed_queues = set()
+
+
+@celeryd_after_setup.connect
+def record_consumed_queues(sender, instance, **kwargs):
+    """Remember the worker's queues (-Q) so children can tell if they need the models."""
+    queues = instance.app.amqp.queues
+    _consumed_queues.update(queues.consume_from or queues)
+
+
+@worker_process_init.connect
+def warm_face_models(**kwargs):
+    """Load and warm the shared face models once per worker process."""
+    if settings.FACE_RECOGNITION_MOCK:
+        return
+
+    api_path = os.path.join(os.path.dirname(__file__), '..', 'api')
+    if api_path not in sys.path:
+        sys.path.insert(0, api_path)
+
+    try:
+        from app.services.inference_pool import inference_pool
+        from app.services.model_registry import model_registry
+    except ImportError as e:
+        logger.info(f"Face models not available in this worker: {e}")
+        return
+
+    # Each prefork child is already one of --concurrency processes: run the
+    # model in this process instead of starting FACE_INFERENCE_WORKERS more
+    # processes per child, each with its own copy of the model
+    inference_pool.workers = 0
+
+    if not settings.FACE_MODEL_WARMUP or not _consumed_queues & FACE_MODEL_QUEUES:
+        return
+
+    try:
+        from db import run_async
+
+        run_async(model_registry.warm_up())
+        logger.info(
+            "Worker face models ready",
+            state=model_registry.state,
+            load_seconds=model_registry.load_seconds,
+            warmup_seconds=model_registry.warmup_seconds,
+        )
+    except Exception as e:
+        # Tasks fall back to loading the models on first use
+        logger.warning(f"Face model warm-up failed: {e}")
+
+
 @worker_ready.connect
 def init_worker_metrics(sender, **kwargs):
     """Initialize Prometheus metrics when worker is ready."""
@@ -101,13 +210,14 @@ def task_prerun_handler(task_id, task, args, kwargs, **rest):
                 correlation_id = parts[1][:16]
         correlation_id = correlation_id or trace_headers.get("correlation_id")
 
-    # Record start time for duration calculation
-    _task_start_times[task_id] = time.time()
+    queue = _get_queue_for_task(task.name)
+
+    # Start CPU/RSS/DB/HTTP accounting (also times the task)
+    start_task_profile(task_id, task.name, queue)
 
     # Record metrics
     try:
         from metrics import record_task_start
-        queue = _get_queue_for_task(task.name)
         record_task_start(task.name, queue)
     except Exception as e:
         logger.debug(f"Failed to record task start metric: {e}")
@@ -122,9 +232,11 @@ def task_prerun_handler(task_id, task, args, kwargs, **rest):
 @task_postrun.connect
 def task_postrun_handler(task_id, task, args, kwargs, retval, state, **rest):
     """Log task completion and record metrics."""
-    # Calculate duration
-    start_time = _task_start_times.pop(task_id, None)
-    duration = time.time() - start_time if start_time else 0
+    # Stop accounting; records the resource histograms
+    profile = finish_task_profile(task_id)
+    duration = profile.duration if profile else 0
+    resources = profile.to_dict() if profile else {}
+    resources.pop("duration_seconds", None)
 
     # Record metrics
     try:
@@ -140,6 +252,7 @@ def task_postrun_handler(task_id, task, args, kwargs, retval, state, **rest):
         task_name=task.name,
         state=state,
         duration_seconds=round(duration, 3),
+        **resources,
     ).info("Task completed")
 
 
@@ -240,6 +353,20 @@ app.conf.beat_schedule = {
         'task': 'tasks.cleanup.update_usage_stats',
         'schedule': 300.0,  # Every 5 minutes
     },
+    'reconcile-usage-stats': {
+        'task': 'tasks.cleanup.reconcile_usage_stats',
+        'schedule': 86400.0,  # Every day - full recount to correct drift
+        'options': {'priority': 9},  # Lowest (Redis broker: 0 is highest)
+    },
+    'create-usage-log-partitions': {
+        'task': 'tasks.cleanup.create_usage_log_partitions',
+        'schedule': 86400.0,  # Every day - keep monthly partitions created ahead
+    },
+    'cleanup-old-logs': {
+        'task': 'tasks.cleanup.cleanup_old_logs',
+        'schedule': 86400.0,  # Every day - archive expired partitions to S3, then drop
+        'options': {'priority': 9},
+    },
     # Payout tasks
     'mature-pending-earnings': {
         'task': 'tasks.payouts.mature_pending_earnings',
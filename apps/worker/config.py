@@ -18,20 +18,73 @@ class WorkerSettings(BaseSettings):
     S3_SECRET_KEY: str = "minioadmin"
     S3_BUCKET_ACTOR_PACKS: str = "actor-packs"
     S3_BUCKET_UPLOADS: str = "uploads"
+    S3_BUCKET_ARCHIVE: str = "archive"
+    S3_REGION: str = "us-east-1"
 
     # Qdrant
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
     QDRANT_COLLECTION: str = "face_embeddings"
+    QDRANT_API_KEY: str = ""
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = True
+    QDRANT_TIMEOUT: float = 10.0
+    QDRANT_MAX_RETRIES: int = 3
+    # Search parameters; keep in line with the API's collection schema (QDRANT_* there)
+    QDRANT_QUANTIZATION: str = "int8"  # none | int8 | binary
+    QDRANT_RESCORE: bool = True  # Re-rank quantized candidates with original vectors
+    QDRANT_OVERSAMPLING: float = 2.0  # Quantized candidates per result before rescoring
+    QDRANT_HNSW_EF_SEARCH: int = 128  # Search beam width
 
     # Face Recognition
     FACE_EMBEDDING_SIZE: int = 512
     FACE_SIMILARITY_THRESHOLD: float = 0.85
+    FACE_DUPLICATE_THRESHOLD: float = 0.85
+
+    # Batch verification (batch_verify task)
+    BATCH_VERIFY_CHUNK_SIZE: int = 64  # Images per embedding batch, Qdrant search and progress update
+    BATCH_VERIFY_DOWNLOAD_CONCURRENCY: int = 16  # Concurrent image downloads per task
+
+    # Image downloads (shared pooled client per worker process)
+    IMAGE_FETCH_TIMEOUT: float = 30.0
+    IMAGE_FETCH_MAX_CONNECTIONS: int = 50
+    IMAGE_FETCH_MAX_CONNECTIONS_PER_HOST: int = 10
+    IMAGE_FETCH_MAX_BYTES: int = 10 * 1024 * 1024  # 10MB per image
+
+    # Registry-wide duplicate audit
+    DUPLICATE_AUDIT_DIR: str = "/tmp/actorhub/duplicate_audit"  # Must be shared by all face workers
+    DUPLICATE_AUDIT_BLOCK_ROWS: int = 8192  # Rows per block task (one block vs. all later rows)
+
+    # Usage statistics (update_usage_stats / reconcile_usage_stats)
+    USAGE_STATS_BATCH_SIZE: int = 10000  # New licenses applied per transaction
+    USAGE_STATS_MAX_BATCHES: int = 50  # Per run; the rest waits for the next run
+    USAGE_STATS_SETTLE_SECONDS: int = 60  # Rows younger than this wait for the next run
+    USAGE_STATS_RECONCILE_BATCH_SIZE: int = 1000  # Identities/listings recounted per transaction
+    USAGE_STATS_RECONCILE_PAUSE_MS: float = 50.0  # Pause between reconciliation batches
+
+    # Usage log retention (monthly usage_logs partitions, see cleanup_old_logs)
+    USAGE_LOG_RETENTION_DAYS: int = 90  # Partitions wholly older than this are archived and dropped
+    USAGE_LOG_PARTITIONS_AHEAD: int = 3  # Monthly partitions kept created past the current month
+    USAGE_LOG_ARCHIVE_PREFIX: str = "usage_logs/"  # Key prefix in S3_BUCKET_ARCHIVE
+    USAGE_LOG_ARCHIVE_FETCH_ROWS: int = 5000  # Rows per server-side cursor fetch while archiving
 
     # Mock Modes (for local dev)
     FACE_RECOGNITION_MOCK: bool = True
     QUALITY_ASSESSMENT_MOCK: bool = True
 
+    # Load and warm face models in each worker process at start (only on
+    # workers that consume the training or face queue)
+    FACE_MODEL_WARMUP: bool = True
+
+    # Prometheus multiprocess mode: prefork children record task metrics, the
+    # parent serves them; every process writes its samples here ("" = off)
+    PROMETHEUS_MULTIPROC_DIR: str = "/tmp/actorhub/prometheus"
+
+    # Per-task stack sampling (CPU/DB/HTTP metrics are always recorded)
+    TASK_PROFILE_SAMPLE_RATE: float = 0.0  # Fraction of tasks run under the stack sampler (0 = off)
+    TASK_PROFILE_INTERVAL_MS: float = 10.0  # Sampling interval
+    TASK_PROFILE_TOP_N: int = 10  # Slowest sampled tasks kept per process; new entries are logged
+
     # External APIs
     ELEVENLABS_API_KEY: str = ""
     REPLICATE_API_TOKEN: str = ""
@@ -3,17 +3,18 @@ Shared Database Connection Pool for Worker Tasks
 
 This module provides a singleton database engine and session factory
 to be shared across all Celery tasks, avoiding the overhead of creating
-new connections for each task.
+new connections for each task. The engine's pool is bound to the worker's
+persistent event loop (see runtime.py).
 """
-import asyncio
 from typing import Optional
 from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config import settings
+from runtime import run_async  # noqa: F401 (re-exported for tasks)
 
 import structlog
 
@@ -28,7 +29,7 @@ def get_engine() -> AsyncEngine:
     """
     Get or create the shared database engine.
 
-    Uses QueuePool for connection pooling in production,
+    Uses an asyncio-adapted QueuePool for connection pooling,
     with reasonable defaults for worker tasks.
     """
     global _engine
@@ -42,7 +43,7 @@ def get_engine() -> AsyncEngine:
         _engine = create_async_engine(
             db_url,
             # Pool configuration for worker tasks
-            poolclass=QueuePool,
+            poolclass=AsyncAdaptedQueuePool,
             pool_size=5,  # Base connections per worker
             max_overflow=10,  # Extra connections under load
             pool_timeout=30,  # Wait time for connection
@@ -105,16 +106,16 @@ async def close_engine():
         logger.info("Worker database engine closed")
 
 
-def run_async(coro):
+def reset_engine():
     """
-    Run an async coroutine in a sync context.
+    Forget the engine without closing its connections.
 
-    Creates a new event loop for each call to ensure
-    clean async context in Celery tasks.
+    Used in a forked worker process: the inherited connections belong to
+    the parent, so the child must not close or reuse them.
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    global _engine, _session_factory
+
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
+    _engine = None
+    _session_factory = None
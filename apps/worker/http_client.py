@@ -0,0 +1,54 @@
+"""
+Shared HTTP Client for Worker Tasks
+
+Like vector_db.py for Qdrant, this module provides one pooled HTTP client
+per worker process for image downloads instead of a new httpx.AsyncClient
+(new TCP + TLS handshake) per image. It reuses the API's SharedHttpClient
+(app/core/http_client.py): keep-alive pool, per-host concurrency limit and
+streamed downloads capped at a byte limit.
+"""
+import os
+import sys
+from typing import Optional
+
+import structlog
+
+from config import settings
+from profiling import http_event_hooks
+
+# Add API app to path for the shared client
+API_PATH = os.path.join(os.path.dirname(__file__), '..', 'api')
+if API_PATH not in sys.path:
+    sys.path.insert(0, API_PATH)
+
+from app.core.http_client import DownloadTooLarge, SharedHttpClient  # noqa: E402,F401
+
+logger = structlog.get_logger()
+
+# Singleton (one httpx client per event loop, see SharedHttpClient)
+_http_client: Optional[SharedHttpClient] = None
+
+
+def get_http_client() -> SharedHttpClient:
+    """Get the shared HTTP client for this worker process."""
+    global _http_client
+
+    if _http_client is None:
+        _http_client = SharedHttpClient(
+            timeout=settings.IMAGE_FETCH_TIMEOUT,
+            max_connections=settings.IMAGE_FETCH_MAX_CONNECTIONS,
+            max_connections_per_host=settings.IMAGE_FETCH_MAX_CONNECTIONS_PER_HOST,
+            event_hooks=http_event_hooks(),
+        )
+        logger.info(
+            "Worker HTTP client created",
+            max_connections=settings.IMAGE_FETCH_MAX_CONNECTIONS,
+        )
+
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client bound to the running loop."""
+    if _http_client is not None:
+        await _http_client.close()
@@ -1,9 +1,17 @@
 """
 Prometheus Metrics for ActorHub Worker
 
-Exposes metrics for task execution, retries, failures, and queue health.
+Exposes metrics for task execution, per-task resource usage, retries,
+failures, and queue health.
+
+Tasks run (and record metrics) in the prefork children while the HTTP
+server runs in the parent, so the worker uses prometheus_client's
+multiprocess mode: celery_app sets PROMETHEUS_MULTIPROC_DIR before this
+module is imported, each process writes its samples there, and the server
+aggregates them with MultiProcessCollector.
 """
 from prometheus_client import Counter, Histogram, Gauge, Info
+import os
 import time
 from functools import wraps
 from typing import Callable
@@ -46,6 +54,52 @@ TASK_FAILURES = Counter(
     ['task_name', 'queue', 'error_type']
 )
 
+# ==============================================================================
+# Task Resource Metrics (see profiling.py)
+# ==============================================================================
+
+TASK_CPU_SECONDS = Histogram(
+    'celery_task_cpu_seconds',
+    'CPU time (user + system) used by the worker process during a task',
+    ['task_name', 'queue'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+)
+
+TASK_RSS_DELTA_BYTES = Histogram(
+    'celery_task_rss_delta_bytes',
+    'Resident memory growth of the worker process during a task',
+    ['task_name', 'queue'],
+    buckets=(0, 1 << 20, 4 << 20, 16 << 20, 64 << 20, 256 << 20, 1 << 30, 4 << 30)
+)
+
+TASK_DB_QUERIES = Histogram(
+    'celery_task_db_queries',
+    'Database queries executed per task',
+    ['task_name', 'queue'],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000, 5000)
+)
+
+TASK_DB_SECONDS = Histogram(
+    'celery_task_db_seconds',
+    'Time spent executing database queries per task',
+    ['task_name', 'queue'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+TASK_HTTP_REQUESTS = Histogram(
+    'celery_task_http_requests',
+    'Outbound HTTP requests made per task',
+    ['task_name', 'queue'],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+)
+
+TASK_HTTP_SECONDS = Histogram(
+    'celery_task_http_seconds',
+    'Time spent waiting on outbound HTTP requests per task',
+    ['task_name', 'queue'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+
 # ==============================================================================
 # Queue Metrics
 # ==============================================================================
@@ -53,19 +107,22 @@ TASK_FAILURES = Counter(
 QUEUE_LENGTH = Gauge(
     'celery_queue_length',
     'Current number of messages in queue',
-    ['queue']
+    ['queue'],
+    multiprocess_mode='mostrecent'
 )
 
 ACTIVE_TASKS = Gauge(
     'celery_active_tasks',
     'Number of currently executing tasks',
-    ['task_name', 'queue']
+    ['task_name', 'queue'],
+    multiprocess_mode='livesum'
 )
 
 RESERVED_TASKS = Gauge(
     'celery_reserved_tasks',
     'Number of tasks reserved by workers',
-    ['queue']
+    ['queue'],
+    multiprocess_mode='mostrecent'
 )
 
 # ==============================================================================
@@ -100,7 +157,8 @@ TRAINING_QUALITY_SCORE = Histogram(
 
 ACTIVE_TRAININGS = Gauge(
     'actor_pack_trainings_active',
-    'Number of currently active trainings'
+    'Number of currently active trainings',
+    multiprocess_mode='livesum'
 )
 
 # ==============================================================================
@@ -232,6 +290,17 @@ def record_task_complete(task_name: str, queue: str = 'default',
     ACTIVE_TASKS.labels(task_name=task_name, queue=queue).dec()
 
 
+def record_task_resources(profile):
+    """Record CPU, memory, DB and HTTP usage from a finished TaskProfile."""
+    labels = {'task_name': profile.task_name, 'queue': profile.queue}
+    TASK_CPU_SECONDS.labels(**labels).observe(profile.cpu_seconds)
+    TASK_RSS_DELTA_BYTES.labels(**labels).observe(max(profile.rss_delta, 0))
+    TASK_DB_QUERIES.labels(**labels).observe(profile.db_queries)
+    TASK_DB_SECONDS.labels(**labels).observe(profile.db_seconds)
+    TASK_HTTP_REQUESTS.labels(**labels).observe(profile.http_requests)
+    TASK_HTTP_SECONDS.labels(**labels).observe(profile.http_seconds)
+
+
 def record_task_retry(task_name: str, queue: str = 'default', reason: str = 'unknown'):
     """Record task retry."""
     TASK_RETRIES.labels(task_name=task_name, queue=queue, reason=reason).inc()
@@ -279,13 +348,31 @@ def start_metrics_server(port: int = 9090):
 
     try:
         from prometheus_client import start_http_server
-        start_http_server(port)
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            from prometheus_client import CollectorRegistry, multiprocess
+
+            # Aggregate every process's samples; Info is not file-backed, so
+            # serve the parent's worker info directly
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            registry.register(WORKER_INFO)
+            start_http_server(port, registry=registry)
+        else:
+            start_http_server(port)
         _metrics_server_started = True
         logger.info(f"Prometheus metrics server started on port {port}")
     except Exception as e:
         logger.warning(f"Failed to start metrics server: {e}")
 
 
+def mark_process_dead(pid: int):
+    """Drop a finished child's live gauges (multiprocess mode only)."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
 def init_worker_info(hostname: str, concurrency: int):
     """Initialize worker info metric."""
     WORKER_INFO.info({
@@ -0,0 +1,291 @@
+"""
+Per-Task Resource Profiling
+
+Measures where each Celery task spends its time, so a slow queue can be
+attributed to CPU, memory, the database or outbound HTTP:
+
+- CPU time and RSS delta, taken at task_prerun / task_postrun
+- DB query count and time, through SQLAlchemy cursor events (every engine)
+- Outbound HTTP request count and time, through httpx event hooks
+  (pass http_event_hooks() to any AsyncClient a task builds); a request
+  is timed until its response body is closed, so streamed downloads
+  count their transfer time, not just the wait for headers
+
+Results go to the celery_task_* histograms in metrics.py.
+
+Optionally (TASK_PROFILE_SAMPLE_RATE > 0) a fraction of tasks run under a
+stack sampler; the slowest TASK_PROFILE_TOP_N sampled tasks per worker
+process are kept, and each one that enters that list has its hottest
+stacks written to the log.
+
+The active profile is per thread: one task at a time per prefork process,
+and the task's event loop (run_async) and SQLAlchemy's greenlets run on
+the same thread as the task.
+"""
+import heapq
+import random
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+import structlog
+
+from config import settings
+
+logger = structlog.get_logger()
+
+STACKS_PER_PROFILE = 5  # Hottest stacks logged per slow task
+MAX_STACK_DEPTH = 64  # Innermost frames kept per sample
+
+_state = threading.local()
+_hooks_installed = False
+
+# Slowest sampled tasks in this process: min-heap of (duration, task_id)
+_slowest: List[tuple] = []
+_slowest_lock = threading.Lock()
+
+
+@dataclass
+class TaskProfile:
+    """Resource usage of one task invocation."""
+
+    task_id: str
+    task_name: str
+    queue: str
+    started: float = field(default_factory=time.perf_counter)
+    cpu_started: float = field(default_factory=time.process_time)
+    rss_started: int = 0
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    http_requests: int = 0
+    http_seconds: float = 0.0
+    duration: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_delta: int = 0
+    sampler: Optional["StackSampler"] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "duration_seconds": round(self.duration, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "rss_delta_bytes": self.rss_delta,
+            "db_queries": self.db_queries,
+            "db_seconds": round(self.db_seconds, 3),
+            "http_requests": self.http_requests,
+            "http_seconds": round(self.http_seconds, 3),
+        }
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        # No procfs (macOS): peak RSS, still shows growth
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_profile() -> Optional[TaskProfile]:
+    """The profile of the task running on this thread, if any."""
+    return getattr(_state, "profile", None)
+
+
+# ==============================================================================
+# Stack Sampler
+# ==============================================================================
+
+def _collapse(frame) -> str:
+    """Format a stack as 'file:function:line;...', outermost first."""
+    frames = []
+    while frame is not None and len(frames) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval from a daemon thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-profiler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+            del frame
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def _record_slowest(profile: TaskProfile, samples: Counter) -> None:
+    """Keep the slowest sampled tasks; log the stacks of each new entry."""
+    entry = (profile.duration, profile.task_id)
+    with _slowest_lock:
+        if len(_slowest) < settings.TASK_PROFILE_TOP_N:
+            heapq.heappush(_slowest, entry)
+        elif _slowest and entry > _slowest[0]:
+            heapq.heapreplace(_slowest, entry)
+        else:
+            return
+        rank = sorted(_slowest, reverse=True).index(entry) + 1
+
+    total = sum(samples.values())
+    logger.warning(
+        "Slow task profile",
+        task_id=profile.task_id,
+        task_name=profile.task_name,
+        rank=rank,
+        samples=total,
+        stacks=[
+            {"samples": count, "share": round(count / total, 3), "stack": stack}
+            for stack, count in samples.most_common(STACKS_PER_PROFILE)
+        ],
+        **profile.to_dict(),
+    )
+
+
+# ==============================================================================
+# Task Lifecycle (called from task_prerun / task_postrun)
+# ==============================================================================
+
+def start_task_profile(task_id: str, task_name: str, queue: str = "default") -> TaskProfile:
+    """Begin profiling the task about to run on this thread."""
+    profile = TaskProfile(
+        task_id=task_id,
+        task_name=task_name,
+        queue=queue,
+        rss_started=_rss_bytes(),
+    )
+
+    rate = settings.TASK_PROFILE_SAMPLE_RATE
+    if rate > 0 and random.random() < rate:
+        profile.sampler = StackSampler(
+            threading.get_ident(), settings.TASK_PROFILE_INTERVAL_MS / 1000
+        ).start()
+
+    _state.profile = profile
+    return profile
+
+
+def finish_task_profile(task_id: str) -> Optional[TaskProfile]:
+    """
+    Finish the profile started for task_id and record its metrics.
+
+    Returns None if no profile was started for this task on this thread.
+    """
+    profile = current_profile()
+    if profile is None or profile.task_id != task_id:
+        return None
+    _state.profile = None
+
+    profile.duration = time.perf_counter() - profile.started
+    profile.cpu_seconds = time.process_time() - profile.cpu_started
+    profile.rss_delta = _rss_bytes() - profile.rss_started
+
+    if profile.sampler is not None:
+        samples = profile.sampler.stop()
+        profile.sampler = None
+        if samples:
+            _record_slowest(profile, samples)
+
+    try:
+        from metrics import record_task_resources
+
+        record_task_resources(profile)
+    except Exception as e:
+        logger.debug(f"Failed to record task resource metrics: {e}")
+
+    return profile
+
+
+# ==============================================================================
+# SQLAlchemy and httpx Hooks
+# ==============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_profile() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.db_queries += 1
+        profile.db_seconds += time.perf_counter() - started
+
+
+def install_sqlalchemy_hooks() -> None:
+    """Time every cursor execution on every engine in this process."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _hooks_installed = True
+
+
+async def _on_http_request(request) -> None:
+    if current_profile() is not None:
+        request.extensions["profile_started"] = time.perf_counter()
+
+
+class _TimedBody(httpx.AsyncByteStream):
+    """Response byte stream that adds the request's time to a profile when closed."""
+
+    def __init__(self, stream, profile: TaskProfile, started: float):
+        self._stream = stream
+        self._profile = profile
+        self._started = started
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._profile is not None:
+                self._profile.http_seconds += time.perf_counter() - self._started
+                self._profile = None
+
+
+async def _on_http_response(response) -> None:
+    # Runs once headers arrive; the body (read by httpx, or streamed by the
+    # caller) is timed by wrapping the stream, recorded when it is closed
+    profile = current_profile()
+    started = response.request.extensions.get("profile_started")
+    if profile is not None and started is not None:
+        profile.http_requests += 1
+        response.stream = _TimedBody(response.stream, profile, started)
+
+
+def http_event_hooks() -> Dict[str, list]:
+    """event_hooks for an httpx.AsyncClient, timing requests for the running task."""
+    return {"request": [_on_http_request], "response": [_on_http_response]}
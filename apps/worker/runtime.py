@@ -0,0 +1,91 @@
+"""
+Worker Async Runtime
+
+One event loop per worker process, created at worker_process_init and
+reused by every task through run_async. The shared clients (database
+engine in db.py, Qdrant in vector_db.py, HTTP in http_client.py) bind
+their connection pools to the loop they were first used on, so a
+persistent loop is what lets those pools actually be reused across tasks
+instead of rebuilt (and leaked) on every invocation.
+
+At worker_process_shutdown the clients are disposed on that same loop
+and the loop is closed.
+"""
+import asyncio
+import os
+from typing import Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Process-wide loop and the pid that created it (prefork children must not
+# inherit the parent's loop or the connections bound to it)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get or create the event loop for this worker process."""
+    global _loop, _loop_pid
+
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+        logger.info("Worker event loop created", pid=_loop_pid)
+
+    return _loop
+
+
+def run_async(coro):
+    """
+    Run an async coroutine in a sync context on the worker's loop.
+
+    The loop stays open between calls, so pooled connections opened by
+    one task are reused by the next.
+    """
+    return get_loop().run_until_complete(coro)
+
+
+def init_worker_runtime() -> None:
+    """
+    Set up the async runtime in a freshly forked worker process.
+
+    Clients inherited from the parent (e.g. created while importing tasks)
+    hold sockets that belong to the parent's loop; drop them without
+    closing so the child opens its own.
+    """
+    import db
+
+    db.reset_engine()
+    get_loop()
+
+
+async def _close_clients() -> None:
+    from db import close_engine
+    from http_client import close_http_client
+    from vector_db import close_qdrant
+
+    for close in (close_engine, close_qdrant, close_http_client):
+        try:
+            await close()
+        except Exception as e:
+            logger.warning(f"Failed to close {close.__name__}: {e}")
+
+
+def shutdown_worker_runtime() -> None:
+    """Dispose the shared clients and close the worker's event loop."""
+    global _loop, _loop_pid
+
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        return
+
+    try:
+        _loop.run_until_complete(_close_clients())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+        _loop = None
+        _loop_pid = None
+        logger.info("Worker event loop closed")
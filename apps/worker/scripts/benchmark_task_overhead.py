@@ -0,0 +1,142 @@
+"""
+Benchmark: per-task event loop + engine vs. persistent worker runtime
+
+Measures the fixed cost a Celery task pays around its async body
+(p50/p95/p99 per call and calls/s), without a broker, for:
+
+  noop_per_task  - new event loop per call, trivial coroutine (previous run_async)
+  noop_runtime   - persistent worker loop, trivial coroutine (runtime.run_async)
+  db_per_task    - new loop + create_async_engine per call, SELECT 1 (previous
+                   cleanup/payouts/notifications path; engine never disposed)
+  db_runtime     - persistent loop + pooled engine from db.py, SELECT 1
+
+The db_* modes need a reachable PostgreSQL (DATABASE_URL or --database-url);
+they are skipped with --no-db.
+
+Usage:
+    python scripts/benchmark_task_overhead.py --calls 500
+    python scripts/benchmark_task_overhead.py --no-db --calls 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _summary(name, latencies, wall):
+    return {
+        "mode": name,
+        "calls": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "calls_per_s": round(len(latencies) / wall, 1),
+    }
+
+
+def _run(name, call, calls, warmup):
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_started)
+    return _summary(name, latencies, time.perf_counter() - started)
+
+
+def _per_task_loop(coro):
+    """The previous pattern: a fresh loop for every task invocation."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def _noop():
+    await asyncio.sleep(0)
+
+
+async def _select_per_task(database_url):
+    engine = create_async_engine(database_url)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as db:
+        await db.execute(text("SELECT 1"))
+
+
+async def _select_pooled():
+    from db import get_db_session
+
+    async with get_db_session() as db:
+        await db.execute(text("SELECT 1"))
+
+
+def main(args):
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from config import settings
+    from runtime import run_async, shutdown_worker_runtime
+
+    database_url = settings.DATABASE_URL
+    if "postgresql://" in database_url and "+asyncpg" not in database_url:
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
+
+    results = [
+        _run("noop_per_task", lambda: _per_task_loop(_noop()), args.calls, args.warmup),
+        _run("noop_runtime", lambda: run_async(_noop()), args.calls, args.warmup),
+    ]
+
+    if not args.no_db:
+        # Bounded: every call leaks an engine (and its connection) like the old tasks did
+        db_calls = min(args.calls, args.max_leaked_engines)
+        results.append(
+            _run("db_per_task", lambda: _per_task_loop(_select_per_task(database_url)), db_calls, 0)
+        )
+        results.append(_run("db_runtime", lambda: run_async(_select_pooled()), args.calls, args.warmup))
+
+    shutdown_worker_runtime()
+
+    for row in results:
+        print(
+            f"{row['mode']:<14} p50={row['p50_ms']:>8}ms  p95={row['p95_ms']:>8}ms  "
+            f"p99={row['p99_ms']:>8}ms  {row['calls_per_s']:>9} calls/s"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--database-url", help="Override DATABASE_URL")
+    parser.add_argument("--no-db", action="store_true", help="Only measure event loop overhead")
+    parser.add_argument(
+        "--max-leaked-engines", type=int, default=50,
+        help="Cap on db_per_task calls (each leaves an engine and connection open)",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    main(parser.parse_args())
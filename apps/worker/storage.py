@@ -0,0 +1,44 @@
+"""
+Shared S3 Client for Worker Tasks
+
+One boto3 S3 client per worker process (S3 or MinIO, path-style
+addressing), for tasks that write to object storage such as the usage log
+archive. boto3 is blocking: call it through asyncio.to_thread from async
+task code.
+"""
+from typing import Optional
+
+import boto3
+import structlog
+from botocore.config import Config
+
+from config import settings
+
+logger = structlog.get_logger()
+
+# Singleton (boto3 clients are thread-safe and hold no event loop state)
+_s3_client: Optional[object] = None
+
+
+def get_s3_client():
+    """Get the shared S3 client for this worker process."""
+    global _s3_client
+
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT or None,
+            aws_access_key_id=settings.S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.S3_SECRET_KEY or None,
+            region_name=settings.S3_REGION,
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path"},  # Required for MinIO
+                connect_timeout=10,
+                read_timeout=60,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
+        )
+        logger.info("Worker S3 client created", endpoint=settings.S3_ENDPOINT)
+
+    return _s3_client
@@ -8,15 +8,21 @@ FIXED: Now includes distributed locking to prevent concurrent execution
 of scheduled tasks.
 """
 import asyncio
+import gzip
+import json
+import re
+import tempfile
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import structlog
 import redis
 
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
 from celery_app import app
 from config import settings
+from db import get_db_session, run_async
 from tracing import trace_task, add_task_attribute, get_trace_headers_for_subtask
 
 logger = structlog.get_logger()
@@ -81,12 +87,7 @@ def cleanup_expired_downloads(self, trace_headers: Optional[Dict] = None) -> Dic
         with trace_task("cleanup_expired_downloads", trace_headers) as span:
             add_task_attribute("retry_count", self.request.retries)
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(_cleanup_expired_downloads_async())
-            finally:
-                loop.close()
+            result = run_async(_cleanup_expired_downloads_async())
 
             add_task_attribute("cleaned_count", result.get("cleaned", 0))
             logger.info("Expired downloads cleanup completed", cleaned=result.get("cleaned", 0))
@@ -103,14 +104,8 @@ def cleanup_expired_downloads(self, trace_headers: Optional[Dict] = None) -> Dic
 
 async def _cleanup_expired_downloads_async() -> Dict:
     """Async cleanup implementation"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
-
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
     cleaned = 0
-    async with async_session() as db:
+    async with get_db_session() as db:
         # Clean up expired download tokens
         result = await db.execute(
             "DELETE FROM download_tokens WHERE expires_at < NOW()"
@@ -154,7 +149,11 @@ def cleanup_orphan_files(self, trace_headers: Optional[Dict] = None) -> Dict:
 @app.task(bind=True, max_retries=2, default_retry_delay=30)
 def update_usage_stats(self, trace_headers: Optional[Dict] = None) -> Dict:
     """
-    Update aggregated usage statistics.
+    Update aggregated usage statistics incrementally.
+
+    Only licenses created since the stored high-water mark are counted, so
+    the cost follows recent activity rather than total history. Drift
+    (deleted rows, late commits) is corrected by reconcile_usage_stats.
 
     FIXED: Uses distributed locking to prevent concurrent execution.
     """
@@ -168,13 +167,10 @@ def update_usage_stats(self, trace_headers: Optional[Dict] = None) -> Dict:
         with trace_task("update_usage_stats", trace_headers) as span:
             add_task_attribute("retry_count", self.request.retries)
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(_update_usage_stats_async())
-            finally:
-                loop.close()
-            logger.info("Usage statistics updated successfully")
+            result = run_async(_update_usage_stats_async())
+
+            add_task_attribute("rows_applied", result.get("rows_applied", 0))
+            logger.info("Usage statistics updated successfully", **result)
             return result
     except Exception as e:
         release_distributed_lock(lock_name)
@@ -186,43 +182,331 @@ def update_usage_stats(self, trace_headers: Optional[Dict] = None) -> Dict:
         release_distributed_lock(lock_name)
 
 
-async def _update_usage_stats_async() -> Dict:
-    """Async stats update"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
+# Watermark over licenses (created_at, id) -> listings.license_count.
+# identities.total_verifications needs no watermark: the API's usage event
+# flusher adds each verify row's delta in the same transaction as its INSERT.
+LICENSE_COUNT_WATERMARK = "listing_license_count"
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+LOCK_NOT_AVAILABLE = "55P03"  # SQLSTATE raised when lock_timeout expires
 
-    async with async_session() as db:
-        # Update identity verification counts
-        await db.execute("""
-            UPDATE identities i SET
-                total_verifications = (
-                    SELECT COUNT(*) FROM usage_logs WHERE identity_id = i.id
-                ),
-                updated_at = NOW()
-        """)
 
-        # Update listing license counts
-        await db.execute("""
-            UPDATE marketplace_listings l SET
-                license_count = (
-                    SELECT COUNT(*) FROM licenses WHERE listing_id = l.id
-                ),
+async def _lock_watermark(db, name: str) -> Optional[Dict]:
+    """Lock and return the watermark row (serializes with reconciliation)."""
+    result = await db.execute(
+        text("""
+            SELECT last_created_at, last_id FROM stats_watermarks
+            WHERE name = :name
+            FOR UPDATE
+        """),
+        {"name": name}
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return {"after_created_at": row.last_created_at, "after_id": row.last_id}
+
+
+async def _bootstrap_license_watermark(db, settled_before: datetime) -> int:
+    """
+    First run: recount every listing up to the newest settled license and
+    start the watermark there, in one transaction.
+    """
+    result = await db.execute(
+        text("""
+            SELECT created_at, id FROM licenses
+            WHERE created_at < :settled_before
+            ORDER BY created_at DESC, id DESC
+            LIMIT 1
+        """),
+        {"settled_before": settled_before}
+    )
+    newest = result.first()
+    mark = {
+        "mark_created_at": newest.created_at if newest else datetime(1970, 1, 1),
+        "mark_id": newest.id if newest else NIL_UUID,
+    }
+
+    await db.execute(
+        text("""
+            INSERT INTO stats_watermarks (name, last_created_at, last_id, rows_applied, reconciled_at, updated_at)
+            VALUES (:name, :mark_created_at, :mark_id, 0, NOW(), NOW())
+            ON CONFLICT (name) DO NOTHING
+        """),
+        {"name": LICENSE_COUNT_WATERMARK, **mark}
+    )
+    result = await db.execute(
+        text("""
+            UPDATE listings l SET
+                license_count = c.total,
                 updated_at = NOW()
-        """)
+            FROM (
+                SELECT l2.id, COUNT(lc.id) AS total
+                FROM listings l2
+                LEFT JOIN licenses lc
+                    ON lc.identity_id = l2.identity_id
+                    AND (lc.created_at, lc.id) <= (:mark_created_at, :mark_id)
+                GROUP BY l2.id
+            ) c
+            WHERE l.id = c.id AND l.license_count IS DISTINCT FROM c.total
+        """),
+        mark
+    )
+    return result.rowcount
+
+
+async def _update_usage_stats_async(
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> Dict:
+    """
+    Apply license count deltas since the watermark, one batch per transaction.
 
-        await db.commit()
+    Each batch takes the next ``batch_size`` licenses after the mark (keyset
+    on created_at, id; idx_license_created_id), adds their per-identity
+    counts to listings in one UPDATE ... FROM, and moves the mark to the
+    batch's last row. Rows newer than USAGE_STATS_SETTLE_SECONDS are left
+    for the next run so transactions still in flight aren't skipped.
+    """
+    batch_size = batch_size or settings.USAGE_STATS_BATCH_SIZE
+    max_batches = max_batches or settings.USAGE_STATS_MAX_BATCHES
+    settled_before = datetime.utcnow() - timedelta(seconds=settings.USAGE_STATS_SETTLE_SECONDS)
+
+    rows_applied = 0
+    listings_updated = 0
+    batches = 0
+
+    while batches < max_batches:
+        async with get_db_session() as db:
+            mark = await _lock_watermark(db, LICENSE_COUNT_WATERMARK)
+            if mark is None:
+                listings_updated += await _bootstrap_license_watermark(db, settled_before)
+                await db.commit()
+                logger.info("Usage stats watermark initialized", listings_updated=listings_updated)
+                break
+
+            result = await db.execute(
+                text("""
+                    SELECT created_at, id, COUNT(*) OVER () AS batch_rows
+                    FROM (
+                        SELECT created_at, id FROM licenses
+                        WHERE (created_at, id) > (:after_created_at, :after_id)
+                        AND created_at < :settled_before
+                        ORDER BY created_at, id
+                        LIMIT :batch_size
+                    ) batch
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1
+                """),
+                {**mark, "settled_before": settled_before, "batch_size": batch_size}
+            )
+            upto = result.first()
+            if upto is None:
+                break
+
+            bounds = {**mark, "upto_created_at": upto.created_at, "upto_id": upto.id}
+            result = await db.execute(
+                text("""
+                    UPDATE listings l SET
+                        license_count = COALESCE(l.license_count, 0) + d.delta,
+                        updated_at = NOW()
+                    FROM (
+                        SELECT identity_id, COUNT(*) AS delta
+                        FROM licenses
+                        WHERE (created_at, id) > (:after_created_at, :after_id)
+                        AND (created_at, id) <= (:upto_created_at, :upto_id)
+                        GROUP BY identity_id
+                    ) d
+                    WHERE l.identity_id = d.identity_id
+                """),
+                bounds
+            )
+            listings_updated += result.rowcount
+
+            await db.execute(
+                text("""
+                    UPDATE stats_watermarks SET
+                        last_created_at = :upto_created_at,
+                        last_id = :upto_id,
+                        rows_applied = rows_applied + :rows,
+                        updated_at = NOW()
+                    WHERE name = :name
+                """),
+                {**bounds, "rows": upto.batch_rows, "name": LICENSE_COUNT_WATERMARK}
+            )
+            await db.commit()
 
-    logger.info("Usage statistics updated")
-    return {'success': True}
+        rows_applied += upto.batch_rows
+        batches += 1
+        if upto.batch_rows < batch_size:
+            break
+
+    return {
+        'success': True,
+        'rows_applied': rows_applied,
+        'listings_updated': listings_updated,
+        'batches': batches,
+    }
+
+
+@app.task(bind=True, max_retries=1, default_retry_delay=600)
+def reconcile_usage_stats(self, trace_headers: Optional[Dict] = None) -> Dict:
+    """
+    Recompute usage counters from scratch to correct incremental drift.
+
+    Runs daily at low priority: keyset batches in short transactions that
+    give up on row locks quickly, a pause between batches, and only rows
+    whose count actually changed are rewritten.
+    """
+    lock_name = "reconcile_usage_stats"
+
+    if not acquire_distributed_lock(lock_name, ttl_seconds=14400):  # 4 hours
+        logger.info("Usage stats reconciliation already running, skipping")
+        return {"success": True, "message": "Already running"}
+
+    try:
+        with trace_task("reconcile_usage_stats", trace_headers) as span:
+            add_task_attribute("retry_count", self.request.retries)
+
+            result = run_async(_reconcile_usage_stats_async())
+
+            add_task_attribute("identities_fixed", result.get("identities_fixed", 0))
+            add_task_attribute("listings_fixed", result.get("listings_fixed", 0))
+            logger.info("Usage statistics reconciled", **result)
+            return result
+    except Exception as e:
+        release_distributed_lock(lock_name)
+        logger.error("Usage stats reconciliation failed", error=str(e))
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=600)
+        raise
+    finally:
+        release_distributed_lock(lock_name)
+
+
+async def _next_keyset_bound(db, table: str, after: str, batch_size: int):
+    """Last id of the next batch of ``table`` rows after ``after`` (None when done)."""
+    result = await db.execute(
+        text(f"""
+            SELECT id FROM (
+                SELECT id FROM {table} WHERE id > :after ORDER BY id LIMIT :batch_size
+            ) batch
+            ORDER BY id DESC
+            LIMIT 1
+        """),
+        {"after": after, "batch_size": batch_size}
+    )
+    return result.scalar()
+
+
+async def _reconcile_identities_batch(db, after: str, upto) -> int:
+    result = await db.execute(
+        text("""
+            UPDATE identities i SET
+                total_verifications = c.total,
+                updated_at = NOW()
+            FROM (
+                -- Retained rows plus those in archived (dropped) partitions
+                SELECT b.id, COUNT(u.id) + COALESCE(MAX(a.verifications), 0) AS total
+                FROM identities b
+                LEFT JOIN usage_logs u ON u.identity_id = b.id AND u.action = 'verify'
+                LEFT JOIN usage_log_archived_counts a ON a.identity_id = b.id
+                WHERE b.id > :after AND b.id <= :upto
+                GROUP BY b.id
+            ) c
+            WHERE i.id = c.id AND i.total_verifications IS DISTINCT FROM c.total
+        """),
+        {"after": after, "upto": upto}
+    )
+    return result.rowcount
+
+
+async def _reconcile_listings_batch(db, after: str, upto) -> int:
+    # Count up to the watermark under its lock, so the next incremental run
+    # adds exactly the rows after it
+    mark = await _lock_watermark(db, LICENSE_COUNT_WATERMARK)
+    if mark is None:
+        return 0  # update_usage_stats bootstraps with a full count
+
+    result = await db.execute(
+        text("""
+            UPDATE listings l SET
+                license_count = c.total,
+                updated_at = NOW()
+            FROM (
+                SELECT b.id, COUNT(lc.id) AS total
+                FROM listings b
+                LEFT JOIN licenses lc
+                    ON lc.identity_id = b.identity_id
+                    AND (lc.created_at, lc.id) <= (:after_created_at, :after_id)
+                WHERE b.id > :after AND b.id <= :upto
+                GROUP BY b.id
+            ) c
+            WHERE l.id = c.id AND l.license_count IS DISTINCT FROM c.total
+        """),
+        {**mark, "after": after, "upto": upto}
+    )
+    return result.rowcount
+
+
+async def _reconcile_usage_stats_async(
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> Dict:
+    """Recount identities.total_verifications and listings.license_count in batches."""
+    batch_size = batch_size or settings.USAGE_STATS_RECONCILE_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.USAGE_STATS_RECONCILE_PAUSE_MS / 1000
+
+    fixed = {"identities": 0, "listings": 0}
+    skipped = 0
+
+    for table, reconcile_batch in (
+        ("identities", _reconcile_identities_batch),
+        ("listings", _reconcile_listings_batch),
+    ):
+        after = NIL_UUID
+        while True:
+            upto = None
+            try:
+                async with get_db_session() as db:
+                    # Yield to request traffic: give up on a busy row instead of queueing behind it
+                    await db.execute(text("SET LOCAL lock_timeout = '2s'"))
+                    upto = await _next_keyset_bound(db, table, after, batch_size)
+                    if upto is not None:
+                        fixed[table] += await reconcile_batch(db, after, upto)
+            except DBAPIError as e:
+                if upto is None or getattr(e.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                    raise
+                skipped += 1
+                logger.warning(f"Skipped {table} reconciliation batch", after=str(after), error=str(e))
+
+            if upto is None:
+                break
+            after = upto
+            await asyncio.sleep(pause_seconds)
+
+    async with get_db_session() as db:
+        await db.execute(
+            text("""
+                UPDATE stats_watermarks SET rows_applied = 0, reconciled_at = NOW()
+                WHERE name = :name
+            """),
+            {"name": LICENSE_COUNT_WATERMARK}
+        )
+
+    return {
+        'success': True,
+        'identities_fixed': fixed["identities"],
+        'listings_fixed': fixed["listings"],
+        'batches_skipped': skipped,
+    }
 
 
 @app.task(bind=True, max_retries=2, default_retry_delay=120)
 def cleanup_old_logs(self, trace_headers: Optional[Dict] = None) -> Dict:
     """
-    Archive and clean up old usage logs.
+    Archive expired usage_logs partitions to S3, then drop them.
 
     FIXED: Uses distributed locking to prevent concurrent execution.
     """
@@ -236,15 +520,15 @@ def cleanup_old_logs(self, trace_headers: Optional[Dict] = None) -> Dict:
         with trace_task("cleanup_old_logs", trace_headers) as span:
             add_task_attribute("retry_count", self.request.retries)
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(_cleanup_old_logs_async())
-            finally:
-                loop.close()
+            result = run_async(_cleanup_old_logs_async())
 
             add_task_attribute("cleaned_count", result.get("cleaned", 0))
-            logger.info("Old logs cleanup completed", cleaned=result.get("cleaned", 0))
+            add_task_attribute("partitions_dropped", len(result.get("partitions", [])))
+            logger.info(
+                "Old logs cleanup completed",
+                cleaned=result.get("cleaned", 0),
+                partitions=result.get("partitions", []),
+            )
             return result
     except Exception as e:
         release_distributed_lock(lock_name)
@@ -256,28 +540,252 @@ def cleanup_old_logs(self, trace_headers: Optional[Dict] = None) -> Dict:
         release_distributed_lock(lock_name)
 
 
-async def _cleanup_old_logs_async() -> Dict:
-    """Async log cleanup"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
+USAGE_LOGS_DEFAULT_PARTITION = "usage_logs_default"
+_PARTITION_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def _add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def usage_log_partition_name(month: datetime) -> str:
+    """Name of the usage_logs partition holding ``month`` (usage_logs_YYYY_MM)."""
+    return f"usage_logs_{month:%Y_%m}"
+
+
+async def _list_usage_log_partitions(db) -> List[Dict]:
+    """Range partitions of usage_logs with their bounds, oldest first (default excluded)."""
+    result = await db.execute(
+        text("""
+            SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'usage_logs'::regclass
+        """)
+    )
+
+    partitions = []
+    for row in result.all():
+        match = _PARTITION_BOUND.search(row.bound)
+        if match is None:
+            continue  # DEFAULT
+        partitions.append({
+            "name": row.name,
+            "lower": datetime.fromisoformat(match.group(1)),
+            "upper": datetime.fromisoformat(match.group(2)),
+        })
+    return sorted(partitions, key=lambda partition: partition["lower"])
+
+
+async def _cleanup_old_logs_async(retention_days: Optional[int] = None) -> Dict:
+    """
+    Archive and drop every partition that ends before the retention cutoff.
+
+    Each partition is written to S3 and verified before it is dropped; a
+    failure leaves it attached for the next run. Rows that landed in
+    usage_logs_default are left alone.
+    """
+    retention_days = retention_days or settings.USAGE_LOG_RETENTION_DAYS
+    # created_at is naive UTC
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=retention_days)
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with get_db_session() as db:
+        partitions = await _list_usage_log_partitions(db)
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
     cleaned = 0
+    dropped = []
+    for partition in partitions:
+        if partition["upper"] > cutoff:
+            break
 
-    async with async_session() as db:
-        # Use parameterized query to prevent SQL injection
-        result = await db.execute(
-            text("DELETE FROM usage_logs WHERE created_at < :cutoff"),
-            {"cutoff": cutoff}
-        )
-        cleaned = result.rowcount
-        await db.commit()
+        archive = await _archive_usage_log_partition(partition)
+        cleaned += await _drop_usage_log_partition(partition, archive["rows"])
+        dropped.append(partition["name"])
+        logger.info("Usage log partition archived and dropped", **archive)
 
     logger.info(f"Cleaned up {cleaned} old log entries")
-    return {'success': True, 'cleaned': cleaned}
+    return {'success': True, 'cleaned': cleaned, 'partitions': dropped}
+
+
+def _upload_archive(fileobj, key: str, metadata: Dict[str, str]) -> Dict:
+    """Upload an archive file and return its HEAD (runs in a thread)."""
+    from storage import get_s3_client
+
+    s3 = get_s3_client()
+    s3.upload_fileobj(
+        fileobj,
+        settings.S3_BUCKET_ARCHIVE,
+        key,
+        ExtraArgs={"ContentType": "application/gzip", "Metadata": metadata},
+    )
+    return s3.head_object(Bucket=settings.S3_BUCKET_ARCHIVE, Key=key)
+
+
+async def _archive_usage_log_partition(partition: Dict) -> Dict:
+    """
+    Stream one partition to S3 as gzipped NDJSON (one row per line).
+
+    Rows are read through a server-side cursor into a temporary file, so
+    memory stays flat however large the month. The upload is checked
+    against the local size and row count before the caller may drop the
+    partition; re-running overwrites the same key.
+    """
+    name = partition["name"]
+    key = f"{settings.USAGE_LOG_ARCHIVE_PREFIX}{name}.ndjson.gz"
+    rows = 0
+
+    with tempfile.TemporaryFile() as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            async with get_db_session() as db:
+                result = await db.stream(
+                    text(f"SELECT * FROM {name}"),
+                    execution_options={"yield_per": settings.USAGE_LOG_ARCHIVE_FETCH_ROWS},
+                )
+                async for row in result.mappings():
+                    archive.write(json.dumps(dict(row), default=str).encode() + b"\n")
+                    rows += 1
+
+        size = raw.tell()
+        raw.seek(0)
+        head = await asyncio.to_thread(
+            _upload_archive,
+            raw,
+            key,
+            {
+                "rows": str(rows),
+                "range-from": partition["lower"].isoformat(),
+                "range-to": partition["upper"].isoformat(),
+            },
+        )
+
+    if head.get("ContentLength") != size or head.get("Metadata", {}).get("rows") != str(rows):
+        raise RuntimeError(f"Archive of {name} failed verification ({key})")
+
+    return {"partition": name, "key": key, "rows": rows, "bytes": size}
+
+
+async def _drop_usage_log_partition(partition: Dict, archived_rows: int) -> int:
+    """
+    Detach and drop an archived partition, keeping its verify counts.
+
+    The partition is locked against writes first, so the count checked
+    against the archive is the count that gets dropped. Returns rows dropped.
+    """
+    name = partition["name"]
+
+    async with get_db_session() as db:
+        # Don't queue request traffic behind us; the next run retries
+        await db.execute(text("SET LOCAL lock_timeout = '5s'"))
+        await db.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+
+        rows = (await db.execute(text(f"SELECT COUNT(*) FROM {name}"))).scalar()
+        if rows != archived_rows:
+            raise RuntimeError(
+                f"{name} has {rows} rows but {archived_rows} were archived; will re-archive"
+            )
+
+        # Dropped history still counts toward identities.total_verifications
+        await db.execute(
+            text(f"""
+                INSERT INTO usage_log_archived_counts (identity_id, verifications, updated_at)
+                SELECT identity_id, COUNT(*), NOW()
+                FROM {name}
+                WHERE action = 'verify' AND identity_id IS NOT NULL
+                GROUP BY identity_id
+                ON CONFLICT (identity_id) DO UPDATE SET
+                    verifications = usage_log_archived_counts.verifications + EXCLUDED.verifications,
+                    updated_at = NOW()
+            """)
+        )
+        await db.execute(text(f"ALTER TABLE usage_logs DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+
+    return rows
+
+
+@app.task(bind=True, max_retries=2, default_retry_delay=300)
+def create_usage_log_partitions(self, trace_headers: Optional[Dict] = None) -> Dict:
+    """Create monthly usage_logs partitions ahead of time."""
+    lock_name = "create_usage_log_partitions"
+
+    if not acquire_distributed_lock(lock_name, ttl_seconds=600):
+        logger.info("Usage log partition creation already running, skipping")
+        return {"success": True, "message": "Already running"}
+
+    try:
+        with trace_task("create_usage_log_partitions", trace_headers) as span:
+            add_task_attribute("retry_count", self.request.retries)
+
+            result = run_async(_create_usage_log_partitions_async())
+
+            add_task_attribute("partitions_created", len(result.get("created", [])))
+            logger.info("Usage log partitions checked", **result)
+            return result
+    except Exception as e:
+        release_distributed_lock(lock_name)
+        logger.error("Usage log partition creation failed", error=str(e))
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=300)
+        raise
+    finally:
+        release_distributed_lock(lock_name)
+
+
+async def _create_usage_log_partitions_async(ahead: Optional[int] = None) -> Dict:
+    """Ensure a partition exists for this month and the next ``ahead`` months."""
+    if ahead is None:
+        ahead = settings.USAGE_LOG_PARTITIONS_AHEAD
+    current = datetime.now(timezone.utc).replace(
+        tzinfo=None, day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+    async with get_db_session() as db:
+        existing = {partition["lower"] for partition in await _list_usage_log_partitions(db)}
+
+    created = []
+    for offset in range(ahead + 1):
+        month = _add_months(current, offset)
+        if month in existing:
+            continue
+
+        async with get_db_session() as db:
+            await _create_usage_log_partition(db, month)
+        created.append(usage_log_partition_name(month))
+
+    return {'success': True, 'created': created}
+
+
+async def _create_usage_log_partition(db, month: datetime) -> None:
+    """
+    Create and attach the partition for ``month``.
+
+    Rows for that month already in usage_logs_default (inserted while the
+    partition was missing) are moved into it first; Postgres refuses to
+    attach a range the default partition still holds rows for.
+    """
+    name = usage_log_partition_name(month)
+    lower, upper = month, _add_months(month, 1)
+
+    await db.execute(text("SET LOCAL lock_timeout = '5s'"))
+    await db.execute(text(
+        f"CREATE TABLE {name} (LIKE usage_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await db.execute(
+        text(f"""
+            WITH moved AS (
+                DELETE FROM {USAGE_LOGS_DEFAULT_PARTITION}
+                WHERE created_at >= :lower AND created_at < :upper
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """),
+        {"lower": lower, "upper": upper}
+    )
+    await db.execute(text(
+        f"ALTER TABLE usage_logs ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
 
 
 @app.task(bind=True, max_retries=2, default_retry_delay=60)
@@ -297,12 +805,7 @@ def check_license_expirations(self, trace_headers: Optional[Dict] = None) -> Dic
         with trace_task("check_license_expirations", trace_headers) as span:
             add_task_attribute("retry_count", self.request.retries)
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(_check_expirations_async())
-            finally:
-                loop.close()
+            result = run_async(_check_expirations_async())
 
             add_task_attribute("notified_count", result.get("notified", 0))
             logger.info("License expiration check completed", notified=result.get("notified", 0))
@@ -319,20 +822,15 @@ def check_license_expirations(self, trace_headers: Optional[Dict] = None) -> Dic
 
 async def _check_expirations_async() -> Dict:
     """Async expiration check"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
     from tasks.notifications import send_email
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
     expiring_soon = datetime.now(timezone.utc) + timedelta(days=7)
     notified = 0
 
     # Get trace headers for sub-tasks
     child_headers = get_trace_headers_for_subtask()
 
-    async with async_session() as db:
+    async with get_db_session() as db:
         # Use parameterized query to prevent SQL injection
         result = await db.execute(
             text("""
@@ -5,15 +5,34 @@ Handles face embedding extraction, verification, and registration
 with distributed tracing for end-to-end visibility.
 """
 import asyncio
-from typing import List, Dict, Optional
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Dict, Optional, Tuple
 import uuid
 import structlog
 import httpx
 import numpy as np
+from celery import chord, group
+from qdrant_client.models import SearchRequest
+from sqlalchemy import text
+
+# Add API app to path for the face recognition service
+API_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'api')
+if API_PATH not in sys.path:
+    sys.path.insert(0, API_PATH)
 
 from celery_app import app
 from config import settings
+from db import get_db_session, run_async
+from profiling import http_event_hooks
 from tracing import trace_task, add_task_attribute
+from vector_db import get_qdrant, search_params
+from http_client import DownloadTooLarge, get_http_client
 
 logger = structlog.get_logger()
 
@@ -32,12 +51,7 @@ def extract_embedding(
     with trace_task("extract_embedding", trace_headers, {"url": image_url[:200]}) as span:
         add_task_attribute("retry_count", self.request.retries)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(_extract_embedding_async(image_url))
-        finally:
-            loop.close()
+        result = run_async(_extract_embedding_async(image_url))
 
         add_task_attribute("face_detected", result.get("face_detected", False))
         add_task_attribute("success", result.get("success", False))
@@ -65,7 +79,7 @@ def extract_embedding(
 async def _extract_embedding_async(image_url: str) -> Dict:
     """Async embedding extraction"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, event_hooks=http_event_hooks()) as client:
             response = await client.get(image_url)
             if response.status_code != 200:
                 return {'success': False, 'error': 'Failed to fetch image'}
@@ -94,6 +108,12 @@ def batch_verify(
     """
     Batch verify multiple images against the identity database.
 
+    Images are processed in chunks of BATCH_VERIFY_CHUNK_SIZE. After each
+    chunk its results are published with state PROGRESS: AsyncResult.info
+    holds that chunk only (results, starting at index offset) plus the
+    processed/total/matched counters, so callers collect the chunks as
+    they arrive instead of re-reading every result so far each time.
+
     FIXED: Now includes retry logic for Qdrant connection issues.
     """
     with trace_task("batch_verify", trace_headers, {
@@ -102,13 +122,23 @@ def batch_verify(
     }) as span:
         add_task_attribute("retry_count", self.request.retries)
 
+        matched_so_far = 0
+
+        def publish_progress(chunk_results: List[Dict], offset: int) -> None:
+            nonlocal matched_so_far
+            matched_so_far += sum(1 for r in chunk_results if r.get("matched"))
+            self.update_state(state="PROGRESS", meta={
+                "processed": offset + len(chunk_results),
+                "total": len(images),
+                "matched": matched_so_far,
+                "offset": offset,
+                "results": chunk_results,
+            })
+
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                results = loop.run_until_complete(_batch_verify_async(images, threshold))
-            finally:
-                loop.close()
+            results = run_async(
+                _batch_verify_async(images, threshold, on_chunk=publish_progress)
+            )
 
             matched_count = sum(1 for r in results if r.get("matched"))
             add_task_attribute("matched_count", matched_count)
@@ -133,61 +163,177 @@ def batch_verify(
             raise
 
 
-async def _batch_verify_async(images: List[str], threshold: float) -> List[Dict]:
-    """Async batch verification"""
-    results = []
+async def _batch_verify_async(
+    images: List[str],
+    threshold: float,
+    on_chunk: Optional[Callable[[List[Dict], int], None]] = None,
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Async batch verification.
+
+    Downloads run with bounded concurrency over the shared HTTP client;
+    while one chunk is embedded (in one batch) and searched (in one
+    multi-vector Qdrant request), the next chunk is already downloading.
+
+    Args:
+        images: Image URLs
+        threshold: Minimum similarity score for a match
+        on_chunk: Called after each chunk with its results and the index
+            of its first image
+        chunk_size: Images per chunk (default BATCH_VERIFY_CHUNK_SIZE)
+        concurrency: Concurrent downloads (default BATCH_VERIFY_DOWNLOAD_CONCURRENCY)
+    """
+    chunk_size = chunk_size or settings.BATCH_VERIFY_CHUNK_SIZE
+    semaphore = asyncio.Semaphore(concurrency or settings.BATCH_VERIFY_DOWNLOAD_CONCURRENCY)
+    chunks = [images[i:i + chunk_size] for i in range(0, len(images), chunk_size)]
+
+    results: List[Dict] = []
+    downloads = _start_downloads(chunks[0], semaphore) if chunks else None
+    try:
+        for index, chunk in enumerate(chunks):
+            fetched = await downloads
+            if index + 1 < len(chunks):
+                downloads = _start_downloads(chunks[index + 1], semaphore)
+
+            chunk_results = await _verify_chunk(chunk, fetched, threshold)
+            if on_chunk is not None:
+                on_chunk(chunk_results, len(results))
+            results.extend(chunk_results)
+    finally:
+        if downloads is not None and not downloads.done():
+            downloads.cancel()
 
-    for image in images:
+    return results
+
+
+def _start_downloads(urls: List[str], semaphore: asyncio.Semaphore) -> asyncio.Future:
+    """Start downloading a chunk in the background."""
+    return asyncio.ensure_future(
+        asyncio.gather(*[_download_image(url, semaphore) for url in urls])
+    )
+
+
+async def _download_image(
+    url: str, semaphore: asyncio.Semaphore
+) -> Tuple[Optional[bytearray], Optional[str]]:
+    """Fetch one image; returns (body, None) or (None, error)."""
+    async with semaphore:
         try:
-            embedding_result = await _extract_embedding_async(image)
-            if not embedding_result['success']:
-                results.append({
-                    'image': image,
-                    'matched': False,
-                    'error': embedding_result['error']
-                })
-                continue
-
-            # Search in Qdrant
-            match = await _search_qdrant(embedding_result['embedding'], threshold)
+            return await get_http_client().fetch_bytes(url, settings.IMAGE_FETCH_MAX_BYTES), None
+        except DownloadTooLarge as e:
+            return None, str(e)
+        except Exception as e:
+            logger.warning("Image download failed", url=url[:100], error=str(e))
+            return None, 'Failed to fetch image'
+
+
+async def _verify_chunk(
+    urls: List[str],
+    fetched: List[Tuple[Optional[bytearray], Optional[str]]],
+    threshold: float,
+) -> List[Dict]:
+    """Embed a downloaded chunk in one batch and search it in one request."""
+    downloaded = [i for i, (body, _) in enumerate(fetched) if body is not None]
+    embeddings = await _embed_batch([fetched[i][0] for i in downloaded])
+
+    embedded = [(i, e) for i, e in zip(downloaded, embeddings) if e is not None]
+    matches = await _search_qdrant_batch([e for _, e in embedded], threshold)
+    match_by_index = dict(zip((i for i, _ in embedded), matches))
+
+    results = []
+    for i, url in enumerate(urls):
+        body, error = fetched[i]
+        if body is None:
+            results.append({'image': url, 'matched': False, 'error': error})
+        elif i not in match_by_index:
+            results.append({'image': url, 'matched': False, 'error': 'No face detected'})
+        else:
+            match = match_by_index[i]
             results.append({
-                'image': image,
+                'image': url,
                 'matched': match is not None,
                 'identity_id': match['identity_id'] if match else None,
                 'score': match['score'] if match else 0.0
             })
-        except Exception as e:
-            results.append({
-                'image': image,
-                'matched': False,
-                'error': str(e)
-            })
-
     return results
 
 
-async def _search_qdrant(embedding: List[float], threshold: float) -> Optional[Dict]:
-    """Search for matching identity in Qdrant"""
-    from qdrant_client import QdrantClient
+# One service per worker process: its models, micro-batcher and collection
+# setup are reused by every batch_verify chunk
+_face_service = None
+
+
+def _get_face_service():
+    """Get the shared FaceRecognitionService for this worker process."""
+    global _face_service
+
+    if _face_service is None:
+        from app.services.face_recognition import FaceRecognitionService
+
+        _face_service = FaceRecognitionService()
+    return _face_service
+
+
+async def _embed_batch(images: List[bytearray]) -> List[Optional[List[float]]]:
+    """Face embeddings for a chunk of images (None where no face was found)."""
+    if not images:
+        return []
+
+    if settings.FACE_RECOGNITION_MOCK:
+        embeddings = np.random.randn(len(images), settings.FACE_EMBEDDING_SIZE).astype(np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings.tolist()
+
+    # Concurrent calls are micro-batched into one recognition pass
+    service = _get_face_service()
+    extracted = await asyncio.gather(
+        *[service.extract_embedding(bytes(image)) for image in images],
+        return_exceptions=True,
+    )
+
+    embeddings = []
+    for result in extracted:
+        if isinstance(result, Exception):
+            logger.warning(f"Embedding extraction failed: {result}")
+            result = None
+        embeddings.append(result.tolist() if result is not None else None)
+    return embeddings
+
+
+async def _search_qdrant_batch(
+    embeddings: List[List[float]], threshold: float
+) -> List[Optional[Dict]]:
+    """Search for matching identities of several embeddings in one request."""
+    if not embeddings:
+        return []
 
     try:
-        client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-        results = client.search(
+        batch_results = await get_qdrant().search_batch(
             collection_name=settings.QDRANT_COLLECTION,
-            query_vector=embedding,
-            limit=1,
-            score_threshold=threshold
+            requests=[
+                SearchRequest(
+                    vector=embedding,
+                    limit=1,
+                    score_threshold=threshold,
+                    with_payload=True,
+                    params=search_params(),
+                )
+                for embedding in embeddings
+            ],
         )
-
-        if results:
-            return {
-                'identity_id': results[0].payload.get('identity_id'),
-                'score': results[0].score
-            }
-        return None
     except Exception as e:
-        logger.error(f"Qdrant search failed: {e}")
-        return None
+        logger.error(f"Qdrant batch search failed: {e}")
+        return [None] * len(embeddings)
+
+    return [
+        {
+            'identity_id': results[0].payload.get('identity_id'),
+            'score': results[0].score
+        } if results else None
+        for results in batch_results
+    ]
 
 
 @app.task(bind=True, max_retries=3, default_retry_delay=15)
@@ -203,23 +349,10 @@ def register_embedding(
     FIXED: Now includes retry logic for Qdrant connection issues.
     """
     with trace_task("register_embedding", trace_headers, {"identity_id": identity_id}) as span:
-        from qdrant_client import QdrantClient
-        from qdrant_client.models import PointStruct
-
         add_task_attribute("retry_count", self.request.retries)
 
         try:
-            client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-            client.upsert(
-                collection_name=settings.QDRANT_COLLECTION,
-                points=[
-                    PointStruct(
-                        id=identity_id,
-                        vector=embedding,
-                        payload={'identity_id': identity_id}
-                    )
-                ]
-            )
+            run_async(_register_embedding_async(identity_id, embedding))
             add_task_attribute("embedding_size", len(embedding))
             logger.info("Embedding registered successfully", identity_id=identity_id)
             return {'success': True, 'identity_id': identity_id}
@@ -236,6 +369,23 @@ def register_embedding(
             return {'success': False, 'error': str(e)}
 
 
+async def _register_embedding_async(identity_id: str, embedding: List[float]) -> None:
+    """Upsert an embedding through the shared Qdrant client"""
+    from qdrant_client.models import PointStruct
+
+    await get_qdrant().upsert(
+        collection_name=settings.QDRANT_COLLECTION,
+        points=[
+            PointStruct(
+                id=identity_id,
+                vector=embedding,
+                # updated_at versions the point for the API's local index sync
+                payload={'identity_id': identity_id, 'updated_at': time.time()}
+            )
+        ]
+    )
+
+
 @app.task(bind=True, max_retries=3, default_retry_delay=15)
 def delete_embedding(
     self,
@@ -248,16 +398,10 @@ def delete_embedding(
     FIXED: Now includes retry logic for Qdrant connection issues.
     """
     with trace_task("delete_embedding", trace_headers, {"identity_id": identity_id}) as span:
-        from qdrant_client import QdrantClient
-
         add_task_attribute("retry_count", self.request.retries)
 
         try:
-            client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-            client.delete(
-                collection_name=settings.QDRANT_COLLECTION,
-                points_selector=[identity_id]
-            )
+            run_async(_delete_embedding_async(identity_id))
             logger.info("Embedding deleted successfully", identity_id=identity_id)
             return {'success': True, 'identity_id': identity_id}
         except Exception as e:
@@ -271,3 +415,408 @@ def delete_embedding(
             if self.request.retries < self.max_retries:
                 raise self.retry(exc=e, countdown=15 * (2 ** self.request.retries))
             return {'success': False, 'error': str(e)}
+
+
+async def _delete_embedding_async(identity_id: str) -> None:
+    """Delete an embedding through the shared Qdrant client"""
+    from qdrant_client.models import PointIdsList
+
+    await get_qdrant().delete(
+        collection_name=settings.QDRANT_COLLECTION,
+        points_selector=PointIdsList(points=[identity_id])
+    )
+
+
+# =============================================================================
+# Registry-wide near-duplicate audit
+# =============================================================================
+#
+# 1. audit_duplicates scrolls every vector out of Qdrant into a float32
+#    memmap under DUPLICATE_AUDIT_DIR/<audit_id>/, checkpointing the scroll
+#    offset so an interrupted export resumes where it stopped.
+# 2. One audit_duplicate_block task per block of DUPLICATE_AUDIT_BLOCK_ROWS
+#    rows computes that block against itself and every later block (upper
+#    triangle only) with one matrix product per tile, keeping pairs above the
+#    threshold. Blocks run in parallel across face worker processes; a
+#    finished block writes pairs/<block>.npz atomically and is skipped when
+#    the audit is re-run with the same audit_id.
+# 3. finalize_duplicate_audit unions all pairs into clusters and replaces
+#    the audit's rows in the duplicate_clusters table.
+#
+# Cost is ~n^2 * dim FLOPs: a 5M x 512 registry is ~1.3e16 FLOPs, which a
+# few multi-core CPU workers get through overnight with BLAS sgemm.
+
+_AUDIT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_ID_BYTES = 16
+
+
+def _audit_dir(audit_id: str) -> Path:
+    if not _AUDIT_ID_PATTERN.match(audit_id):
+        raise ValueError(f"Invalid audit_id: {audit_id!r}")
+    return Path(settings.DUPLICATE_AUDIT_DIR) / audit_id
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+def _open_vectors(audit_dir: Path, mode: str = "r") -> Tuple[np.memmap, np.memmap, Dict]:
+    export = _read_json(audit_dir / "export.json")
+    shape = (export["capacity"], export["dim"])
+    vectors = np.memmap(audit_dir / "vectors.f32", dtype=np.float32, mode=mode, shape=shape)
+    ids = np.memmap(audit_dir / "ids.u8", dtype=np.uint8, mode=mode, shape=(shape[0], _ID_BYTES))
+    return vectors, ids, export
+
+
+async def _export_vectors(audit_dir: Path, batch_size: int = 1024) -> int:
+    """Scroll all points into the audit's memmap, resuming from the last checkpoint"""
+    client = get_qdrant()
+    export_file = audit_dir / "export.json"
+    export = _read_json(export_file)
+    if export and export["complete"]:
+        return export["count"]
+
+    if export is None:
+        total = (await client.count(collection_name=settings.QDRANT_COLLECTION, exact=True)).count
+        export = {
+            "capacity": total,
+            "dim": settings.FACE_EMBEDDING_SIZE,
+            "count": 0,
+            "offset": None,
+            "complete": False,
+        }
+        for name, row_bytes in (("vectors.f32", export["dim"] * 4), ("ids.u8", _ID_BYTES)):
+            with open(audit_dir / name, "wb") as f:
+                f.truncate(max(1, total) * row_bytes)
+        _write_json(export_file, export)
+
+    if export["capacity"] == 0:
+        export["complete"] = True
+        _write_json(export_file, export)
+        return 0
+
+    vectors, ids, _ = _open_vectors(audit_dir, mode="r+")
+    count, offset = export["count"], export["offset"]
+
+    while count < export["capacity"]:
+        points, next_offset = await client.scroll(
+            collection_name=settings.QDRANT_COLLECTION,
+            limit=batch_size,
+            offset=offset,
+            with_vectors=True,
+            with_payload=["identity_id"],
+        )
+        taken = points[: export["capacity"] - count]
+        if taken:
+            rows = np.asarray([point.vector for point in taken], dtype=np.float32)
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            vectors[count:count + len(taken)] = rows / np.where(norms > 0, norms, 1.0)
+            ids[count:count + len(taken)] = [
+                np.frombuffer(
+                    uuid.UUID(str((point.payload or {}).get("identity_id") or point.id)).bytes,
+                    dtype=np.uint8,
+                )
+                for point in taken
+            ]
+            count += len(taken)
+            vectors.flush()
+            ids.flush()
+
+        if len(taken) < len(points):
+            logger.warning("Registry grew during export, newer points skipped", capacity=export["capacity"])
+        offset = next_offset
+        export.update(count=count, offset=offset)
+        _write_json(export_file, export)
+        if next_offset is None or not points:
+            break
+
+    export.update(capacity=count, complete=True)
+    _write_json(export_file, export)
+    logger.info("Duplicate audit export complete", audit_dir=str(audit_dir), vectors=count)
+    return count
+
+
+def _compute_block_pairs(
+    vectors: np.ndarray,
+    count: int,
+    block: int,
+    block_rows: int,
+    threshold: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pairs (i < j) with similarity >= threshold where i is in ``block``"""
+    start = block * block_rows
+    left = np.asarray(vectors[start:min(start + block_rows, count)])
+    rows_out, cols_out, scores_out = [], [], []
+
+    for tile_start in range(start, count, block_rows):
+        right = left if tile_start == start else np.asarray(vectors[tile_start:min(tile_start + block_rows, count)])
+        tile = left @ right.T
+        if tile_start == start:
+            # Self-pairs and (j, i) mirrors; row slices, no n^2 index arrays
+            for k in range(len(left)):
+                tile[k, :k + 1] = -np.inf
+        r, c = np.nonzero(tile >= threshold)
+        if len(r):
+            rows_out.append(r + start)
+            cols_out.append(c + tile_start)
+            scores_out.append(tile[r, c])
+
+    if not rows_out:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.float32)
+    return (
+        np.concatenate(rows_out).astype(np.int64),
+        np.concatenate(cols_out).astype(np.int64),
+        np.concatenate(scores_out).astype(np.float32),
+    )
+
+
+class _UnionFind:
+    """Disjoint sets over row indices with union by size and path halving"""
+
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int64)
+        self.size = np.ones(n, dtype=np.int64)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return int(x)
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+
+
+def _cluster_pairs(
+    count: int,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    scores: np.ndarray,
+) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Union pairs into clusters.
+
+    Returns:
+        (cluster_id, member rows, member max similarity) per cluster,
+        largest cluster first
+    """
+    if len(rows) == 0:
+        return []
+
+    sets = _UnionFind(count)
+    for a, b in zip(rows.tolist(), cols.tolist()):
+        sets.union(a, b)
+
+    best = np.full(count, -np.inf, dtype=np.float32)
+    np.maximum.at(best, rows, scores)
+    np.maximum.at(best, cols, scores)
+
+    members = np.unique(np.concatenate([rows, cols]))
+    roots = np.fromiter((sets.find(m) for m in members.tolist()), dtype=np.int64, count=len(members))
+    unique_roots, inverse, sizes = np.unique(roots, return_inverse=True, return_counts=True)
+
+    clusters = []
+    for cluster_id, root_index in enumerate(np.argsort(-sizes, kind="stable")):
+        cluster_members = members[inverse == root_index]
+        clusters.append((cluster_id, cluster_members, best[cluster_members]))
+    return clusters
+
+
+async def _write_duplicate_report(
+    audit_id: str,
+    threshold: float,
+    clusters: List[Tuple[int, List[str], List[float]]],
+    batch_size: int = 5000,
+) -> int:
+    """Replace the audit's rows in duplicate_clusters"""
+    now = datetime.utcnow()
+    records = [
+        {
+            "id": str(uuid.uuid4()),
+            "audit_id": audit_id,
+            "cluster_id": cluster_id,
+            "cluster_size": len(identity_ids),
+            "identity_id": identity_id,
+            "max_similarity": float(similarity),
+            "threshold": threshold,
+            "created_at": now,
+        }
+        for cluster_id, identity_ids, similarities in clusters
+        for identity_id, similarity in zip(identity_ids, similarities)
+    ]
+
+    async with get_db_session() as db:
+        await db.execute(
+            text("DELETE FROM duplicate_clusters WHERE audit_id = :audit_id"),
+            {"audit_id": audit_id},
+        )
+        for start in range(0, len(records), batch_size):
+            await db.execute(
+                text("""
+                    INSERT INTO duplicate_clusters
+                        (id, audit_id, cluster_id, cluster_size, identity_id,
+                         max_similarity, threshold, created_at)
+                    VALUES
+                        (:id, :audit_id, :cluster_id, :cluster_size,
+                         (SELECT id FROM identities WHERE id = CAST(:identity_id AS UUID)),
+                         :max_similarity, :threshold, :created_at)
+                """),
+                records[start:start + batch_size],
+            )
+    return len(records)
+
+
+@app.task(bind=True, soft_time_limit=6 * 3600, time_limit=6 * 3600 + 300)
+def audit_duplicates(
+    self,
+    audit_id: Optional[str] = None,
+    threshold: Optional[float] = None,
+    trace_headers: Optional[Dict] = None
+) -> Dict:
+    """
+    Audit the whole registry for near-duplicate faces.
+
+    Exports all vectors, then fans out one block task per row block and
+    finalizes when they all finish. Re-running with the same audit_id
+    resumes: the export continues from its checkpoint and finished blocks
+    are skipped. Threshold and block size are fixed at the audit's first run.
+    """
+    audit_id = audit_id or f"dup-{datetime.utcnow():%Y%m%d-%H%M%S}"
+
+    with trace_task("audit_duplicates", trace_headers, {"audit_id": audit_id}) as span:
+        audit_dir = _audit_dir(audit_id)
+        (audit_dir / "pairs").mkdir(parents=True, exist_ok=True)
+
+        config = _read_json(audit_dir / "audit.json")
+        if config is None:
+            config = {
+                "threshold": settings.FACE_DUPLICATE_THRESHOLD if threshold is None else threshold,
+                "block_rows": settings.DUPLICATE_AUDIT_BLOCK_ROWS,
+                "started_at": datetime.utcnow().isoformat(),
+            }
+            _write_json(audit_dir / "audit.json", config)
+
+        count = run_async(_export_vectors(audit_dir))
+        blocks = -(-count // config["block_rows"])
+        pending = [b for b in range(blocks) if not (audit_dir / "pairs" / f"{b:06d}.npz").exists()]
+
+        add_task_attribute("vectors", count)
+        add_task_attribute("pending_blocks", len(pending))
+
+        if pending:
+            chord(
+                group(audit_duplicate_block.s(audit_id, block) for block in pending),
+                finalize_duplicate_audit.s(audit_id),
+            ).apply_async()
+        else:
+            finalize_duplicate_audit.delay([], audit_id)
+
+        logger.info(
+            "Duplicate audit dispatched",
+            audit_id=audit_id,
+            vectors=count,
+            blocks=blocks,
+            pending_blocks=len(pending),
+            threshold=config["threshold"],
+        )
+        return {
+            "audit_id": audit_id,
+            "vectors": count,
+            "blocks": blocks,
+            "pending_blocks": len(pending),
+        }
+
+
+@app.task(bind=True, max_retries=2, default_retry_delay=60)
+def audit_duplicate_block(self, audit_id: str, block: int) -> int:
+    """Find above-threshold pairs for one row block; idempotent per block"""
+    audit_dir = _audit_dir(audit_id)
+    output = audit_dir / "pairs" / f"{block:06d}.npz"
+    if output.exists():
+        with np.load(output) as done:
+            return int(len(done["scores"]))
+
+    try:
+        config = _read_json(audit_dir / "audit.json")
+        vectors, _, export = _open_vectors(audit_dir)
+        rows, cols, scores = _compute_block_pairs(
+            vectors, export["count"], block, config["block_rows"], config["threshold"]
+        )
+
+        tmp = output.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, rows=rows, cols=cols, scores=scores)
+        os.replace(tmp, output)
+    except OSError as e:
+        # Shared audit volume unavailable or full; one failed block fails the chord
+        logger.error("Duplicate audit block failed", audit_id=audit_id, block=block, error=str(e))
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
+        raise
+
+    logger.info("Duplicate audit block done", audit_id=audit_id, block=block, pairs=len(scores))
+    return int(len(scores))
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=60)
+def finalize_duplicate_audit(self, block_results: List[int], audit_id: str) -> Dict:
+    """Union all block pairs into clusters and write the report table"""
+    audit_dir = _audit_dir(audit_id)
+    config = _read_json(audit_dir / "audit.json")
+    _, ids, export = _open_vectors(audit_dir)
+    count = export["count"]
+
+    rows, cols, scores = [np.zeros(0, np.int64)], [np.zeros(0, np.int64)], [np.zeros(0, np.float32)]
+    for path in sorted((audit_dir / "pairs").glob("*.npz")):
+        with np.load(path) as part:
+            rows.append(part["rows"])
+            cols.append(part["cols"])
+            scores.append(part["scores"])
+    rows, cols, scores = np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+    clusters = [
+        (
+            cluster_id,
+            [str(uuid.UUID(bytes=ids[m].tobytes())) for m in members.tolist()],
+            similarities.tolist(),
+        )
+        for cluster_id, members, similarities in _cluster_pairs(count, rows, cols, scores)
+    ]
+
+    try:
+        written = run_async(_write_duplicate_report(audit_id, config["threshold"], clusters))
+    except Exception as e:
+        logger.error("Failed to write duplicate report", audit_id=audit_id, error=str(e))
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        raise
+
+    summary = {
+        "audit_id": audit_id,
+        "vectors": count,
+        "pairs": int(len(scores)),
+        "clusters": len(clusters),
+        "duplicate_identities": written,
+        "largest_cluster": len(clusters[0][1]) if clusters else 0,
+        "threshold": config["threshold"],
+        "finished_at": datetime.utcnow().isoformat(),
+    }
+    _write_json(audit_dir / "report.json", summary)
+    logger.info("Duplicate audit complete", **summary)
+    return summary
@@ -5,7 +5,6 @@ Handles email, push, and webhook notifications with distributed tracing.
 
 FIXED: Now actually sends emails via SendGrid instead of being a stub.
 """
-import asyncio
 from typing import Dict, Optional
 from datetime import datetime
 import structlog
@@ -13,6 +12,8 @@ import httpx
 
 from celery_app import app
 from config import settings
+from db import get_db_session, run_async
+from profiling import http_event_hooks
 from tracing import trace_task, get_trace_headers_for_subtask, add_task_attribute
 
 logger = structlog.get_logger()
@@ -190,14 +191,9 @@ def _send_push_notification_sync(
 
 async def _get_user_device_tokens(user_id: str) -> list:
     """Fetch user's device tokens from database."""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
     from sqlalchemy import text
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with async_session() as db:
+    async with get_db_session() as db:
         result = await db.execute(
             text("""
                 SELECT token FROM device_tokens
@@ -207,7 +203,6 @@ async def _get_user_device_tokens(user_id: str) -> list:
         )
         tokens = [row[0] for row in result.fetchall()]
 
-    await engine.dispose()
     return tokens
 
 
@@ -363,12 +358,7 @@ def send_push_notification(
             # Get device tokens if not provided
             tokens = device_tokens
             if not tokens:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    tokens = loop.run_until_complete(_get_user_device_tokens(user_id))
-                finally:
-                    loop.close()
+                tokens = run_async(_get_user_device_tokens(user_id))
 
             if not tokens:
                 logger.debug("No device tokens found for user", user_id=user_id)
@@ -445,12 +435,7 @@ def send_webhook(
     with trace_task("send_webhook", trace_headers, {"url": url[:200]}) as span:
         add_task_attribute("retry_count", self.request.retries)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(_send_webhook_async(url, payload, headers))
-        finally:
-            loop.close()
+        result = run_async(_send_webhook_async(url, payload, headers))
 
         add_task_attribute("status_code", result.get("status_code", 0))
         add_task_attribute("success", result.get("success", False))
@@ -479,7 +464,7 @@ def send_webhook(
 async def _send_webhook_async(url: str, payload: Dict, headers: Dict = None) -> Dict:
     """Async webhook sending"""
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=30.0, event_hooks=http_event_hooks()) as client:
             response = await client.post(
                 url,
                 json=payload,
@@ -8,7 +8,6 @@ Handles automatic payouts to creators:
 
 CRITICAL: Uses Redis-based idempotency to prevent duplicate payments.
 """
-import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 import structlog
@@ -17,6 +16,7 @@ import hashlib
 
 from celery_app import app
 from config import settings
+from db import get_db_session, run_async
 from tracing import trace_task, add_task_attribute
 
 logger = structlog.get_logger()
@@ -79,16 +79,12 @@ def mature_pending_earnings(self, trace_headers: Optional[Dict] = None) -> Dict:
         return {"success": True, "message": "Already running", "matured_count": 0}
 
     with trace_task("mature_pending_earnings", trace_headers) as span:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            result = loop.run_until_complete(_mature_pending_earnings_async())
+            result = run_async(_mature_pending_earnings_async())
         except Exception as e:
             release_idempotency_lock(idempotency_key)
             logger.error("Mature earnings failed", error=str(e))
             raise self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
-        finally:
-            loop.close()
 
         add_task_attribute("matured_count", result.get("matured_count", 0))
         add_task_attribute("total_amount", result.get("total_amount", 0))
@@ -102,14 +98,9 @@ def mature_pending_earnings(self, trace_headers: Optional[Dict] = None) -> Dict:
 
 async def _mature_pending_earnings_async() -> Dict:
     """Async implementation of earning maturation"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
     from sqlalchemy import select, update, func
     import enum
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
     # Import enum values directly since we can't import from API
     class EarningStatus(str, enum.Enum):
         PENDING = "PENDING"
@@ -117,7 +108,7 @@ async def _mature_pending_earnings_async() -> Dict:
         PAID = "PAID"
         REFUNDED = "REFUNDED"
 
-    async with async_session() as db:
+    async with get_db_session() as db:
         now = datetime.now(timezone.utc)
 
         # Get count and sum of earnings to mature
@@ -184,17 +175,13 @@ def process_auto_payouts(self, trace_headers: Optional[Dict] = None) -> Dict:
         return {"success": True, "message": "Already processed today", "processed": 0}
 
     with trace_task("process_auto_payouts", trace_headers) as span:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            result = loop.run_until_complete(_process_auto_payouts_async())
+            result = run_async(_process_auto_payouts_async())
         except Exception as e:
             # Release lock on failure so retry can happen
             release_idempotency_lock(idempotency_key)
             logger.error("Auto payouts failed", error=str(e))
             raise self.retry(exc=e, countdown=300 * (2 ** self.request.retries))
-        finally:
-            loop.close()
 
         add_task_attribute("processed_count", result.get("processed", 0))
         add_task_attribute("total_paid", result.get("total_paid", 0))
@@ -208,8 +195,6 @@ def process_auto_payouts(self, trace_headers: Optional[Dict] = None) -> Dict:
 
 async def _process_auto_payouts_async() -> Dict:
     """Async implementation of auto payouts"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
     from sqlalchemy import text
     import stripe
     import enum
@@ -220,9 +205,6 @@ async def _process_auto_payouts_async() -> Dict:
 
     stripe.api_key = settings.STRIPE_SECRET_KEY
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
     class EarningStatus(str, enum.Enum):
         PENDING = "PENDING"
         AVAILABLE = "AVAILABLE"
@@ -238,7 +220,7 @@ async def _process_auto_payouts_async() -> Dict:
     total_paid = 0
     errors = []
 
-    async with async_session() as db:
+    async with get_db_session() as db:
         now = datetime.now(timezone.utc)
 
         # First, mature any pending earnings
@@ -460,16 +442,12 @@ def send_payout_reminders(self, trace_headers: Optional[Dict] = None) -> Dict:
         return {"success": True, "message": "Already sent today", "sent": 0}
 
     with trace_task("send_payout_reminders", trace_headers) as span:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
         try:
-            result = loop.run_until_complete(_send_payout_reminders_async())
+            result = run_async(_send_payout_reminders_async())
         except Exception as e:
             release_idempotency_lock(idempotency_key)
             logger.error("Payout reminders failed", error=str(e))
             raise self.retry(exc=e, countdown=300 * (2 ** self.request.retries))
-        finally:
-            loop.close()
 
         add_task_attribute("reminders_sent", result.get("sent", 0))
         logger.info("Payout reminders sent", sent=result.get("sent", 0))
@@ -478,16 +456,11 @@ def send_payout_reminders(self, trace_headers: Optional[Dict] = None) -> Dict:
 
 async def _send_payout_reminders_async() -> Dict:
     """Async implementation of reminder sending"""
-    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-    from sqlalchemy.orm import sessionmaker
     from sqlalchemy import text
 
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
     sent = 0
 
-    async with async_session() as db:
+    async with get_db_session() as db:
         # Find creators with available balance but no Connect account
         result = await db.execute(
             text("""
@@ -19,6 +19,7 @@ if API_PATH not in sys.path:
 from celery_app import app
 from config import settings
 from db import get_db_session, run_async
+from profiling import http_event_hooks
 from tracing import trace_task, get_trace_headers_for_subtask, add_task_attribute
 
 logger = structlog.get_logger()
@@ -263,7 +264,7 @@ async def _fallback_training(
             task.update_state(state='PROGRESS', meta={'progress': 10, 'step': 'Processing images'})
             embeddings = []
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with httpx.AsyncClient(timeout=60.0, event_hooks=http_event_hooks()) as client:
                 for url in image_urls:
                     try:
                         response = await client.get(url)
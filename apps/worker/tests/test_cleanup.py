@@ -151,6 +151,159 @@ class TestUpdateUsageStats:
         assert update_usage_stats.default_retry_delay == 30
 
 
+def _result(first=None, rowcount=0, scalar=None):
+    result = Mock()
+    result.first.return_value = first
+    result.rowcount = rowcount
+    result.scalar.return_value = scalar
+    return result
+
+
+def _scripted_session(*results):
+    """get_db_session replacement whose session returns results in order."""
+    db = Mock()
+    db.execute = AsyncMock(side_effect=list(results))
+    db.commit = AsyncMock()
+
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return db, Mock(return_value=session)
+
+
+class TestIncrementalUsageStats:
+    """Test the watermark-based license count aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_applies_batches_after_watermark(self):
+        """Should add deltas batch by batch and advance the watermark each time."""
+        from tasks.cleanup import _update_usage_stats_async
+
+        start = datetime(2024, 12, 1)
+        first_id, second_id, third_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        db, get_session = _scripted_session(
+            # Batch 1: full (2 rows)
+            _result(first=Mock(last_created_at=start, last_id=first_id)),
+            _result(first=Mock(created_at=start + timedelta(minutes=1), id=second_id, batch_rows=2)),
+            _result(rowcount=2),
+            _result(),
+            # Batch 2: short (1 row), so the run stops
+            _result(first=Mock(last_created_at=start + timedelta(minutes=1), last_id=second_id)),
+            _result(first=Mock(created_at=start + timedelta(minutes=2), id=third_id, batch_rows=1)),
+            _result(rowcount=1),
+            _result(),
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            result = await _update_usage_stats_async(batch_size=2, max_batches=10)
+
+        assert result["rows_applied"] == 3
+        assert result["batches"] == 2
+        assert result["listings_updated"] == 3
+
+        delta_sql, delta_params = db.execute.call_args_list[2].args
+        assert "UPDATE listings" in str(delta_sql) and "FROM" in str(delta_sql)
+        assert delta_params["after_id"] == first_id
+        assert delta_params["upto_id"] == second_id
+
+        watermark_params = db.execute.call_args_list[7].args[1]
+        assert watermark_params["upto_id"] == third_id
+        assert watermark_params["rows"] == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_new_is_noop(self):
+        """No settled rows after the watermark should write nothing."""
+        from tasks.cleanup import _update_usage_stats_async
+
+        db, get_session = _scripted_session(
+            _result(first=Mock(last_created_at=datetime(2024, 12, 1), last_id=uuid.uuid4())),
+            _result(first=None),
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            result = await _update_usage_stats_async(batch_size=100)
+
+        assert result["rows_applied"] == 0
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_first_run_bootstraps_watermark(self):
+        """Without a watermark, should recount once and start the mark at the newest license."""
+        from tasks.cleanup import _update_usage_stats_async
+
+        newest_id = uuid.uuid4()
+        db, get_session = _scripted_session(
+            _result(first=None),  # No watermark row
+            _result(first=Mock(created_at=datetime(2024, 12, 1), id=newest_id)),
+            _result(),  # INSERT watermark
+            _result(rowcount=5),  # Full recount
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            result = await _update_usage_stats_async()
+
+        insert_sql, insert_params = db.execute.call_args_list[2].args
+        assert "INSERT INTO stats_watermarks" in str(insert_sql)
+        assert insert_params["mark_id"] == newest_id
+        assert result["listings_updated"] == 5
+        assert result["batches"] == 0
+
+
+class TestReconcileUsageStats:
+    """Test the low-priority full reconciliation."""
+
+    def test_scheduled_daily_at_low_priority(self):
+        """Reconciliation should be on the beat schedule with the lowest priority."""
+        from celery_app import app
+
+        entry = app.conf.beat_schedule['reconcile-usage-stats']
+        assert entry['task'] == 'tasks.cleanup.reconcile_usage_stats'
+        assert entry['options']['priority'] == 9
+
+    @pytest.mark.asyncio
+    async def test_skips_batch_on_lock_timeout(self):
+        """A batch that hits lock_timeout should be skipped, not fail the run."""
+        from sqlalchemy.exc import DBAPIError
+        from tasks.cleanup import _reconcile_usage_stats_async
+
+        lock_error = DBAPIError("UPDATE identities", {}, Mock(sqlstate="55P03"))
+        identity_upto = uuid.uuid4()
+        db, get_session = _scripted_session(
+            # identities: one batch, its UPDATE times out on a row lock
+            _result(), _result(scalar=identity_upto), lock_error,
+            _result(), _result(scalar=None),
+            # listings: one batch under the watermark lock, one row fixed
+            _result(), _result(scalar=uuid.uuid4()),
+            _result(first=Mock(last_created_at=datetime(2024, 12, 1), last_id=uuid.uuid4())),
+            _result(rowcount=1),
+            _result(), _result(scalar=None),
+            # Reset rows_applied / reconciled_at
+            _result(),
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            result = await _reconcile_usage_stats_async(batch_size=100, pause_seconds=0)
+
+        assert result["batches_skipped"] == 1
+        assert result["identities_fixed"] == 0
+        assert result["listings_fixed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_db_errors_raise(self):
+        """Errors other than lock timeouts should fail the task."""
+        from sqlalchemy.exc import DBAPIError
+        from tasks.cleanup import _reconcile_usage_stats_async
+
+        db, get_session = _scripted_session(
+            _result(), _result(scalar=uuid.uuid4()),
+            DBAPIError("UPDATE identities", {}, Mock(sqlstate="42P01")),
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            with pytest.raises(DBAPIError):
+                await _reconcile_usage_stats_async(batch_size=100, pause_seconds=0)
+
+
 class TestCleanupOldLogs:
     """Test old log cleanup."""
 
@@ -162,6 +315,215 @@ class TestCleanupOldLogs:
         assert cleanup_old_logs.default_retry_delay == 120
 
 
+def _partitions_result(*months):
+    """pg_inherits rows for monthly partitions starting at each month, plus the default."""
+    default = Mock(bound="DEFAULT")
+    default.name = "usage_logs_default"  # Mock(name=...) names the mock itself
+    rows = [default]
+    for month in months:
+        upper = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+        row = Mock(bound=f"FOR VALUES FROM ('{month:%Y-%m-%d %H:%M:%S}') TO ('{upper:%Y-%m-%d %H:%M:%S}')")
+        row.name = f"usage_logs_{month:%Y_%m}"
+        rows.append(row)
+    result = Mock()
+    result.all.return_value = rows
+    return result
+
+
+class _StreamedRows:
+    """AsyncResult stand-in for db.stream(...).mappings()."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self._rows)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class TestUsageLogRetention:
+    """Test archive-then-drop of expired usage_logs partitions."""
+
+    def test_scheduled_daily(self):
+        """Retention and partition creation should both be on the beat schedule."""
+        from celery_app import app
+
+        schedule = app.conf.beat_schedule
+        assert schedule['cleanup-old-logs']['task'] == 'tasks.cleanup.cleanup_old_logs'
+        assert schedule['create-usage-log-partitions']['task'] == 'tasks.cleanup.create_usage_log_partitions'
+
+    @pytest.mark.asyncio
+    async def test_archives_then_drops_only_expired_partitions(self):
+        """Each expired partition should be archived before it is dropped; newer ones kept."""
+        from tasks.cleanup import _cleanup_old_logs_async
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        current = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        db, get_session = _scripted_session(
+            _partitions_result(datetime(2020, 2, 1), datetime(2020, 1, 1), current)
+        )
+
+        calls = Mock()
+        archive = AsyncMock(side_effect=lambda partition: {"partition": partition["name"], "rows": 7})
+        drop = AsyncMock(return_value=7)
+        calls.attach_mock(archive, "archive")
+        calls.attach_mock(drop, "drop")
+
+        with patch('tasks.cleanup.get_db_session', get_session), \
+             patch('tasks.cleanup._archive_usage_log_partition', archive), \
+             patch('tasks.cleanup._drop_usage_log_partition', drop):
+            result = await _cleanup_old_logs_async(retention_days=90)
+
+        assert result["partitions"] == ["usage_logs_2020_01", "usage_logs_2020_02"]
+        assert result["cleaned"] == 14
+        assert [c[0] for c in calls.mock_calls] == ["archive", "drop", "archive", "drop"]
+        assert drop.await_args_list[0].args[1] == 7
+
+    @pytest.mark.asyncio
+    async def test_failed_archive_keeps_partition(self):
+        """A partition whose archive fails must not be dropped."""
+        from tasks.cleanup import _cleanup_old_logs_async
+
+        db, get_session = _scripted_session(_partitions_result(datetime(2020, 1, 1)))
+        drop = AsyncMock()
+
+        with patch('tasks.cleanup.get_db_session', get_session), \
+             patch('tasks.cleanup._archive_usage_log_partition', AsyncMock(side_effect=RuntimeError("S3 down"))), \
+             patch('tasks.cleanup._drop_usage_log_partition', drop):
+            with pytest.raises(RuntimeError):
+                await _cleanup_old_logs_async(retention_days=90)
+
+        drop.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_archive_streams_ndjson_and_verifies_upload(self):
+        """Rows should be written as gzipped NDJSON and the upload checked before returning."""
+        import gzip
+        import json
+        from tasks.cleanup import _archive_usage_log_partition
+
+        rows = [
+            {"id": uuid.uuid4(), "action": "verify", "created_at": datetime(2020, 1, 5)},
+            {"id": uuid.uuid4(), "action": "generate", "created_at": datetime(2020, 1, 6)},
+        ]
+        db, get_session = _scripted_session()
+        db.stream = AsyncMock(return_value=_StreamedRows(rows))
+        uploaded = {}
+
+        def upload(fileobj, key, metadata):
+            uploaded["body"] = fileobj.read()
+            uploaded["key"] = key
+            return {"ContentLength": len(uploaded["body"]), "Metadata": metadata}
+
+        partition = {
+            "name": "usage_logs_2020_01",
+            "lower": datetime(2020, 1, 1),
+            "upper": datetime(2020, 2, 1),
+        }
+        with patch('tasks.cleanup.get_db_session', get_session), \
+             patch('tasks.cleanup._upload_archive', upload):
+            archive = await _archive_usage_log_partition(partition)
+
+        lines = gzip.decompress(uploaded["body"]).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [str(row["id"]) for row in rows]
+        assert archive["rows"] == 2
+        assert archive["key"].endswith("usage_logs_2020_01.ndjson.gz")
+
+    @pytest.mark.asyncio
+    async def test_archive_rejects_short_upload(self):
+        """A size mismatch on HEAD should fail the archive."""
+        from tasks.cleanup import _archive_usage_log_partition
+
+        db, get_session = _scripted_session()
+        db.stream = AsyncMock(return_value=_StreamedRows([{"id": uuid.uuid4()}]))
+        partition = {"name": "usage_logs_2020_01", "lower": datetime(2020, 1, 1), "upper": datetime(2020, 2, 1)}
+
+        with patch('tasks.cleanup.get_db_session', get_session), \
+             patch('tasks.cleanup._upload_archive', lambda f, k, m: {"ContentLength": 1, "Metadata": m}):
+            with pytest.raises(RuntimeError):
+                await _archive_usage_log_partition(partition)
+
+    @pytest.mark.asyncio
+    async def test_drop_refuses_rows_added_since_archive(self):
+        """If the partition gained rows after archiving, it should not be detached."""
+        from tasks.cleanup import _drop_usage_log_partition
+
+        db, get_session = _scripted_session(_result(), _result(), _result(scalar=5))
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            with pytest.raises(RuntimeError):
+                await _drop_usage_log_partition({"name": "usage_logs_2020_01"}, archived_rows=4)
+
+        executed = " ".join(str(c.args[0]) for c in db.execute.call_args_list)
+        assert "DETACH" not in executed and "DROP TABLE" not in executed
+
+    @pytest.mark.asyncio
+    async def test_drop_keeps_verify_counts_then_detaches(self):
+        """Archived verify counts should be saved in the same transaction as the drop."""
+        from tasks.cleanup import _drop_usage_log_partition
+
+        db, get_session = _scripted_session(
+            _result(), _result(), _result(scalar=4), _result(), _result(), _result()
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            dropped = await _drop_usage_log_partition({"name": "usage_logs_2020_01"}, archived_rows=4)
+
+        statements = [str(c.args[0]) for c in db.execute.call_args_list]
+        assert dropped == 4
+        assert "usage_log_archived_counts" in statements[3]
+        assert "DETACH PARTITION usage_logs_2020_01" in statements[4]
+        assert "DROP TABLE usage_logs_2020_01" in statements[5]
+
+
+class TestCreateUsageLogPartitions:
+    """Test monthly partitions created ahead of time."""
+
+    def test_partition_name(self):
+        """Partitions should be named usage_logs_YYYY_MM."""
+        from tasks.cleanup import usage_log_partition_name
+
+        assert usage_log_partition_name(datetime(2025, 3, 1)) == "usage_logs_2025_03"
+
+    @pytest.mark.asyncio
+    async def test_creates_only_missing_months(self):
+        """Existing months should be skipped; missing ones created and attached."""
+        from tasks.cleanup import _add_months, _create_usage_log_partitions_async
+
+        current = datetime.now(timezone.utc).replace(
+            tzinfo=None, day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        next_month = _add_months(current, 1)
+        db, get_session = _scripted_session(
+            _partitions_result(current),
+            _result(), _result(), _result(), _result(),
+        )
+
+        with patch('tasks.cleanup.get_db_session', get_session):
+            result = await _create_usage_log_partitions_async(ahead=1)
+
+        assert result["created"] == [f"usage_logs_{next_month:%Y_%m}"]
+        statements = [str(c.args[0]) for c in db.execute.call_args_list]
+        assert "DELETE FROM usage_logs_default" in statements[3]
+        assert f"ATTACH PARTITION usage_logs_{next_month:%Y_%m}" in statements[4]
+        assert f"FROM ('{next_month.isoformat()}')" in statements[4]
+
+    def test_add_months_rolls_over_year(self):
+        """Month arithmetic should cross year boundaries."""
+        from tasks.cleanup import _add_months
+
+        assert _add_months(datetime(2024, 11, 1), 3) == datetime(2025, 2, 1)
+
+
 class TestCheckLicenseExpirations:
     """Test license expiration checks."""
 
@@ -202,13 +564,12 @@ class TestRetryBehavior:
         with patch('tasks.cleanup.get_redis_client', return_value=mock_redis), \
              patch('tasks.cleanup.trace_task') as mock_trace, \
              patch('tasks.cleanup.add_task_attribute'), \
-             patch('asyncio.new_event_loop') as mock_loop:
+             patch('tasks.cleanup.run_async') as mock_run:
 
             mock_trace.return_value.__enter__ = Mock(return_value=Mock())
             mock_trace.return_value.__exit__ = Mock(return_value=False)
 
-            mock_loop.return_value.run_until_complete.side_effect = Exception("DB connection lost")
-            mock_loop.return_value.close = Mock()
+            mock_run.side_effect = Exception("DB connection lost")
 
             with pytest.raises(Exception):
                 cleanup_expired_downloads(mock_celery_task)
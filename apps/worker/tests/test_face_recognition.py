@@ -55,16 +55,15 @@ class TestExtractEmbedding:
 
         with patch('tasks.face_recognition.trace_task') as mock_trace, \
              patch('tasks.face_recognition.add_task_attribute'), \
-             patch('asyncio.new_event_loop') as mock_loop:
+             patch('tasks.face_recognition.run_async') as mock_run:
 
             mock_trace.return_value.__enter__ = Mock(return_value=Mock())
             mock_trace.return_value.__exit__ = Mock(return_value=False)
 
-            mock_loop.return_value.run_until_complete.return_value = {
+            mock_run.return_value = {
                 "success": False,
                 "error": "Network timeout"
             }
-            mock_loop.return_value.close = Mock()
 
             with pytest.raises(Exception):
                 extract_embedding(
@@ -87,18 +86,13 @@ class TestBatchVerify:
             "https://example.com/face3.jpg",
         ]
 
-        with patch('tasks.face_recognition._extract_embedding_async') as mock_extract, \
-             patch('tasks.face_recognition._search_qdrant') as mock_search:
+        with patch('tasks.face_recognition._download_image', new_callable=AsyncMock) as mock_download, \
+             patch('tasks.face_recognition._search_qdrant_batch', new_callable=AsyncMock) as mock_search:
 
-            # Mock successful embedding extraction
-            mock_extract.return_value = {
-                "success": True,
-                "embedding": np.random.randn(512).tolist(),
-                "face_detected": True
-            }
+            mock_download.return_value = (bytearray(b"image"), None)
 
             # Mock Qdrant search - first two match, third doesn't
-            mock_search.side_effect = [
+            mock_search.return_value = [
                 {"identity_id": "id_1", "score": 0.95},
                 {"identity_id": "id_2", "score": 0.88},
                 None,
@@ -110,25 +104,107 @@ class TestBatchVerify:
             assert results[0]["matched"] is True
             assert results[1]["matched"] is True
             assert results[2]["matched"] is False
+            # One multi-vector search for the chunk, not one per image
+            mock_search.assert_awaited_once()
+            assert len(mock_search.await_args.args[0]) == 3
 
     @pytest.mark.asyncio
     async def test_batch_verify_handles_extraction_errors(self):
         """Should handle individual extraction errors gracefully."""
         from tasks.face_recognition import _batch_verify_async
 
-        images = ["https://example.com/bad.jpg"]
+        images = ["https://example.com/bad.jpg", "https://example.com/noface.jpg"]
 
-        with patch('tasks.face_recognition._extract_embedding_async') as mock_extract:
-            mock_extract.return_value = {
-                "success": False,
-                "error": "No face detected"
-            }
+        with patch('tasks.face_recognition._download_image', new_callable=AsyncMock) as mock_download, \
+             patch('tasks.face_recognition._embed_batch', new_callable=AsyncMock) as mock_embed, \
+             patch('tasks.face_recognition._search_qdrant_batch', new_callable=AsyncMock) as mock_search:
+            mock_download.side_effect = [(None, "Failed to fetch image"), (bytearray(b"image"), None)]
+            mock_embed.return_value = [None]
+            mock_search.return_value = []
 
             results = await _batch_verify_async(images, threshold=0.85)
 
-            assert len(results) == 1
+            assert len(results) == 2
             assert results[0]["matched"] is False
-            assert "error" in results[0]
+            assert results[0]["error"] == "Failed to fetch image"
+            assert results[1]["error"] == "No face detected"
+
+    @pytest.mark.asyncio
+    async def test_batch_verify_reports_progress_per_chunk(self):
+        """Should publish each chunk's results with its offset, not all results so far."""
+        from tasks.face_recognition import _batch_verify_async
+
+        images = [f"https://example.com/face{i}.jpg" for i in range(5)]
+        progress = []
+
+        with patch('tasks.face_recognition._download_image', new_callable=AsyncMock) as mock_download, \
+             patch('tasks.face_recognition._search_qdrant_batch', new_callable=AsyncMock) as mock_search:
+            mock_download.return_value = (bytearray(b"image"), None)
+            mock_search.side_effect = lambda embeddings, threshold: [None] * len(embeddings)
+
+            results = await _batch_verify_async(
+                images, threshold=0.85, chunk_size=2,
+                on_chunk=lambda chunk, offset: progress.append((offset, [r["image"] for r in chunk])),
+            )
+
+        assert [offset for offset, _ in progress] == [0, 2, 4]
+        assert [image for _, chunk in progress for image in chunk] == images
+        assert [r["image"] for r in results] == images
+        assert mock_search.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_verify_bounds_download_concurrency(self):
+        """Should never run more downloads at once than the limit."""
+        import asyncio
+        from tasks.face_recognition import _batch_verify_async
+
+        active = 0
+        peak = 0
+
+        async def fetch_bytes(url, max_bytes):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return bytearray(b"image")
+
+        client = Mock()
+        client.fetch_bytes = fetch_bytes
+
+        with patch('tasks.face_recognition.get_http_client', return_value=client), \
+             patch('tasks.face_recognition._search_qdrant_batch', new_callable=AsyncMock) as mock_search:
+            mock_search.side_effect = lambda embeddings, threshold: [None] * len(embeddings)
+
+            results = await _batch_verify_async(
+                [f"https://example.com/{i}.jpg" for i in range(12)],
+                threshold=0.85, chunk_size=4, concurrency=3,
+            )
+
+        assert len(results) == 12
+        assert peak == 3
+
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_reuses_one_service(self, monkeypatch):
+        """Chunks should share one face service instead of re-initializing one each."""
+        import sys
+        import types
+        import tasks.face_recognition as face_tasks
+
+        service = Mock()
+        service.extract_embedding = AsyncMock(return_value=np.ones(512, dtype=np.float32))
+        module = types.ModuleType("app.services.face_recognition")
+        module.FaceRecognitionService = Mock(return_value=service)
+        monkeypatch.setitem(sys.modules, "app.services.face_recognition", module)
+        monkeypatch.setattr(face_tasks, "_face_service", None)
+        monkeypatch.setattr(face_tasks.settings, "FACE_RECOGNITION_MOCK", False)
+
+        for _ in range(3):
+            assert len(await face_tasks._embed_batch([bytearray(b"img"), bytearray(b"img")])) == 2
+
+        module.FaceRecognitionService.assert_called_once()
+        assert service.extract_embedding.await_count == 6
 
 
 class TestQdrantOperations:
@@ -137,17 +213,17 @@ class TestQdrantOperations:
     @pytest.mark.asyncio
     async def test_search_qdrant_finds_match(self):
         """Should find matching identity in Qdrant."""
-        from tasks.face_recognition import _search_qdrant
+        from tasks.face_recognition import _search_qdrant_batch
 
         mock_qdrant = Mock()
         mock_result = Mock()
         mock_result.payload = {"identity_id": "test_identity_123"}
         mock_result.score = 0.92
-        mock_qdrant.search.return_value = [mock_result]
+        mock_qdrant.search_batch = AsyncMock(return_value=[[mock_result]])
 
-        with patch('qdrant_client.QdrantClient', return_value=mock_qdrant):
+        with patch('tasks.face_recognition.get_qdrant', return_value=mock_qdrant):
             embedding = np.random.randn(512).tolist()
-            result = await _search_qdrant(embedding, threshold=0.85)
+            result, = await _search_qdrant_batch([embedding], threshold=0.85)
 
             assert result is not None
             assert result["identity_id"] == "test_identity_123"
@@ -156,29 +232,60 @@ class TestQdrantOperations:
     @pytest.mark.asyncio
     async def test_search_qdrant_no_match(self):
         """Should return None when no match found."""
-        from tasks.face_recognition import _search_qdrant
+        from tasks.face_recognition import _search_qdrant_batch
 
         mock_qdrant = Mock()
-        mock_qdrant.search.return_value = []
+        mock_qdrant.search_batch = AsyncMock(return_value=[[]])
 
-        with patch('qdrant_client.QdrantClient', return_value=mock_qdrant):
+        with patch('tasks.face_recognition.get_qdrant', return_value=mock_qdrant):
             embedding = np.random.randn(512).tolist()
-            result = await _search_qdrant(embedding, threshold=0.85)
+            result = await _search_qdrant_batch([embedding], threshold=0.85)
 
-            assert result is None
+            assert result == [None]
 
     @pytest.mark.asyncio
     async def test_search_qdrant_handles_connection_error(self):
         """Should handle Qdrant connection errors."""
-        from tasks.face_recognition import _search_qdrant
+        from tasks.face_recognition import _search_qdrant_batch
 
-        with patch('qdrant_client.QdrantClient') as mock_client:
-            mock_client.side_effect = Exception("Connection refused")
+        mock_qdrant = Mock()
+        mock_qdrant.search_batch = AsyncMock(side_effect=Exception("Connection refused"))
 
-            embedding = np.random.randn(512).tolist()
-            result = await _search_qdrant(embedding, threshold=0.85)
+        with patch('tasks.face_recognition.get_qdrant', return_value=mock_qdrant):
+            embeddings = [np.random.randn(512).tolist() for _ in range(2)]
+            result = await _search_qdrant_batch(embeddings, threshold=0.85)
+
+            assert result == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_search_qdrant_batch_one_request(self):
+        """Should search every embedding of a chunk in one request."""
+        from config import settings
+        from tasks.face_recognition import _search_qdrant_batch
+
+        hit = Mock()
+        hit.payload = {"identity_id": "test_identity_123"}
+        hit.score = 0.92
+        mock_qdrant = Mock()
+        mock_qdrant.search_batch = AsyncMock(return_value=[[hit], []])
+
+        with patch('tasks.face_recognition.get_qdrant', return_value=mock_qdrant):
+            result = await _search_qdrant_batch(
+                [np.random.randn(512).tolist(), np.random.randn(512).tolist()], threshold=0.85
+            )
+
+        assert result == [{"identity_id": "test_identity_123", "score": 0.92}, None]
+        requests = mock_qdrant.search_batch.await_args.kwargs["requests"]
+        assert len(requests) == 2
+        assert requests[0].params.hnsw_ef == settings.QDRANT_HNSW_EF_SEARCH
+        assert requests[0].params.quantization.rescore is settings.QDRANT_RESCORE
+
+    @pytest.mark.asyncio
+    async def test_shared_client_reused_across_calls(self):
+        """Should reuse one process-wide client instead of one per call."""
+        from vector_db import get_qdrant
 
-            assert result is None
+        assert get_qdrant() is get_qdrant()
 
 
 class TestRegisterEmbedding:
@@ -234,3 +341,134 @@ class TestEmbeddingNormalization:
         from config import settings
 
         assert settings.FACE_EMBEDDING_SIZE == 512
+
+
+class TestDuplicateAudit:
+    """Test the registry-wide near-duplicate audit."""
+
+    @staticmethod
+    def _registry(n=40, dim=512, seed=0):
+        rng = np.random.default_rng(seed)
+        vectors = rng.standard_normal((n, dim)).astype(np.float32)
+        # Plant clusters: {0, 1, 2} chained near-duplicates, {10, 30}
+        vectors[1] = vectors[0] + 0.1 * rng.standard_normal(dim)
+        vectors[2] = vectors[1] + 0.1 * rng.standard_normal(dim)
+        vectors[30] = vectors[10] + 0.1 * rng.standard_normal(dim)
+        ids = [str(uuid.uuid4()) for _ in range(n)]
+        return vectors, ids
+
+    @staticmethod
+    def _qdrant(vectors, ids, page=16, fail_after=None):
+        points = [Mock(id=pid, vector=v.tolist(), payload={"identity_id": pid}) for pid, v in zip(ids, vectors)]
+        calls = {"scroll": 0}
+
+        async def scroll(collection_name, limit, offset, **kwargs):
+            calls["scroll"] += 1
+            if fail_after is not None and calls["scroll"] > fail_after:
+                raise ConnectionError("qdrant went away")
+            start = offset or 0
+            end = start + limit
+            return points[start:end], (end if end < len(points) else None)
+
+        client = Mock()
+        client.count = AsyncMock(return_value=Mock(count=len(points)))
+        client.scroll = scroll
+        return client, calls
+
+    def _setup(self, tmp_path, audit_id, threshold=0.9, block_rows=16):
+        from tasks.face_recognition import _audit_dir, _write_json
+
+        audit_dir = _audit_dir(audit_id)
+        (audit_dir / "pairs").mkdir(parents=True)
+        _write_json(audit_dir / "audit.json", {"threshold": threshold, "block_rows": block_rows})
+        return audit_dir
+
+    @pytest.mark.asyncio
+    async def test_blocks_and_clusters_match_brute_force(self, tmp_path):
+        """Blocked pairs unioned into clusters should equal a full-matrix check."""
+        from tasks.face_recognition import (
+            _cluster_pairs, _export_vectors, _open_vectors, audit_duplicate_block,
+        )
+
+        vectors, ids = self._registry()
+        client, _ = self._qdrant(vectors, ids)
+
+        with patch('tasks.face_recognition.settings.DUPLICATE_AUDIT_DIR', str(tmp_path)), \
+             patch('tasks.face_recognition.get_qdrant', return_value=client):
+            audit_dir = self._setup(tmp_path, "audit-1")
+            assert await _export_vectors(audit_dir, batch_size=16) == 40
+
+            pair_counts = [audit_duplicate_block.run("audit-1", block) for block in range(3)]
+            stored, stored_ids, export = _open_vectors(audit_dir)
+
+            rows, cols, scores = [], [], []
+            for block in range(3):
+                with np.load(audit_dir / "pairs" / f"{block:06d}.npz") as part:
+                    rows.append(part["rows"]); cols.append(part["cols"]); scores.append(part["scores"])
+            clusters = _cluster_pairs(
+                export["count"], np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+            )
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        full = normalized @ normalized.T
+        expected = {(i, j) for i, j in zip(*np.nonzero(np.triu(full, k=1) >= 0.9))}
+        assert sum(pair_counts) == len(expected)
+        assert [sorted(members.tolist()) for _, members, _ in clusters] == [[0, 1, 2], [10, 30]]
+        assert str(uuid.UUID(bytes=stored_ids[30].tobytes())) == ids[30]
+
+    @pytest.mark.asyncio
+    async def test_export_resumes_from_checkpoint(self, tmp_path):
+        """An interrupted export should continue from its saved scroll offset."""
+        from tasks.face_recognition import _export_vectors, _open_vectors
+
+        vectors, ids = self._registry()
+        failing, _ = self._qdrant(vectors, ids, fail_after=1)
+        healthy, calls = self._qdrant(vectors, ids)
+
+        with patch('tasks.face_recognition.settings.DUPLICATE_AUDIT_DIR', str(tmp_path)):
+            audit_dir = self._setup(tmp_path, "audit-2")
+            with patch('tasks.face_recognition.get_qdrant', return_value=failing):
+                with pytest.raises(ConnectionError):
+                    await _export_vectors(audit_dir, batch_size=16)
+            with patch('tasks.face_recognition.get_qdrant', return_value=healthy):
+                assert await _export_vectors(audit_dir, batch_size=16) == 40
+
+            stored, _, _ = _open_vectors(audit_dir)
+
+        assert calls["scroll"] == 2  # pages 2 and 3 only
+        assert np.allclose(stored[39], vectors[39] / np.linalg.norm(vectors[39]), atol=1e-6)
+
+    def test_finished_block_is_skipped(self, tmp_path):
+        """Re-running an audit should not recompute blocks that already finished."""
+        from tasks.face_recognition import audit_duplicate_block
+
+        with patch('tasks.face_recognition.settings.DUPLICATE_AUDIT_DIR', str(tmp_path)), \
+             patch('tasks.face_recognition._compute_block_pairs') as compute:
+            audit_dir = self._setup(tmp_path, "audit-3")
+            with open(audit_dir / "pairs" / "000000.npz", "wb") as f:
+                np.savez(f, rows=np.array([0]), cols=np.array([1]), scores=np.array([0.95], np.float32))
+
+            assert audit_duplicate_block.run("audit-3", 0) == 1
+            compute.assert_not_called()
+
+    def test_block_io_error_retries(self, tmp_path):
+        """A failed read or write of the shared audit files should retry the block."""
+        from celery.exceptions import Retry
+        from tasks.face_recognition import audit_duplicate_block
+
+        with patch('tasks.face_recognition.settings.DUPLICATE_AUDIT_DIR', str(tmp_path)), \
+             patch('tasks.face_recognition._open_vectors', side_effect=OSError("stale file handle")), \
+             patch.object(audit_duplicate_block, 'retry', side_effect=Retry()) as retry:
+            self._setup(tmp_path, "audit-4")
+            with pytest.raises(Retry):
+                audit_duplicate_block.run("audit-4", 0)
+
+        assert isinstance(retry.call_args.kwargs["exc"], OSError)
+        assert retry.call_args.kwargs["countdown"] == 60
+
+    def test_audit_id_must_be_path_safe(self):
+        """Audit ids are used as directory names."""
+        from tasks.face_recognition import _audit_dir
+
+        with pytest.raises(ValueError):
+            _audit_dir("../../etc")
@@ -154,17 +154,16 @@ class TestSendWebhook:
 
         with patch('tasks.notifications.trace_task') as mock_trace, \
              patch('tasks.notifications.add_task_attribute'), \
-             patch('asyncio.new_event_loop') as mock_loop:
+             patch('tasks.notifications.run_async') as mock_run:
 
             mock_trace.return_value.__enter__ = Mock(return_value=Mock())
             mock_trace.return_value.__exit__ = Mock(return_value=False)
 
             # Mock the async result to be a failure
-            mock_loop.return_value.run_until_complete.return_value = {
+            mock_run.return_value = {
                 "success": False,
                 "error": "Connection timeout"
             }
-            mock_loop.return_value.close = Mock()
 
             with pytest.raises(Exception):
                 send_webhook(
@@ -0,0 +1,192 @@
+"""
+Tests for Per-Task Resource Profiling
+
+Tests CPU/DB/HTTP accounting, the resource histograms and the opt-in
+stack sampler.
+"""
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+
+@pytest.fixture
+def profiling():
+    """Profiling module with no task active and an empty slow-task list."""
+    import profiling
+
+    profiling._state.profile = None
+    profiling._slowest.clear()
+    yield profiling
+    profiling._state.profile = None
+    profiling._slowest.clear()
+
+
+def _sample(name, task_name, suffix="_count"):
+    return REGISTRY.get_sample_value(
+        f"{name}{suffix}", {"task_name": task_name, "queue": "default"}
+    ) or 0
+
+
+class TestTaskProfile:
+    """Test per-task accounting."""
+
+    def test_counts_db_queries(self, profiling):
+        """Should count and time queries on any engine while a task runs."""
+        profiling.install_sqlalchemy_hooks()
+        engine = create_engine("sqlite://")
+
+        profiling.start_task_profile("t-db", "tasks.test.db")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        profile = profiling.finish_task_profile("t-db")
+
+        assert profile.db_queries == 2
+        assert profile.db_seconds > 0
+
+    def test_queries_outside_task_not_counted(self, profiling):
+        """Queries with no active task should be ignored."""
+        profiling.install_sqlalchemy_hooks()
+        engine = create_engine("sqlite://")
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert profiling.current_profile() is None
+
+    async def test_times_http_requests(self, profiling):
+        """httpx hooks should add request count and time to the task."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text="ok"))
+
+        profiling.start_task_profile("t-http", "tasks.test.http")
+        async with httpx.AsyncClient(
+            transport=transport, event_hooks=profiling.http_event_hooks()
+        ) as client:
+            await client.get("https://example.com/a")
+            await client.get("https://example.com/b")
+        profile = profiling.finish_task_profile("t-http")
+
+        assert profile.http_requests == 2
+        assert profile.http_seconds >= 0
+
+    async def test_times_streamed_body_until_closed(self, profiling):
+        """A streamed download should be timed through its body, not just its headers."""
+        import asyncio
+
+        async def slow_body():
+            for _ in range(3):
+                await asyncio.sleep(0.02)
+                yield b"x" * 1024
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=slow_body()))
+
+        profiling.start_task_profile("t-stream", "tasks.test.http")
+        async with httpx.AsyncClient(
+            transport=transport, event_hooks=profiling.http_event_hooks()
+        ) as client:
+            async with client.stream("GET", "https://example.com/big.jpg") as response:
+                body = b"".join([chunk async for chunk in response.aiter_bytes()])
+        profile = profiling.finish_task_profile("t-stream")
+
+        assert len(body) == 3 * 1024
+        assert profile.http_requests == 1
+        assert profile.http_seconds >= 0.05
+
+    def test_records_histograms(self, profiling):
+        """Finishing a task should observe each resource histogram once."""
+        before = _sample("celery_task_cpu_seconds", "tasks.test.metrics")
+
+        profiling.start_task_profile("t-metrics", "tasks.test.metrics")
+        sum(i * i for i in range(20000))
+        profile = profiling.finish_task_profile("t-metrics")
+
+        assert profile.cpu_seconds > 0
+        assert profile.duration > 0
+        assert _sample("celery_task_cpu_seconds", "tasks.test.metrics") == before + 1
+        assert _sample("celery_task_db_queries", "tasks.test.metrics") >= 1
+        assert _sample("celery_task_http_seconds", "tasks.test.metrics") >= 1
+        assert _sample("celery_task_rss_delta_bytes", "tasks.test.metrics") >= 1
+
+    def test_finish_other_task_ignored(self, profiling):
+        """A postrun for a different task id should not consume the profile."""
+        profiling.start_task_profile("t-1", "tasks.test.a")
+
+        assert profiling.finish_task_profile("t-2") is None
+        assert profiling.finish_task_profile("t-1") is not None
+
+
+class TestStackSampler:
+    """Test opt-in sampling of slow tasks."""
+
+    def test_disabled_by_default(self, profiling):
+        """No sampler should run with a zero sample rate."""
+        with patch.object(profiling.settings, "TASK_PROFILE_SAMPLE_RATE", 0.0):
+            profile = profiling.start_task_profile("t-off", "tasks.test.off")
+
+        assert profile.sampler is None
+        profiling.finish_task_profile("t-off")
+
+    def test_logs_stacks_of_slowest_tasks(self, profiling):
+        """Sampled tasks entering the top N should have their stacks logged."""
+        def busy_wait(seconds):
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                pass
+
+        with patch.object(profiling.settings, "TASK_PROFILE_SAMPLE_RATE", 1.0), \
+             patch.object(profiling.settings, "TASK_PROFILE_INTERVAL_MS", 1.0), \
+             patch.object(profiling.settings, "TASK_PROFILE_TOP_N", 1), \
+             patch.object(profiling, "logger") as mock_logger:
+            profiling.start_task_profile("t-slow", "tasks.test.slow")
+            busy_wait(0.1)
+            profiling.finish_task_profile("t-slow")
+
+            profiling.start_task_profile("t-fast", "tasks.test.fast")
+            busy_wait(0.02)
+            profiling.finish_task_profile("t-fast")
+
+        mock_logger.warning.assert_called_once()
+        logged = mock_logger.warning.call_args.kwargs
+        assert logged["task_id"] == "t-slow"
+        assert logged["rank"] == 1
+        assert "busy_wait" in logged["stacks"][0]["stack"]
+
+
+class TestMultiprocessMetrics:
+    """Test metrics recorded in prefork children reach the parent's server."""
+
+    def test_child_samples_visible_to_parent(self, tmp_path):
+        """A histogram observed in a forked child should be collected in the parent."""
+        import os
+        import subprocess
+        import sys
+
+        worker_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        probe = (
+            "import multiprocessing, sys\n"
+            "import celery_app\n"
+            "celery_app.init_multiprocess_metrics()\n"
+            "import metrics\n"
+            "def child():\n"
+            "    metrics.record_task_complete('tasks.test.mp', 'face', 'success', 1.5)\n"
+            "p = multiprocessing.get_context('fork').Process(target=child)\n"
+            "p.start(); p.join()\n"
+            "from prometheus_client import CollectorRegistry, multiprocess\n"
+            "registry = CollectorRegistry()\n"
+            "multiprocess.MultiProcessCollector(registry)\n"
+            "count = registry.get_sample_value(\n"
+            "    'celery_task_duration_seconds_count', {'task_name': 'tasks.test.mp', 'queue': 'face'})\n"
+            "sys.exit(0 if count == 1 else 1)\n"
+        )
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [worker_dir, os.environ.get("PYTHONPATH")])),
+            "PROMETHEUS_MULTIPROC_DIR": str(tmp_path),
+        }
+        result = subprocess.run([sys.executable, "-c", probe], cwd=worker_dir, env=env, capture_output=True)
+
+        assert result.returncode == 0, result.stderr.decode()[-500:]
@@ -0,0 +1,153 @@
+"""
+Tests for the Worker Async Runtime
+
+Tests the persistent per-process event loop and client shutdown.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def runtime():
+    """Fresh runtime state, closed again after the test."""
+    import runtime
+
+    runtime._loop = None
+    runtime._loop_pid = None
+    yield runtime
+    if runtime._loop is not None and not runtime._loop.is_closed():
+        runtime._loop.close()
+    runtime._loop = None
+    runtime._loop_pid = None
+
+
+class TestRunAsync:
+    """Test loop reuse across task invocations."""
+
+    def test_reuses_loop_between_calls(self, runtime):
+        """Consecutive tasks should run on the same loop."""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = runtime.run_async(current_loop())
+        second = runtime.run_async(current_loop())
+
+        assert first is second
+        assert not first.is_closed()
+
+    def test_db_run_async_uses_runtime(self, runtime):
+        """db.run_async should be the runtime's loop runner."""
+        from db import run_async
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert run_async(current_loop()) is runtime.get_loop()
+
+    def test_new_loop_after_fork(self, runtime):
+        """A forked child must not reuse the parent's loop."""
+        parent_loop = runtime.get_loop()
+
+        with patch("runtime.os.getpid", return_value=runtime._loop_pid + 1):
+            child_loop = runtime.get_loop()
+
+        assert child_loop is not parent_loop
+        parent_loop.close()
+
+    def test_new_loop_after_close(self, runtime):
+        """A closed loop should be replaced on next use."""
+        loop = runtime.get_loop()
+        loop.close()
+
+        assert runtime.get_loop() is not loop
+
+
+class TestShutdown:
+    """Test clean disposal at worker_process_shutdown."""
+
+    def test_closes_clients_and_loop(self, runtime):
+        """Should dispose engine, Qdrant and HTTP clients, then close the loop."""
+        loop = runtime.get_loop()
+
+        with patch("db.close_engine", new_callable=AsyncMock) as close_engine, \
+             patch("vector_db.close_qdrant", new_callable=AsyncMock) as close_qdrant, \
+             patch("http_client.close_http_client", new_callable=AsyncMock) as close_http:
+            runtime.shutdown_worker_runtime()
+
+        close_engine.assert_awaited_once()
+        close_qdrant.assert_awaited_once()
+        close_http.assert_awaited_once()
+        assert loop.is_closed()
+        assert runtime._loop is None
+
+    def test_client_failure_does_not_block_shutdown(self, runtime):
+        """One failing client should not leave the others or the loop open."""
+        loop = runtime.get_loop()
+
+        with patch("db.close_engine", new_callable=AsyncMock, side_effect=Exception("gone")), \
+             patch("vector_db.close_qdrant", new_callable=AsyncMock), \
+             patch("http_client.close_http_client", new_callable=AsyncMock) as close_http:
+            runtime.shutdown_worker_runtime()
+
+        close_http.assert_awaited_once()
+        assert loop.is_closed()
+
+    def test_noop_without_loop(self, runtime):
+        """Shutdown before any task ran should do nothing."""
+        runtime.shutdown_worker_runtime()
+
+        assert runtime._loop is None
+
+
+
+class TestFaceModelWarmup:
+    """Test face model setup in prefork children."""
+
+    @pytest.fixture
+    def face_models(self, monkeypatch):
+        """Stand-ins for the API's inference pool and model registry."""
+        import sys
+        import types
+        from unittest.mock import MagicMock
+
+        pool = MagicMock(workers=2)
+        registry = MagicMock(warm_up=AsyncMock())
+        for name, attr, value in (
+            ("app.services.inference_pool", "inference_pool", pool),
+            ("app.services.model_registry", "model_registry", registry),
+        ):
+            module = types.ModuleType(name)
+            setattr(module, attr, value)
+            monkeypatch.setitem(sys.modules, name, module)
+        return pool, registry
+
+    @pytest.fixture
+    def celery_app(self, monkeypatch):
+        import celery_app
+
+        monkeypatch.setattr(celery_app.settings, "FACE_RECOGNITION_MOCK", False)
+        monkeypatch.setattr(celery_app.settings, "FACE_MODEL_WARMUP", True)
+        return celery_app
+
+    def test_child_runs_inference_in_process(self, celery_app, face_models, monkeypatch):
+        """A child must not start its own inference pool (one model copy per child)."""
+        pool, registry = face_models
+        monkeypatch.setattr(celery_app, "_consumed_queues", {"face"})
+
+        with patch("db.run_async", side_effect=asyncio.run):
+            celery_app.warm_face_models()
+
+        assert pool.workers == 0
+        registry.warm_up.assert_awaited_once()
+
+    def test_skips_warmup_on_other_queues(self, celery_app, face_models, monkeypatch):
+        """Workers that never run face tasks should not load the models."""
+        pool, registry = face_models
+        monkeypatch.setattr(celery_app, "_consumed_queues", {"notifications", "cleanup"})
+
+        celery_app.warm_face_models()
+
+        assert pool.workers == 0
+        registry.warm_up.assert_not_awaited()
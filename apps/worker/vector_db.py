@@ -0,0 +1,67 @@
+"""
+Shared Qdrant Client for Worker Tasks
+
+Like db.py for the database, this module provides one process-wide
+Qdrant client for all Celery tasks instead of building a new
+QdrantClient on every call. It reuses the API's client factory
+(app/core/qdrant.py): async gRPC over a pooled HTTP/2 channel, per-call
+timeout, and retries on transient errors.
+"""
+import os
+import sys
+from typing import Optional
+
+import structlog
+from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+from config import settings
+
+# Add API app to path for the shared client factory
+API_PATH = os.path.join(os.path.dirname(__file__), '..', 'api')
+if API_PATH not in sys.path:
+    sys.path.insert(0, API_PATH)
+
+from app.core.qdrant import QdrantClientConfig, QdrantClientFactory, RetryingQdrantClient
+
+logger = structlog.get_logger()
+
+# Singleton factory (one client per event loop, see QdrantClientFactory)
+_factory: Optional[QdrantClientFactory] = None
+
+
+def get_qdrant() -> RetryingQdrantClient:
+    """Get the shared Qdrant client for this worker process."""
+    global _factory
+
+    if _factory is None:
+        _factory = QdrantClientFactory(
+            QdrantClientConfig(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                api_key=settings.QDRANT_API_KEY,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                timeout=settings.QDRANT_TIMEOUT,
+                max_retries=settings.QDRANT_MAX_RETRIES,
+            )
+        )
+        logger.info("Worker Qdrant client factory created", grpc=settings.QDRANT_PREFER_GRPC)
+
+    return _factory.client
+
+
+def search_params() -> SearchParams:
+    """Per-search parameters matching the collection schema the API applies."""
+    quantization = None
+    if settings.QDRANT_QUANTIZATION != "none":
+        quantization = QuantizationSearchParams(
+            rescore=settings.QDRANT_RESCORE, oversampling=settings.QDRANT_OVERSAMPLING
+        )
+    return SearchParams(hnsw_ef=settings.QDRANT_HNSW_EF_SEARCH, quantization=quantization)
+
+
+async def close_qdrant():
+    """Close the shared Qdrant client."""
+    if _factory is not None:
+        await _factory.close()
+        logger.info("Worker Qdrant client closed")
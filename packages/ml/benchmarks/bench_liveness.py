@@ -0,0 +1,131 @@
+"""
+Benchmark: per-crop vs. batched liveness scoring
+
+Compares three ways of scoring the same face crops:
+
+- legacy:  the previous per-crop checks (four gray conversions and a complex
+           FFT on the crop's native, arbitrary size)
+- detect:  LivenessDetector.detect per crop (one FaceCrop, real FFT)
+- batch:   LivenessDetector.detect_batch over all crops at once
+
+Crops are synthetic with mixed, deliberately awkward (prime) sizes.
+
+Usage:
+    python benchmarks/bench_liveness.py --crops 256 --repeat 5
+    python benchmarks/bench_liveness.py --analysis-size 256 --output liveness.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+try:
+    from actorhub_ml.liveness import LivenessDetector
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from src.liveness import LivenessDetector
+
+CROP_SIZES = [(113, 127), (211, 199), (331, 307), (487, 461)]
+
+
+def _synthetic_crops(count):
+    rng = np.random.default_rng(0)
+    crops = []
+    for i in range(count):
+        h, w = CROP_SIZES[i % len(CROP_SIZES)]
+        noise = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        crops.append(cv2.GaussianBlur(noise, (5, 5), 1.5))
+    return crops
+
+
+def _legacy_checks(face_img, texture_threshold=20.0, color_threshold=10.0):
+    """The checks as they ran before FaceCrop, kept here as the baseline."""
+    checks = {}
+
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    checks["texture"] = cv2.Laplacian(gray, cv2.CV_64F).var() > texture_threshold
+
+    ycrcb = cv2.cvtColor(face_img, cv2.COLOR_BGR2YCrCb)
+    cr, cb = ycrcb[:, :, 1], ycrcb[:, :, 2]
+    skin_mask = (cr > 133) & (cr < 173) & (cb > 77) & (cb < 127)
+    checks["color"] = (
+        np.std(cr) > color_threshold
+        and np.std(cb) > color_threshold
+        and np.sum(skin_mask) / skin_mask.size > 0.3
+    )
+
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    checks["reflection"] = np.sum(gray > 240) / gray.size < 0.05
+
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    magnitude = np.abs(np.fft.fftshift(np.fft.fft2(gray)))
+    h, w = magnitude.shape
+    magnitude[h // 2 - 5 : h // 2 + 5, w // 2 - 5 : w // 2 + 5] = 0
+    mean_mag = np.mean(magnitude)
+    checks["moire"] = (np.max(magnitude) / mean_mag if mean_mag > 0 else 0) < 100
+
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    checks["edges"] = 0.02 < np.sum(edges > 0) / edges.size < 0.15
+
+    return checks
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(args):
+    crops = _synthetic_crops(args.crops)
+    detector = LivenessDetector(analysis_size=args.analysis_size)
+
+    timings = {
+        "legacy": _time(lambda: [_legacy_checks(c) for c in crops], args.repeat),
+        "detect": _time(lambda: [detector.detect(c) for c in crops], args.repeat),
+        "batch": _time(lambda: detector.detect_batch(crops), args.repeat),
+    }
+
+    legacy = [_legacy_checks(c) for c in crops]
+    batched = detector.detect_batch(crops)
+    agreement = {
+        name: round(float(np.mean([bool(old[name]) == new.checks[name] for old, new in zip(legacy, batched)])), 3)
+        for name in legacy[0]
+    }
+
+    result = {
+        "crops": args.crops,
+        "crop_sizes": CROP_SIZES,
+        "analysis_size": args.analysis_size,
+        "per_crop_us": {name: round(t / args.crops * 1e6, 1) for name, t in timings.items()},
+        "speedup_vs_legacy": {
+            name: round(timings["legacy"] / t, 2) for name, t in timings.items() if t
+        },
+        "check_agreement_vs_legacy": agreement,
+    }
+
+    for name, per_crop in result["per_crop_us"].items():
+        print(f"{name:<8} {per_crop:>10} us/crop  x{result['speedup_vs_legacy'][name]}")
+    print(f"agreement with legacy checks: {agreement}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", type=int, default=256)
+    parser.add_argument("--analysis-size", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    main(parser.parse_args())
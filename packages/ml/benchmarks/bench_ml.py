@@ -0,0 +1,350 @@
+"""
+Benchmark suite: throughput, latency and memory of the ML package
+
+Runs every model entry point over a grid of synthetic images (several
+resolutions x face counts) plus optional fixture photos, fully offline,
+and reports per workload:
+
+  images_per_s - images processed per second of wall time
+  p50/p99_ms   - latency per call (one image, or one batch for *_batch cases)
+  peak_rss_mb  - peak resident memory of the case's process so far
+
+Each (case, mode) runs in a fresh process so model memory doesn't leak
+between cases; within a process workloads run smallest first, so the peak
+RSS of a workload includes everything before it but nothing larger.
+
+Modes:
+  mock - model-backed cases run without models: InsightFace is hidden, so
+         embeddings are mocked and detection uses OpenCV's Haar cascade
+  real - InsightFace models (skipped with a note if not installed or the
+         model pack can't be loaded; nothing is downloaded on the fly
+         unless already cached)
+Liveness, quality and image loading use no models and run in mode "cv".
+
+Synthetic faces are drawn ellipses with eyes and a mouth: enough for the
+classic checks and stable timings, not for a neural detector to find
+faces. Pass real photos with --fixtures for representative detection.
+
+Usage:
+    python benchmarks/bench_ml.py --output results.json
+    python benchmarks/bench_ml.py --modes mock real --fixtures ../../test_face.jpg
+    python benchmarks/bench_ml.py --cases embed embed_batch --compare baseline.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RESOLUTIONS = ["640x480", "1280x720", "1920x1080"]
+FACE_COUNTS = [0, 1, 4]
+
+MODEL_CASES = ("detect", "detect_batch", "detect_tiled", "embed", "embed_batch")
+CASES = MODEL_CASES + ("liveness", "liveness_batch", "quality", "quality_batch", "load")
+
+
+def _import_ml():
+    try:
+        import actorhub_ml as ml
+    except ImportError:
+        sys.path.insert(0, str(ROOT))
+        import src as ml
+    return ml
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+# ---------------------------------------------------------------------------
+# Workloads
+# ---------------------------------------------------------------------------
+
+
+def _synthetic_image(width, height, faces, seed):
+    """Textured background with ``faces`` face-like ellipses; returns (image, bboxes)."""
+    rng = np.random.default_rng(seed)
+    image = cv2.GaussianBlur(rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (7, 7), 2)
+
+    bboxes = []
+    cols = max(1, int(np.ceil(np.sqrt(faces))))
+    rows = max(1, int(np.ceil(faces / cols)))
+    cell_w, cell_h = width // cols, height // rows
+    for i in range(faces):
+        cx = cell_w * (i % cols) + cell_w // 2
+        cy = cell_h * (i // cols) + cell_h // 2
+        axis_w, axis_h = int(cell_w * 0.3), int(cell_h * 0.38)
+        skin = tuple(int(c) for c in rng.integers(-15, 15, 3) + (120, 150, 200))
+        cv2.ellipse(image, (cx, cy), (axis_w, axis_h), 0, 0, 360, skin, -1)
+        for dx in (-axis_w // 3, axis_w // 3):
+            cv2.circle(image, (cx + dx, cy - axis_h // 4), max(2, axis_w // 8), (40, 30, 30), -1)
+        cv2.ellipse(image, (cx, cy + axis_h // 2), (axis_w // 3, axis_h // 10), 0, 0, 180, (60, 60, 150), 2)
+        bboxes.append((cx - axis_w, cy - axis_h, cx + axis_w, cy + axis_h))
+    return image, bboxes
+
+
+def _workloads(args):
+    """[(name, resolution, faces, images, bboxes)], smallest resolution first."""
+    workloads = []
+    for resolution in sorted(args.resolutions, key=lambda r: np.prod([int(v) for v in r.split("x")])):
+        width, height = (int(v) for v in resolution.split("x"))
+        for faces in args.faces:
+            images, bboxes = [], []
+            for i in range(args.images):
+                image, boxes = _synthetic_image(width, height, faces, seed=i)
+                images.append(image)
+                bboxes.append(boxes[0] if boxes else None)
+            workloads.append((f"synthetic_{resolution}_{faces}f", resolution, faces, images, bboxes))
+
+    for path in args.fixtures or []:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"skipping unreadable fixture {path}", file=sys.stderr)
+            continue
+        resolution = f"{image.shape[1]}x{image.shape[0]}"
+        workloads.append(
+            (f"fixture_{Path(path).stem}", resolution, None, [image] * args.images, [None] * args.images)
+        )
+    return workloads
+
+
+# ---------------------------------------------------------------------------
+# Cases: build(ml, mode, args) -> run(images, bboxes) -> per-call latencies
+# ---------------------------------------------------------------------------
+
+
+def _per_image(fn):
+    def run(images, bboxes):
+        samples = []
+        for image, bbox in zip(images, bboxes):
+            started = time.perf_counter()
+            fn(image, bbox)
+            samples.append(time.perf_counter() - started)
+        return samples
+
+    return run
+
+
+def _per_batch(fn, batch_size):
+    def run(images, bboxes):
+        samples = []
+        for start in range(0, len(images), batch_size):
+            started = time.perf_counter()
+            fn(images[start : start + batch_size], bboxes[start : start + batch_size])
+            samples.append(time.perf_counter() - started)
+        return samples
+
+    return run
+
+
+def _build_case(ml, case, mode, args):
+    if case in ("detect", "detect_batch", "detect_tiled"):
+        detector = ml.FaceDetector(backend="insightface" if mode == "real" else "opencv")
+        detector._initialize()
+        if mode == "real" and detector._detector_type != "insightface":
+            raise RuntimeError("InsightFace detector could not be loaded")
+        if case == "detect_batch":
+            return _per_batch(lambda images, bboxes: detector.detect_batch(images), args.batch_size)
+        tile_size = args.tile_size if case == "detect_tiled" else None
+        return _per_image(lambda image, bbox: detector.detect(image, tile_size=tile_size))
+
+    if case in ("embed", "embed_batch"):
+        extractor = ml.FaceEmbeddingExtractor()
+        extractor._initialize()
+        if mode == "real" and extractor._app is None:
+            raise RuntimeError("InsightFace model could not be loaded")
+        if case == "embed":
+            return _per_image(lambda image, bbox: extractor.extract(image))
+        return _per_batch(lambda images, bboxes: extractor.extract_batch(images), args.batch_size)
+
+    if case in ("liveness", "liveness_batch"):
+        detector = ml.LivenessDetector()
+        if case == "liveness":
+            return _per_image(detector.detect)
+        return _per_batch(detector.detect_batch, args.batch_size)
+
+    if case in ("quality", "quality_batch"):
+        assessor = ml.QualityAssessor()
+        if case == "quality":
+            return _per_image(assessor.assess)
+        return _per_batch(assessor.assess_batch, args.batch_size)
+
+    if case == "load":
+        loader = ml.ImageBatchLoader()
+
+        def load(images, bboxes):
+            if not images:
+                return []
+            encoded = [cv2.imencode(".jpg", image)[1].tobytes() for image in images]
+            started = time.perf_counter()
+            for _ in loader.load(encoded):
+                pass
+            # Decodes overlap, so only the mean per image is meaningful
+            return [(time.perf_counter() - started) / len(images)] * len(images)
+
+        return load
+
+    raise ValueError(f"Unknown case {case}")
+
+
+def _summarize(samples, images):
+    samples = np.asarray(samples)
+    total = float(samples.sum())
+    return {
+        "calls": len(samples),
+        "images_per_s": round(images / total, 2) if total else None,
+        "p50_ms": round(float(np.percentile(samples, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(samples, 99)) * 1000, 3),
+    }
+
+
+def _run_case(case, mode, args):
+    """Entry point of the per-case process."""
+    logging.disable(logging.WARNING)  # Mock mode warns on every image
+    if mode == "mock":
+        sys.modules["insightface"] = None  # Import fails -> mock embeddings, Haar detection
+
+    ml = _import_ml()
+    base = {"case": case, "mode": mode}
+    workloads = _workloads(args)
+
+    started = time.perf_counter()
+    try:
+        run = _build_case(ml, case, mode, args)
+    except Exception as e:
+        return [{**base, "skipped": f"{type(e).__name__}: {e}"}]
+    setup_s = round(time.perf_counter() - started, 3)
+
+    results = []
+    for name, resolution, faces, images, bboxes in workloads:
+        row = {**base, "workload": name, "resolution": resolution, "faces": faces, "images": len(images)}
+        try:
+            if args.warmup:
+                run(images[: args.warmup], bboxes[: args.warmup])
+            samples = []
+            for _ in range(args.repeat):
+                samples.extend(run(images, bboxes))
+            row.update(_summarize(samples, len(images) * args.repeat))
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        row["setup_s"] = setup_s
+        row["peak_rss_mb"] = _peak_rss_mb()
+        results.append(row)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__}
+    for module in ("onnxruntime", "insightface"):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def _key(row):
+    return (row["case"], row["mode"], row.get("workload"))
+
+
+def _compare(results, baseline_path, tolerance):
+    """Print throughput change vs. a previous run; returns the regressed rows."""
+    baseline = {_key(r): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = []
+    for row in results:
+        old = baseline.get(_key(row))
+        if not old or not old.get("images_per_s") or not row.get("images_per_s"):
+            continue
+        ratio = row["images_per_s"] / old["images_per_s"]
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions.append(row)
+        print(f"{row['case']:<15} {row['mode']:<5} {row['workload']:<28} x{ratio:.2f} images/s{flag}")
+    return regressions
+
+
+def main(args):
+    jobs = []
+    for case in args.cases:
+        modes = args.modes if case in MODEL_CASES else ["cv"]
+        jobs.extend((case, mode) for mode in modes)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for case, mode in jobs:
+            rows = pool.apply(_run_case, (case, mode, args))
+            for row in rows:
+                if "skipped" in row:
+                    print(f"{case:<15} {mode:<5} skipped: {row['skipped']}")
+                elif "error" in row:
+                    print(f"{case:<15} {mode:<5} {row['workload']:<28} error: {row['error']}")
+                else:
+                    print(
+                        f"{case:<15} {mode:<5} {row['workload']:<28} {row['images_per_s']:>9} img/s  "
+                        f"p50={row['p50_ms']:>9}ms  p99={row['p99_ms']:>9}ms  rss={row['peak_rss_mb']}MB"
+                    )
+            results.extend(rows)
+
+    report = {"meta": _metadata(), "config": vars(args), "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    if args.compare and _compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=CASES)
+    parser.add_argument("--modes", nargs="+", default=["mock", "real"], choices=["mock", "real"])
+    parser.add_argument("--resolutions", nargs="+", default=RESOLUTIONS, help="WIDTHxHEIGHT")
+    parser.add_argument("--faces", type=int, nargs="+", default=FACE_COUNTS)
+    parser.add_argument("--fixtures", nargs="*", help="Real photos to add as workloads")
+    parser.add_argument("--images", type=int, default=16, help="Images per workload")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--tile-size", type=int, default=640, help="Tile size for detect_tiled")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed images before each workload")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous JSON results to compare throughput against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="Allowed throughput drop before --compare fails"
+    )
+    main(parser.parse_args())
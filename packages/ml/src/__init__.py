@@ -4,17 +4,26 @@ ActorHub ML Package
 Face recognition, identity verification, and ML utilities for ActorHub.ai
 """
 
-from .face_embedding import FaceEmbedding, extract_face_embedding
+from .face_embedding import FaceEmbedding, FaceEmbeddingExtractor, extract_face_embedding
 from .face_detection import FaceDetector, detect_faces
-from .face_comparison import compare_faces, cosine_similarity
-from .quality import assess_image_quality, QualityScore
-from .liveness import LivenessDetector, check_liveness
+from .face_comparison import (
+    EmbeddingGallery,
+    SimilarityPairs,
+    compare_faces,
+    cosine_similarity,
+    pairwise_similarity,
+)
+from .quality import QualityAssessor, QualityScore, assess_image_quality, assess_image_quality_batch
+from .liveness import FaceCrop, LivenessDetector, check_liveness
+from .batching import BatchStats, MicroBatcher
+from .image_loader import ImageBatchLoader, LoadedImage, load_image
 
 __version__ = "1.0.0"
 
 __all__ = [
     # Face Embedding
     "FaceEmbedding",
+    "FaceEmbeddingExtractor",
     "extract_face_embedding",
     # Face Detection
     "FaceDetector",
@@ -22,10 +31,23 @@ __all__ = [
     # Face Comparison
     "compare_faces",
     "cosine_similarity",
+    "EmbeddingGallery",
+    "pairwise_similarity",
+    "SimilarityPairs",
     # Quality Assessment
     "assess_image_quality",
+    "assess_image_quality_batch",
+    "QualityAssessor",
     "QualityScore",
     # Liveness Detection
     "LivenessDetector",
+    "FaceCrop",
     "check_liveness",
+    # Batching
+    "MicroBatcher",
+    "BatchStats",
+    # Image Loading
+    "ImageBatchLoader",
+    "LoadedImage",
+    "load_image",
 ]
@@ -0,0 +1,154 @@
+"""
+Micro-batching
+
+Coalesce single-item calls from concurrent threads into batched calls, so a
+model that accepts batched input runs one forward pass for many callers.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchStats:
+    """Running batch size and queue wait statistics."""
+
+    batches: int = 0
+    items: int = 0
+    largest_batch: int = 0
+    total_queue_wait: float = 0.0  # seconds
+    max_queue_wait: float = 0.0  # seconds
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    @property
+    def mean_queue_wait_ms(self) -> float:
+        return 1000 * self.total_queue_wait / self.items if self.items else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+            "mean_queue_wait_ms": round(self.mean_queue_wait_ms, 3),
+            "max_queue_wait_ms": round(1000 * self.max_queue_wait, 3),
+        }
+
+
+class MicroBatcher:
+    """
+    Thread-safe micro-batching scheduler.
+
+    Items submitted from any thread are collected for up to ``max_wait_ms``
+    after the first one arrives, or until ``max_batch_size`` are waiting,
+    then passed to ``process_batch`` in one call on a background thread.
+    Each caller receives its own result (or the batch's exception).
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[list], list],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        on_batch: Optional[Callable[[int, list[float]], None]] = None,
+    ):
+        """
+        Initialize micro-batcher.
+
+        Args:
+            process_batch: Function taking a list of items, returning results in the same order
+            max_batch_size: Maximum items per batch
+            max_wait_ms: Maximum time to hold the first item of a batch
+            on_batch: Optional callback(batch_size, queue_waits_seconds) for metrics export
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.on_batch = on_batch
+        self.stats = BatchStats()
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item; the returned future resolves with its result."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future: Future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item: Any) -> Any:
+        """Submit an item and block until its result is ready."""
+        return self.submit(item).result()
+
+    def close(self) -> None:
+        """Stop the background thread after draining queued items."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: list) -> None:
+        now = time.perf_counter()
+        waits = [now - enqueued_at for _, _, enqueued_at in batch]
+
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        self.stats.total_queue_wait += sum(waits)
+        self.stats.max_queue_wait = max(self.stats.max_queue_wait, max(waits))
+        if self.on_batch is not None:
+            try:
+                self.on_batch(len(batch), waits)
+            except Exception as e:
+                logger.warning(f"on_batch callback failed: {e}")
+
+        try:
+            results = self.process_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
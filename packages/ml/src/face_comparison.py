@@ -2,10 +2,17 @@
 Face Comparison Module
 
 Compare face embeddings for identity verification.
+
+Pairwise helpers (cosine_similarity, compare_faces) work on two embeddings.
+For galleries and offline audits, use the matrix API: EmbeddingGallery
+stacks and normalizes embeddings once and searches them in tiles, and
+pairwise_similarity returns only pairs above a threshold instead of a
+dense NxN matrix.
 """
 
 import logging
-from typing import Union
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
 
 import numpy as np
 
@@ -137,13 +144,11 @@ def find_best_match(
             "rank": -1,
         }
 
-    similarities = []
-    for emb in gallery_embeddings:
-        sim = cosine_similarity(query_embedding, emb)
-        similarities.append(sim)
+    query = stack_embeddings([query_embedding])[0]
+    similarities = stack_embeddings(gallery_embeddings) @ query
 
     best_idx = int(np.argmax(similarities))
-    best_similarity = similarities[best_idx]
+    best_similarity = float(similarities[best_idx])
 
     is_match = best_similarity >= threshold
 
@@ -173,23 +178,337 @@ def batch_compare(
     Returns:
         NxN similarity matrix
     """
-    n = len(embeddings)
-    matrix = np.zeros((n, n))
+    if len(embeddings) == 0:
+        return np.zeros((0, 0))
+
+    arrays = stack_embeddings(embeddings)
+    return (arrays @ arrays.T).astype(np.float64)
+
+
+def _as_array(embedding: Union[np.ndarray, FaceEmbedding]) -> np.ndarray:
+    if isinstance(embedding, FaceEmbedding):
+        return embedding.embedding
+    return np.asarray(embedding)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row as float32 (zero rows stay zero)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def stack_embeddings(
+    embeddings: Union[np.ndarray, Sequence[Union[np.ndarray, FaceEmbedding]]],
+) -> np.ndarray:
+    """
+    Stack embeddings into an (n, d) float32 matrix of L2-normalized rows.
 
-    # Convert all to numpy arrays
-    arrays = []
-    for emb in embeddings:
-        if isinstance(emb, FaceEmbedding):
-            arrays.append(emb.normalized())
+    Args:
+        embeddings: (n, d) array, or a sequence of arrays / FaceEmbedding
+
+    Returns:
+        Normalized (n, d) float32 matrix
+    """
+    if isinstance(embeddings, np.ndarray):
+        return normalize_rows(np.atleast_2d(embeddings))
+    return normalize_rows(np.stack([_as_array(e) for e in embeddings]))
+
+
+def _merge_topk(
+    best_scores: np.ndarray,
+    best_idx: np.ndarray,
+    scores: np.ndarray,
+    offset: int,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge a (m, chunk) score tile into running (m, k) top-k arrays."""
+    if scores.shape[1] > k:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    merged_scores = np.concatenate(
+        [best_scores, np.take_along_axis(scores, candidates, axis=1)], axis=1
+    )
+    merged_idx = np.concatenate([best_idx, candidates + offset], axis=1)
+    keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+    return (
+        np.take_along_axis(merged_scores, keep, axis=1),
+        np.take_along_axis(merged_idx, keep, axis=1),
+    )
+
+
+class EmbeddingGallery:
+    """
+    Matrix-based face gallery for 1:N matching.
+
+    The gallery is normalized once (or per chunk when it is a np.memmap too
+    large to load) and searched tile by tile: ``query_block`` queries against
+    ``chunk_rows`` gallery rows per matrix product, keeping a running top-k,
+    so memory stays bounded regardless of gallery size.
+
+    Precision modes:
+        float32: exact scores
+        float16: half-size scoring copy, then exact rescoring
+        int8:    per-row symmetric quantization (quarter size), then exact
+                 rescoring
+
+    In the reduced modes the top ``k * rescore_factor`` candidates per query
+    are rescored in float32 against the original rows, so returned scores
+    are exact and recall loss is limited to candidates ranked beyond that.
+    """
+
+    PRECISIONS = ("float32", "float16", "int8")
+
+    def __init__(
+        self,
+        embeddings: Union[np.ndarray, Sequence[Union[np.ndarray, FaceEmbedding]]],
+        ids: Optional[Sequence[str]] = None,
+        precision: str = "float32",
+        chunk_rows: int = 65536,
+        query_block: int = 1024,
+        rescore_factor: int = 4,
+    ):
+        """
+        Initialize gallery.
+
+        Args:
+            embeddings: (n, d) array (np.memmap is read chunk by chunk, never
+                fully loaded) or a sequence of embeddings
+            ids: Optional identity IDs, one per row
+            precision: Scoring precision ('float32', 'float16' or 'int8')
+            chunk_rows: Gallery rows per matrix product
+            query_block: Queries per matrix product
+            rescore_factor: Candidates kept per requested result for exact
+                rescoring in reduced-precision modes
+        """
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+
+        self._memmapped = isinstance(embeddings, np.memmap)
+        if self._memmapped:
+            self._source = embeddings  # normalized lazily, chunk by chunk
+        else:
+            self._source = stack_embeddings(embeddings)
+
+        if ids is not None and len(ids) != len(self._source):
+            raise ValueError(f"{len(ids)} ids for {len(self._source)} embeddings")
+
+        self.ids = list(ids) if ids is not None else None
+        self.precision = precision
+        self.chunk_rows = max(1, chunk_rows)
+        self.query_block = max(1, query_block)
+        self.rescore_factor = max(1, rescore_factor)
+
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        if precision != "float32":
+            self._quantize()
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    @property
+    def dim(self) -> int:
+        return self._source.shape[1]
+
+    def _rows(self, start: int, stop: int) -> np.ndarray:
+        """Normalized float32 gallery rows [start, stop)."""
+        rows = self._source[start:stop]
+        return normalize_rows(rows) if self._memmapped else rows
+
+    def _quantize(self) -> None:
+        n = len(self)
+        if self.precision == "float16":
+            self._codes = np.empty((n, self.dim), dtype=np.float16)
+        else:
+            self._codes = np.empty((n, self.dim), dtype=np.int8)
+            self._scales = np.empty(n, dtype=np.float32)
+
+        for start in range(0, n, self.chunk_rows):
+            stop = min(start + self.chunk_rows, n)
+            rows = self._rows(start, stop)
+            if self.precision == "float16":
+                self._codes[start:stop] = rows.astype(np.float16)
+            else:
+                scale = np.abs(rows).max(axis=1) / 127.0
+                scale[scale == 0] = 1.0
+                self._codes[start:stop] = np.round(rows / scale[:, None]).astype(np.int8)
+                self._scales[start:stop] = scale
+
+    def _score_chunk(self, queries: np.ndarray, start: int, stop: int) -> np.ndarray:
+        """(m, stop - start) similarity tile in the gallery's scoring precision."""
+        if self.precision == "float32":
+            return queries @ self._rows(start, stop).T
+        if self.precision == "float16":
+            # float16 matmul is slow on CPU; upcast the tile, keep storage small
+            return queries @ self._codes[start:stop].astype(np.float32).T
+        codes = self._codes[start:stop].astype(np.float32)
+        return (queries @ codes.T) * self._scales[start:stop]
+
+    def _topk_block(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        m = queries.shape[0]
+        best_scores = np.full((m, k), -np.inf, dtype=np.float32)
+        best_idx = np.full((m, k), -1, dtype=np.int64)
+        for start in range(0, len(self), self.chunk_rows):
+            stop = min(start + self.chunk_rows, len(self))
+            best_scores, best_idx = _merge_topk(
+                best_scores, best_idx, self._score_chunk(queries, start, stop), start, k
+            )
+        return best_scores, best_idx
+
+    def _rescore(self, queries: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Exact float32 scores for candidate rows (m, c)."""
+        flat = np.unique(idx[idx >= 0])
+        position = np.searchsorted(flat, np.maximum(idx, 0))
+        if self._memmapped:
+            rows = normalize_rows(self._source[flat])
         else:
-            norm = np.linalg.norm(emb)
-            arrays.append(emb / norm if norm > 0 else emb)
+            rows = self._source[flat]
+        exact = np.einsum("md,mcd->mc", queries, rows[position])
+        return np.where(idx >= 0, exact, -np.inf).astype(np.float32)
+
+    def search(
+        self,
+        queries: Union[np.ndarray, Sequence[Union[np.ndarray, FaceEmbedding]]],
+        k: int = 1,
+        threshold: Optional[float] = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k gallery matches for each query.
+
+        Args:
+            queries: (m, d) array, single (d,) embedding, or sequence
+            k: Matches per query
+            threshold: Optional minimum similarity; weaker matches get
+                index -1 and score -inf
+
+        Returns:
+            (scores, indices), each (m, k), sorted by score descending
+        """
+        queries = stack_embeddings(queries)
+        m = queries.shape[0]
+        k = min(k, len(self))
+        if k <= 0:
+            return np.zeros((m, 0), dtype=np.float32), np.zeros((m, 0), dtype=np.int64)
+
+        candidates = k if self.precision == "float32" else min(len(self), k * self.rescore_factor)
+        all_scores = np.empty((m, k), dtype=np.float32)
+        all_idx = np.empty((m, k), dtype=np.int64)
+
+        for q_start in range(0, m, self.query_block):
+            block = queries[q_start:q_start + self.query_block]
+            scores, idx = self._topk_block(block, candidates)
+            if self.precision != "float32":
+                scores = self._rescore(block, idx)
+            order = np.argsort(-scores, axis=1)[:, :k]
+            all_scores[q_start:q_start + len(block)] = np.take_along_axis(scores, order, axis=1)
+            all_idx[q_start:q_start + len(block)] = np.take_along_axis(idx, order, axis=1)
+
+        if threshold is not None:
+            below = all_scores < threshold
+            all_scores[below] = -np.inf
+            all_idx[below] = -1
+        return all_scores, all_idx
+
+    def match(
+        self,
+        query: Union[np.ndarray, FaceEmbedding],
+        threshold: float = 0.4,
+    ) -> dict:
+        """Best match for one query, in find_best_match's result format."""
+        if len(self) == 0:
+            return {"matched": False, "identity_id": None, "similarity": 0.0, "rank": -1}
+
+        scores, idx = self.search([query], k=1)
+        similarity = float(scores[0, 0])
+        is_match = similarity >= threshold
+        best = int(idx[0, 0])
+        return {
+            "matched": is_match,
+            "identity_id": (self.ids[best] if self.ids else best) if is_match else None,
+            "similarity": similarity,
+            "rank": 1 if is_match else -1,
+        }
+
+
+@dataclass
+class SimilarityPairs:
+    """Sparse (COO) pairwise similarities at or above a threshold."""
+
+    rows: np.ndarray  # int64
+    cols: np.ndarray  # int64
+    scores: np.ndarray  # float32
+    n: int
+    threshold: float
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def to_csr(self):
+        """scipy.sparse CSR matrix (symmetric when built with symmetric=True)."""
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((self.scores, (self.rows, self.cols)), shape=(self.n, self.n))
 
-    # Compute pairwise similarities
-    for i in range(n):
-        for j in range(i, n):
-            sim = float(np.dot(arrays[i], arrays[j]))
-            matrix[i, j] = sim
-            matrix[j, i] = sim
+    def to_dense(self) -> np.ndarray:
+        """Dense NxN matrix with zeros below the threshold (small N only)."""
+        matrix = np.zeros((self.n, self.n), dtype=np.float32)
+        matrix[self.rows, self.cols] = self.scores
+        return matrix
 
-    return matrix
+
+def pairwise_similarity(
+    embeddings: Union[np.ndarray, Sequence[Union[np.ndarray, FaceEmbedding]]],
+    threshold: float = 0.4,
+    block_size: int = 4096,
+    symmetric: bool = False,
+) -> SimilarityPairs:
+    """
+    All pairs of embeddings with similarity >= threshold.
+
+    Computes the upper triangle in (block_size x block_size) tiles and keeps
+    only pairs above the threshold, so memory is O(block_size^2 + matches)
+    instead of a dense NxN float64 matrix. Self-pairs are excluded.
+
+    Args:
+        embeddings: (n, d) array (np.memmap read block by block) or sequence
+        threshold: Minimum similarity to report
+        block_size: Rows per tile side
+        symmetric: Also emit (j, i) for every (i, j)
+
+    Returns:
+        SimilarityPairs with i < j (plus mirrored pairs if symmetric)
+    """
+    memmapped = isinstance(embeddings, np.memmap)
+    source = embeddings if memmapped else stack_embeddings(embeddings)
+    n = len(source)
+
+    def block(start: int) -> np.ndarray:
+        rows = source[start:min(start + block_size, n)]
+        return normalize_rows(rows) if memmapped else rows
+
+    rows_out, cols_out, scores_out = [], [], []
+    for i in range(0, n, block_size):
+        left = block(i)
+        for j in range(i, n, block_size):
+            right = left if j == i else block(j)
+            tile = left @ right.T
+            if j == i:
+                # Self-pairs and mirrored pairs; row slices, no n^2 index arrays
+                for k in range(len(left)):
+                    tile[k, :k + 1] = -np.inf
+            r, c = np.nonzero(tile >= threshold)
+            rows_out.append(r + i)
+            cols_out.append(c + j)
+            scores_out.append(tile[r, c])
+
+    rows = np.concatenate(rows_out).astype(np.int64) if rows_out else np.zeros(0, np.int64)
+    cols = np.concatenate(cols_out).astype(np.int64) if cols_out else np.zeros(0, np.int64)
+    scores = np.concatenate(scores_out).astype(np.float32) if scores_out else np.zeros(0, np.float32)
+
+    if symmetric:
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        scores = np.concatenate([scores, scores])
+
+    return SimilarityPairs(rows=rows, cols=cols, scores=scores, n=n, threshold=threshold)
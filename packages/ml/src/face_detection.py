@@ -7,13 +7,31 @@ Detect faces in images and return bounding boxes and landmarks.
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
 import cv2
 import numpy as np
 
+from .image_loader import ImageSource, load_image
+
 logger = logging.getLogger(__name__)
 
+# Detection alone yields bboxes, scores and 5-point keypoints; recognition,
+# landmark and genderage models would only add per-face work we discard
+DETECTION_MODULES = ("detection",)
+
+# OpenCV DNN SSD face detector (res10_300x300_ssd and compatible models)
+DNN_INPUT_SIZE = (300, 300)
+DNN_MEAN = (104.0, 177.0, 123.0)  # BGR means subtracted by the res10 model
+
+# Tiled detection: overlapping tiles are merged with NMS at this IoU
+TILE_NMS_IOU = 0.4
+# A detection cut by a tile edge is dropped when at least this fraction of
+# it lies inside a detection some other tile (or the whole frame) holds
+# whole; intersecting cut pieces that line up along one axis by this much
+# are merged as two sides of one face
+TILE_CUT_CONTAINMENT = 0.6
+
 
 @dataclass
 class DetectedFace:
@@ -51,6 +69,7 @@ class FaceDetector:
         backend: str = "opencv",
         confidence_threshold: float = 0.5,
         model_path: Optional[str] = None,
+        config_path: Optional[str] = None,
     ):
         """
         Initialize face detector.
@@ -58,11 +77,14 @@ class FaceDetector:
         Args:
             backend: Detection backend ('opencv', 'insightface', 'mediapipe')
             confidence_threshold: Minimum confidence to consider a detection
-            model_path: Optional path to custom model
+            model_path: Optional OpenCV DNN face model (e.g. res10_300x300_ssd
+                .caffemodel or .onnx); without it the opencv backend uses Haar
+            config_path: Network config for model_path (e.g. deploy.prototxt)
         """
         self.backend = backend
         self.confidence_threshold = confidence_threshold
         self.model_path = model_path
+        self.config_path = config_path
         self._detector = None
 
     def _initialize(self) -> None:
@@ -80,6 +102,12 @@ class FaceDetector:
 
     def _init_opencv(self) -> None:
         """Initialize OpenCV face detector."""
+        if self.model_path:
+            self._detector = cv2.dnn.readNet(self.model_path, self.config_path or "")
+            self._detector_type = "dnn"
+            logger.info(f"OpenCV DNN face detector initialized: {self.model_path}")
+            return
+
         # Use Haar Cascade as fallback (always available)
         cascade_path = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
         self._detector = cv2.CascadeClassifier(cascade_path)
@@ -91,7 +119,11 @@ class FaceDetector:
         try:
             from insightface.app import FaceAnalysis
 
-            self._detector = FaceAnalysis(name="buffalo_sc", providers=["CPUExecutionProvider"])
+            self._detector = FaceAnalysis(
+                name="buffalo_sc",
+                providers=["CPUExecutionProvider"],
+                allowed_modules=list(DETECTION_MODULES),
+            )
             self._detector.prepare(ctx_id=0, det_size=(320, 320))
             self._detector_type = "insightface"
             logger.info("InsightFace detector initialized")
@@ -103,6 +135,8 @@ class FaceDetector:
         self,
         image: Union[np.ndarray, bytes, str, Path],
         max_faces: Optional[int] = None,
+        tile_size: Optional[int] = None,
+        tile_overlap: float = 0.25,
     ) -> list[DetectedFace]:
         """
         Detect faces in image.
@@ -110,6 +144,10 @@ class FaceDetector:
         Args:
             image: Input image
             max_faces: Maximum number of faces to return (largest first)
+            tile_size: Detect on overlapping square tiles of this size (plus the
+                whole frame) when the image is larger, so small faces in
+                high-resolution frames aren't lost to downscaling
+            tile_overlap: Fraction of tile_size shared by neighbouring tiles
 
         Returns:
             List of DetectedFace objects
@@ -120,17 +158,111 @@ class FaceDetector:
         if img is None:
             return []
 
-        if hasattr(self, "_detector_type") and self._detector_type == "insightface":
-            return self._detect_insightface(img, max_faces)
+        if tile_size and max(img.shape[:2]) > tile_size:
+            faces = self._detect_tiled(img, tile_size, tile_overlap)
         else:
-            return self._detect_opencv(img, max_faces)
+            faces = self._detect_frames([img])[0]
+        return self._select(faces, max_faces)
 
-    def _detect_opencv(
+    def detect_batch(
         self,
-        img: np.ndarray,
+        images: Sequence[Union[np.ndarray, bytes, str, Path]],
         max_faces: Optional[int] = None,
+        batch_size: int = 32,
+    ) -> list[list[DetectedFace]]:
+        """
+        Detect faces in several images.
+
+        With an OpenCV DNN model, images are stacked with
+        cv2.dnn.blobFromImages (each resized to the network input) and run
+        ``batch_size`` per forward pass; other backends run per image.
+
+        Args:
+            images: Input images
+            max_faces: Maximum number of faces to return per image
+            batch_size: Images per DNN forward pass
+
+        Returns:
+            One list of DetectedFace per input image (empty if it failed to load)
+        """
+        self._initialize()
+
+        imgs = [self._load_image(image) for image in images]
+        loaded = [img for img in imgs if img is not None]
+
+        detected: list[list[DetectedFace]] = []
+        for start in range(0, len(loaded), batch_size):
+            detected.extend(self._detect_frames(loaded[start : start + batch_size]))
+
+        results = iter(detected)
+        return [self._select(next(results), max_faces) if img is not None else [] for img in imgs]
+
+    def _detect_frames(self, frames: list[np.ndarray]) -> list[list[DetectedFace]]:
+        """Unsorted detections per frame with the initialized backend."""
+        if self._detector_type == "dnn":
+            return self._detect_dnn(frames)
+        if self._detector_type == "insightface":
+            return [self._detect_insightface(frame) for frame in frames]
+        return [self._detect_opencv(frame) for frame in frames]
+
+    def _detect_tiled(
+        self,
+        img: np.ndarray,
+        tile_size: int,
+        tile_overlap: float,
     ) -> list[DetectedFace]:
-        """Detect faces using OpenCV."""
+        """Detect on overlapping tiles and the whole frame, merged with NMS."""
+        height, width = img.shape[:2]
+        stride = max(1, int(tile_size * (1 - tile_overlap)))
+        origins = [
+            (x, y)
+            for y in _tile_origins(height, tile_size, stride)
+            for x in _tile_origins(width, tile_size, stride)
+        ]
+        tiles = [img[y : y + tile_size, x : x + tile_size] for x, y in origins]
+
+        # The whole frame catches faces too large to fit in one tile
+        per_frame = self._detect_frames(tiles + [img])
+        faces = per_frame[-1]
+
+        # A face cut by an inner tile edge is partial. Keep it aside: it is
+        # only redundant if another tile (or the whole frame) holds the face
+        # whole, which the overlap doesn't guarantee for faces larger than it
+        margin = max(2, tile_size // 100)
+        cut: list[DetectedFace] = []
+        for (x, y), tile, tile_faces in zip(origins, tiles, per_frame):
+            tile_h, tile_w = tile.shape[:2]
+            for face in tile_faces:
+                x1, y1, x2, y2 = face.bbox
+                landmarks = face.landmarks
+                if landmarks is not None:
+                    landmarks = landmarks + np.array([x, y], dtype=landmarks.dtype)
+                shifted = DetectedFace(
+                    bbox=(x1 + x, y1 + y, x2 + x, y2 + y),
+                    confidence=face.confidence,
+                    landmarks=landmarks,
+                )
+                if (
+                    (x1 <= margin and x > 0)
+                    or (y1 <= margin and y > 0)
+                    or (x2 >= tile_w - margin and x + tile_w < width)
+                    or (y2 >= tile_h - margin and y + tile_h < height)
+                ):
+                    cut.append(shifted)
+                else:
+                    faces.append(shifted)
+
+        return _resolve_cut_faces(_non_max_suppression(faces, TILE_NMS_IOU), cut)
+
+    def _select(self, faces: list[DetectedFace], max_faces: Optional[int]) -> list[DetectedFace]:
+        """Sort by area (largest first) and keep at most max_faces."""
+        faces = sorted(faces, key=lambda f: f.area, reverse=True)
+        if max_faces:
+            faces = faces[:max_faces]
+        return faces
+
+    def _detect_opencv(self, img: np.ndarray) -> list[DetectedFace]:
+        """Detect faces using OpenCV Haar cascade."""
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
         faces = self._detector.detectMultiScale(
@@ -140,62 +272,124 @@ class FaceDetector:
             minSize=(30, 30),
         )
 
-        results = []
-        for x, y, w, h in faces:
-            results.append(DetectedFace(
+        return [
+            DetectedFace(
                 bbox=(int(x), int(y), int(x + w), int(y + h)),
                 confidence=1.0,  # Haar doesn't give confidence
                 landmarks=None,
-            ))
-
-        # Sort by area (largest first)
-        results.sort(key=lambda f: f.area, reverse=True)
-
-        if max_faces:
-            results = results[:max_faces]
-
+            )
+            for x, y, w, h in faces
+        ]
+
+    def _detect_dnn(self, frames: list[np.ndarray]) -> list[list[DetectedFace]]:
+        """Detect faces in frames with one OpenCV DNN forward pass."""
+        blob = cv2.dnn.blobFromImages(frames, 1.0, DNN_INPUT_SIZE, DNN_MEAN, swapRB=False, crop=False)
+        self._detector.setInput(blob)
+        # SSD output: [1, 1, N, 7] rows of (frame, label, score, x1, y1, x2, y2)
+        detections = self._detector.forward().reshape(-1, 7)
+
+        results: list[list[DetectedFace]] = [[] for _ in frames]
+        for frame_id, _, score, x1, y1, x2, y2 in detections:
+            frame_id = int(frame_id)
+            if score < self.confidence_threshold or not 0 <= frame_id < len(frames):
+                continue
+            height, width = frames[frame_id].shape[:2]
+            box = np.clip([x1 * width, y1 * height, x2 * width, y2 * height], 0, [width, height] * 2)
+            x1, y1, x2, y2 = (int(v) for v in box)
+            if x2 > x1 and y2 > y1:
+                results[frame_id].append(
+                    DetectedFace(bbox=(x1, y1, x2, y2), confidence=float(score), landmarks=None)
+                )
         return results
 
-    def _detect_insightface(
-        self,
-        img: np.ndarray,
-        max_faces: Optional[int] = None,
-    ) -> list[DetectedFace]:
+    def _detect_insightface(self, img: np.ndarray) -> list[DetectedFace]:
         """Detect faces using InsightFace."""
-        faces = self._detector.get(img)
-
-        results = []
-        for face in faces:
-            if face.det_score < self.confidence_threshold:
-                continue
-
-            results.append(DetectedFace(
-                bbox=tuple(face.bbox.astype(int)),
+        return [
+            DetectedFace(
+                bbox=tuple(int(v) for v in face.bbox),
                 confidence=float(face.det_score),
                 landmarks=face.kps if hasattr(face, "kps") else None,
-            ))
-
-        # Sort by area (largest first)
-        results.sort(key=lambda f: f.area, reverse=True)
-
-        if max_faces:
-            results = results[:max_faces]
-
-        return results
-
-    def _load_image(self, image: Union[np.ndarray, bytes, str, Path]) -> Optional[np.ndarray]:
-        """Load image from various sources."""
-        if isinstance(image, np.ndarray):
-            return image
-
-        if isinstance(image, bytes):
-            nparr = np.frombuffer(image, np.uint8)
-            return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-        if isinstance(image, (str, Path)):
-            return cv2.imread(str(image))
+            )
+            for face in self._detector.get(img)
+            if face.det_score >= self.confidence_threshold
+        ]
+
+    def _load_image(self, image: ImageSource) -> Optional[np.ndarray]:
+        """Load image from various sources (including ImageBatchLoader output)."""
+        return load_image(image)
+
+
+def _tile_origins(length: int, tile_size: int, stride: int) -> list[int]:
+    """Tile start offsets covering [0, length), the last one flush with the end."""
+    if length <= tile_size:
+        return [0]
+    origins = list(range(0, length - tile_size, stride))
+    origins.append(length - tile_size)
+    return origins
+
+
+def _non_max_suppression(faces: list[DetectedFace], iou_threshold: float) -> list[DetectedFace]:
+    """Drop faces overlapping a higher-confidence face by more than iou_threshold."""
+    if len(faces) < 2:
+        return faces
+    boxes = [[x1, y1, x2 - x1, y2 - y1] for x1, y1, x2, y2 in (f.bbox for f in faces)]
+    keep = cv2.dnn.NMSBoxes(boxes, [f.confidence for f in faces], 0.0, iou_threshold)
+    return [faces[i] for i in np.asarray(keep, dtype=int).flatten()]
+
+
+def _overlap_fraction(face: DetectedFace, other: DetectedFace) -> float:
+    """Fraction of face's box area that lies inside other's box."""
+    ax1, ay1, ax2, ay2 = face.bbox
+    bx1, by1, bx2, by2 = other.bbox
+    inter_w = min(ax2, bx2) - max(ax1, bx1)
+    inter_h = min(ay2, by2) - max(ay1, by1)
+    if inter_w <= 0 or inter_h <= 0 or face.area <= 0:
+        return 0.0
+    return inter_w * inter_h / face.area
+
+
+def _same_face_pieces(face: DetectedFace, other: DetectedFace) -> bool:
+    """True if two cut boxes intersect and line up along one axis (one face split by a seam)."""
+    ax1, ay1, ax2, ay2 = face.bbox
+    bx1, by1, bx2, by2 = other.bbox
+    inter_w = min(ax2, bx2) - max(ax1, bx1)
+    inter_h = min(ay2, by2) - max(ay1, by1)
+    if inter_w <= 0 or inter_h <= 0:
+        return False
+    return (
+        inter_h >= TILE_CUT_CONTAINMENT * min(face.height, other.height)
+        or inter_w >= TILE_CUT_CONTAINMENT * min(face.width, other.width)
+    )
+
+
+def _resolve_cut_faces(whole: list[DetectedFace], cut: list[DetectedFace]) -> list[DetectedFace]:
+    """
+    Add tile-edge detections that no whole detection accounts for.
 
-        return None
+    A cut detection inside a whole one is a partial copy and is dropped.
+    The rest are faces no tile saw whole: pieces of the same face from
+    neighbouring tiles are merged into their union box.
+    """
+    merged: list[DetectedFace] = []
+    for face in sorted(cut, key=lambda f: f.confidence, reverse=True):
+        if any(_overlap_fraction(face, other) >= TILE_CUT_CONTAINMENT for other in whole):
+            continue
+        for i, other in enumerate(merged):
+            if _same_face_pieces(face, other):
+                merged[i] = DetectedFace(
+                    bbox=(
+                        min(face.bbox[0], other.bbox[0]),
+                        min(face.bbox[1], other.bbox[1]),
+                        max(face.bbox[2], other.bbox[2]),
+                        max(face.bbox[3], other.bbox[3]),
+                    ),
+                    confidence=other.confidence,
+                    landmarks=other.landmarks if other.area >= face.area else face.landmarks,
+                )
+                break
+        else:
+            merged.append(face)
+    return whole + merged
 
 
 # Default detector instance
@@ -206,6 +400,8 @@ def detect_faces(
     image: Union[np.ndarray, bytes, str, Path],
     max_faces: Optional[int] = None,
     confidence_threshold: float = 0.5,
+    tile_size: Optional[int] = None,
+    tile_overlap: float = 0.25,
 ) -> list[DetectedFace]:
     """
     Detect faces in image using default detector.
@@ -214,6 +410,9 @@ def detect_faces(
         image: Input image
         max_faces: Maximum number of faces to return
         confidence_threshold: Minimum confidence
+        tile_size: Tile high-resolution images into squares of this size
+            (e.g. 640 for crowd shots); None detects on the whole frame
+        tile_overlap: Fraction of tile_size shared by neighbouring tiles
 
     Returns:
         List of DetectedFace objects
@@ -223,4 +422,6 @@ def detect_faces(
     if _default_detector is None:
         _default_detector = FaceDetector(confidence_threshold=confidence_threshold)
 
-    return _default_detector.detect(image, max_faces=max_faces)
+    return _default_detector.detect(
+        image, max_faces=max_faces, tile_size=tile_size, tile_overlap=tile_overlap
+    )
@@ -7,11 +7,13 @@ Extract 512-dimensional face embeddings from images using InsightFace or ONNX mo
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
-import cv2
 import numpy as np
 
+from .batching import MicroBatcher
+from .image_loader import ImageSource, load_image
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +43,12 @@ class FaceEmbedding:
         return self.embedding
 
 
+# InsightFace model-pack modules needed for embeddings. The 5-point keypoints
+# used for alignment come from detection, so landmark and genderage models
+# are skipped; pass modules=None to load the whole pack.
+RECOGNITION_MODULES = ("detection", "recognition")
+
+
 class FaceEmbeddingExtractor:
     """Extract face embeddings using InsightFace."""
 
@@ -50,6 +58,7 @@ class FaceEmbeddingExtractor:
         providers: Optional[list[str]] = None,
         det_thresh: float = 0.5,
         det_size: tuple[int, int] = (640, 640),
+        modules: Optional[Sequence[str]] = RECOGNITION_MODULES,
     ):
         """
         Initialize face embedding extractor.
@@ -59,11 +68,13 @@ class FaceEmbeddingExtractor:
             providers: ONNX runtime providers (default: CPU)
             det_thresh: Face detection threshold
             det_size: Detection input size
+            modules: Model-pack modules to load (None loads all of them)
         """
         self.model_name = model_name
         self.providers = providers or ["CPUExecutionProvider"]
         self.det_thresh = det_thresh
         self.det_size = det_size
+        self.modules = list(modules) if modules else None
         self._app = None
 
     def _initialize(self) -> None:
@@ -74,9 +85,14 @@ class FaceEmbeddingExtractor:
         try:
             from insightface.app import FaceAnalysis
 
-            self._app = FaceAnalysis(name=self.model_name, providers=self.providers)
+            self._app = FaceAnalysis(
+                name=self.model_name, providers=self.providers, allowed_modules=self.modules
+            )
             self._app.prepare(ctx_id=0, det_size=self.det_size, det_thresh=self.det_thresh)
-            logger.info(f"InsightFace initialized with model: {self.model_name}")
+            logger.info(
+                f"InsightFace initialized with model: {self.model_name} "
+                f"(modules: {', '.join(self._app.models)})"
+            )
         except ImportError:
             logger.warning("InsightFace not installed. Using mock embeddings.")
             self._app = None
@@ -124,15 +140,7 @@ class FaceEmbeddingExtractor:
         else:
             face = faces[0]
 
-        # Normalize embedding
-        embedding = face.embedding / np.linalg.norm(face.embedding)
-
-        return FaceEmbedding(
-            embedding=embedding.astype(np.float32),
-            bbox=tuple(face.bbox.astype(int)),
-            confidence=float(face.det_score),
-            landmarks=face.kps if hasattr(face, "kps") else None,
-        )
+        return self._to_face_embedding(face)
 
     def extract_all(self, image: Union[np.ndarray, bytes, str, Path]) -> list[FaceEmbedding]:
         """
@@ -156,31 +164,131 @@ class FaceEmbeddingExtractor:
 
         faces = self._app.get(img)
 
-        results = []
-        for face in faces:
-            embedding = face.embedding / np.linalg.norm(face.embedding)
-            results.append(FaceEmbedding(
-                embedding=embedding.astype(np.float32),
-                bbox=tuple(face.bbox.astype(int)),
-                confidence=float(face.det_score),
-                landmarks=face.kps if hasattr(face, "kps") else None,
-            ))
+        return [e for e in (self._to_face_embedding(face) for face in faces) if e is not None]
+
+    def extract_batch(
+        self,
+        images: list[Union[np.ndarray, bytes, str, Path]],
+        return_largest: bool = True,
+    ) -> list[Optional[FaceEmbedding]]:
+        """
+        Extract face embeddings from several images with one recognition pass.
+
+        Detection runs per image; every detected face crop is then embedded
+        in a single batched ArcFace forward pass.
+
+        Args:
+            images: Input images
+            return_largest: If multiple faces, return the largest one
+
+        Returns:
+            FaceEmbedding (or None if no face / unreadable) per input image
+        """
+        self._initialize()
+
+        imgs = [self._load_image(image) for image in images]
+        loaded = [img for img in imgs if img is not None]
+
+        if self._app is None:
+            faces_per_image = iter([self._mock_embedding(img)] for img in loaded)
+        else:
+            faces_per_image = iter(
+                [self._to_face_embedding(face) for face in faces]
+                for faces in self._get_batch(loaded)
+            )
+
+        results: list[Optional[FaceEmbedding]] = []
+        for img in imgs:
+            if img is None:
+                results.append(None)
+                continue
+            faces = [face for face in next(faces_per_image) if face is not None]
+            if not faces:
+                results.append(None)
+            elif return_largest:
+                results.append(max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1])))
+            else:
+                results.append(faces[0])
 
         return results
 
-    def _load_image(self, image: Union[np.ndarray, bytes, str, Path]) -> Optional[np.ndarray]:
-        """Load image from various sources."""
-        if isinstance(image, np.ndarray):
-            return image
+    def batcher(self, max_batch_size: int = 16, max_wait_ms: float = 5.0, **kwargs) -> MicroBatcher:
+        """
+        Create a micro-batcher that coalesces concurrent ``extract`` calls.
+
+        Example:
+            batcher = extractor.batcher(max_wait_ms=5)
+            embedding = batcher(image_bytes)  # call from many threads
+
+        Args:
+            max_batch_size: Maximum images per batched forward pass
+            max_wait_ms: Maximum time an image waits for others to join its batch
+            **kwargs: Passed to MicroBatcher (e.g. on_batch for metrics)
+
+        Returns:
+            MicroBatcher whose results are Optional[FaceEmbedding]
+        """
+        return MicroBatcher(self.extract_batch, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, **kwargs)
+
+    def _get_batch(self, imgs: list[np.ndarray]) -> list[list]:
+        """FaceAnalysis.get over several images with batched recognition."""
+        if len(imgs) <= 1:
+            return [self._app.get(img) for img in imgs]
+
+        from insightface.app.common import Face
+        from insightface.utils import face_align
+
+        recognition = self._app.models.get("recognition")
+        per_image = []
+        crops = []
+        crop_faces = []
+
+        for img in imgs:
+            bboxes, kpss = self._app.det_model.detect(img, max_num=0, metric="default")
+            faces = []
+            for i in range(bboxes.shape[0]):
+                face = Face(
+                    bbox=bboxes[i, 0:4],
+                    kps=kpss[i] if kpss is not None else None,
+                    det_score=bboxes[i, 4],
+                )
+                for taskname, model in self._app.models.items():
+                    if taskname in ("detection", "recognition"):
+                        continue
+                    model.get(img, face)
+                if recognition is not None and face.kps is not None:
+                    crops.append(
+                        face_align.norm_crop(img, landmark=face.kps, image_size=recognition.input_size[0])
+                    )
+                    crop_faces.append(face)
+                faces.append(face)
+            per_image.append(faces)
+
+        if crops:
+            embeddings = recognition.get_feat(crops)
+            for face, embedding in zip(crop_faces, embeddings):
+                face.embedding = embedding.flatten()
+
+        return per_image
+
+    def _to_face_embedding(self, face) -> Optional[FaceEmbedding]:
+        """Convert an InsightFace face to a normalized FaceEmbedding."""
+        if face.embedding is None:
+            return None
 
-        if isinstance(image, bytes):
-            nparr = np.frombuffer(image, np.uint8)
-            return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # Normalize embedding
+        embedding = face.embedding / np.linalg.norm(face.embedding)
 
-        if isinstance(image, (str, Path)):
-            return cv2.imread(str(image))
+        return FaceEmbedding(
+            embedding=embedding.astype(np.float32),
+            bbox=tuple(face.bbox.astype(int)),
+            confidence=float(face.det_score),
+            landmarks=face.kps if hasattr(face, "kps") else None,
+        )
 
-        return None
+    def _load_image(self, image: ImageSource) -> Optional[np.ndarray]:
+        """Load image from various sources (including ImageBatchLoader output)."""
+        return load_image(image)
 
     def _mock_embedding(self, img: np.ndarray) -> Optional[FaceEmbedding]:
         """Generate deterministic mock embedding for testing."""
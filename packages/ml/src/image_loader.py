@@ -0,0 +1,256 @@
+"""
+Bulk Image Loading
+
+Read and decode many images in parallel for batch jobs. Files are read
+through memory maps, URLs are fetched, and decoding runs on a thread pool
+(OpenCV releases the GIL while decoding) with a bounded number of images
+in flight, so reading and decoding overlap with the caller's inference.
+"""
+
+import logging
+import mmap
+import os
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+URL_SCHEMES = ("http://", "https://")
+
+
+@dataclass
+class LoadedImage:
+    """A decoded image from ImageBatchLoader (image is None if loading failed)."""
+
+    index: int  # Position in the input
+    source: Any
+    image: Optional[np.ndarray]
+    error: Optional[str] = None
+    load_time: float = 0.0  # seconds (read + decode)
+
+    @property
+    def ok(self) -> bool:
+        return self.image is not None
+
+
+ImageSource = Union[np.ndarray, bytes, str, Path, LoadedImage]
+
+
+def _is_url(source: Any) -> bool:
+    return isinstance(source, str) and source.startswith(URL_SCHEMES)
+
+
+def _decode_buffer(buffer, flags: int) -> Optional[np.ndarray]:
+    data = np.frombuffer(buffer, np.uint8)
+    if data.size == 0:
+        return None
+    return cv2.imdecode(data, flags)
+
+
+def _decode_file(path: Union[str, Path], flags: int) -> Optional[np.ndarray]:
+    """Decode a file straight from a read-only memory map (no read() copy)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = np.frombuffer(mapped, np.uint8)
+            try:
+                return cv2.imdecode(data, flags)
+            finally:
+                del data  # Release the buffer export before the map closes
+
+
+def _fetch_url(url: str, timeout: float, max_bytes: int) -> bytes:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        body = response.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        raise ValueError(f"Image larger than {max_bytes} bytes")
+    return body
+
+
+def load_image(image: ImageSource, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """
+    Load an image from an array, encoded bytes, a file path or a LoadedImage.
+
+    This is the single-image path used by every model in the package;
+    URLs are only fetched by ImageBatchLoader.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+
+    if isinstance(image, LoadedImage):
+        return image.image
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return _decode_buffer(image, flags)
+
+    if isinstance(image, (str, Path)):
+        return cv2.imread(str(image), flags)
+
+    return None
+
+
+class ImageBatchLoader:
+    """
+    Parallel image loader with bounded prefetch.
+
+    Sources may be arrays, encoded bytes, file paths or http(s) URLs, mixed
+    freely. At most ``prefetch`` images are read/decoded ahead of the
+    consumer, which bounds memory however long the input is. Failed images
+    are yielded with ``image=None`` and an ``error`` rather than raising,
+    so one bad file doesn't stop a batch job.
+
+    Every model in the package accepts LoadedImage directly:
+
+        with ImageBatchLoader(max_workers=8) as loader:
+            for batch in loader.batches(paths, batch_size=32):
+                embeddings = extractor.extract_batch(batch)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        ordered: bool = True,
+        flags: int = cv2.IMREAD_COLOR,
+        url_timeout: float = 30.0,
+        max_url_bytes: int = 50 * 1024 * 1024,
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            max_workers: Decode threads (default: CPU count, at most 16)
+            prefetch: Images in flight ahead of the consumer (default: 2x workers)
+            ordered: Yield in input order; False yields as each image completes
+            flags: cv2.imdecode flags (e.g. cv2.IMREAD_REDUCED_COLOR_2)
+            url_timeout: Per-request timeout for URL sources (seconds)
+            max_url_bytes: Largest response accepted from a URL
+        """
+        self.max_workers = max_workers or min(16, os.cpu_count() or 1)
+        self.prefetch = max(prefetch or 2 * self.max_workers, 1)
+        self.ordered = ordered
+        self.flags = flags
+        self.url_timeout = url_timeout
+        self.max_url_bytes = max_url_bytes
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="image-loader"
+            )
+        return self._executor
+
+    def _load_one(self, index: int, source: Any) -> LoadedImage:
+        started = time.perf_counter()
+        try:
+            if isinstance(source, LoadedImage):
+                return source
+            if _is_url(source):
+                image = _decode_buffer(
+                    _fetch_url(source, self.url_timeout, self.max_url_bytes), self.flags
+                )
+            elif isinstance(source, (str, Path)):
+                image = _decode_file(source, self.flags)
+            else:
+                image = load_image(source, self.flags)
+            error = None if image is not None else "Could not decode image"
+        except Exception as e:
+            image, error = None, str(e)
+
+        if error is not None:
+            logger.debug(f"Failed to load image {index}: {error}")
+        return LoadedImage(
+            index=index,
+            source=source,
+            image=image,
+            error=error,
+            load_time=time.perf_counter() - started,
+        )
+
+    def load(self, sources: Iterable[Any], ordered: Optional[bool] = None) -> Iterator[LoadedImage]:
+        """
+        Yield decoded images, loading up to ``prefetch`` ahead.
+
+        Args:
+            sources: Images to load (consumed lazily)
+            ordered: Override the loader's ordering for this call
+
+        Yields:
+            LoadedImage per source
+        """
+        ordered = self.ordered if ordered is None else ordered
+        executor = self._get_executor()
+        items = enumerate(sources)
+        pending: deque = deque()
+
+        def fill() -> None:
+            while len(pending) < self.prefetch:
+                try:
+                    index, source = next(items)
+                except StopIteration:
+                    return
+                pending.append(executor.submit(self._load_one, index, source))
+
+        try:
+            fill()
+            while pending:
+                if ordered:
+                    future: Future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+                result = future.result()
+                fill()
+                yield result
+        finally:
+            # Consumer stopped early: drop work that hasn't started
+            for future in pending:
+                future.cancel()
+
+    def load_all(self, sources: Iterable[Any]) -> list[LoadedImage]:
+        """Load every source, in input order."""
+        return list(self.load(sources, ordered=True))
+
+    def batches(
+        self,
+        sources: Iterable[Any],
+        batch_size: int = 32,
+        ordered: Optional[bool] = None,
+    ) -> Iterator[list[LoadedImage]]:
+        """
+        Yield lists of up to ``batch_size`` loaded images.
+
+        The next images keep loading while the caller runs inference on the
+        current batch.
+        """
+        batch: list[LoadedImage] = []
+        for loaded in self.load(sources, ordered=ordered):
+            batch.append(loaded)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """Shut down the decode threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "ImageBatchLoader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
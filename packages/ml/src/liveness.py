@@ -7,11 +7,13 @@ Detect if a face is from a live person vs a photo/video replay attack.
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
 import cv2
 import numpy as np
 
+from .image_loader import ImageSource, load_image
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +27,71 @@ class LivenessResult:
     message: str
 
 
+# Square power-of-two side the face region is resampled to before analysis
+ANALYSIS_SIZE = 128
+
+
+@dataclass
+class FaceCrop:
+    """
+    Face region preprocessed once for all liveness checks.
+
+    The crop is resampled to a fixed power-of-two square, so every check sees
+    the same resolution and the FFT never runs on awkward (e.g. prime) sizes.
+    Gray and YCrCb planes are converted once and shared between checks.
+    """
+
+    bgr: np.ndarray  # (size, size, 3) uint8
+    gray: np.ndarray  # (size, size) uint8
+    ycrcb: np.ndarray  # (size, size, 3) uint8
+
+    @property
+    def size(self) -> int:
+        return self.gray.shape[0]
+
+    @classmethod
+    def from_image(
+        cls,
+        image: np.ndarray,
+        face_bbox: Optional[tuple[int, int, int, int]] = None,
+        size: int = ANALYSIS_SIZE,
+    ) -> Optional["FaceCrop"]:
+        """
+        Crop, resample and convert a BGR image.
+
+        Args:
+            image: BGR image
+            face_bbox: Optional face bounding box (x1, y1, x2, y2); the
+                center half of the image is used when omitted
+            size: Analysis side length (power of two)
+
+        Returns:
+            FaceCrop, or None if the face region is empty
+        """
+        h, w = image.shape[:2]
+        if face_bbox:
+            x1, y1, x2, y2 = (int(v) for v in face_bbox)
+            x1, y1 = max(x1, 0), max(y1, 0)
+            x2, y2 = min(x2, w), min(y2, h)
+        else:
+            # Use center region as approximation
+            x1, y1, x2, y2 = w // 4, h // 4, 3 * w // 4, 3 * h // 4
+
+        if x2 <= x1 or y2 <= y1:
+            return None
+
+        face_img = image[y1:y2, x1:x2]
+        # INTER_AREA when shrinking avoids aliasing that would look like moire
+        interpolation = cv2.INTER_AREA if max(face_img.shape[:2]) > size else cv2.INTER_LINEAR
+        bgr = cv2.resize(face_img, (size, size), interpolation=interpolation)
+
+        return cls(
+            bgr=bgr,
+            gray=cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY),
+            ycrcb=cv2.cvtColor(bgr, cv2.COLOR_BGR2YCrCb),
+        )
+
+
 class LivenessDetector:
     """
     Passive liveness detection using image analysis.
@@ -38,6 +105,7 @@ class LivenessDetector:
         min_confidence: float = 0.6,
         texture_threshold: float = 20.0,
         color_threshold: float = 10.0,
+        analysis_size: int = ANALYSIS_SIZE,
     ):
         """
         Initialize liveness detector.
@@ -46,63 +114,119 @@ class LivenessDetector:
             min_confidence: Minimum confidence to consider live
             texture_threshold: Minimum texture variation
             color_threshold: Minimum color variation for skin tone
+            analysis_size: Side the face region is resampled to (power of two)
         """
+        if analysis_size < 16 or analysis_size & (analysis_size - 1):
+            raise ValueError(f"analysis_size must be a power of two >= 16, got {analysis_size}")
+
         self.min_confidence = min_confidence
         self.texture_threshold = texture_threshold
         self.color_threshold = color_threshold
+        self.analysis_size = analysis_size
 
     def detect(
         self,
-        image: Union[np.ndarray, bytes, str, Path],
+        image: Union[np.ndarray, bytes, str, Path, FaceCrop],
         face_bbox: Optional[tuple[int, int, int, int]] = None,
     ) -> LivenessResult:
         """
         Detect if image contains a live face.
 
         Args:
-            image: Input image
+            image: Input image, or a FaceCrop prepared earlier
             face_bbox: Optional face bounding box
 
         Returns:
             LivenessResult object
         """
-        img = self._load_image(image)
-        if img is None:
-            return LivenessResult(
-                is_live=False,
-                confidence=0.0,
-                checks={},
-                message="Failed to load image",
-            )
-
-        # Extract face region
-        if face_bbox:
-            x1, y1, x2, y2 = face_bbox
-            face_img = img[y1:y2, x1:x2]
-        else:
-            # Use center region as approximation
-            h, w = img.shape[:2]
-            face_img = img[h // 4 : 3 * h // 4, w // 4 : 3 * w // 4]
+        return self.detect_batch([image], [face_bbox])[0]
 
-        # Run checks
-        checks = {}
-
-        # 1. Texture analysis (photos often have different texture)
-        checks["texture"] = self._check_texture(face_img)
+    def detect_batch(
+        self,
+        images: Sequence[Union[np.ndarray, bytes, str, Path, FaceCrop]],
+        face_bboxes: Optional[Sequence[Optional[tuple[int, int, int, int]]]] = None,
+    ) -> list[LivenessResult]:
+        """
+        Score many face crops in one vectorized pass.
 
-        # 2. Color distribution (natural skin has specific distribution)
-        checks["color"] = self._check_color_distribution(face_img)
+        Crops are stacked into (N, size, size) arrays so the texture,
+        color, reflection and moire checks run as single numpy operations
+        over the whole batch (one batched real FFT for moire).
 
-        # 3. Reflection/glare detection
-        checks["reflection"] = self._check_reflections(face_img)
+        Args:
+            images: Input images or FaceCrops
+            face_bboxes: Optional bounding box per image (None entries use
+                the center region); ignored for FaceCrop inputs
 
-        # 4. Moire pattern detection (screens)
-        checks["moire"] = self._check_moire(face_img)
+        Returns:
+            LivenessResult per input, in input order
+        """
+        if face_bboxes is None:
+            face_bboxes = [None] * len(images)
+        if len(face_bboxes) != len(images):
+            raise ValueError("face_bboxes must have one entry per image")
+
+        results: list[Optional[LivenessResult]] = [None] * len(images)
+        crops: list[FaceCrop] = []
+        positions: list[int] = []
+
+        for i, (image, bbox) in enumerate(zip(images, face_bboxes)):
+            crop = self.prepare(image, bbox)
+            if crop is None:
+                results[i] = LivenessResult(
+                    is_live=False,
+                    confidence=0.0,
+                    checks={},
+                    message="Failed to load image",
+                )
+                continue
+            crops.append(crop)
+            positions.append(i)
+
+        if crops:
+            gray = np.stack([crop.gray for crop in crops])
+            ycrcb = np.stack([crop.ycrcb for crop in crops])
+
+            checks = {
+                # 1. Texture analysis (photos often have different texture)
+                "texture": self._check_texture(gray),
+                # 2. Color distribution (natural skin has specific distribution)
+                "color": self._check_color_distribution(ycrcb),
+                # 3. Reflection/glare detection
+                "reflection": self._check_reflections(gray),
+                # 4. Moire pattern detection (screens)
+                "moire": self._check_moire(gray),
+                # 5. Edge analysis (printed photos have different edges)
+                "edges": self._check_edges(gray),
+            }
+
+            for row, i in enumerate(positions):
+                results[i] = self._build_result(
+                    {name: bool(passed[row]) for name, passed in checks.items()}
+                )
+
+        return results
+
+    def prepare(
+        self,
+        image: Union[np.ndarray, bytes, str, Path, FaceCrop],
+        face_bbox: Optional[tuple[int, int, int, int]] = None,
+    ) -> Optional[FaceCrop]:
+        """Load an image and build its FaceCrop at this detector's analysis size."""
+        if isinstance(image, FaceCrop):
+            if image.size == self.analysis_size:
+                return image
+            # Resample the whole prepared region rather than its center
+            size = image.size
+            image, face_bbox = image.bgr, (0, 0, size, size)
 
-        # 5. Edge analysis (printed photos have different edges)
-        checks["edges"] = self._check_edges(face_img)
+        img = self._load_image(image)
+        if img is None:
+            return None
+        return FaceCrop.from_image(img, face_bbox, self.analysis_size)
 
-        # Calculate confidence
+    def _build_result(self, checks: dict[str, bool]) -> LivenessResult:
+        """Combine check outcomes into a LivenessResult."""
         passed_checks = sum(checks.values())
         total_checks = len(checks)
         confidence = passed_checks / total_checks
@@ -122,95 +246,85 @@ class LivenessDetector:
             message=message,
         )
 
-    def _check_texture(self, face_img: np.ndarray) -> bool:
-        """Check face texture using Local Binary Patterns variance."""
-        gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
-
-        # Calculate LBP-like texture measure
-        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-        texture_var = laplacian.var()
+    def _check_texture(self, gray: np.ndarray) -> np.ndarray:
+        """Check face texture using Laplacian variance, per crop of (N, H, W)."""
+        # 3x3 Laplacian with reflect-101 borders, same as cv2.Laplacian(ksize=1)
+        padded = np.pad(gray.astype(np.float32), ((0, 0), (1, 1), (1, 1)), mode="reflect")
+        laplacian = (
+            padded[:, :-2, 1:-1]
+            + padded[:, 2:, 1:-1]
+            + padded[:, 1:-1, :-2]
+            + padded[:, 1:-1, 2:]
+            - 4 * padded[:, 1:-1, 1:-1]
+        )
+        texture_var = laplacian.var(axis=(1, 2), dtype=np.float64)
 
         return texture_var > self.texture_threshold
 
-    def _check_color_distribution(self, face_img: np.ndarray) -> bool:
-        """Check if color distribution matches natural skin tones."""
-        # Convert to YCrCb (better for skin detection)
-        ycrcb = cv2.cvtColor(face_img, cv2.COLOR_BGR2YCrCb)
-
+    def _check_color_distribution(self, ycrcb: np.ndarray) -> np.ndarray:
+        """Check if color distribution matches natural skin tones, per crop of (N, H, W, 3)."""
         # Typical skin color ranges in YCrCb
         # Cr: 133-173, Cb: 77-127
-        cr = ycrcb[:, :, 1]
-        cb = ycrcb[:, :, 2]
+        cr = ycrcb[..., 1]
+        cb = ycrcb[..., 2]
 
-        cr_std = np.std(cr)
-        cb_std = np.std(cb)
+        cr_std = cr.std(axis=(1, 2))
+        cb_std = cb.std(axis=(1, 2))
 
         # Natural skin has some variation
-        has_variation = cr_std > self.color_threshold and cb_std > self.color_threshold
+        has_variation = (cr_std > self.color_threshold) & (cb_std > self.color_threshold)
 
         # Check if majority is in skin range
         skin_mask = (cr > 133) & (cr < 173) & (cb > 77) & (cb < 127)
-        skin_ratio = np.sum(skin_mask) / skin_mask.size
-
-        return has_variation and skin_ratio > 0.3
+        skin_ratio = skin_mask.mean(axis=(1, 2))
 
-    def _check_reflections(self, face_img: np.ndarray) -> bool:
-        """Check for unnatural reflections (screen/photo glare)."""
-        gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+        return has_variation & (skin_ratio > 0.3)
 
+    def _check_reflections(self, gray: np.ndarray) -> np.ndarray:
+        """Check for unnatural reflections (screen/photo glare), per crop of (N, H, W)."""
         # Find very bright spots (potential reflections)
         bright_threshold = 240
-        bright_spots = gray > bright_threshold
-        bright_ratio = np.sum(bright_spots) / bright_spots.size
+        bright_ratio = (gray > bright_threshold).mean(axis=(1, 2))
 
         # Some bright spots are normal, too many indicate screen/photo
         return bright_ratio < 0.05
 
-    def _check_moire(self, face_img: np.ndarray) -> bool:
-        """Check for moire patterns (indicates screen capture)."""
-        gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
-
-        # Apply FFT to detect periodic patterns
-        f_transform = np.fft.fft2(gray)
-        f_shift = np.fft.fftshift(f_transform)
-        magnitude = np.abs(f_shift)
-
-        # Remove DC component
-        h, w = magnitude.shape
-        magnitude[h // 2 - 5 : h // 2 + 5, w // 2 - 5 : w // 2 + 5] = 0
-
-        # Check for strong periodic patterns
-        max_mag = np.max(magnitude)
-        mean_mag = np.mean(magnitude)
+    def _check_moire(self, gray: np.ndarray) -> np.ndarray:
+        """Check for moire patterns (indicates screen capture), per crop of (N, H, W)."""
+        # Real FFT over the last two axes: half the spectrum, one call for the batch
+        magnitude = np.abs(np.fft.rfft2(gray.astype(np.float32), axes=(-2, -1)))
+
+        # Remove DC component (low frequencies sit at the corners, unshifted)
+        magnitude[:, :5, :5] = 0
+        magnitude[:, -5:, :5] = 0
+
+        # Columns 1..W/2-1 stand in for their mirrored conjugates in the full spectrum
+        h, w = gray.shape[1:]
+        total = (
+            magnitude[..., 0].sum(axis=1)
+            + magnitude[..., -1].sum(axis=1)
+            + 2 * magnitude[..., 1:-1].sum(axis=(1, 2))
+        )
+        mean_mag = total / (h * w)
+        max_mag = magnitude.max(axis=(1, 2))
 
         # Moire patterns create strong periodic peaks
-        ratio = max_mag / mean_mag if mean_mag > 0 else 0
+        ratio = np.divide(max_mag, mean_mag, out=np.zeros_like(mean_mag), where=mean_mag > 0)
         return ratio < 100  # No strong periodic patterns
 
-    def _check_edges(self, face_img: np.ndarray) -> bool:
-        """Check edge characteristics (printed photos have different edges)."""
-        gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
-
-        # Detect edges
-        edges = cv2.Canny(gray, 50, 150)
-        edge_density = np.sum(edges > 0) / edges.size
+    def _check_edges(self, gray: np.ndarray) -> np.ndarray:
+        """Check edge characteristics (printed photos have different edges), per crop of (N, H, W)."""
+        # Canny has no batched form; crops are small and fixed-size
+        edge_density = np.array(
+            [np.count_nonzero(cv2.Canny(crop, 50, 150)) / crop.size for crop in gray]
+        )
 
         # Natural faces have moderate edge density
-        return 0.02 < edge_density < 0.15
-
-    def _load_image(self, image: Union[np.ndarray, bytes, str, Path]) -> Optional[np.ndarray]:
-        """Load image from various sources."""
-        if isinstance(image, np.ndarray):
-            return image
-
-        if isinstance(image, bytes):
-            nparr = np.frombuffer(image, np.uint8)
-            return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-        if isinstance(image, (str, Path)):
-            return cv2.imread(str(image))
+        return (0.02 < edge_density) & (edge_density < 0.15)
 
-        return None
+    def _load_image(self, image: ImageSource) -> Optional[np.ndarray]:
+        """Load image from various sources (including ImageBatchLoader output)."""
+        return load_image(image)
 
 
 # Default detector instance
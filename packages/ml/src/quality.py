@@ -5,13 +5,16 @@ Assess face image quality for registration and verification.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
 import cv2
 import numpy as np
 
+from .image_loader import ImageSource, load_image
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,10 +94,12 @@ class QualityAssessor:
                 face_size=0, face_pose=0, is_acceptable=False
             )
 
+        # Convert once; every pixel metric works on the gray image
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
         # Calculate individual metrics
-        sharpness = self._calculate_sharpness(img)
-        brightness = self._calculate_brightness(img)
-        contrast = self._calculate_contrast(img)
+        sharpness = self._calculate_sharpness(gray)
+        brightness, contrast = self._calculate_brightness_contrast(gray)
         face_size = self._calculate_face_size(img, face_bbox)
         face_pose = self._estimate_face_pose(img, face_bbox)
 
@@ -126,30 +131,53 @@ class QualityAssessor:
             is_acceptable=is_acceptable,
         )
 
-    def _calculate_sharpness(self, img: np.ndarray) -> float:
+    def assess_batch(
+        self,
+        images: Sequence[Union[np.ndarray, bytes, str, Path]],
+        face_bboxes: Optional[Sequence[Optional[tuple[int, int, int, int]]]] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[QualityScore]:
+        """
+        Assess many images in parallel.
+
+        Decoding and the OpenCV metrics release the GIL, so a thread pool
+        scales across cores without pickling images to other processes.
+
+        Args:
+            images: Input images
+            face_bboxes: Optional bounding box per image
+            max_workers: Thread pool size (default: ThreadPoolExecutor's)
+
+        Returns:
+            QualityScore per input, in input order
+        """
+        if face_bboxes is None:
+            face_bboxes = [None] * len(images)
+        if len(face_bboxes) != len(images):
+            raise ValueError("face_bboxes must have one entry per image")
+
+        if len(images) <= 1 or max_workers == 1:
+            return [self.assess(image, bbox) for image, bbox in zip(images, face_bboxes)]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.assess, images, face_bboxes))
+
+    def _calculate_sharpness(self, gray: np.ndarray) -> float:
         """Calculate image sharpness using Laplacian variance."""
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
 
         # Normalize to 0-100 (typical range is 0-3000)
         score = min(100, laplacian_var / 30)
         return score
 
-    def _calculate_brightness(self, img: np.ndarray) -> float:
-        """Calculate average brightness."""
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        brightness = np.mean(gray)
-
-        # Normalize to 0-100
-        return brightness / 255 * 100
+    def _calculate_brightness_contrast(self, gray: np.ndarray) -> tuple[float, float]:
+        """Calculate average brightness and contrast (standard deviation) in one pass."""
+        mean, std = cv2.meanStdDev(gray)
 
-    def _calculate_contrast(self, img: np.ndarray) -> float:
-        """Calculate image contrast using standard deviation."""
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        contrast = np.std(gray)
-
-        # Normalize to 0-100 (typical range is 0-80)
-        return min(100, contrast / 80 * 100)
+        # Normalize to 0-100 (typical contrast range is 0-80)
+        brightness = float(mean[0, 0]) / 255 * 100
+        contrast = min(100, float(std[0, 0]) / 80 * 100)
+        return brightness, contrast
 
     def _calculate_face_size(
         self,
@@ -221,19 +249,9 @@ class QualityAssessor:
         else:
             return 40.0
 
-    def _load_image(self, image: Union[np.ndarray, bytes, str, Path]) -> Optional[np.ndarray]:
-        """Load image from various sources."""
-        if isinstance(image, np.ndarray):
-            return image
-
-        if isinstance(image, bytes):
-            nparr = np.frombuffer(image, np.uint8)
-            return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-        if isinstance(image, (str, Path)):
-            return cv2.imread(str(image))
-
-        return None
+    def _load_image(self, image: ImageSource) -> Optional[np.ndarray]:
+        """Load image from various sources (including ImageBatchLoader output)."""
+        return load_image(image)
 
 
 # Default assessor instance
@@ -260,3 +278,27 @@ def assess_image_quality(
         _default_assessor = QualityAssessor()
 
     return _default_assessor.assess(image, face_bbox)
+
+
+def assess_image_quality_batch(
+    images: Sequence[Union[np.ndarray, bytes, str, Path]],
+    face_bboxes: Optional[Sequence[Optional[tuple[int, int, int, int]]]] = None,
+    max_workers: Optional[int] = None,
+) -> list[QualityScore]:
+    """
+    Assess many images in parallel using default assessor.
+
+    Args:
+        images: Input images
+        face_bboxes: Optional bounding box per image
+        max_workers: Thread pool size
+
+    Returns:
+        QualityScore per input, in input order
+    """
+    global _default_assessor
+
+    if _default_assessor is None:
+        _default_assessor = QualityAssessor()
+
+    return _default_assessor.assess_batch(images, face_bboxes, max_workers)